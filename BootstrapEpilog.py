@@ -6,9 +6,13 @@
 # ----------------------------------------------------------------------
 # pylint: disable=missing-module-docstring
 
+import hashlib
+import json
 import os
+import re
 import subprocess
 import sys
+import time
 
 from pathlib import Path
 
@@ -19,6 +23,9 @@ is_force = False
 is_verbose = False
 is_package = False
 no_cache = False
+use_wheelhouse = "PYTHON_BOOTSTRAPPER_WHEELHOUSE" in os.environ
+is_offline = False
+prune_wheelhouse = False
 
 display_flags: list[str] = []
 
@@ -35,22 +42,200 @@ for arg in sys.argv[2:]:
         display_flags.append("package")
     elif arg == "--no-cache":
         no_cache = True
+    elif arg == "--wheelhouse":
+        use_wheelhouse = True
+    elif arg == "--offline":
+        use_wheelhouse = True
+        is_offline = True
+    elif arg == "--prune-wheelhouse":
+        use_wheelhouse = True
+        prune_wheelhouse = True
     else:
         raise Exception("'{}' is not a recognized argument.".format(arg))
 
 if is_debug:
     is_verbose = True
 
-subprocess.run(
-    'pip install --disable-pip-version-check {} --editable ".[dev{}]"'.format(
+generated_dir = Path(__file__).parent / os.environ["PYTHON_BOOTSTRAPPER_GENERATED_DIR"]
+
+# A wheelhouse is a local directory of wheels shared by all bootstrapped projects. It is populated (from
+# the package index) when it doesn't contain all of the required wheels, and installations are made from
+# it with '--no-index', which allows bootstrapping without network access once it has been populated.
+if "PYTHON_BOOTSTRAPPER_WHEELHOUSE" in os.environ:
+    wheelhouse_dir = Path(os.environ["PYTHON_BOOTSTRAPPER_WHEELHOUSE"])
+elif os.name == "nt" and "LOCALAPPDATA" in os.environ:
+    wheelhouse_dir = Path(os.environ["LOCALAPPDATA"]) / "PythonProjectBootstrapper" / "Wheelhouse"
+elif "XDG_CACHE_HOME" in os.environ:
+    wheelhouse_dir = Path(os.environ["XDG_CACHE_HOME"]) / "PythonProjectBootstrapper" / "wheelhouse"
+else:
+    wheelhouse_dir = Path.home() / ".cache" / "PythonProjectBootstrapper" / "wheelhouse"
+
+# Wheels that haven't been used by a bootstrap in this many days are removed by '--prune-wheelhouse'
+wheelhouse_prune_days = 30
+
+extras = "dev{}".format(", package" if is_package else "")
+
+# Skip the installation when nothing that impacts it has changed since the last successful installation
+fingerprint_filename = generated_dir / "bootstrap_fingerprint.txt"
+
+hasher = hashlib.sha256()
+
+with (Path(__file__).parent / "pyproject.toml").open("rb") as f:
+    hasher.update(f.read())
+
+for value in [extras, sys.version, sys.executable]:
+    hasher.update(b"\0")
+    hasher.update(value.encode("utf-8"))
+
+fingerprint = hasher.hexdigest()
+
+if (
+    not is_force
+    and fingerprint_filename.is_file()
+    and fingerprint_filename.read_text().strip() == fingerprint
+):
+    sys.stdout.write(
+        "Dependencies are up to date; skipping installation (use '--force' to install them again).\n"
+    )
+else:
+    # Remove the fingerprint so that an interrupted installation is not considered complete
+    if fingerprint_filename.is_file():
+        fingerprint_filename.unlink()
+
+    install_args = '--disable-pip-version-check {} --editable ".[{}]"'.format(
         "--no-cache-dir" if no_cache else "",
-        ", package" if is_package else "",
-    ),
-    check=True,
-    shell=True,
-)
-
-with (
-    Path(__file__).parent / os.environ["PYTHON_BOOTSTRAPPER_GENERATED_DIR"] / "bootstrap_flags.json"
-).open("w") as f:
+        extras,
+    )
+
+    if not use_wheelhouse:
+        subprocess.run("pip install {}".format(install_args), check=True, shell=True)
+    else:
+        wheelhouse_dir.mkdir(parents=True, exist_ok=True)
+
+        with (Path(__file__).parent / "pyproject.toml").open() as f:
+            pyproject_content = f.read()
+
+        # The build requirements are needed to install the project itself without an index
+        build_requirements = ["wheel"]
+
+        build_system_match = re.search(
+            r"^\[build-system\][^\[]*?^requires\s*=\s*\[(?P<values>[^\]]*)\]",
+            pyproject_content,
+            re.MULTILINE | re.DOTALL,
+        )
+        if build_system_match:
+            build_requirements += re.findall(r'"([^"]+)"', build_system_match.group("values"))
+
+        report_filename = generated_dir / "wheelhouse_install_report.json"
+        report_filename.parent.mkdir(parents=True, exist_ok=True)
+
+        offline_install_command = (
+            'pip install --no-index --find-links "{}" --report "{}" {}'.format(
+                wheelhouse_dir,
+                report_filename,
+                install_args,
+            )
+        )
+
+        if subprocess.run(offline_install_command, shell=True).returncode != 0:
+            if is_offline:
+                raise Exception(
+                    "The wheelhouse at '{}' does not contain all of the required wheels; bootstrap without '--offline' on a machine with network access to populate it.".format(
+                        wheelhouse_dir,
+                    ),
+                )
+
+            sys.stdout.write("Populating the wheelhouse at '{}'...\n".format(wheelhouse_dir))
+
+            subprocess.run(
+                'pip wheel --disable-pip-version-check --wheel-dir "{}" ".[{}]" {}'.format(
+                    wheelhouse_dir,
+                    extras,
+                    " ".join(f'"{requirement}"' for requirement in build_requirements),
+                ),
+                check=True,
+                shell=True,
+            )
+
+            # The wheel for this project is built as part of the process, but it shouldn't be shared
+            project_name_match = re.search(
+                r'^\[project\][^\[]*?^name\s*=\s*"(?P<name>[^"]+)"',
+                pyproject_content,
+                re.MULTILINE | re.DOTALL,
+            )
+            if project_name_match:
+                project_wheel_prefix = (
+                    re.sub(r"[-_.]+", "_", project_name_match.group("name")).lower() + "-"
+                )
+
+                for wheel_filename in wheelhouse_dir.glob("*.whl"):
+                    if wheel_filename.name.lower().startswith(project_wheel_prefix):
+                        wheel_filename.unlink()
+
+            subprocess.run(offline_install_command, check=True, shell=True)
+
+        # Update the modification time of the wheels that were used so that they aren't pruned
+        if report_filename.is_file():
+            with report_filename.open() as f:
+                report = json.load(f)
+
+            for item in report.get("install", []):
+                url = item.get("download_info", {}).get("url", "")
+                if not url.startswith("file:") or not url.endswith(".whl"):
+                    continue
+
+                wheel_filename = wheelhouse_dir / url.rsplit("/", 1)[-1]
+                if wheel_filename.is_file():
+                    os.utime(wheel_filename)
+
+            report_filename.unlink()
+
+        # Build requirements are installed in an isolated environment and are not included in the report
+        build_requirement_prefixes = tuple(
+            re.sub(r"[-_.]+", "_", re.match(r"[A-Za-z0-9_.-]+", requirement).group(0)).lower() + "-"
+            for requirement in build_requirements
+        )
+
+        for wheel_filename in wheelhouse_dir.glob("*.whl"):
+            if wheel_filename.name.lower().startswith(build_requirement_prefixes):
+                os.utime(wheel_filename)
+
+    fingerprint_filename.parent.mkdir(parents=True, exist_ok=True)
+    fingerprint_filename.write_text(fingerprint)
+
+with (generated_dir / "bootstrap_flags.json").open("w") as f:
     f.write("[{}]".format(", ".join(f'"{flag}"' for flag in display_flags)))
+
+if use_wheelhouse and wheelhouse_dir.is_dir():
+    if prune_wheelhouse:
+        prune_time = time.time() - wheelhouse_prune_days * 24 * 60 * 60
+
+        num_pruned = 0
+        pruned_size = 0
+
+        for wheel_filename in wheelhouse_dir.glob("*.whl"):
+            status = wheel_filename.stat()
+
+            if status.st_mtime < prune_time:
+                wheel_filename.unlink()
+
+                num_pruned += 1
+                pruned_size += status.st_size
+
+        sys.stdout.write(
+            "Pruned {} wheel(s) ({:.1f} MB) not used in the last {} days.\n".format(
+                num_pruned,
+                pruned_size / (1024 * 1024),
+                wheelhouse_prune_days,
+            ),
+        )
+
+    wheel_sizes = [wheel_filename.stat().st_size for wheel_filename in wheelhouse_dir.glob("*.whl")]
+
+    sys.stdout.write(
+        "Wheelhouse: {} wheel(s), {:.1f} MB in '{}'.\n".format(
+            len(wheel_sizes),
+            sum(wheel_sizes) / (1024 * 1024),
+            wheelhouse_dir,
+        ),
+    )
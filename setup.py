@@ -0,0 +1,56 @@
+# ----------------------------------------------------------------------
+# |
+# |  Copyright (c) 2024 Scientific Software Engineering Center at Georgia Tech
+# |  Distributed under the MIT License.
+# |
+# ----------------------------------------------------------------------
+"""Packaging customizations that can't be expressed in pyproject.toml."""
+
+import importlib.util
+
+from pathlib import Path
+
+from setuptools import setup
+from setuptools.command.build_py import build_py
+
+
+# ----------------------------------------------------------------------
+class BuildPy(build_py):
+    """Writes the template bundle (see TemplateBundle.py) alongside the project templates"""
+
+    # ----------------------------------------------------------------------
+    def run(self):
+        super().run()
+
+        if self.dry_run:
+            return
+
+        # Load the module directly, as the package's dependencies aren't available when it is built
+        spec = importlib.util.spec_from_file_location(
+            "TemplateBundle",
+            Path(__file__).parent / "src" / "PythonProjectBootstrapper" / "TemplateBundle.py",
+        )
+        assert spec is not None and spec.loader is not None
+
+        mod = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(mod)
+
+        templates_root_dir = Path(self.build_lib) / "PythonProjectBootstrapper"
+
+        mod.CreateTemplateBundle(
+            templates_root_dir,
+            [
+                item.name
+                for item in templates_root_dir.iterdir()
+                if item.is_dir() and not item.name.startswith(".") and item.name != "__pycache__"
+            ],
+            templates_root_dir / mod.template_bundle_filename,
+        )
+
+
+# ----------------------------------------------------------------------
+setup(
+    cmdclass={
+        "build_py": BuildPy,
+    },
+)
@@ -8,14 +8,124 @@
 
 import datetime
 import importlib
+import importlib.metadata
+import importlib.util
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
 import textwrap
+import time
 
 from functools import cache
 from pathlib import Path
+from typing import Any
+
+import yaml
 
 from cx_Freeze import setup, Executable
 from dbrownell_Common import PathEx
 
+from PythonProjectBootstrapper.Generation import GetProjectNames
+from PythonProjectBootstrapper.TemplateBundle import CreateTemplateBundle, template_bundle_filename
+
+
+# The build profile is selected with this environment variable:
+#
+#   startup (default): Optimized bytecode, modules that are not imported when generating a project are
+#                      excluded, and pure-python packages are stored in an uncompressed zip file.
+#   standard:          Unoptimized bytecode and all modules found by cx_Freeze are included; use this
+#                      profile when investigating problems that may be caused by the startup profile.
+#
+BUILD_PROFILE_ENVIRONMENT_VARIABLE = "PYTHON_PROJECT_BOOTSTRAPPER_BUILD_PROFILE"
+
+# Configuration values used when tracing imports and benchmarking the binary
+_GENERATION_PROJECT = "package"
+
+_GENERATION_CONFIGURATION: dict[str, str] = {
+    "name": "Jane Doe",
+    "email": "jane@example.com",
+    "project_description": "A project generated while building the binary",
+    "license": "MIT",
+    "github_username": "jdoe",
+    "github_project_name": "test_project",
+    "gist_id": "abc123",
+    "minisign_public_key": "none",
+    "openssf_best_practices_badge_id": "none",
+}
+
+# Modules that must never be excluded, even when they are not imported during the traced run
+_ALWAYS_INCLUDED_MODULES: set[str] = {
+    "encodings",
+    "importlib",
+    "zipimport",
+    # Imported by `os.path.expanduser` when HOME isn't defined
+    "pwd",
+    # Imported by `multiprocessing` when worker processes are spawned rather than forked
+    "runpy",
+}
+
+# Invoked in a separate process so that the modules imported by the build itself are not included in the trace.
+_TRACE_SCRIPT = textwrap.dedent(
+    """\
+    import json
+    import subprocess
+    import sys
+
+    from pathlib import Path
+
+    import typer
+
+    from PythonProjectBootstrapper.EntryPoint import app
+
+    temp_dir, configuration_filename, output_filename = (Path(arg) for arg in sys.argv[1:])
+
+    output_dir = temp_dir / "output"
+    subprocess.run(["git", "init", "-q", str(output_dir)], check=True)
+
+    generate_args = [
+        "{project}",
+        str(output_dir),
+        "--configuration",
+        str(configuration_filename),
+        "--yes",
+        "--skip-prompts",
+    ]
+
+    for args, expected_exit_code in [
+        (["--version"], 0),
+        (["--help"], 0),
+        (["--invalid-option"], 2),
+        (
+            generate_args
+            + [
+                "--report-json",
+                str(temp_dir / "report.json"),
+                "--report-junit",
+                str(temp_dir / "report.xml"),
+            ],
+            0,
+        ),
+        (generate_args + ["--progress", "--render-workers", "2"], 0),
+        (generate_args + ["--json-lines"], 0),
+    ]:
+        exit_code = 0
+
+        try:
+            typer.main.get_command(app).main(args, prog_name="PythonProjectBootstrapper")
+        except SystemExit as ex:
+            exit_code = ex.code or 0
+
+        if exit_code != expected_exit_code:
+            raise Exception(f"{{args}} returned {{exit_code}}; {{expected_exit_code}} was expected.")
+
+    output_filename.write_text(json.dumps(sorted(sys.modules)))
+    """,
+).format(project=_GENERATION_PROJECT)
+
 
 # ----------------------------------------------------------------------
 @cache
@@ -75,7 +185,299 @@ def _GetCopyright() -> str:
 
 
 # ----------------------------------------------------------------------
-setup(
+@cache
+def _GetProfile() -> str:
+    profile = os.environ.get(BUILD_PROFILE_ENVIRONMENT_VARIABLE, "startup")
+
+    if profile not in ["startup", "standard"]:
+        raise Exception(
+            f"'{profile}' is not a valid value for {BUILD_PROFILE_ENVIRONMENT_VARIABLE}; valid values are 'startup' and 'standard'."
+        )
+
+    return profile
+
+
+# ----------------------------------------------------------------------
+@cache
+def _GetBuildExeOptions() -> dict[str, Any]:
+    if _GetProfile() == "standard":
+        return {
+            "excludes": [
+                "tcl",
+                "tkinter",
+            ],
+            "no_compress": False,
+            "optimize": 0,
+        }
+
+    return {
+        "excludes": _GetExcludes(),
+        "zip_include_packages": _GetZipIncludePackages(),
+        # Modules stored in an uncompressed zip file are imported without being decompressed
+        "no_compress": True,
+        # Level 2 removes docstrings, which typer uses to generate the command line help
+        "optimize": 1,
+    }
+
+
+# ----------------------------------------------------------------------
+@cache
+def _GetTracedModules() -> set[str]:
+    """Returns the names of the modules imported when generating a project"""
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = Path(temp_dir)
+        output_filename = temp_path / "modules.json"
+
+        subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                _TRACE_SCRIPT,
+                str(temp_path),
+                str(_WriteGenerationConfiguration(temp_path)),
+                str(output_filename),
+            ],
+            check=True,
+            cwd=temp_path,
+            # Accept the default (configured) value for each prompt
+            input="\n" * 1000,
+            text=True,
+            stdout=subprocess.DEVNULL,
+        )
+
+        return set(json.loads(output_filename.read_text()))
+
+
+# ----------------------------------------------------------------------
+@cache
+def _GetHookModules() -> set[str]:
+    """Returns the names of the top-level modules imported by project hooks; hooks are executed by the binary but aren't frozen"""
+
+    # Hooks are templates, so they can't be parsed as python
+    import_regex = re.compile(r"^\s*import\s+(?P<names>[\w.]+(?:\s*,\s*[\w.]+)*)", re.MULTILINE)
+    from_import_regex = re.compile(r"^\s*from\s+(?P<name>\w+)", re.MULTILINE)
+
+    modules: set[str] = set()
+
+    for hook_filename in (Path(__file__).parent / _GetName()).glob("*/hooks/*.py"):
+        content = hook_filename.read_text(encoding="utf-8")
+
+        for match in import_regex.finditer(content):
+            modules.update(
+                name.strip().partition(".")[0] for name in match.group("names").split(",")
+            )
+
+        modules.update(match.group("name") for match in from_import_regex.finditer(content))
+
+    return modules
+
+
+# ----------------------------------------------------------------------
+@cache
+def _GetDependencyModules() -> set[str]:
+    """Returns the names of the top-level modules provided by this package's dependencies (and their dependencies)"""
+
+    # ----------------------------------------------------------------------
+    def Normalize(name: str) -> str:
+        return re.sub(r"[-_.]+", "-", name).lower()
+
+    # ----------------------------------------------------------------------
+
+    distributions: set[str] = set()
+    pending: list[str] = [_GetName()]
+
+    while pending:
+        name = pending.pop()
+
+        normalized_name = Normalize(name)
+        if normalized_name in distributions:
+            continue
+
+        distributions.add(normalized_name)
+
+        try:
+            requirements = importlib.metadata.requires(name) or []
+        except importlib.metadata.PackageNotFoundError:
+            continue
+
+        for requirement in requirements:
+            if "extra ==" in requirement:
+                continue
+
+            match = re.match(r"[A-Za-z0-9_.-]+", requirement)
+            assert match, requirement
+
+            pending.append(match.group(0))
+
+    return {
+        module_name
+        for module_name, distribution_names in importlib.metadata.packages_distributions().items()
+        if any(
+            Normalize(distribution_name) in distributions
+            for distribution_name in distribution_names
+        )
+    }
+
+
+# ----------------------------------------------------------------------
+@cache
+def _GetExcludes() -> list[str]:
+    """Returns the names of standard library and dependency modules that are not imported when generating a project"""
+
+    required = {
+        module_name.partition(".")[0] for module_name in _GetTracedModules() | _GetHookModules()
+    }
+
+    candidates = set(sys.stdlib_module_names) | _GetDependencyModules() | {"tcl", "tkinter"}
+
+    return sorted(
+        module_name
+        for module_name in candidates
+        if (
+            module_name not in required
+            and module_name not in _ALWAYS_INCLUDED_MODULES
+            and not module_name.startswith("_")
+        )
+    )
+
+
+# ----------------------------------------------------------------------
+@cache
+def _GetZipIncludePackages() -> list[str]:
+    """Returns the names of the imported dependency packages that only contain python files; these packages can be imported from a zip file"""
+
+    python_suffixes = {".py", ".pyc", ".pyi"}
+
+    packages: list[str] = []
+
+    for module_name in sorted(
+        {module_name.partition(".")[0] for module_name in _GetTracedModules()}
+        & _GetDependencyModules()
+    ):
+        if module_name == _GetName():
+            continue
+
+        spec = importlib.util.find_spec(module_name)
+
+        # Skip modules and namespace packages
+        if spec is None or spec.origin is None or not spec.submodule_search_locations:
+            continue
+
+        if all(
+            filename.suffix in python_suffixes or filename.name == "py.typed"
+            for location in spec.submodule_search_locations
+            for filename in Path(location).rglob("*")
+            if filename.is_file()
+        ):
+            packages.append(module_name)
+
+    return packages
+
+
+# ----------------------------------------------------------------------
+def _WriteGenerationConfiguration(output_dir: Path) -> Path:
+    configuration_filename = output_dir / "configuration.yaml"
+
+    with configuration_filename.open("w") as f:
+        yaml.dump({"default_context": _GENERATION_CONFIGURATION}, f)
+
+    return configuration_filename
+
+
+# ----------------------------------------------------------------------
+def _WriteStartupBenchmark(
+    build_exe_dir: Path,
+    num_version_runs: int = 10,
+    num_generation_runs: int = 3,
+) -> Path:
+    """Time the frozen binary's `--version` and a full generation; the results are written to the build directory"""
+
+    executable = PathEx.EnsureFile(
+        build_exe_dir / (_GetName() + (".exe" if os.name == "nt" else ""))
+    )
+
+    # ----------------------------------------------------------------------
+    def Time(args: list[str]) -> float:
+        start_time = time.perf_counter()
+
+        subprocess.run(
+            [str(executable)] + args,
+            check=True,
+            # Accept the default (configured) value for each prompt
+            input="\n" * 1000,
+            text=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+
+        return time.perf_counter() - start_time
+
+    # ----------------------------------------------------------------------
+    def Summarize(durations: list[float]) -> dict[str, Any]:
+        return {
+            "runs": durations,
+            "min": min(durations),
+            "median": statistics.median(durations),
+            "max": max(durations),
+        }
+
+    # ----------------------------------------------------------------------
+
+    version_durations = [Time(["--version"]) for _ in range(num_version_runs)]
+    generation_durations: list[float] = []
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = Path(temp_dir)
+        configuration_filename = _WriteGenerationConfiguration(temp_path)
+
+        for index in range(num_generation_runs):
+            output_dir = temp_path / f"output{index}"
+            subprocess.run(["git", "init", "-q", str(output_dir)], check=True)
+
+            generation_durations.append(
+                Time(
+                    [
+                        _GENERATION_PROJECT,
+                        str(output_dir),
+                        "--configuration",
+                        str(configuration_filename),
+                        "--yes",
+                        "--skip-prompts",
+                    ],
+                ),
+            )
+
+    # The build directory is moved in its entirety after the build, so the results are written next to the
+    # executable's directory rather than within it (where they would be distributed with the binary).
+    results_filename = build_exe_dir.parent / "startup_benchmark.json"
+
+    with results_filename.open("w") as f:
+        json.dump(
+            {
+                "profile": _GetProfile(),
+                "build_exe_options": _GetBuildExeOptions(),
+                "version": Summarize(version_durations),
+                "generation": Summarize(generation_durations),
+            },
+            f,
+            indent=2,
+        )
+
+    sys.stdout.write(
+        "\nStartup benchmark ({} profile): --version {:.3f}s, generation {:.3f}s (median); results written to '{}'.\n".format(
+            _GetProfile(),
+            statistics.median(version_durations),
+            statistics.median(generation_durations),
+            results_filename,
+        ),
+    )
+
+    return results_filename
+
+
+# ----------------------------------------------------------------------
+distribution = setup(
     name=_GetName(),
     version=_GetVersionAndDocstring()[0],
     description=_GetVersionAndDocstring()[1],
@@ -91,14 +493,24 @@ setup(
     ],
     options={
         "build_exe": {
-            "excludes": [
-                "tcl",
-                "tkinter",
-            ],
-            "no_compress": False,
-            "optimize": 0,
+            **_GetBuildExeOptions(),
             # "packages": [],
             # "include_files": [],
         },
     },
 )
+
+if "build_exe" in sys.argv[1:]:
+    _build_exe_dir = Path(distribution.get_command_obj("build_exe").build_exe)
+
+    # Package the templates so that loading them requires a single file to be opened; this must
+    # happen before the benchmark so that its results reflect the binary as it is distributed.
+    _templates_root_dir = _build_exe_dir / "lib" / _GetName()
+
+    CreateTemplateBundle(
+        _templates_root_dir,
+        GetProjectNames(),
+        _templates_root_dir / template_bundle_filename,
+    )
+
+    _WriteStartupBenchmark(_build_exe_dir)
@@ -0,0 +1,297 @@
+# ----------------------------------------------------------------------
+# |
+# |  Copyright (c) 2024 Scientific Software Engineering Center at Georgia Tech
+# |  Distributed under the MIT License.
+# |
+# ----------------------------------------------------------------------
+"""Functionality that creates many projects, each with its own configuration values, within long-lived worker processes"""
+
+import csv
+import itertools
+import json
+import os
+import string
+import time
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+from PythonProjectBootstrapper.Generation import ConflictPolicy, Generate, GetTemplatesRootDir
+from PythonProjectBootstrapper.Rendering import RenderingBackend
+
+
+# Backend created once per worker process by `_InitializeWorker`, so that compiled templates are
+# reused across the projects created by that process.
+_worker_backend: Optional[RenderingBackend] = None
+
+
+# ----------------------------------------------------------------------
+@dataclass(frozen=True)
+class ProjectResult:
+    """Result of creating a single project"""
+
+    output_dir: Path
+
+    # Description of the error encountered while creating the project (if any)
+    error: Optional[str]
+
+    num_added_files: int
+    num_overwritten_files: int
+    num_deleted_files: int
+
+    # Seconds spent creating the project
+    duration: float
+
+    # ----------------------------------------------------------------------
+    @property
+    def is_success(self) -> bool:
+        return self.error is None
+
+
+# ----------------------------------------------------------------------
+def LoadContexts(
+    project: str,
+    filename: Path,
+) -> list[dict[str, Any]]:
+    """
+    Load the configuration values of multiple projects from a JSON Lines file (one JSON object per line) or
+    a CSV file (one row per project, with configuration value names in the header row).
+
+    Empty CSV cells are omitted (so that the project's default value is used) and CSV values that
+    correspond to flags in the project's cookiecutter.json file are converted to booleans.
+
+    Args:
+        project (str): Name of the project
+        filename (Path): A file with a ".jsonl" or ".csv" extension
+
+    Returns:
+        list[dict[str, Any]]: Configuration values for each project, in the order in which they appear in the file
+    """
+
+    suffix = filename.suffix.lower()
+
+    if suffix == ".jsonl":
+        contexts: list[dict[str, Any]] = []
+
+        with filename.open(encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+
+                try:
+                    context = json.loads(line)
+                except ValueError as ex:
+                    raise Exception(f"'{filename}', line {line_number}: {ex}.") from ex
+
+                if not isinstance(context, dict):
+                    raise Exception(f"'{filename}', line {line_number}: a JSON object is expected.")
+
+                contexts.append(context)
+
+        return contexts
+
+    if suffix == ".csv":
+        with (GetTemplatesRootDir() / project / "cookiecutter.json").open(encoding="utf-8") as f:
+            flag_names = {key for key, value in json.load(f).items() if isinstance(value, bool)}
+
+        contexts = []
+
+        with filename.open(encoding="utf-8", newline="") as f:
+            for row_number, row in enumerate(csv.DictReader(f), 2):
+                context = {}
+
+                for key, value in row.items():
+                    if key is None or value is None or value == "":
+                        continue
+
+                    if key in flag_names:
+                        if value.lower() not in ["true", "false", "yes", "no", "1", "0"]:
+                            raise Exception(
+                                f"'{filename}', row {row_number}: '{value}' is not a valid value for '{key}'."
+                            )
+
+                        typed_value: Any = value.lower() in ["true", "yes", "1"]
+                    else:
+                        typed_value = value
+
+                    context[key] = typed_value
+
+                contexts.append(context)
+
+        return contexts
+
+    raise Exception(f"'{filename}' is not a '.jsonl' or '.csv' file.")
+
+
+# ----------------------------------------------------------------------
+def GetOutputDirs(
+    output_dir_pattern: str,
+    contexts: list[dict[str, Any]],
+) -> list[Path]:
+    """
+    Returns the output directory of each project.
+
+    Args:
+        output_dir_pattern (str): Directory that may contain configuration value names in braces (for example, "repos/{github_project_name}"); "{index}" is replaced with the project's index (starting at 1)
+        contexts (list[dict[str, Any]]): Configuration values for each project
+
+    Returns:
+        list[Path]: The output directories
+    """
+
+    field_names = {
+        field_name
+        for _, field_name, _, _ in string.Formatter().parse(output_dir_pattern)
+        if field_name is not None
+    }
+
+    if not field_names:
+        raise Exception(
+            f"'{output_dir_pattern}' must contain at least one configuration value name in braces (for example, '{{github_project_name}}')."
+        )
+
+    output_dirs: list[Path] = []
+    indexes: dict[Path, int] = {}
+
+    for index, context in enumerate(contexts, 1):
+        try:
+            output_dir = Path(output_dir_pattern.format_map({"index": index, **context})).resolve()
+        except KeyError as ex:
+            raise Exception(
+                f"Project {index} does not provide a value for {ex} in '{output_dir_pattern}'."
+            ) from ex
+
+        existing_index = indexes.get(output_dir)
+        if existing_index is not None:
+            raise Exception(
+                f"Projects {existing_index} and {index} would both be created in '{output_dir}'."
+            )
+
+        indexes[output_dir] = index
+        output_dirs.append(output_dir)
+
+    return output_dirs
+
+
+# ----------------------------------------------------------------------
+def CreateProjects(
+    project: str,
+    contexts: list[dict[str, Any]],
+    output_dirs: list[Path],
+    *,
+    policy: ConflictPolicy = ConflictPolicy.Keep,
+    require_git: bool = False,
+    max_workers: Optional[int] = None,
+) -> list[ProjectResult]:
+    """
+    Create many projects in a pool of worker processes; each process creates multiple projects, so modules
+    are imported and templates are compiled once per process rather than once per project.
+
+    Errors encountered while creating a project are reported in its result and do not prevent the creation
+    of other projects.
+
+    Args:
+        project (str): Name of the project to generate (see GetProjectNames())
+        contexts (list[dict[str, Any]]): Configuration values for each project
+        output_dirs (list[Path]): Output directory for each project (see GetOutputDirs())
+        policy (ConflictPolicy, optional): How conflicts are resolved when an output directory contains a previously generated project. Defaults to ConflictPolicy.Keep.
+        require_git (bool, optional): Report an error for output directories that are not git repositories. Defaults to False.
+        max_workers (Optional[int], optional): Maximum number of worker processes. Defaults to None (one process per CPU).
+
+    Returns:
+        list[ProjectResult]: Results, in the same order as `contexts`
+    """
+
+    assert len(contexts) == len(output_dirs)
+
+    if not contexts:
+        return []
+
+    # Projects are created in worker processes (even when only one worker is used), as cookiecutter changes
+    # the working directory while rendering.
+    with ProcessPoolExecutor(
+        max_workers=min(max_workers or os.cpu_count() or 1, len(contexts)),
+        initializer=_InitializeWorker,
+    ) as executor:
+        return list(
+            executor.map(
+                _CreateProject,
+                itertools.repeat(project),
+                contexts,
+                output_dirs,
+                itertools.repeat(policy),
+                itertools.repeat(require_git),
+            ),
+        )
+
+
+# ----------------------------------------------------------------------
+def WriteSummary(
+    results: list[ProjectResult],
+    filename: Path,
+) -> None:
+    """Write the result of each project to a JSON file"""
+
+    filename.parent.mkdir(parents=True, exist_ok=True)
+
+    with filename.open("w") as f:
+        json.dump(
+            [
+                {
+                    "output_dir": result.output_dir.as_posix(),
+                    "status": "created" if result.is_success else "failed",
+                    "error": result.error,
+                    "added_files": result.num_added_files,
+                    "overwritten_files": result.num_overwritten_files,
+                    "deleted_files": result.num_deleted_files,
+                    "duration": round(result.duration, 3),
+                }
+                for result in results
+            ],
+            f,
+            indent=2,
+        )
+        f.write("\n")
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _InitializeWorker() -> None:
+    global _worker_backend  # pylint: disable=global-statement
+
+    _worker_backend = RenderingBackend()
+
+
+# ----------------------------------------------------------------------
+def _CreateProject(
+    project: str,
+    context: dict[str, Any],
+    output_dir: Path,
+    policy: ConflictPolicy,
+    require_git: bool,
+) -> ProjectResult:
+    start_time = time.perf_counter()
+
+    try:
+        result = Generate(
+            project,
+            output_dir,
+            context,
+            policy,
+            require_git=require_git,
+            rendering_backend=_worker_backend,
+        )
+    except Exception as ex:  # pylint: disable=broad-except
+        return ProjectResult(output_dir, str(ex), 0, 0, 0, time.perf_counter() - start_time)
+
+    return ProjectResult(
+        output_dir,
+        None,
+        len(result.modifications.added_files),
+        len(result.modifications.overwritten_files),
+        len(result.modifications.deleted_files),
+        time.perf_counter() - start_time,
+    )
@@ -0,0 +1,38 @@
+# ----------------------------------------------------------------------
+# |
+# |  Copyright (c) 2024 Scientific Software Engineering Center at Georgia Tech
+# |  Distributed under the MIT License.
+# |
+# ----------------------------------------------------------------------
+"""Location of the directory used to cache information across invocations"""
+
+import os
+
+from pathlib import Path
+
+from dbrownell_Common import PathEx
+
+
+# Environment variable that can be used to override the directory used to cache information across invocations
+CACHE_DIRECTORY_ENV_VAR: str = "PYTHON_PROJECT_BOOTSTRAPPER_CACHE_DIR"
+
+
+# ----------------------------------------------------------------------
+def GetCacheDirectory() -> Path:
+    """
+    Returns the directory used to cache information across invocations (the directory may not exist yet)
+
+    Returns:
+        Path: Value of the PYTHON_PROJECT_BOOTSTRAPPER_CACHE_DIR environment variable if defined, otherwise a user-specific cache directory
+    """
+    env_value = os.getenv(CACHE_DIRECTORY_ENV_VAR)
+    if env_value:
+        return Path(env_value)
+
+    if os.name == "nt" and os.getenv("LOCALAPPDATA"):
+        return Path(os.environ["LOCALAPPDATA"]) / "PythonProjectBootstrapper" / "Cache"
+
+    if os.getenv("XDG_CACHE_HOME"):
+        return Path(os.environ["XDG_CACHE_HOME"]) / "PythonProjectBootstrapper"
+
+    return PathEx.GetUserDirectory() / ".cache" / "PythonProjectBootstrapper"
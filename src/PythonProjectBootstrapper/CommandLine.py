@@ -0,0 +1,54 @@
+# ----------------------------------------------------------------------
+# |
+# |  Copyright (c) 2024 Scientific Software Engineering Center at Georgia Tech
+# |  Distributed under the MIT License.
+# |
+# ----------------------------------------------------------------------
+"""Functionality shared by the command line entry points"""
+
+import sys
+
+from typing import Optional
+
+import typer
+
+from typer.core import TyperGroup  # type: ignore [import-untyped]
+
+from PythonProjectBootstrapper import __version__
+
+
+# ----------------------------------------------------------------------
+class NaturalOrderGrouper(TyperGroup):
+    # pylint: disable=missing-class-docstring
+    # ----------------------------------------------------------------------
+    def list_commands(self, *args, **kwargs):  # pylint: disable=unused-argument
+        return self.commands.keys()
+
+
+# ----------------------------------------------------------------------
+def CreateApp(help_text: Optional[str]) -> typer.Typer:
+    """Returns an app that lists its commands in the order in which they were defined"""
+
+    return typer.Typer(
+        cls=NaturalOrderGrouper,
+        help=help_text,
+        no_args_is_help=True,
+        pretty_exceptions_show_locals=False,
+        pretty_exceptions_enable=False,
+    )
+
+
+# ----------------------------------------------------------------------
+def _VersionCallback(value: bool) -> None:
+    if value:
+        sys.stdout.write(f"PythonProjectBootstrapper {__version__}")
+        raise typer.Exit()
+
+
+# ----------------------------------------------------------------------
+version_option = typer.Option(
+    "--version",
+    help="Display the current version and exit.",
+    callback=_VersionCallback,
+    is_eager=True,
+)
@@ -0,0 +1,329 @@
+# ----------------------------------------------------------------------
+# |
+# |  Copyright (c) 2024 Scientific Software Engineering Center at Georgia Tech
+# |  Distributed under the MIT License.
+# |
+# ----------------------------------------------------------------------
+"""Memory-efficient manifest representation for output directories that contain many files"""
+
+import hashlib
+
+from array import array
+from collections.abc import ItemsView, Iterable, Iterator, Mapping, ValuesView
+from typing import Optional
+
+
+# ----------------------------------------------------------------------
+class CompactManifest(Mapping[str, str]):
+    """
+    Hash values keyed by posix path, with the same read-only API as `dict[str, str]`.
+
+    Rather than storing a string object for each path and hash value, directory names are interned and
+    the remainder of each path is stored (utf-8 encoded) in a single buffer, with entries sorted by
+    path; hash values are stored as raw digests in a contiguous buffer. This reduces the memory used
+    for each entry by ~4x. Lookups are binary searches and the set operations used when merging
+    manifests are linear walks of the sorted paths. Paths are iterated in sorted order.
+
+    Hash values must be hexadecimal digests of the same size. Existing entries can be updated, but new
+    entries can only be added by creating a new manifest (see `Union`).
+    """
+
+    # ----------------------------------------------------------------------
+    def __init__(
+        self,
+        manifest: Optional[Mapping[str, str]] = None,
+    ):
+        items = manifest.items() if manifest is not None else []
+
+        encoded_items: list[tuple[bytes, bytes]] = []
+        digest_size: Optional[int] = None
+
+        for path, hash_value in items:
+            digest = _DecodeHashValue(hash_value)
+
+            if digest_size is None:
+                digest_size = len(digest)
+            elif len(digest) != digest_size:
+                raise Exception(f"'{hash_value}' ({path}) is not a {digest_size}-byte digest.")
+
+            encoded_items.append((path.encode("utf-8"), digest))
+
+        encoded_items.sort()
+
+        self._Initialize(encoded_items, digest_size)
+
+    # ----------------------------------------------------------------------
+    @classmethod
+    def FromMapping(cls, manifest: Mapping[str, str]) -> "CompactManifest":
+        """Returns the manifest if it is a CompactManifest or a CompactManifest with its content"""
+
+        if isinstance(manifest, cls):
+            return manifest
+
+        return cls(manifest)
+
+    # ----------------------------------------------------------------------
+    @classmethod
+    def FromDigests(cls, items: Iterable[tuple[str, bytes]]) -> "CompactManifest":
+        """
+        Create a manifest from raw digests, without creating intermediate hexadecimal strings.
+
+        Args:
+            items (Iterable[tuple[str, bytes]]): Posix path and raw digest (for example, `hashlib.sha256().digest()`) of each file; as with a dict, the last digest is used for paths that appear more than once
+
+        Returns:
+            CompactManifest: The manifest
+        """
+
+        # The sort is stable, so the last digest for a path is the last item in its run
+        encoded_items = sorted(
+            ((path.encode("utf-8"), digest) for path, digest in items),
+            key=lambda item: item[0],
+        )
+
+        encoded_items = [
+            item
+            for index, item in enumerate(encoded_items)
+            if index + 1 == len(encoded_items) or encoded_items[index + 1][0] != item[0]
+        ]
+
+        return cls._FromSortedItems(
+            encoded_items,
+            len(encoded_items[0][1]) if encoded_items else None,
+        )
+
+    # ----------------------------------------------------------------------
+    @property
+    def digest_size(self) -> int:
+        return self._digest_size
+
+    # ----------------------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self._directory_indexes)
+
+    # ----------------------------------------------------------------------
+    def __iter__(self) -> Iterator[str]:
+        for index in range(len(self)):
+            yield self.GetEncodedPath(index).decode("utf-8")
+
+    # ----------------------------------------------------------------------
+    def __contains__(self, path: object) -> bool:
+        return isinstance(path, str) and self._Find(path.encode("utf-8")) is not None
+
+    # ----------------------------------------------------------------------
+    def __getitem__(self, path: str) -> str:
+        index = self._Find(path.encode("utf-8")) if isinstance(path, str) else None
+        if index is None:
+            raise KeyError(path)
+
+        return self.GetDigest(index).hex()
+
+    # ----------------------------------------------------------------------
+    def __setitem__(self, path: str, hash_value: str) -> None:
+        """Update the hash value of an existing entry"""
+
+        index = self._Find(path.encode("utf-8"))
+        if index is None:
+            raise KeyError(path)
+
+        digest = _DecodeHashValue(hash_value)
+        if len(digest) != self._digest_size:
+            raise Exception(f"'{hash_value}' ({path}) is not a {self._digest_size}-byte digest.")
+
+        offset = index * self._digest_size
+        self._digests[offset : offset + self._digest_size] = digest
+
+    # ----------------------------------------------------------------------
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, CompactManifest):
+            return (
+                self._directories == other._directories
+                and self._directory_indexes == other._directory_indexes
+                and self._names == other._names
+                and self._name_offsets == other._name_offsets
+                and self._digests == other._digests
+            )
+
+        return super().__eq__(other)
+
+    # ----------------------------------------------------------------------
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self.items())!r})"
+
+    # ----------------------------------------------------------------------
+    def items(self) -> ItemsView[str, str]:
+        return _ItemsView(self)
+
+    # ----------------------------------------------------------------------
+    def values(self) -> ValuesView[str]:
+        return _ValuesView(self)
+
+    # ----------------------------------------------------------------------
+    def Difference(self, other: "CompactManifest") -> list[str]:
+        """Returns the sorted paths that are in this manifest but not in `other`"""
+
+        results: list[str] = []
+
+        other_index = 0
+        other_len = len(other)
+
+        for index in range(len(self)):
+            path = self.GetEncodedPath(index)
+
+            while other_index < other_len and other.GetEncodedPath(other_index) < path:
+                other_index += 1
+
+            if other_index == other_len or other.GetEncodedPath(other_index) != path:
+                results.append(path.decode("utf-8"))
+
+        return results
+
+    # ----------------------------------------------------------------------
+    def Union(self, other: "CompactManifest") -> "CompactManifest":
+        """Returns a new manifest with the entries of both manifests; hash values in `other` take precedence"""
+
+        if len(self) and len(other) and self._digest_size != other.digest_size:
+            raise Exception(
+                f"Manifests with {self._digest_size}-byte and {other.digest_size}-byte digests can't be combined."
+            )
+
+        items: list[tuple[bytes, bytes]] = []
+
+        index = 0
+        other_index = 0
+
+        while index < len(self) or other_index < len(other):
+            path = self.GetEncodedPath(index) if index < len(self) else None
+            other_path = other.GetEncodedPath(other_index) if other_index < len(other) else None
+
+            if other_path is None or (path is not None and path < other_path):
+                assert path is not None
+                items.append((path, self.GetDigest(index)))
+                index += 1
+            else:
+                items.append((other_path, other.GetDigest(other_index)))
+                other_index += 1
+
+                if path == other_path:
+                    index += 1
+
+        return CompactManifest._FromSortedItems(
+            items,
+            other.digest_size if len(other) else self._digest_size,
+        )
+
+    # ----------------------------------------------------------------------
+    def GetEncodedPath(self, index: int) -> bytes:
+        """Returns the utf-8 encoded path of the entry at the index (entries are sorted by path)"""
+
+        return (
+            self._directories[self._directory_indexes[index]]
+            + self._names[self._name_offsets[index] : self._name_offsets[index + 1]]
+        )
+
+    # ----------------------------------------------------------------------
+    def GetDigest(self, index: int) -> bytes:
+        """Returns the raw digest of the entry at the index (entries are sorted by path)"""
+
+        offset = index * self._digest_size
+        return bytes(self._digests[offset : offset + self._digest_size])
+
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    @classmethod
+    def _FromSortedItems(
+        cls,
+        sorted_items: list[tuple[bytes, bytes]],
+        digest_size: Optional[int],
+    ) -> "CompactManifest":
+        result = cls.__new__(cls)
+        result._Initialize(sorted_items, digest_size)
+
+        return result
+
+    # ----------------------------------------------------------------------
+    def _Initialize(
+        self,
+        sorted_items: list[tuple[bytes, bytes]],
+        digest_size: Optional[int],
+    ) -> None:
+        # Directories are stored with a trailing slash (the root directory is empty)
+        directories: list[bytes] = []
+        directory_lookup: dict[bytes, int] = {}
+
+        directory_indexes = array("I")
+        names = bytearray()
+        name_offsets = array("I", [0])
+        digests = bytearray()
+
+        for path, digest in sorted_items:
+            directory, slash, name = path.rpartition(b"/")
+            directory += slash
+
+            directory_index = directory_lookup.get(directory)
+            if directory_index is None:
+                directory_index = len(directories)
+
+                directories.append(directory)
+                directory_lookup[directory] = directory_index
+
+            directory_indexes.append(directory_index)
+            names += name
+            name_offsets.append(len(names))
+            digests += digest
+
+        self._directories = directories
+        self._directory_indexes = directory_indexes
+        self._names = bytes(names)
+        self._name_offsets = name_offsets
+        self._digests = digests
+        self._digest_size = digest_size or hashlib.sha256().digest_size
+
+    # ----------------------------------------------------------------------
+    def _Find(self, path: bytes) -> Optional[int]:
+        # utf-8 preserves code point ordering, so the encoded paths can be compared directly
+        low = 0
+        high = len(self)
+
+        while low < high:
+            mid = (low + high) // 2
+
+            if self.GetEncodedPath(mid) < path:
+                low = mid + 1
+            else:
+                high = mid
+
+        if low < len(self) and self.GetEncodedPath(low) == path:
+            return low
+
+        return None
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+class _ItemsView(ItemsView):
+    # Iterate the buffers directly rather than looking up each path
+    def __iter__(self):
+        manifest = self._mapping
+
+        for index in range(len(manifest)):
+            yield manifest.GetEncodedPath(index).decode("utf-8"), manifest.GetDigest(index).hex()
+
+
+# ----------------------------------------------------------------------
+class _ValuesView(ValuesView):
+    def __iter__(self):
+        manifest = self._mapping
+
+        for index in range(len(manifest)):
+            yield manifest.GetDigest(index).hex()
+
+
+# ----------------------------------------------------------------------
+def _DecodeHashValue(hash_value: str) -> bytes:
+    try:
+        return bytes.fromhex(hash_value)
+    except ValueError as ex:
+        raise Exception(f"'{hash_value}' is not a hexadecimal digest.") from ex
@@ -0,0 +1,210 @@
+# ----------------------------------------------------------------------
+# |
+# |  Copyright (c) 2024 Scientific Software Engineering Center at Georgia Tech
+# |  Distributed under the MIT License.
+# |
+# ----------------------------------------------------------------------
+"""Declarative validation of template configuration values, evaluated in-process before content is generated"""
+
+import json
+import re
+
+from dataclasses import dataclass, field
+from functools import cache
+from pathlib import Path
+from typing import Any, Optional
+
+import yaml
+
+from cookiecutter.config import get_config
+
+
+# Name of the file (alongside `cookiecutter.json`) that contains the validation rules for a project
+validation_schema_filename: str = "cookiecutter_validation.yaml"
+
+
+# ----------------------------------------------------------------------
+@dataclass(frozen=True)
+class FieldSchema:
+    """Validation rules for a single configuration value"""
+
+    name: str
+
+    # The value must be provided and may not be empty
+    required: bool = False
+
+    # The value may not be a placeholder (for example, "<your name>")
+    placeholder: bool = False
+
+    pattern: Optional[re.Pattern] = None
+
+    # ----------------------------------------------------------------------
+    def Validate(self, value: Any) -> Optional[str]:
+        """Returns a description of the error or None if the value is valid"""
+
+        if value is None or value == "":
+            return f"{self.name}: a value is required" if self.required else None
+
+        if not isinstance(value, str):
+            return None
+
+        if self.placeholder and value.startswith("<") and value.endswith(">"):
+            return f'{self.name} ("{value}"): the value has not been populated'
+
+        if self.pattern is not None and self.pattern.fullmatch(value) is None:
+            return f'{self.name} ("{value}"): the value does not match "{self.pattern.pattern}"'
+
+        return None
+
+
+# ----------------------------------------------------------------------
+@dataclass(frozen=True)
+class ValidationSchema:
+    """Validation rules for a project's configuration values"""
+
+    fields: list[FieldSchema] = field(default_factory=list)
+
+    # ----------------------------------------------------------------------
+    def Validate(
+        self,
+        values: dict[str, Any],
+        *,
+        partial: bool = False,
+    ) -> list[str]:
+        """
+        Validate configuration values.
+
+        Args:
+            values (dict[str, Any]): The configuration values
+            partial (bool, optional): Only validate the values that are present and fully resolved (values that reference other values, such as "{{ cookiecutter.github_username }}", are skipped); this is used to validate values before prompting and rendering. Defaults to False.
+
+        Returns:
+            list[str]: Errors; the list is empty if the values are valid
+        """
+
+        errors: list[str] = []
+
+        for field_schema in self.fields:
+            value = values.get(field_schema.name)
+
+            if partial and (
+                field_schema.name not in values or (isinstance(value, str) and "{{" in value)
+            ):
+                continue
+
+            error = field_schema.Validate(value)
+            if error is not None:
+                errors.append(error)
+
+        return errors
+
+
+# ----------------------------------------------------------------------
+def LoadValidationSchema(project_dir: Path) -> Optional[ValidationSchema]:
+    """Returns the validation rules for a project or None if the project does not define any"""
+
+    filename = project_dir / validation_schema_filename
+
+    try:
+        mtime_ns = filename.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+    return _LoadValidationSchema(filename, mtime_ns)
+
+
+# ----------------------------------------------------------------------
+def ValidateContext(
+    project_dir: Path,
+    values: dict[str, Any],
+    *,
+    partial: bool = False,
+) -> None:
+    """
+    Raise an exception if configuration values are not valid according to the project's validation rules.
+
+    Args:
+        project_dir (Path): Project template directory (the directory that contains `cookiecutter.json`)
+        values (dict[str, Any]): The configuration values
+        partial (bool, optional): Only validate the values that are present and fully resolved (see `ValidationSchema.Validate`). Defaults to False.
+    """
+
+    schema = LoadValidationSchema(project_dir)
+    if schema is None:
+        return
+
+    errors = schema.Validate(values, partial=partial)
+    if errors:
+        raise Exception(
+            "Template configuration values are not valid:\n{}".format(
+                "\n".join("    - {}".format(error) for error in errors),
+            ),
+        )
+
+
+# ----------------------------------------------------------------------
+def ValidateConfiguration(
+    project_dir: Path,
+    context: Optional[dict[str, Any]] = None,
+    configuration_filename: Optional[Path] = None,
+) -> None:
+    """
+    Raise an exception if the configuration values that will be used when a project is generated without
+    input are not valid; this allows invalid configurations to be detected before any work is performed.
+
+    Args:
+        project_dir (Path): Project template directory (the directory that contains `cookiecutter.json`)
+        context (Optional[dict[str, Any]], optional): Template configuration values; they take precedence over values in `configuration_filename`. Defaults to None.
+        configuration_filename (Optional[Path], optional): Filename that contains template configuration values. Defaults to None.
+    """
+
+    if LoadValidationSchema(project_dir) is None:
+        return
+
+    with (project_dir / "cookiecutter.json").open(encoding="utf-8") as f:
+        values: dict[str, Any] = json.load(f)
+
+    if configuration_filename is not None:
+        values.update(get_config(str(configuration_filename)).get("default_context", {}))
+
+    values.update(context or {})
+
+    ValidateContext(project_dir, values, partial=True)
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+@cache
+def _LoadValidationSchema(
+    filename: Path,
+    mtime_ns: int,  # pylint: disable=unused-argument
+) -> ValidationSchema:
+    with filename.open(encoding="utf-8") as f:
+        content = yaml.load(f, Loader=yaml.SafeLoader) or {}
+
+    fields: list[FieldSchema] = []
+
+    for name, rules in content.items():
+        rules = rules or {}
+
+        unknown_rules = set(rules) - {"required", "placeholder", "pattern"}
+        if unknown_rules:
+            raise Exception(
+                "'{}' contains unknown rules for '{}': {}.".format(
+                    filename,
+                    name,
+                    ", ".join(sorted(unknown_rules)),
+                ),
+            )
+
+        fields.append(
+            FieldSchema(
+                name,
+                required=bool(rules.get("required", False)),
+                placeholder=bool(rules.get("placeholder", False)),
+                pattern=re.compile(rules["pattern"]) if "pattern" in rules else None,
+            ),
+        )
+
+    return ValidationSchema(fields)
@@ -0,0 +1,136 @@
+# ----------------------------------------------------------------------
+# |
+# |  Copyright (c) 2024 Scientific Software Engineering Center at Georgia Tech
+# |  Distributed under the MIT License.
+# |
+# ----------------------------------------------------------------------
+"""Merkle digests of the directories that contain the files in a manifest"""
+
+import hashlib
+
+from typing import Mapping, Optional
+
+
+# Manifest entries whose paths end with a slash contain directory digests (see CalculateDirectoryDigests()); the
+# digest of the root directory is stored as "./"
+root_directory_key: str = "./"
+
+
+# ----------------------------------------------------------------------
+def CalculateDirectoryDigests(manifest: Mapping[str, str]) -> dict[str, str]:
+    """
+    Calculate a Merkle digest for each directory that contains files in a manifest. A directory's digest is calculated
+    from the names and digests of its files and subdirectories, so directories have the same digest only if all of the
+    files within them are the same.
+
+    Args:
+        manifest (Mapping[str, str]): Hash values keyed by posix path relative to the manifest's directory
+
+    Returns:
+        dict[str, str]: Digests keyed by posix directory path with a trailing slash ("./" for the root directory)
+    """
+
+    children: dict[str, list[tuple[str, str]]] = {root_directory_key: []}
+
+    for relative_path, hash_value in manifest.items():
+        parent, _, name = relative_path.rpartition("/")
+        children.setdefault(_GetDirectoryKey(parent), []).append((name, hash_value))
+
+    # Ensure that every ancestor is present, even if it doesn't contain any files directly
+    for directory_key in list(children):
+        while directory_key != root_directory_key:
+            directory_key = _GetDirectoryKey(directory_key[:-1].rpartition("/")[0])
+            children.setdefault(directory_key, [])
+
+    digests: dict[str, str] = {}
+
+    # Calculate the digests of subdirectories before the digests of the directories that contain them
+    for directory_key in sorted(
+        children,
+        key=lambda value: 0 if value == root_directory_key else value.count("/"),
+        reverse=True,
+    ):
+        hasher = hashlib.sha256()
+
+        for name, hash_value in sorted(children[directory_key]):
+            hasher.update(f"{name}\0{hash_value}\n".encode("utf-8"))
+
+        digest = hasher.hexdigest()
+        digests[directory_key] = digest
+
+        if directory_key != root_directory_key:
+            parent, _, name = directory_key[:-1].rpartition("/")
+            children[_GetDirectoryKey(parent)].append((name + "/", digest))
+
+    return digests
+
+
+# ----------------------------------------------------------------------
+def DiffManifests(
+    old_manifest: Mapping[str, str],
+    new_manifest: Mapping[str, str],
+    old_directory_digests: Optional[dict[str, str]] = None,
+    new_directory_digests: Optional[dict[str, str]] = None,
+) -> list[str]:
+    """
+    Returns the files whose hash values differ between two manifests (including files that are only in one of them).
+
+    Files within directories whose digests are the same in both manifests are not compared, so comparing manifests that
+    are the same requires a single comparison of the root directory digests.
+
+    Args:
+        old_manifest (Mapping[str, str]): Hash values keyed by posix path
+        new_manifest (Mapping[str, str]): Hash values keyed by posix path
+        old_directory_digests (Optional[dict[str, str]], optional): Digests of the directories in `old_manifest`. Defaults to None (calculated).
+        new_directory_digests (Optional[dict[str, str]], optional): Digests of the directories in `new_manifest`. Defaults to None (calculated).
+
+    Returns:
+        list[str]: Sorted posix paths of the files that differ
+    """
+
+    if old_directory_digests is None:
+        old_directory_digests = CalculateDirectoryDigests(old_manifest)
+    if new_directory_digests is None:
+        new_directory_digests = CalculateDirectoryDigests(new_manifest)
+
+    if old_directory_digests[root_directory_key] == new_directory_digests[root_directory_key]:
+        return []
+
+    changed_files: list[str] = []
+
+    for manifest in [old_manifest, new_manifest]:
+        for relative_path in manifest:
+            directory_key = _GetDirectoryKey(relative_path.rpartition("/")[0])
+
+            # Every ancestor of a directory whose digest differs also differs, so checking the parent is sufficient
+            if old_directory_digests.get(directory_key) == new_directory_digests.get(directory_key):
+                continue
+
+            if manifest is new_manifest and relative_path in old_manifest:
+                continue
+
+            if old_manifest.get(relative_path) != new_manifest.get(relative_path):
+                changed_files.append(relative_path)
+
+    return sorted(changed_files)
+
+
+# ----------------------------------------------------------------------
+def GetDirectoryKeys(relative_path: str) -> list[str]:
+    """Returns the keys of the directories that contain a file, starting with the directory that contains it directly and ending with the root directory"""
+
+    directory_keys: list[str] = []
+
+    while True:
+        relative_path = relative_path.rpartition("/")[0]
+        directory_keys.append(_GetDirectoryKey(relative_path))
+
+        if not relative_path:
+            return directory_keys
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _GetDirectoryKey(directory: str) -> str:
+    return directory + "/" if directory else root_directory_key
@@ -6,30 +6,42 @@
 # ----------------------------------------------------------------------
 """This file serves as an example of how to create scripts that can be invoked from the command line once the package is installed."""
 
+import contextlib
 import importlib
+import multiprocessing
 import sys
 
-from enum import Enum
 from pathlib import Path
-from typing import Annotated, Optional
+from typing import Annotated, Callable, Optional
 
 import typer
-import yaml
 
-from typer.core import TyperGroup  # type: ignore [import-untyped]
-
-from cookiecutter.main import cookiecutter
 from dbrownell_Common.ContextlibEx import ExitStack
 from dbrownell_Common import PathEx
 from dbrownell_Common.Streams.DoneManager import DoneManager
 
-from PythonProjectBootstrapper import __version__
+from PythonProjectBootstrapper.CommandLine import CreateApp, version_option
+from PythonProjectBootstrapper.Generation import (
+    Generate,
+    GenerationStage,
+    GetProjectNames,
+    ResolveProject,
+)
+from PythonProjectBootstrapper.ModificationReports import (
+    DisplayReport,
+    ReportMode,
+    WriteJsonReport,
+    WriteJUnitReport,
+)
+from PythonProjectBootstrapper.PathSelection import PathSelection
+from PythonProjectBootstrapper.Prefetch import Prefetch
+from PythonProjectBootstrapper.ProgressDisplay import CopyProgressDisplay, WriteEventJsonLine
 from PythonProjectBootstrapper.ProjectGenerationUtils import (
-    CopyToOutputDir,
+    CopyToOutputDirEvent,
     DisplayPrompt,
-    DisplayModifications,
-    prompt_filename,
+    PromptForConflict,
 )
+from PythonProjectBootstrapper.Rendering import RenderingBackend
 
 # The following imports are used in cookiecutter hooks. Import them here to
 # ensure that they are frozen when creating binaries,
@@ -38,64 +50,14 @@ import textwrap  # pylint: disable=unused-import, wrong-import-order
 
 
 # ----------------------------------------------------------------------
-class NaturalOrderGrouper(TyperGroup):
-    # pylint: disable=missing-class-docstring
-    # ----------------------------------------------------------------------
-    def list_commands(self, *args, **kwargs):  # pylint: disable=unused-argument
-        return self.commands.keys()
-
-
-# ----------------------------------------------------------------------
-app = typer.Typer(
-    cls=NaturalOrderGrouper,
-    help=__doc__,
-    no_args_is_help=True,
-    pretty_exceptions_show_locals=False,
-    pretty_exceptions_enable=False,
-)
-
-
-# ----------------------------------------------------------------------
-# Dynamically create the ProjectType enumeration based on the directories found in this dir.
-
-
-def _CreateProjectType():
-    project_types: list[str] = []
-
-    if getattr(sys, "frozen", False):
-        template_dir = Path(sys.executable).parent / "lib" / "PythonProjectBootstrapper"
-    else:
-        template_dir = Path(__file__).parent
-
-    PathEx.EnsureDir(template_dir)
-
-    for file_item in template_dir.iterdir():
-        if not file_item.is_dir():
-            continue
-
-        if file_item.name.startswith("."):
-            continue
-
-        project_types.append(file_item.name)
-
-    assert project_types
-    return Enum("ProjectType", {project_type: project_type for project_type in project_types})
-
-
-ProjectType = _CreateProjectType()
-del _CreateProjectType
-
-
-# ----------------------------------------------------------------------
-def _VersionCallback(value: bool) -> None:
-    if value:
-        sys.stdout.write(f"PythonProjectBootstrapper {__version__}")
-        raise typer.Exit()
+app = CreateApp(__doc__)
 
 
 # ----------------------------------------------------------------------
 _project_argument = typer.Argument(
-    help="Project to build.",
+    help="Project to build ({}); when '--template-source' is provided, the name of a project within that source.".format(
+        ", ".join(f"'{project_name}'" for project_name in sorted(GetProjectNames())),
+    ),
 )
 
 _configuration_filename_option = typer.Option(
@@ -110,28 +72,83 @@ _replay_option = typer.Option(
     "--replay", help="Do not prompt for input, instead read from saved json."
 )
 _yes_option = typer.Option("--yes", help="Answer yes to all prompts.")
-_version_option = typer.Option(
-    "--version",
-    help="Display the current version and exit.",
-    callback=_VersionCallback,
-    is_eager=True,
-)
 
 _skip_prompts_option = typer.Option(
     "--skip-prompts",
     help="Do not display prompts after generating content.",
 )
 
+_progress_option = typer.Option(
+    "--progress",
+    help="Display a progress bar while changes are applied to the output directory.",
+)
+
+_json_lines_option = typer.Option(
+    "--json-lines",
+    help="Write a line of JSON for each file as changes are applied to the output directory (rather than a summary of the modifications).",
+)
+
+_report_option = typer.Option(
+    "--report",
+    case_sensitive=False,
+    help="Determines how modifications to the output directory are displayed; defaults to 'full' when the output is a terminal and 'top' otherwise.",
+)
+
+_report_max_files_option = typer.Option(
+    "--report-max-files",
+    min=1,
+    help="Maximum number of files displayed for each type of modification when using '--report top'.",
+)
+
+_report_json_option = typer.Option(
+    "--report-json",
+    dir_okay=False,
+    resolve_path=True,
+    help="Write modifications to the output directory to this JSON file.",
+)
+
+_report_junit_option = typer.Option(
+    "--report-junit",
+    dir_okay=False,
+    resolve_path=True,
+    help="Write modifications to the output directory to this JUnit XML file.",
+)
+
+_render_workers_option = typer.Option(
+    "--render-workers",
+    min=0,
+    help="Number of processes used to render template files; 0 uses one process per CPU.",
+)
+
+_only_option = typer.Option(
+    "--only",
+    help="Only render and apply generated files whose paths (relative to the output directory) match this glob pattern; the option can be provided multiple times. Manifest entries for all other files are preserved.",
+)
+
+_exclude_option = typer.Option(
+    "--exclude",
+    help="Do not render or apply generated files whose paths (relative to the output directory) match this glob pattern; the option can be provided multiple times.",
+)
+
+_pipelined_option = typer.Option(
+    "--pipelined",
+    help="Hash and apply generated files while template files are being rendered, rather than once rendering has completed. Files are not applied until rendering has completed when the project has a post-generation hook.",
+)
+
+_template_source_option = typer.Option(
+    "--template-source",
+    help="Local directory that contains project templates (one directory per project), or '<directory>@<ref>' for a directory within a local git repository at a branch, tag, or commit. The content of a commit is cached, so later uses of the same commit don't export it again.",
+)
+
+_lock_timeout_option = typer.Option(
+    "--lock-timeout",
+    min=0,
+    help="Maximum number of seconds to wait for other processes that are modifying the output directory; wait indefinitely when not provided.",
+)
+
 
 # ----------------------------------------------------------------------
-# The cookiecutter project dir must be accessed in different ways depending on whether the code is:
-#   - running from source
-#   - running from a pip installation
-#   - running as a frozen binary.
-#
 if getattr(sys, "frozen", False):
-    _project_root_dir = Path(sys.executable).parent / "lib" / "PythonProjectBootstrapper"
-
     # This is admittedly very strange. cookiecutter apparently uses sys.argv[0] to invoke
     # python hooks. Within a binary, sys.argv[0] will point back to this file. So, create
     # functionality that invokes cookiecutter when passed a directory and executes python code
@@ -140,7 +157,7 @@ if getattr(sys, "frozen", False):
     # ----------------------------------------------------------------------
     @app.command()
     def FrozenExecute(
-        project: Annotated[ProjectType, _project_argument],
+        project: Annotated[str, _project_argument],
         output_dir: Annotated[
             Path, typer.Argument(resolve_path=True, help="Directory to populate.")
         ],
@@ -148,7 +165,19 @@ if getattr(sys, "frozen", False):
         replay: Annotated[bool, _replay_option] = False,
         yes: Annotated[bool, _yes_option] = False,
         skip_prompts: Annotated[bool, _skip_prompts_option] = False,
-        version: Annotated[bool, _version_option] = False,  # pylint: disable=unused-argument
+        render_workers: Annotated[int, _render_workers_option] = 1,
+        progress: Annotated[bool, _progress_option] = False,
+        json_lines: Annotated[bool, _json_lines_option] = False,
+        report: Annotated[Optional[ReportMode], _report_option] = None,
+        report_max_files: Annotated[int, _report_max_files_option] = 20,
+        report_json: Annotated[Optional[Path], _report_json_option] = None,
+        report_junit: Annotated[Optional[Path], _report_junit_option] = None,
+        only: Annotated[Optional[list[str]], _only_option] = None,
+        exclude: Annotated[Optional[list[str]], _exclude_option] = None,
+        pipelined: Annotated[bool, _pipelined_option] = False,
+        template_source: Annotated[Optional[str], _template_source_option] = None,
+        lock_timeout: Annotated[Optional[float], _lock_timeout_option] = None,
+        version: Annotated[bool, version_option] = False,  # pylint: disable=unused-argument
     ) -> None:
         if output_dir.is_file():
             with output_dir.open() as f:
@@ -164,17 +193,26 @@ if getattr(sys, "frozen", False):
             replay=replay,
             yes=yes,
             skip_prompts=skip_prompts,
+            render_workers=render_workers,
+            progress=progress,
+            json_lines=json_lines,
+            report=report,
+            report_max_files=report_max_files,
+            report_json=report_json,
+            report_junit=report_junit,
+            path_selection=PathSelection.Create(only, exclude),
+            pipelined=pipelined,
+            template_source=template_source,
+            lock_timeout=lock_timeout,
         )
 
     # ----------------------------------------------------------------------
 
 else:
-    _project_root_dir = Path(__file__).parent
-
     # ----------------------------------------------------------------------
     @app.command()
     def StandardExecute(
-        project: Annotated[ProjectType, _project_argument],
+        project: Annotated[str, _project_argument],
         output_dir: Annotated[
             Path, typer.Argument(file_okay=False, resolve_path=True, help="Directory to populate.")
         ],
@@ -182,7 +220,19 @@ else:
         replay: Annotated[bool, _replay_option] = False,
         yes: Annotated[bool, _yes_option] = False,
         skip_prompts: Annotated[bool, _skip_prompts_option] = False,
-        version: Annotated[bool, _version_option] = False,  # pylint: disable=unused-argument
+        render_workers: Annotated[int, _render_workers_option] = 1,
+        progress: Annotated[bool, _progress_option] = False,
+        json_lines: Annotated[bool, _json_lines_option] = False,
+        report: Annotated[Optional[ReportMode], _report_option] = None,
+        report_max_files: Annotated[int, _report_max_files_option] = 20,
+        report_json: Annotated[Optional[Path], _report_json_option] = None,
+        report_junit: Annotated[Optional[Path], _report_junit_option] = None,
+        only: Annotated[Optional[list[str]], _only_option] = None,
+        exclude: Annotated[Optional[list[str]], _exclude_option] = None,
+        pipelined: Annotated[bool, _pipelined_option] = False,
+        template_source: Annotated[Optional[str], _template_source_option] = None,
+        lock_timeout: Annotated[Optional[float], _lock_timeout_option] = None,
+        version: Annotated[bool, version_option] = False,  # pylint: disable=unused-argument
     ) -> None:
         _ExecuteOutputDir(
             project,
@@ -191,74 +241,132 @@ else:
             replay=replay,
             yes=yes,
             skip_prompts=skip_prompts,
+            render_workers=render_workers,
+            progress=progress,
+            json_lines=json_lines,
+            report=report,
+            report_max_files=report_max_files,
+            report_json=report_json,
+            report_junit=report_junit,
+            path_selection=PathSelection.Create(only, exclude),
+            pipelined=pipelined,
+            template_source=template_source,
+            lock_timeout=lock_timeout,
         )
 
 
-PathEx.EnsureDir(_project_root_dir)
-
-
 # ----------------------------------------------------------------------
 # ----------------------------------------------------------------------
 # ----------------------------------------------------------------------
 def _ExecuteOutputDir(
-    project: ProjectType,
+    project: str,
     output_dir: Path,
     configuration_filename: Optional[Path],
     *,
     replay: bool,
     yes: bool,
     skip_prompts: bool,
+    render_workers: int = 1,
+    progress: bool = False,
+    json_lines: bool = False,
+    report: Optional[ReportMode] = None,
+    report_max_files: int = 20,
+    report_json: Optional[Path] = None,
+    report_junit: Optional[Path] = None,
+    path_selection: Optional[PathSelection] = None,
+    pipelined: bool = False,
+    template_source: Optional[str] = None,
+    lock_timeout: Optional[float] = None,
 ) -> None:
     if not (output_dir / ".git").is_dir():
         raise Exception(f"{output_dir} is not a git repository.")
 
-    project_dir = PathEx.EnsureDir(_project_root_dir / project.value)
-
-    # create temporary directory for cookiecutter output
-    tmp_dir = PathEx.CreateTempDirectory()
-
-    # Does the project have a startup script? If so, invoke it dynamically.
-    potential_startup_script = project_dir / "hooks" / "startup.py"
-    if potential_startup_script.is_file():
-        sys.path.insert(0, str(potential_startup_script.parent))
-        with ExitStack(lambda: sys.path.pop(0)):
-            module = importlib.import_module(potential_startup_script.stem)
-
-            execute_func = getattr(module, "Execute", None)
-            if execute_func:
-                if execute_func(project_dir, tmp_dir, yes=yes) is False:
-                    return
-
-    with DoneManager.Create(sys.stdout, "\nGenerating content..."):
-        # generate project in temporary directory so we can avoid overwriting files without user approval
-        cookiecutter(
-            str(project_dir),
-            output_dir=str(tmp_dir),
-            config_file=str(configuration_filename) if configuration_filename is not None else None,
-            replay=replay,
-            overwrite_if_exists=True,
-            accept_hooks=True,
-        )
-
-    modifications = CopyToOutputDir(src_dir=tmp_dir, dest_dir=output_dir)
-
-    prompt_text_path = PathEx.EnsureFile(output_dir / prompt_filename)
-
-    # The approach below with reading in the prompt file regardless of whether or not we will display the prompts is not ideal but has to be
-    # done since we need to remove the prompt_text file before running DisplayPrompt(). This is because prompt_text.yml is currently stored in the output directory
-    # and the instructions being printed out during the execution of DisplayPrompt() would result in that file being check into the git repo.
-    # Alternate solutions would be to only read in the file in the 'if' block below, but, this would result in us needing the call 'unlink()' in both the 'if' block and a separate 'else' block.
-    # This issue also prevents us from using a cleaner solution such as ExitStack()
-    with open(prompt_text_path, "r") as prompt_file:
-        prompts = yaml.load(prompt_file, Loader=yaml.Loader)
-
-    prompt_text_path.unlink()
-
-    DisplayModifications(modifications=modifications)
+    project_dir = ResolveProject(project, template_source)
+
+    # Hash the existing files and compile the templates while the user responds to prompts
+    rendering_backend = RenderingBackend(max_workers=render_workers or None)
+
+    with Prefetch(project_dir, output_dir, rendering_backend) as prefetch:
+        # create temporary directory for cookiecutter output
+        tmp_dir = PathEx.CreateTempDirectory()
+
+        # Does the project have a startup script? If so, invoke it dynamically.
+        potential_startup_script = project_dir / "hooks" / "startup.py"
+        if potential_startup_script.is_file():
+            sys.path.insert(0, str(potential_startup_script.parent))
+            with ExitStack(lambda: sys.path.pop(0)):
+                module = importlib.import_module(potential_startup_script.stem)
+
+                execute_func = getattr(module, "Execute", None)
+                if execute_func:
+                    if execute_func(project_dir, tmp_dir, yes=yes) is False:
+                        return
+
+        on_conflict = PromptForConflict
+        on_event: Optional[Callable[[CopyToOutputDirEvent], None]] = None
+        progress_display: Optional[CopyProgressDisplay] = None
+
+        if json_lines:
+            on_event = WriteEventJsonLine
+        elif progress:
+            progress_display = CopyProgressDisplay()
+
+            on_conflict = progress_display.WrapConflictCallback(on_conflict)
+            on_event = progress_display.OnEvent
+
+        with contextlib.ExitStack() as stage_stack:
+            # ----------------------------------------------------------------------
+            def OnProgress(stage: GenerationStage, is_complete: bool) -> None:
+                if is_complete:
+                    stage_stack.close()
+                elif stage == GenerationStage.Render:
+                    # Keep stdout limited to JSON content when writing JSON lines
+                    stage_stack.enter_context(
+                        DoneManager.Create(
+                            sys.stderr if json_lines else sys.stdout,
+                            "\nGenerating content...",
+                        ),
+                    )
+                elif stage == GenerationStage.Apply and progress_display is not None:
+                    stage_stack.enter_context(progress_display)
+
+            # ----------------------------------------------------------------------
+
+            # generate project in a temporary directory so we can avoid overwriting files without user approval
+            result = Generate(
+                project,
+                output_dir,
+                configuration_filename=configuration_filename,
+                replay=replay,
+                no_input=False,
+                working_dir=tmp_dir,
+                on_conflict=on_conflict,
+                on_progress=OnProgress,
+                on_event=on_event,
+                lock_timeout=lock_timeout,
+                path_selection=path_selection,
+                pipelined=pipelined,
+                rendering_backend=rendering_backend,
+                prefetch=prefetch,
+                # The source has been resolved to a directory, which is used in place
+                template_source=str(project_dir.parent),
+            )
+
+    if report_json is not None:
+        WriteJsonReport(result.modifications, report_json)
+
+    if report_junit is not None:
+        WriteJUnitReport(result.modifications, report_junit)
+
+    if not json_lines:
+        DisplayReport(result.modifications, output_dir, report, report_max_files)
 
     if not skip_prompts:
-        DisplayPrompt(output_dir=output_dir, prompts=prompts)
+        DisplayPrompt(output_dir=output_dir, prompts=result.prompts)
 
 
 if __name__ == "__main__":
+    # Required by the rendering worker processes when running as a frozen binary
+    multiprocessing.freeze_support()
+
     app()  # pragma: no cover
@@ -0,0 +1,345 @@
+# ----------------------------------------------------------------------
+# |
+# |  Copyright (c) 2024 Scientific Software Engineering Center at Georgia Tech
+# |  Distributed under the MIT License.
+# |
+# ----------------------------------------------------------------------
+"""Python API used to generate projects without terminal input or output"""
+
+import sys
+import time
+
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import yaml
+
+from cookiecutter.main import cookiecutter
+from dbrownell_Common import PathEx
+
+from PythonProjectBootstrapper.ContextValidation import ValidateConfiguration
+from PythonProjectBootstrapper.History import CalculateContextHash
+from PythonProjectBootstrapper.PathSelection import PathSelection
+from PythonProjectBootstrapper.Pipeline import PipelineOptions, RenderAndCopyToOutputDir
+from PythonProjectBootstrapper.Prefetch import Prefetch
+from PythonProjectBootstrapper.ProjectGenerationUtils import (
+    ConflictType,
+    CopyToOutputDir,
+    CopyToOutputDirEvent,
+    CopyToOutputDirResult,
+    KnownFileHash,
+    prompt_filename,
+)
+from PythonProjectBootstrapper.Rendering import RenderingBackend
+from PythonProjectBootstrapper.TemplateSources import ResolveTemplateSource
+
+
+# ----------------------------------------------------------------------
+class ConflictPolicy(str, Enum):
+    """How conflicts between generated content and user changes are resolved when a conflict callback is not provided"""
+
+    # Keep the user's changes (modified files are not overwritten and deleted files are not recreated)
+    Keep = "keep"
+
+    # Overwrite modified files and recreate deleted files with the generated content
+    Overwrite = "overwrite"
+
+
+# ----------------------------------------------------------------------
+class GenerationStage(str, Enum):
+    """Stages of project generation reported to progress callbacks"""
+
+    # Templates are rendered into a working directory
+    Render = "render"
+
+    # Rendered content is applied to the output directory
+    Apply = "apply"
+
+
+# ----------------------------------------------------------------------
+@dataclass(frozen=True)
+class GenerateResult:
+    """Result of a call to Generate()"""
+
+    output_dir: Path
+    modifications: CopyToOutputDirResult
+
+    # (title, text) of the instructions that should be presented to the user after generation
+    prompts: list[tuple[str, str]] = field(default_factory=list)
+
+    # Elapsed time (in seconds) of each stage
+    timings: dict[GenerationStage, float] = field(default_factory=dict)
+
+    # Context used to render the templates (see `RenderTemplateFiles`)
+    context: dict[str, Any] = field(default_factory=dict)
+
+
+# ----------------------------------------------------------------------
+def GetTemplatesRootDir() -> Path:
+    """Returns the directory that contains the project templates"""
+
+    # The cookiecutter project dir must be accessed in different ways depending on whether the code is:
+    #   - running from source
+    #   - running from a pip installation
+    #   - running as a frozen binary.
+    #
+    if getattr(sys, "frozen", False):
+        return Path(sys.executable).parent / "lib" / "PythonProjectBootstrapper"
+
+    return Path(__file__).parent
+
+
+# ----------------------------------------------------------------------
+def GetProjectNames(templates_root_dir: Optional[Path] = None) -> list[str]:
+    """Returns the names of the projects that can be generated (the directories that contain a cookiecutter.json file)"""
+
+    templates_root_dir = PathEx.EnsureDir(templates_root_dir or GetTemplatesRootDir())
+
+    return [
+        item.name
+        for item in templates_root_dir.iterdir()
+        if item.is_dir()
+        and not item.name.startswith(".")
+        and item.name != "__pycache__"
+        and (item / "cookiecutter.json").is_file()
+    ]
+
+
+# ----------------------------------------------------------------------
+def ResolveProject(project: str, template_source: Optional[str] = None) -> Path:
+    """
+    Returns the template directory of a project (the directory that contains its cookiecutter.json file).
+
+    Args:
+        project (str): Name of the project (see GetProjectNames())
+        template_source (Optional[str], optional): Local directory or local git repository at a ref that provides the project templates (see TemplateSources.ResolveTemplateSource()). Defaults to None (the templates bundled with this package).
+
+    Returns:
+        Path: The project's template directory
+    """
+
+    templates_root_dir = (
+        ResolveTemplateSource(template_source)
+        if template_source is not None
+        else GetTemplatesRootDir()
+    )
+
+    project_names = GetProjectNames(templates_root_dir)
+    if project not in project_names:
+        raise Exception(
+            "'{}' is not a valid project; valid values are {}.".format(
+                project,
+                ", ".join(f"'{project_name}'" for project_name in sorted(project_names)),
+            ),
+        )
+
+    return templates_root_dir / project
+
+
+# ----------------------------------------------------------------------
+def Generate(
+    project: str,
+    output_dir: Path,
+    context: Optional[dict[str, Any]] = None,
+    policy: ConflictPolicy = ConflictPolicy.Keep,
+    *,
+    on_conflict: Optional[Callable[[Path, ConflictType], bool]] = None,
+    on_progress: Optional[Callable[[GenerationStage, bool], None]] = None,
+    on_event: Optional[Callable[[CopyToOutputDirEvent], None]] = None,
+    configuration_filename: Optional[Path] = None,
+    replay: bool = False,
+    render_workers: Optional[int] = 1,
+    require_git: bool = True,
+    no_input: bool = True,
+    working_dir: Optional[Path] = None,
+    lock_timeout: Optional[float] = None,
+    use_template_bundle: bool = True,
+    rendering_backend: Optional[RenderingBackend] = None,
+    path_selection: Optional[PathSelection] = None,
+    pipelined: bool = False,
+    prefetch: Optional[Prefetch] = None,
+    template_source: Optional[str] = None,
+) -> GenerateResult:
+    """
+    Generate (or update) a project in the output directory.
+
+    Nothing is written to the terminal and input is never requested (unless `no_input` is False), so
+    this function can be called in-process by other tools and services. Project startup scripts are
+    not invoked.
+
+    Args:
+        project (str): Name of the project to generate (see GetProjectNames()); when `template_source` is provided, the name of a project within that source
+        output_dir (Path): Directory to populate
+        context (Optional[dict[str, Any]], optional): Template configuration values; they take precedence over values in `configuration_filename`. Defaults to None.
+        policy (ConflictPolicy, optional): How conflicts are resolved when `on_conflict` is not provided. Defaults to ConflictPolicy.Keep.
+        on_conflict (Optional[Callable[[Path, ConflictType], bool]], optional): Called with the output filename when a conflict is detected; returns True to overwrite (or recreate) the file with the generated content. Defaults to None.
+        on_progress (Optional[Callable[[GenerationStage, bool], None]], optional): Called with False when a stage begins and True when it completes. Defaults to None.
+        on_event (Optional[Callable[[CopyToOutputDirEvent], None]], optional): Called as each file is applied to the output directory. Defaults to None.
+        configuration_filename (Optional[Path], optional): Filename that contains template configuration values. Defaults to None.
+        replay (bool, optional): Use the values saved during the previous generation. Defaults to False.
+        render_workers (Optional[int], optional): Number of processes used to render template files; None uses one process per CPU. Defaults to 1.
+        require_git (bool, optional): Raise an exception if the output directory is not a git repository. Defaults to True.
+        no_input (bool, optional): Do not prompt for template configuration values that were not provided. Defaults to True.
+        working_dir (Optional[Path], optional): Directory used to render content before it is applied to the output directory. Defaults to None (a new temporary directory).
+        lock_timeout (Optional[float], optional): Maximum number of seconds to wait for other processes that are modifying the output directory; wait indefinitely when None. Defaults to None.
+        use_template_bundle (bool, optional): Read template files from the template bundle created when the package was built (if it exists) rather than from the template directory. Defaults to True.
+        rendering_backend (Optional[RenderingBackend], optional): Backend used to render the templates; providing the same backend to multiple calls allows compiled templates to be reused. `render_workers` and `use_template_bundle` are ignored when a backend is provided. Defaults to None.
+        path_selection (Optional[PathSelection], optional): Only render and apply the selected files; manifest entries for all other files are preserved. Defaults to None (all files are selected).
+        pipelined (bool, optional): Hash and apply rendered files while rendering is in progress (see Pipeline.RenderAndCopyToOutputDir); the render and apply stages overlap, so their timings do as well. Files are not applied until rendering has completed when the project has a post-generation hook, as the hook may modify rendered files. Defaults to False.
+        prefetch (Optional[Prefetch], optional): Work started before this function was called (for example, before the user was prompted for input); hash values of the files in the output directory are used when they are unchanged, and the backend it prepared should be provided as `rendering_backend`. Defaults to None.
+        template_source (Optional[str], optional): Local directory or local git repository at a ref that provides the project templates (see TemplateSources.ResolveTemplateSource()). Defaults to None (the templates bundled with this package).
+
+    Returns:
+        GenerateResult: Modifications made to the output directory, prompts, and timing information
+    """
+
+    project_dir = ResolveProject(project, template_source)
+
+    if require_git and not (output_dir / ".git").is_dir():
+        raise Exception(f"{output_dir} is not a git repository.")
+
+    if on_conflict is None:
+        # ----------------------------------------------------------------------
+        def ApplyPolicy(
+            output_filename: Path,  # pylint: disable=unused-argument
+            conflict_type: ConflictType,  # pylint: disable=unused-argument
+        ) -> bool:
+            return policy == ConflictPolicy.Overwrite
+
+        # ----------------------------------------------------------------------
+
+        on_conflict = ApplyPolicy
+
+    # Values are validated again once they have been resolved, but detecting invalid values that were
+    # provided explicitly here avoids the creation of directories and the invocation of cookiecutter.
+    if no_input and not replay:
+        ValidateConfiguration(project_dir, context, configuration_filename)
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    working_dir = working_dir or PathEx.CreateTempDirectory()
+
+    timings: dict[GenerationStage, float] = {}
+
+    # ----------------------------------------------------------------------
+    def BeginStage(stage: GenerationStage) -> float:
+        if on_progress is not None:
+            on_progress(stage, False)
+
+        return time.perf_counter()
+
+    # ----------------------------------------------------------------------
+    def EndStage(stage: GenerationStage, start_time: float) -> None:
+        timings[stage] = time.perf_counter() - start_time
+
+        if on_progress is not None:
+            on_progress(stage, True)
+
+    # ----------------------------------------------------------------------
+
+    start_time = BeginStage(GenerationStage.Render)
+
+    if rendering_backend is None:
+        rendering_backend = RenderingBackend(
+            max_workers=render_workers,
+            use_template_bundle=use_template_bundle,
+        )
+
+    rendering_backend.path_selection = path_selection
+
+    # ----------------------------------------------------------------------
+    def Render(on_file_rendered: Optional[Callable[[str, KnownFileHash], None]]) -> str:
+        assert rendering_backend is not None
+
+        rendering_backend.on_file_rendered = on_file_rendered
+
+        try:
+            with rendering_backend.Install():
+                cookiecutter(
+                    str(project_dir),
+                    output_dir=str(working_dir),
+                    config_file=(
+                        str(configuration_filename) if configuration_filename is not None else None
+                    ),
+                    extra_context=context,
+                    no_input=no_input,
+                    replay=replay,
+                    overwrite_if_exists=True,
+                    accept_hooks=True,
+                )
+        finally:
+            rendering_backend.on_file_rendered = None
+
+        return CalculateContextHash(rendering_backend.context)
+
+    # ----------------------------------------------------------------------
+
+    if pipelined:
+        render_start_time = start_time
+        apply_start_time = start_time
+
+        # ----------------------------------------------------------------------
+        def OnRenderComplete() -> None:
+            nonlocal apply_start_time
+
+            EndStage(GenerationStage.Render, render_start_time)
+            apply_start_time = BeginStage(GenerationStage.Apply)
+
+        # ----------------------------------------------------------------------
+
+        modifications = RenderAndCopyToOutputDir(
+            Render,
+            src_dir=working_dir,
+            dest_dir=output_dir,
+            on_conflict=on_conflict,
+            on_event=on_event,
+            lock_timeout=lock_timeout,
+            path_selection=path_selection,
+            # A post-generation hook may modify or remove rendered files
+            options=PipelineOptions(
+                apply_during_render=not any((project_dir / "hooks").glob("post_gen_project.*")),
+            ),
+            on_render_complete=OnRenderComplete,
+            get_current_hashes=prefetch.GetCurrentHashes if prefetch is not None else None,
+        )
+
+        start_time = apply_start_time
+    else:
+        context_hash = Render(None)
+
+        EndStage(GenerationStage.Render, start_time)
+
+        start_time = BeginStage(GenerationStage.Apply)
+
+        modifications = CopyToOutputDir(
+            src_dir=working_dir,
+            dest_dir=output_dir,
+            known_hashes=rendering_backend.known_hashes,
+            on_conflict=on_conflict,
+            on_event=on_event,
+            lock_timeout=lock_timeout,
+            context_hash=context_hash,
+            path_selection=path_selection,
+            current_hashes=prefetch.GetCurrentHashes() if prefetch is not None else None,
+        )
+
+    # The prompts are written to the output directory by the post-generation hook, but shouldn't remain there
+    prompts: list[tuple[str, str]] = []
+
+    prompt_text_path = output_dir / prompt_filename
+    if prompt_text_path.is_file():
+        with prompt_text_path.open() as prompt_file:
+            prompts = yaml.load(prompt_file, Loader=yaml.Loader)
+
+        prompt_text_path.unlink()
+
+    EndStage(GenerationStage.Apply, start_time)
+
+    return GenerateResult(
+        output_dir=output_dir,
+        modifications=modifications,
+        prompts=prompts,
+        timings=timings,
+        context=rendering_backend.context,
+    )
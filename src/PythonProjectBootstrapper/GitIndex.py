@@ -0,0 +1,99 @@
+# ----------------------------------------------------------------------
+# |
+# |  Copyright (c) 2024 Scientific Software Engineering Center at Georgia Tech
+# |  Distributed under the MIT License.
+# |
+# ----------------------------------------------------------------------
+"""Functionality that reads information about tracked files from a git repository's index"""
+
+import subprocess
+
+from pathlib import Path
+from typing import Optional
+
+from dbrownell_Common import PathEx
+
+
+# File modes of the regular files in a git index; symlinks, submodules, etc. are never clean regular files
+_REGULAR_FILE_MODES = {"100644", "100755"}
+
+
+# ----------------------------------------------------------------------
+def GetCleanBlobIds(repo_dir: Path) -> Optional[dict[str, str]]:
+    """
+    Returns the git blob ids of tracked files whose working tree content matches the git index.
+
+    `git status` refreshes the index's stat information as part of its processing, so the
+    detection of modified files benefits from git's (highly optimized) status machinery.
+
+    Args:
+        repo_dir (Path): Root of the git repository
+
+    Returns:
+        Optional[dict[str, str]]: Blob ids keyed by posix path relative to repo_dir, or None if the information is not available (for example, when git is not installed or repo_dir is not the root of a repository)
+    """
+    PathEx.EnsureDir(repo_dir)
+
+    if not (repo_dir / ".git").exists():
+        return None
+
+    ls_files_output = _RunGit(repo_dir, "ls-files", "--stage", "-z")
+    if ls_files_output is None:
+        return None
+
+    status_output = _RunGit(
+        repo_dir,
+        "status",
+        "--porcelain=v1",
+        "-z",
+        "--untracked-files=no",
+        "--no-renames",
+        "--ignore-submodules=all",
+    )
+    if status_output is None:
+        return None
+
+    blob_ids: dict[str, str] = {}
+
+    # Entries are in the form "<mode> <blob id> <stage>\t<path>"
+    for entry in ls_files_output.split("\0"):
+        if not entry:
+            continue
+
+        info, path = entry.split("\t", 1)
+        mode, blob_id, stage = info.split(" ")
+
+        # Files with merge conflicts have multiple (non-zero) stages and are always considered dirty
+        if stage != "0" or mode not in _REGULAR_FILE_MODES:
+            continue
+
+        blob_ids[path] = blob_id
+
+    # Entries are in the form "XY <path>", where "Y" describes the working tree relative to the index
+    for entry in status_output.split("\0"):
+        if len(entry) < 4:
+            continue
+
+        if entry[1] != " ":
+            blob_ids.pop(entry[3:], None)
+
+    return blob_ids
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _RunGit(repo_dir: Path, *args: str) -> Optional[str]:
+    try:
+        result = subprocess.run(
+            ["git", "-C", str(repo_dir), *args],
+            capture_output=True,
+            check=False,
+        )
+    except OSError:
+        return None
+
+    if result.returncode != 0:
+        return None
+
+    return result.stdout.decode("utf-8", errors="surrogateescape")
@@ -0,0 +1,223 @@
+# ----------------------------------------------------------------------
+# |
+# |  Copyright (c) 2024 Scientific Software Engineering Center at Georgia Tech
+# |  Distributed under the MIT License.
+# |
+# ----------------------------------------------------------------------
+"""Cache of file hash values within an output directory, validated with file stat information or git blob ids"""
+
+import json
+import os
+
+from pathlib import Path
+from typing import Optional
+
+from dbrownell_Common import PathEx
+
+
+# ----------------------------------------------------------------------
+class FileHashCache:
+    """
+    Hash values of files within an output directory, keyed by posix path relative to that directory.
+
+    A cached hash value is only used when the file's size and modification time match those recorded
+    when the value was calculated, or when git reports that the file is clean and its blob id in the
+    git index matches the blob id recorded when the value was calculated.
+
+    The digest of a directory (see DirectoryDigests.CalculateDirectoryDigests()) is also cached along with a signature
+    calculated from the stat information of the files within it; the digest is only used when the signature matches,
+    which allows all of the files within an unchanged directory to be skipped. The cache is persisted within
+    the output directory's `.git` directory (so it is never committed); it is only kept in memory for
+    directories that are not git repositories.
+    """
+
+    # Incremented when the format of the persisted cache changes
+    _FORMAT_VERSION = 3
+
+    # ----------------------------------------------------------------------
+    def __init__(
+        self,
+        root: Path,
+        cache_filename: Optional[Path],
+        *,
+        stat_entries: Optional[dict[str, tuple[int, int, str]]] = None,
+        blob_entries: Optional[dict[str, tuple[str, str]]] = None,
+        directory_entries: Optional[dict[str, tuple[str, int, str]]] = None,
+    ):
+        self.root = root
+        self.cache_filename = cache_filename
+
+        self._stat_entries: dict[str, tuple[int, int, str]] = stat_entries or {}
+        self._blob_entries: dict[str, tuple[str, str]] = blob_entries or {}
+        self._directory_entries: dict[str, tuple[str, int, str]] = directory_entries or {}
+        self._is_modified = False
+
+    # ----------------------------------------------------------------------
+    @classmethod
+    def Load(cls, root: Path) -> "FileHashCache":
+        """
+        Load the cache for an output directory
+
+        Args:
+            root (Path): Output directory
+
+        Returns:
+            FileHashCache: The cache; it will be empty if no information has been cached yet
+        """
+        PathEx.EnsureDir(root)
+
+        git_dir = root / ".git"
+        if not git_dir.is_dir():
+            return cls(root, None)
+
+        cache_filename = git_dir / "PythonProjectBootstrapper" / "file_hashes.json"
+
+        try:
+            with cache_filename.open() as f:
+                content = json.load(f)
+
+            cache_mtime_ns = cache_filename.stat().st_mtime_ns
+
+            if content.get("version") != cls._FORMAT_VERSION:
+                return cls(root, cache_filename)
+
+            # Entries for files modified at (or after) the time that the cache was written are not trusted,
+            # as the file may have been modified again without a change in its modification time.
+            stat_entries = {
+                key: (value[0], value[1], value[2])
+                for key, value in content["stat"].items()
+                if value[1] < cache_mtime_ns
+            }
+
+            blob_entries = {key: (value[0], value[1]) for key, value in content["blobs"].items()}
+
+            # The same is true for directories that contain files modified at (or after) that time
+            directory_entries = {
+                key: (value[0], value[1], value[2])
+                for key, value in content["directories"].items()
+                if value[1] < cache_mtime_ns
+            }
+
+        except (OSError, ValueError, KeyError, TypeError, IndexError):
+            return cls(root, cache_filename)
+
+        return cls(
+            root,
+            cache_filename,
+            stat_entries=stat_entries,
+            blob_entries=blob_entries,
+            directory_entries=directory_entries,
+        )
+
+    # ----------------------------------------------------------------------
+    def GetHash(
+        self,
+        relative_path: str,
+        status: os.stat_result,
+    ) -> Optional[str]:
+        """Returns the cached hash value for the file or None if the file has changed since the value was cached"""
+
+        entry = self._stat_entries.get(relative_path)
+        if entry is None or entry[0] != status.st_size or entry[1] != status.st_mtime_ns:
+            return None
+
+        return entry[2]
+
+    # ----------------------------------------------------------------------
+    def SetHash(
+        self,
+        relative_path: str,
+        status: os.stat_result,
+        hash_value: str,
+    ) -> None:
+        entry = (status.st_size, status.st_mtime_ns, hash_value)
+
+        if self._stat_entries.get(relative_path) != entry:
+            self._stat_entries[relative_path] = entry
+            self._is_modified = True
+
+    # ----------------------------------------------------------------------
+    def GetHashByBlobId(
+        self,
+        relative_path: str,
+        blob_id: str,
+    ) -> Optional[str]:
+        """Returns the cached hash value for a file that git reports as clean or None if the blob id has changed since the value was cached"""
+
+        entry = self._blob_entries.get(relative_path)
+        if entry is None or entry[0] != blob_id:
+            return None
+
+        return entry[1]
+
+    # ----------------------------------------------------------------------
+    def SetHashByBlobId(
+        self,
+        relative_path: str,
+        blob_id: str,
+        hash_value: str,
+    ) -> None:
+        entry = (blob_id, hash_value)
+
+        if self._blob_entries.get(relative_path) != entry:
+            self._blob_entries[relative_path] = entry
+            self._is_modified = True
+
+    # ----------------------------------------------------------------------
+    def GetDirectoryDigest(
+        self,
+        directory_key: str,
+        signature: str,
+    ) -> Optional[str]:
+        """Returns the cached digest of the directory or None if any file within it has changed since the digest was cached"""
+
+        entry = self._directory_entries.get(directory_key)
+        if entry is None or entry[0] != signature:
+            return None
+
+        return entry[2]
+
+    # ----------------------------------------------------------------------
+    def SetDirectoryDigest(
+        self,
+        directory_key: str,
+        signature: str,
+        newest_mtime_ns: int,
+        digest: str,
+    ) -> None:
+        entry = (signature, newest_mtime_ns, digest)
+
+        if self._directory_entries.get(directory_key) != entry:
+            self._directory_entries[directory_key] = entry
+            self._is_modified = True
+
+    # ----------------------------------------------------------------------
+    def Save(self) -> None:
+        """Persist the cache (if it has been modified)"""
+
+        if self.cache_filename is None or not self._is_modified:
+            return
+
+        # The cache is an optimization, so failures to write it are not errors
+        try:
+            self.cache_filename.parent.mkdir(parents=True, exist_ok=True)
+
+            temp_filename = self.cache_filename.with_suffix(".{}.tmp".format(os.getpid()))
+
+            with temp_filename.open("w") as f:
+                json.dump(
+                    {
+                        "version": self._FORMAT_VERSION,
+                        "stat": self._stat_entries,
+                        "blobs": self._blob_entries,
+                        "directories": self._directory_entries,
+                    },
+                    f,
+                )
+
+            os.replace(temp_filename, self.cache_filename)
+
+        except OSError:
+            return
+
+        self._is_modified = False
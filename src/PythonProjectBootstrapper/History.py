@@ -0,0 +1,231 @@
+# ----------------------------------------------------------------------
+# |
+# |  Copyright (c) 2024 Scientific Software Engineering Center at Georgia Tech
+# |  Distributed under the MIT License.
+# |
+# ----------------------------------------------------------------------
+"""Append-only log of the changes made to an output directory by each generation"""
+
+import hashlib
+import json
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Optional
+
+from PythonProjectBootstrapper import __version__
+
+
+# Name of the file that contains the generation history in output directories that are not git repositories
+history_filename: str = ".python_project_bootstrapper_history.jsonl"
+
+
+# ----------------------------------------------------------------------
+def GetHistoryFilename(output_dir: Path) -> Path:
+    """Returns the name of the history file for an output directory; the file is created within the `.git` directory (so that it is never committed) when the output directory is a git repository"""
+
+    git_dir = output_dir / ".git"
+    if git_dir.is_dir():
+        return git_dir / "PythonProjectBootstrapper" / "history.jsonl"
+
+    return output_dir / history_filename
+
+
+# ----------------------------------------------------------------------
+@dataclass(frozen=True)
+class FileDelta:
+    """Change to a file's content; a None digest indicates that the file did not exist"""
+
+    old_digest: Optional[str]
+    new_digest: Optional[str]
+
+    # ----------------------------------------------------------------------
+    @property
+    def status(self) -> str:
+        if self.old_digest is None:
+            return "added"
+        if self.new_digest is None:
+            return "removed"
+
+        return "modified"
+
+
+# ----------------------------------------------------------------------
+@dataclass(frozen=True)
+class HistoryEntry:
+    """Information about a single generation"""
+
+    version: str
+    timestamp: str
+
+    # Hash of the template configuration values used during generation (if known)
+    context_hash: Optional[str]
+
+    # Files written or removed by the generation, keyed by posix path relative to the output directory
+    files: dict[str, FileDelta] = field(default_factory=dict)
+
+    # ----------------------------------------------------------------------
+    @classmethod
+    def Create(
+        cls,
+        files: dict[str, FileDelta],
+        context_hash: Optional[str] = None,
+    ) -> "HistoryEntry":
+        """Create an entry for a generation made by this version of PythonProjectBootstrapper at the current time"""
+
+        return cls(
+            __version__,
+            datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            context_hash,
+            files,
+        )
+
+    # ----------------------------------------------------------------------
+    def ToJsonLine(self) -> str:
+        return json.dumps(
+            {
+                "version": self.version,
+                "timestamp": self.timestamp,
+                "context": self.context_hash,
+                "files": {
+                    path: [delta.old_digest, delta.new_digest]
+                    for path, delta in sorted(self.files.items())
+                },
+            },
+            separators=(",", ":"),
+        )
+
+    # ----------------------------------------------------------------------
+    @classmethod
+    def FromJsonLine(cls, line: str) -> "HistoryEntry":
+        content = json.loads(line)
+
+        return cls(
+            content["version"],
+            content["timestamp"],
+            content["context"],
+            {path: FileDelta(value[0], value[1]) for path, value in content["files"].items()},
+        )
+
+
+# ----------------------------------------------------------------------
+def CalculateContextHash(context: dict[str, Any]) -> str:
+    """
+    Returns a hash of the template configuration values used during generation.
+
+    Args:
+        context (dict[str, Any]): Context used to render the templates (see `RenderingBackend.context`); private values (whose names begin with "_") are not included
+
+    Returns:
+        str: The hash value
+    """
+
+    values = context.get("cookiecutter", context)
+
+    return hashlib.sha256(
+        json.dumps(
+            {key: value for key, value in values.items() if not key.startswith("_")},
+            sort_keys=True,
+            default=str,
+        ).encode("utf-8"),
+    ).hexdigest()
+
+
+# ----------------------------------------------------------------------
+def AppendHistoryEntry(output_dir: Path, entry: HistoryEntry) -> None:
+    """Append an entry to the output directory's history"""
+
+    filename = GetHistoryFilename(output_dir)
+    filename.parent.mkdir(parents=True, exist_ok=True)
+
+    with filename.open("a", encoding="utf-8", newline="\n") as f:
+        f.write(entry.ToJsonLine())
+        f.write("\n")
+
+
+# ----------------------------------------------------------------------
+def LoadHistory(output_dir: Path) -> list[HistoryEntry]:
+    """Load the output directory's history, ordered from the oldest to the newest generation; an empty list is returned if the history doesn't exist"""
+
+    entries: list[HistoryEntry] = []
+
+    # Generations made before the output directory became a git repository are recorded in the output directory
+    # until the next generation moves them (see ProjectGenerationUtils.CopyToOutputDir())
+    for filename in dict.fromkeys([output_dir / history_filename, GetHistoryFilename(output_dir)]):
+        if not filename.is_file():
+            continue
+
+        with filename.open(encoding="utf-8") as f:
+            entries += [HistoryEntry.FromJsonLine(line) for line in f if line.strip()]
+
+    return entries
+
+
+# ----------------------------------------------------------------------
+def FindGeneration(entries: list[HistoryEntry], value: str) -> int:
+    """
+    Returns the index of a generation.
+
+    Args:
+        entries (list[HistoryEntry]): The history
+        value (str): A generation number (starting at 1; 0 represents the output directory before the first generation) or a PythonProjectBootstrapper version; the most recent generation made by that version is returned
+
+    Returns:
+        int: Index of the generation within `entries` (-1 for generation 0)
+    """
+
+    if value.isdigit():
+        index = int(value) - 1
+
+        if not -1 <= index < len(entries):
+            raise Exception(
+                f"'{value}' is not a valid generation number; valid values are 0-{len(entries)}."
+            )
+
+        return index
+
+    for index in range(len(entries) - 1, -1, -1):
+        if entries[index].version == value:
+            return index
+
+    raise Exception(f"A generation made by version '{value}' was not found.")
+
+
+# ----------------------------------------------------------------------
+def DiffHistory(
+    entries: list[HistoryEntry],
+    from_index: Optional[int] = None,
+    to_index: Optional[int] = None,
+) -> dict[str, FileDelta]:
+    """
+    Returns the net changes made by a range of generations.
+
+    Args:
+        entries (list[HistoryEntry]): The history
+        from_index (Optional[int], optional): Changes made after this generation are included; changes made by all generations are included when None or -1. Defaults to None.
+        to_index (Optional[int], optional): Changes made by this generation (and those before it) are included; changes made by the most recent generation are included when None. Defaults to None.
+
+    Returns:
+        dict[str, FileDelta]: Changes keyed by posix path relative to the output directory and sorted by path; files whose content is the same at the beginning and end of the range are not included
+    """
+
+    start = 0 if from_index is None else from_index + 1
+    end = len(entries) if to_index is None else to_index + 1
+
+    deltas: dict[str, FileDelta] = {}
+
+    for entry in entries[start:end]:
+        for path, delta in entry.files.items():
+            existing_delta = deltas.get(path)
+
+            deltas[path] = FileDelta(
+                delta.old_digest if existing_delta is None else existing_delta.old_digest,
+                delta.new_digest,
+            )
+
+    return {
+        path: delta
+        for path, delta in sorted(deltas.items())
+        if delta.old_digest != delta.new_digest
+    }
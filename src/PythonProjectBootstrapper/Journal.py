@@ -0,0 +1,329 @@
+# ----------------------------------------------------------------------
+# |
+# |  Copyright (c) 2024 Scientific Software Engineering Center at Georgia Tech
+# |  Distributed under the MIT License.
+# |
+# ----------------------------------------------------------------------
+"""Write-ahead journal that allows changes applied to an output directory to be rolled back"""
+
+import json
+import os
+import shutil
+import stat
+
+from pathlib import Path
+from typing import Any, Optional, TextIO
+
+from dbrownell_Common import PathEx
+
+
+# Name of the journal directory created in output directories that are not git repositories
+journal_dirname: str = ".python_project_bootstrapper_journal"
+
+_JOURNAL_FILENAME = "journal.jsonl"
+_BACKUPS_DIRNAME = "backups"
+
+
+# ----------------------------------------------------------------------
+def GetJournalDirectory(output_dir: Path) -> Path:
+    """Returns the journal directory for an output directory; the directory is created within the `.git` directory (so that it is never committed) when the output directory is a git repository"""
+
+    git_dir = output_dir / ".git"
+    if git_dir.is_dir():
+        return git_dir / "PythonProjectBootstrapper" / "journal"
+
+    return output_dir / journal_dirname
+
+
+# ----------------------------------------------------------------------
+class ApplyJournal:
+    """
+    Records the operations performed while changes are applied to an output directory so that they can be rolled
+    back if the process is interrupted.
+
+    Each operation is recorded before it is performed. Files that are overwritten or removed are preserved by
+    hard-linking them into the journal's backup directory (they are copied when hard links are not supported)
+    and the original file is removed before new content is written, so the backup is never modified. Rolling back
+    restores the backups and removes new files and directories, so its cost is proportional to the number of
+    files changed rather than the size of the output directory.
+
+    Removing the journal file is the commit point: once it has been removed, the changes are permanent. The
+    manifest should be written (through the journal) as the last operation before committing.
+
+    Records are flushed to the operating system before each operation is performed, which is sufficient when the
+    process is killed; file content written to the output directory is not synced to disk, so syncing individual
+    records would not provide additional guarantees in the event of power loss.
+    """
+
+    # ----------------------------------------------------------------------
+    def __init__(
+        self,
+        output_dir: Path,
+        journal_dir: Path,
+        journal_file: TextIO,
+    ):
+        self.output_dir = output_dir
+        self.journal_dir = journal_dir
+
+        self._journal_file: Optional[TextIO] = journal_file
+        self._num_backups = 0
+
+    # ----------------------------------------------------------------------
+    @classmethod
+    def Begin(cls, output_dir: Path) -> "ApplyJournal":
+        """
+        Begin a journal for an output directory; an exception is raised if an interrupted journal exists (see RecoverJournal()).
+
+        Args:
+            output_dir (Path): Output directory
+
+        Returns:
+            ApplyJournal: The journal
+        """
+        PathEx.EnsureDir(output_dir)
+
+        journal_dir = GetJournalDirectory(output_dir)
+
+        if (journal_dir / _JOURNAL_FILENAME).exists():
+            raise Exception(
+                f"An interrupted journal exists in '{journal_dir}'; it must be recovered before changes can be applied."
+            )
+
+        # Remove the remnants of a previously committed journal
+        if journal_dir.exists():
+            _RemoveTree(journal_dir)
+
+        (journal_dir / _BACKUPS_DIRNAME).mkdir(parents=True)
+
+        return cls(
+            output_dir,
+            journal_dir,
+            (journal_dir / _JOURNAL_FILENAME).open("w", encoding="utf-8"),
+        )
+
+    # ----------------------------------------------------------------------
+    def PrepareDirectory(self, relative_path: str) -> None:
+        """Record that a directory is about to be created (nothing is recorded if the directory already exists)"""
+
+        if (self.output_dir / relative_path).is_dir():
+            return
+
+        self._Record({"operation": "mkdir", "path": relative_path})
+
+    # ----------------------------------------------------------------------
+    def PrepareWrite(
+        self,
+        relative_path: str,
+        *,
+        remove_existing: bool = True,
+    ) -> None:
+        """
+        Record that a file is about to be written, backing up the existing file (if any).
+
+        Args:
+            relative_path (str): Posix path relative to the output directory
+            remove_existing (bool, optional): Remove the existing file so that the new content is written to a new file rather than to the backup; this is not necessary when the file will be replaced with `os.replace`. Defaults to True.
+        """
+
+        filename = self.output_dir / relative_path
+
+        if not filename.is_file():
+            self._Record({"operation": "write", "path": relative_path, "backup": None})
+            return
+
+        backup_name = self._Backup(filename)
+
+        self._Record({"operation": "write", "path": relative_path, "backup": backup_name})
+
+        if remove_existing:
+            _Unlink(filename)
+
+    # ----------------------------------------------------------------------
+    def PrepareAppend(self, relative_path: str) -> None:
+        """Record that content is about to be appended to a file; the file is truncated to its current size (or removed if it doesn't exist) during rollback"""
+
+        filename = self.output_dir / relative_path
+
+        self._Record(
+            {
+                "operation": "append",
+                "path": relative_path,
+                "size": filename.stat().st_size if filename.is_file() else None,
+            },
+        )
+
+    # ----------------------------------------------------------------------
+    def PrepareModeChange(self, relative_path: str) -> None:
+        """Record that the mode of a file is about to be changed"""
+
+        self._Record(
+            {
+                "operation": "mode",
+                "path": relative_path,
+                "mode": stat.S_IMODE((self.output_dir / relative_path).stat().st_mode),
+            },
+        )
+
+    # ----------------------------------------------------------------------
+    def RemoveFile(self, relative_path: str) -> None:
+        """Back up and remove a file"""
+
+        filename = self.output_dir / relative_path
+        backup_name = self._Backup(filename)
+
+        self._Record({"operation": "delete", "path": relative_path, "backup": backup_name})
+        _Unlink(filename)
+
+    # ----------------------------------------------------------------------
+    def Commit(self) -> None:
+        """Make the recorded changes permanent"""
+
+        assert self._journal_file is not None
+
+        self._journal_file.close()
+        self._journal_file = None
+
+        (self.journal_dir / _JOURNAL_FILENAME).unlink()
+        _RemoveTree(self.journal_dir)
+
+    # ----------------------------------------------------------------------
+    def Rollback(self) -> list[str]:
+        """Undo the recorded changes, returning the relative paths that were restored or removed"""
+
+        assert self._journal_file is not None
+
+        self._journal_file.close()
+        self._journal_file = None
+
+        return _Rollback(self.output_dir, self.journal_dir)
+
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    def _Backup(self, filename: Path) -> str:
+        self._num_backups += 1
+        backup_name = "{:06}".format(self._num_backups)
+
+        backup_filename = self.journal_dir / _BACKUPS_DIRNAME / backup_name
+
+        try:
+            os.link(filename, backup_filename)
+        except OSError:
+            shutil.copy2(filename, backup_filename)
+
+        return backup_name
+
+    # ----------------------------------------------------------------------
+    def _Record(self, record: dict[str, Any]) -> None:
+        assert self._journal_file is not None
+
+        self._journal_file.write(json.dumps(record))
+        self._journal_file.write("\n")
+        self._journal_file.flush()
+
+
+# ----------------------------------------------------------------------
+def RecoverJournal(output_dir: Path) -> list[str]:
+    """
+    Roll back the changes recorded by an interrupted journal.
+
+    Args:
+        output_dir (Path): Output directory
+
+    Returns:
+        list[str]: Relative paths that were restored or removed; the list is empty if there wasn't an interrupted journal
+    """
+
+    journal_dir = GetJournalDirectory(output_dir)
+
+    if not (journal_dir / _JOURNAL_FILENAME).is_file():
+        return []
+
+    return _Rollback(output_dir, journal_dir)
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _Rollback(output_dir: Path, journal_dir: Path) -> list[str]:
+    records: list[dict[str, Any]] = []
+
+    with (journal_dir / _JOURNAL_FILENAME).open(encoding="utf-8") as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                # The process was interrupted while the last record was written, so the operation
+                # associated with it was never performed.
+                break
+
+    restored: list[str] = []
+
+    for record in reversed(records):
+        operation = record["operation"]
+        filename = output_dir / record["path"]
+
+        if operation == "mkdir":
+            if filename.is_dir() and not any(filename.iterdir()):
+                filename.rmdir()
+
+        elif operation == "append":
+            if filename.is_file():
+                if record["size"] is None:
+                    _Unlink(filename)
+                else:
+                    os.truncate(filename, record["size"])
+
+        elif operation == "mode":
+            if filename.is_file():
+                filename.chmod(record["mode"])
+
+        elif operation in ["write", "delete"]:
+            backup_name = record["backup"]
+
+            if backup_name is None:
+                if filename.is_file():
+                    _Unlink(filename)
+            else:
+                backup_filename = journal_dir / _BACKUPS_DIRNAME / backup_name
+
+                if backup_filename.is_file():
+                    filename.parent.mkdir(parents=True, exist_ok=True)
+
+                    # Read-only files can't be replaced on Windows
+                    if os.name == "nt" and filename.is_file():
+                        _Unlink(filename)
+
+                    os.replace(backup_filename, filename)
+
+        else:
+            assert False, operation  # pragma: no cover
+
+        restored.append(record["path"])
+
+    # Removing the journal file completes the rollback
+    (journal_dir / _JOURNAL_FILENAME).unlink()
+    _RemoveTree(journal_dir)
+
+    return sorted(set(restored))
+
+
+# ----------------------------------------------------------------------
+def _Unlink(filename: Path) -> None:
+    try:
+        filename.unlink()
+    except PermissionError:
+        # Read-only files can't be removed on Windows
+        filename.chmod(stat.S_IWRITE)
+        filename.unlink()
+
+
+# ----------------------------------------------------------------------
+def _RemoveTree(path: Path) -> None:
+    # ----------------------------------------------------------------------
+    def OnError(func, value, _):
+        os.chmod(value, stat.S_IWRITE)
+        func(value)
+
+    # ----------------------------------------------------------------------
+
+    shutil.rmtree(path, onerror=OnError)
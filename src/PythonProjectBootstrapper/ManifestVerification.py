@@ -0,0 +1,366 @@
+# ----------------------------------------------------------------------
+# |
+# |  Copyright (c) 2024 Scientific Software Engineering Center at Georgia Tech
+# |  Distributed under the MIT License.
+# |
+# ----------------------------------------------------------------------
+"""Functionality that compares the manifest written during project generation with the current contents of the output directory"""
+
+import os
+import stat
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from dbrownell_Common import PathEx
+
+from PythonProjectBootstrapper.DirectoryDigests import (
+    CalculateDirectoryDigests,
+    DiffManifests,
+    GetDirectoryKeys,
+)
+from PythonProjectBootstrapper.GitIndex import GetCleanBlobIds
+from PythonProjectBootstrapper.HashCache import FileHashCache
+from PythonProjectBootstrapper.ProjectGenerationUtils import (
+    GenerateFileHash,
+    LoadManifestWithDigests,
+    manifest_filename,
+)
+
+
+# Number of files hashed by a worker thread at a time; batching keeps scheduling overhead low for manifests with many small files
+_BATCH_SIZE = 256
+
+
+# ----------------------------------------------------------------------
+@dataclass(frozen=True)
+class VerifyManifestResult:
+    """
+    Object containing the files in a manifest grouped by their current state in the output directory
+    """
+
+    unchanged_files: list[str] = field(default_factory=list)
+    modified_files: list[str] = field(default_factory=list)
+    missing_files: list[str] = field(default_factory=list)
+
+    # ----------------------------------------------------------------------
+    @property
+    def has_drift(self) -> bool:
+        return bool(self.modified_files or self.missing_files)
+
+
+# ----------------------------------------------------------------------
+def VerifyManifest(
+    output_dir: Path,
+    *,
+    max_workers: Optional[int] = None,
+    use_cache: bool = True,
+    use_git_index: bool = False,
+) -> VerifyManifestResult:
+    """
+    Compare every entry in the manifest with the corresponding file in the output directory.
+
+    The digest of each directory in the manifest is cached once the files within it have been verified, along with a
+    signature calculated from their stat information. Files within directories whose signatures have not changed
+    since then are not hashed (or compared) individually. The hash values of the remaining files are compared with
+    the manifest by directory (see DiffManifests()).
+
+    Args:
+        output_dir (Path): Output directory containing the manifest
+        max_workers (Optional[int], optional): Maximum number of threads used to hash files. Defaults to None (determined by the system).
+        use_cache (bool, optional): Use (and update) the file hash cache. Defaults to True.
+        use_git_index (bool, optional): Use the git index to detect files that are unchanged since they were last hashed. Defaults to False.
+
+    Returns:
+        VerifyManifestResult: Files in the manifest grouped by their current state
+    """
+    PathEx.EnsureDir(output_dir)
+
+    manifest, directory_digests = LoadManifestWithDigests(output_dir / manifest_filename)
+
+    hash_cache = FileHashCache.Load(output_dir) if use_cache else FileHashCache(output_dir, None)
+
+    current_hashes, current_digests = _CalculateManifestHashes(
+        output_dir,
+        manifest,
+        directory_digests,
+        hash_cache,
+        max_workers=max_workers,
+        use_git_index=use_git_index,
+    )
+
+    hash_cache.Save()
+
+    current_manifest = {
+        relative_path: hash_value
+        for relative_path, hash_value in current_hashes.items()
+        if hash_value is not None
+    }
+
+    changed_files = DiffManifests(manifest, current_manifest, directory_digests, current_digests)
+
+    modified_files: list[str] = []
+    missing_files: list[str] = []
+
+    for relative_path in changed_files:
+        if current_hashes[relative_path] is None:
+            missing_files.append(relative_path)
+        else:
+            modified_files.append(relative_path)
+
+    changed_files_set = set(changed_files)
+
+    return VerifyManifestResult(
+        unchanged_files=sorted(
+            relative_path for relative_path in manifest if relative_path not in changed_files_set
+        ),
+        modified_files=sorted(modified_files),
+        missing_files=sorted(missing_files),
+    )
+
+
+# ----------------------------------------------------------------------
+def CalculateCurrentHashes(
+    output_dir: Path,
+    relative_paths: list[str],
+    *,
+    max_workers: Optional[int] = None,
+    use_cache: bool = True,
+    use_git_index: bool = False,
+    cancel: Optional[threading.Event] = None,
+) -> dict[str, Optional[str]]:
+    """
+    Calculate the hash values of files within the output directory.
+
+    Files are hashed in parallel; hashing is skipped for files whose size and modification time match
+    information cached during a previous calculation. When the git index is used, hashing (and stat
+    calls) are also skipped for tracked files that git reports as clean and whose blob id is unchanged
+    since the file was last hashed.
+
+    Args:
+        output_dir (Path): Output directory
+        relative_paths (list[str]): Posix paths of the files to hash, relative to output_dir
+        max_workers (Optional[int], optional): Maximum number of threads used to hash files. Defaults to None (determined by the system).
+        use_cache (bool, optional): Use (and update) the file hash cache. Defaults to True.
+        use_git_index (bool, optional): Use the git index to detect files that are unchanged since they were last hashed. Defaults to False.
+        cancel (Optional[threading.Event], optional): Hashing stops once this event is set; files that have not been hashed are omitted from the results. Defaults to None.
+
+    Returns:
+        dict[str, Optional[str]]: Hash values keyed by relative path; the value is None for files that do not exist
+    """
+    PathEx.EnsureDir(output_dir)
+
+    hash_cache = FileHashCache.Load(output_dir) if use_cache else FileHashCache(output_dir, None)
+
+    current_hashes = _CalculateCurrentHashes(
+        output_dir,
+        relative_paths,
+        hash_cache,
+        (GetCleanBlobIds(output_dir) if use_git_index else None) or {},
+        max_workers=max_workers,
+        cancel=cancel,
+    )
+
+    hash_cache.Save()
+
+    return current_hashes
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _CalculateManifestHashes(
+    output_dir: Path,
+    manifest: dict[str, str],
+    directory_digests: dict[str, str],
+    hash_cache: FileHashCache,
+    *,
+    max_workers: Optional[int],
+    use_git_index: bool,
+) -> tuple[dict[str, Optional[str]], dict[str, str]]:
+    """Returns the current hash values of the files in the manifest (see CalculateCurrentHashes()) and the current directory digests, skipping directories whose cached digests are still valid"""
+
+    statuses = {relative_path: _GetStatus(output_dir / relative_path) for relative_path in manifest}
+
+    # A directory's signature is calculated from the stat information of the files within it in the same way that its
+    # digest is calculated from their hash values
+    signatures = CalculateDirectoryDigests(
+        {
+            relative_path: (
+                "" if status is None else "{}:{}".format(status.st_size, status.st_mtime_ns)
+            )
+            for relative_path, status in statuses.items()
+        },
+    )
+
+    unchanged_directories = {
+        directory_key
+        for directory_key, digest in directory_digests.items()
+        if hash_cache.GetDirectoryDigest(directory_key, signatures[directory_key]) == digest
+    }
+
+    current_hashes: dict[str, Optional[str]] = {}
+    paths_to_hash: list[str] = []
+
+    for relative_path, hash_value in manifest.items():
+        if any(
+            directory_key in unchanged_directories
+            for directory_key in GetDirectoryKeys(relative_path)
+        ):
+            current_hashes[relative_path] = hash_value
+        else:
+            paths_to_hash.append(relative_path)
+
+    if paths_to_hash:
+        current_hashes.update(
+            _CalculateCurrentHashes(
+                output_dir,
+                paths_to_hash,
+                hash_cache,
+                (GetCleanBlobIds(output_dir) if use_git_index else None) or {},
+                max_workers=max_workers,
+                cancel=None,
+            ),
+        )
+
+    current_digests = CalculateDirectoryDigests(
+        {
+            relative_path: hash_value
+            for relative_path, hash_value in current_hashes.items()
+            if hash_value is not None
+        },
+    )
+
+    _CacheDirectoryDigests(hash_cache, statuses, signatures, directory_digests, current_digests)
+
+    return current_hashes, current_digests
+
+
+# ----------------------------------------------------------------------
+def _CacheDirectoryDigests(
+    hash_cache: FileHashCache,
+    statuses: dict[str, Optional[os.stat_result]],
+    signatures: dict[str, str],
+    directory_digests: dict[str, str],
+    current_digests: dict[str, str],
+) -> None:
+    """Cache the digests of the directories whose files are unchanged"""
+
+    newest_mtimes = _GetNewestModificationTimes(statuses)
+
+    for directory_key, digest in directory_digests.items():
+        if current_digests.get(directory_key) == digest and directory_key in newest_mtimes:
+            hash_cache.SetDirectoryDigest(
+                directory_key, signatures[directory_key], newest_mtimes[directory_key], digest
+            )
+
+
+# ----------------------------------------------------------------------
+def _CalculateCurrentHashes(
+    output_dir: Path,
+    relative_paths: list[str],
+    hash_cache: FileHashCache,
+    blob_ids: dict[str, str],
+    *,
+    max_workers: Optional[int],
+    cancel: Optional[threading.Event],
+) -> dict[str, Optional[str]]:
+    current_hashes: dict[str, Optional[str]] = {}
+    paths_to_hash: list[str] = []
+
+    for relative_path in relative_paths:
+        blob_id = blob_ids.get(relative_path)
+        hash_value = hash_cache.GetHashByBlobId(relative_path, blob_id) if blob_id else None
+
+        if hash_value is None:
+            paths_to_hash.append(relative_path)
+        else:
+            current_hashes[relative_path] = hash_value
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for batch_results in executor.map(
+            lambda batch: _HashBatch(output_dir, hash_cache, batch, cancel),
+            (
+                paths_to_hash[index : index + _BATCH_SIZE]
+                for index in range(0, len(paths_to_hash), _BATCH_SIZE)
+            ),
+        ):
+            for relative_path, status, hash_value in batch_results:
+                current_hashes[relative_path] = hash_value
+
+                if status is not None:
+                    assert hash_value is not None
+                    hash_cache.SetHash(relative_path, status, hash_value)
+
+                    blob_id = blob_ids.get(relative_path)
+                    if blob_id is not None:
+                        hash_cache.SetHashByBlobId(relative_path, blob_id, hash_value)
+
+    return current_hashes
+
+
+# ----------------------------------------------------------------------
+def _GetNewestModificationTimes(statuses: dict[str, Optional[os.stat_result]]) -> dict[str, int]:
+    """Returns the newest modification time of the files within each directory, keyed by directory key"""
+
+    newest_mtimes: dict[str, int] = {}
+
+    for relative_path, status in statuses.items():
+        if status is None:
+            continue
+
+        for directory_key in GetDirectoryKeys(relative_path):
+            newest_mtimes[directory_key] = max(
+                newest_mtimes.get(directory_key, status.st_mtime_ns), status.st_mtime_ns
+            )
+
+    return newest_mtimes
+
+
+# ----------------------------------------------------------------------
+def _GetStatus(fullpath: Path) -> Optional[os.stat_result]:
+    """Returns stat information for the file or None if it does not exist (or is not a regular file)"""
+
+    try:
+        status = fullpath.stat()
+    except OSError:
+        return None
+
+    if not stat.S_ISREG(status.st_mode):
+        return None
+
+    return status
+
+
+# ----------------------------------------------------------------------
+def _HashBatch(
+    output_dir: Path,
+    hash_cache: FileHashCache,
+    relative_paths: list[str],
+    cancel: Optional[threading.Event],
+) -> list[tuple[str, Optional[os.stat_result], Optional[str]]]:
+    """Returns (relative path, stat information, hash value) for each file; stat information and hash value are None for missing files"""
+
+    results: list[tuple[str, Optional[os.stat_result], Optional[str]]] = []
+
+    for relative_path in relative_paths:
+        if cancel is not None and cancel.is_set():
+            break
+
+        fullpath = output_dir / relative_path
+
+        status = _GetStatus(fullpath)
+        if status is None:
+            results.append((relative_path, None, None))
+            continue
+
+        hash_value = hash_cache.GetHash(relative_path, status)
+        if hash_value is None:
+            hash_value = GenerateFileHash(fullpath)
+
+        results.append((relative_path, status, hash_value))
+
+    return results
@@ -0,0 +1,270 @@
+# ----------------------------------------------------------------------
+# |
+# |  Copyright (c) 2024 Scientific Software Engineering Center at Georgia Tech
+# |  Distributed under the MIT License.
+# |
+# ----------------------------------------------------------------------
+"""Functionality that renders the permutations of a project's configuration values and compares them with golden snapshots"""
+
+import hashlib
+import itertools
+import json
+import random
+import tempfile
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+from PythonProjectBootstrapper.Generation import Generate, GetTemplatesRootDir
+from PythonProjectBootstrapper.ProjectGenerationUtils import LoadManifest, manifest_filename
+
+
+# Date used when rendering templates that include the current date (for example, copyright headers); a
+# fixed value ensures that snapshots don't change over time.
+DEFAULT_SNAPSHOT_DATE = "2024-01-01"
+
+
+# ----------------------------------------------------------------------
+@dataclass(frozen=True)
+class Permutation:
+    """Configuration values used to render a single permutation of a project"""
+
+    name: str
+    context: dict[str, Any]
+
+
+# ----------------------------------------------------------------------
+@dataclass(frozen=True)
+class SnapshotComparison:
+    """Result of comparing rendered permutations with golden snapshots"""
+
+    matching: list[str] = field(default_factory=list)
+    mismatched: list[str] = field(default_factory=list)
+
+    # Permutations that were rendered but do not have a snapshot
+    new: list[str] = field(default_factory=list)
+
+    # ----------------------------------------------------------------------
+    @property
+    def is_success(self) -> bool:
+        return not self.mismatched and not self.new
+
+
+# ----------------------------------------------------------------------
+def GetAxes(project: str) -> dict[str, list[Any]]:
+    """
+    Returns the configuration values that vary across permutations of a project; these are the values in
+    the project's cookiecutter.json file that are choices (lists) or flags (booleans).
+
+    Args:
+        project (str): Name of the project
+
+    Returns:
+        dict[str, list[Any]]: Potential values, keyed by configuration value name
+    """
+
+    with (GetTemplatesRootDir() / project / "cookiecutter.json").open() as f:
+        content = json.load(f)
+
+    axes: dict[str, list[Any]] = {}
+
+    for key, value in content.items():
+        if key.startswith("_"):
+            continue
+
+        if isinstance(value, bool):
+            axes[key] = [False, True]
+        elif isinstance(value, list):
+            axes[key] = value
+
+    return axes
+
+
+# ----------------------------------------------------------------------
+def CreatePermutations(
+    project: str,
+    base_context: dict[str, Any],
+    axes: Optional[dict[str, list[Any]]] = None,
+    *,
+    sample: Optional[int] = None,
+    seed: int = 0,
+) -> list[Permutation]:
+    """
+    Create the permutations of a project's configuration values.
+
+    Args:
+        project (str): Name of the project
+        base_context (dict[str, Any]): Configuration values common to all permutations
+        axes (Optional[dict[str, list[Any]]], optional): Additional (or overridden) values that vary across permutations. Defaults to None.
+        sample (Optional[int], optional): Number of permutations to randomly select; all permutations are returned when None. Defaults to None.
+        seed (int, optional): Seed used when selecting permutations. Defaults to 0.
+
+    Returns:
+        list[Permutation]: The permutations, sorted by name
+    """
+
+    all_axes = GetAxes(project)
+    all_axes.update(axes or {})
+
+    axis_names = sorted(all_axes)
+
+    permutations: list[Permutation] = []
+
+    for values in itertools.product(*(all_axes[axis_name] for axis_name in axis_names)):
+        context = dict(base_context)
+        context.update(zip(axis_names, values))
+
+        permutations.append(
+            Permutation(
+                ",".join(f"{name}={value}" for name, value in zip(axis_names, values)),
+                context,
+            ),
+        )
+
+    if sample is not None and sample < len(permutations):
+        permutations = random.Random(seed).sample(permutations, sample)
+
+    return sorted(permutations, key=lambda permutation: permutation.name)
+
+
+# ----------------------------------------------------------------------
+def RenderPermutations(
+    project: str,
+    permutations: list[Permutation],
+    *,
+    max_workers: Optional[int] = None,
+    snapshot_date: str = DEFAULT_SNAPSHOT_DATE,
+) -> dict[str, str]:
+    """
+    Render permutations (with hooks enabled) in parallel worker processes.
+
+    Args:
+        project (str): Name of the project
+        permutations (list[Permutation]): Permutations to render
+        max_workers (Optional[int], optional): Maximum number of worker processes. Defaults to None (one process per CPU).
+        snapshot_date (str, optional): Date used when rendering templates that include the current date. Defaults to DEFAULT_SNAPSHOT_DATE.
+
+    Returns:
+        dict[str, str]: Manifest digests, keyed by permutation name
+    """
+
+    # Each permutation is rendered in a worker process (even when rendering a single permutation), as
+    # cookiecutter changes the working directory and the current date is patched while rendering.
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_InitializeWorker,
+        initargs=(snapshot_date,),
+    ) as executor:
+        digests = executor.map(
+            _RenderPermutation,
+            itertools.repeat(project),
+            (permutation.context for permutation in permutations),
+        )
+
+        return {permutation.name: digest for permutation, digest in zip(permutations, digests)}
+
+
+# ----------------------------------------------------------------------
+def CalculateManifestDigest(manifest: dict[str, str]) -> str:
+    """Returns a digest that represents the relative paths and contents of every file in a manifest"""
+
+    hasher = hashlib.sha256()
+
+    for relative_path, hash_value in sorted(manifest.items()):
+        hasher.update(f"{relative_path}\0{hash_value}\n".encode("utf-8"))
+
+    return hasher.hexdigest()
+
+
+# ----------------------------------------------------------------------
+def LoadSnapshots(filename: Path) -> dict[str, str]:
+    """Load the manifest digests stored in a snapshot file; an empty dictionary is returned if the file doesn't exist"""
+
+    if not filename.is_file():
+        return {}
+
+    with filename.open() as f:
+        return json.load(f)
+
+
+# ----------------------------------------------------------------------
+def SaveSnapshots(filename: Path, digests: dict[str, str]) -> None:
+    """Save manifest digests to a snapshot file"""
+
+    filename.parent.mkdir(parents=True, exist_ok=True)
+
+    with filename.open("w") as f:
+        json.dump(dict(sorted(digests.items())), f, indent=2)
+        f.write("\n")
+
+
+# ----------------------------------------------------------------------
+def CompareSnapshots(
+    snapshots: dict[str, str],
+    digests: dict[str, str],
+) -> SnapshotComparison:
+    """
+    Compare manifest digests with golden snapshots.
+
+    Args:
+        snapshots (dict[str, str]): Golden snapshots, keyed by permutation name
+        digests (dict[str, str]): Rendered manifest digests, keyed by permutation name
+
+    Returns:
+        SnapshotComparison: The result of the comparison
+    """
+
+    matching: list[str] = []
+    mismatched: list[str] = []
+    new: list[str] = []
+
+    for name, digest in sorted(digests.items()):
+        snapshot = snapshots.get(name)
+
+        if snapshot is None:
+            new.append(name)
+        elif snapshot == digest:
+            matching.append(name)
+        else:
+            mismatched.append(name)
+
+    return SnapshotComparison(matching=matching, mismatched=mismatched, new=new)
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _InitializeWorker(snapshot_date: str) -> None:
+    import arrow
+
+    fixed_date = arrow.get(snapshot_date)
+
+    # ----------------------------------------------------------------------
+    def Now(tzinfo=None) -> arrow.Arrow:
+        return fixed_date if tzinfo is None else fixed_date.to(tzinfo)
+
+    # ----------------------------------------------------------------------
+
+    arrow.now = Now
+    arrow.utcnow = lambda: fixed_date
+
+
+# ----------------------------------------------------------------------
+def _RenderPermutation(project: str, context: dict[str, Any]) -> str:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output_dir = Path(temp_dir) / "output"
+
+        working_dir = Path(temp_dir) / "working"
+        working_dir.mkdir()
+
+        Generate(
+            project,
+            output_dir,
+            context,
+            require_git=False,
+            working_dir=working_dir,
+        )
+
+        return CalculateManifestDigest(LoadManifest(output_dir / manifest_filename))
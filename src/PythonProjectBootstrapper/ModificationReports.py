@@ -0,0 +1,269 @@
+# ----------------------------------------------------------------------
+# |
+# |  Copyright (c) 2024 Scientific Software Engineering Center at Georgia Tech
+# |  Distributed under the MIT License.
+# |
+# ----------------------------------------------------------------------
+"""Reports that describe the modifications made to an output directory during project generation"""
+
+import json
+import sys
+import xml.etree.ElementTree as ET
+
+from enum import Enum
+from pathlib import Path, PurePosixPath
+from typing import Optional, TextIO
+
+from PythonProjectBootstrapper.ProjectGenerationUtils import CopyToOutputDirResult
+
+
+# ----------------------------------------------------------------------
+class ReportMode(str, Enum):
+    """Ways in which modifications are displayed"""
+
+    # Every modified file
+    Full = "full"
+
+    # The number of modified files in each category
+    Summary = "summary"
+
+    # The number of modified files in each category, grouped by directory
+    Directories = "directories"
+
+    # The first files in each category
+    Top = "top"
+
+
+# ----------------------------------------------------------------------
+def DisplayModifications(
+    modifications: CopyToOutputDirResult,
+    output_stream: TextIO = sys.stdout,
+) -> None:
+    """
+    Print out the changes in the output directory that were triggered by this project generation
+
+    Rich is only used for the headings; each modified file is written as a line of plain text as it is
+    reached, so the output appears immediately (and memory use stays flat) regardless of the number of
+    modified files.
+
+    Args:
+        modifications (CopyToOutputDirResult): Object containing information about files deleted, added, overwritten, and modified
+        output_stream (TextIO, optional): Stream to write to. Defaults to sys.stdout.
+    """
+
+    from rich.console import Console
+
+    console = Console(file=output_stream, highlight=False)
+
+    output_stream.write("\n\n")
+    console.rule("Output Directory Modifications", align="left", style="green")
+
+    for label, filenames in _GetCategories(modifications):
+        console.print("\n" + label, style="bold", markup=False)
+
+        for filename in filenames:
+            output_stream.write(f" - {filename}\n")
+
+    output_stream.write("\n")
+    console.rule(style="green")
+
+
+# ----------------------------------------------------------------------
+def GetDefaultReportMode(output_stream: TextIO = sys.stdout) -> ReportMode:
+    """Returns ReportMode.Full when the output is displayed in a terminal and ReportMode.Top otherwise (for example, in CI logs)"""
+
+    return ReportMode.Full if output_stream.isatty() else ReportMode.Top
+
+
+# ----------------------------------------------------------------------
+def DisplayReport(
+    modifications: CopyToOutputDirResult,
+    output_dir: Path,
+    mode: Optional[ReportMode] = None,
+    max_files: int = 20,
+    output_stream: TextIO = sys.stdout,
+) -> None:
+    """
+    Display the modifications made to the output directory.
+
+    Rich is only used for the full report; the other modes write plain text, which remains fast (and
+    readable in CI logs) regardless of the number of modified files.
+
+    Args:
+        modifications (CopyToOutputDirResult): Modifications made to the output directory
+        output_dir (Path): Output directory
+        mode (Optional[ReportMode], optional): How the modifications are displayed. Defaults to None (see GetDefaultReportMode()).
+        max_files (int, optional): Maximum number of files displayed per category in ReportMode.Top. Defaults to 20.
+        output_stream (TextIO, optional): Stream used for plain text reports. Defaults to sys.stdout.
+    """
+
+    if mode is None:
+        mode = GetDefaultReportMode(output_stream)
+
+    if mode == ReportMode.Full:
+        DisplayModifications(modifications, output_stream)
+        return
+
+    categories = _GetCategories(modifications)
+
+    output_stream.write("\n\n")
+
+    if mode == ReportMode.Summary:
+        for label, filenames in categories:
+            output_stream.write(f"{label}: {len(filenames)}\n")
+
+    elif mode == ReportMode.Directories:
+        rollup = CreateDirectoryRollup(modifications, output_dir)
+
+        column_width = max([len("Directory")] + [len(directory) for directory in rollup])
+
+        output_stream.write(
+            "{}  {}\n".format(
+                "Directory".ljust(column_width),
+                "  ".join(label for label, _ in categories),
+            ),
+        )
+
+        for directory, counts in rollup.items():
+            output_stream.write(
+                "{}  {}\n".format(
+                    directory.ljust(column_width),
+                    "  ".join(
+                        str(count).rjust(len(label))
+                        for (label, _), count in zip(categories, counts)
+                    ),
+                ),
+            )
+
+    elif mode == ReportMode.Top:
+        for label, filenames in categories:
+            output_stream.write(f"{label} ({len(filenames)})\n")
+
+            for filename in filenames[:max_files]:
+                output_stream.write(f" - {filename}\n")
+
+            if len(filenames) > max_files:
+                output_stream.write(f" ... and {len(filenames) - max_files} more\n")
+
+    else:
+        assert False, mode  # pragma: no cover
+
+
+# ----------------------------------------------------------------------
+def CreateDirectoryRollup(
+    modifications: CopyToOutputDirResult,
+    output_dir: Path,
+) -> dict[str, list[int]]:
+    """
+    Count the modified files in each directory.
+
+    Args:
+        modifications (CopyToOutputDirResult): Modifications made to the output directory
+        output_dir (Path): Output directory
+
+    Returns:
+        dict[str, list[int]]: Counts of deleted, added, overwritten, and modified template files, keyed by posix directory relative to the output directory and sorted by directory
+    """
+
+    output_dir_path = PurePosixPath(output_dir.as_posix())
+
+    rollup: dict[str, list[int]] = {}
+    categories = _GetCategories(modifications)
+
+    for category_index, (_, filenames) in enumerate(categories):
+        for filename in filenames:
+            directory = PurePosixPath(filename).parent
+
+            if directory.is_relative_to(output_dir_path):
+                directory = directory.relative_to(output_dir_path)
+
+            counts = rollup.get(str(directory))
+            if counts is None:
+                counts = [0] * len(categories)
+                rollup[str(directory)] = counts
+
+            counts[category_index] += 1
+
+    return dict(sorted(rollup.items()))
+
+
+# ----------------------------------------------------------------------
+def WriteJsonReport(
+    modifications: CopyToOutputDirResult,
+    filename: Path,
+) -> None:
+    """
+    Write the modifications to a JSON file.
+
+    Args:
+        modifications (CopyToOutputDirResult): Modifications made to the output directory
+        filename (Path): Name of the file to write
+    """
+
+    filename.parent.mkdir(parents=True, exist_ok=True)
+
+    with filename.open("w") as f:
+        json.dump(
+            {
+                "deleted_files": modifications.deleted_files,
+                "added_files": modifications.added_files,
+                "overwritten_files": modifications.overwritten_files,
+                "modified_template_files": modifications.modified_template_files,
+            },
+            f,
+            indent=2,
+        )
+
+
+# ----------------------------------------------------------------------
+def WriteJUnitReport(
+    modifications: CopyToOutputDirResult,
+    filename: Path,
+) -> None:
+    """
+    Write the modifications to a JUnit XML file so that they can be displayed by CI systems; each category is
+    written as a test suite and each modified file is written as a test case within that suite.
+
+    Args:
+        modifications (CopyToOutputDirResult): Modifications made to the output directory
+        filename (Path): Name of the file to write
+    """
+
+    categories = _GetCategories(modifications)
+
+    root = ET.Element(
+        "testsuites",
+        name="PythonProjectBootstrapper",
+        tests=str(sum(len(filenames) for _, filenames in categories)),
+        failures="0",
+        errors="0",
+    )
+
+    for label, filenames in categories:
+        suite = ET.SubElement(
+            root,
+            "testsuite",
+            name=label,
+            tests=str(len(filenames)),
+            failures="0",
+            errors="0",
+        )
+
+        for modified_filename in filenames:
+            ET.SubElement(suite, "testcase", classname=label, name=modified_filename)
+
+    filename.parent.mkdir(parents=True, exist_ok=True)
+
+    ET.ElementTree(root).write(filename, encoding="utf-8", xml_declaration=True)
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _GetCategories(modifications: CopyToOutputDirResult) -> list[tuple[str, list[str]]]:
+    return [
+        ("Deleted Files", modifications.deleted_files),
+        ("Added Files", modifications.added_files),
+        ("Overwritten Files", modifications.overwritten_files),
+        ("Modified Template Files", modifications.modified_template_files),
+    ]
@@ -0,0 +1,74 @@
+# ----------------------------------------------------------------------
+# |
+# |  Copyright (c) 2024 Scientific Software Engineering Center at Georgia Tech
+# |  Distributed under the MIT License.
+# |
+# ----------------------------------------------------------------------
+"""Selection of the generated files that are rendered and applied to the output directory"""
+
+import fnmatch
+import re
+
+from dataclasses import dataclass
+from functools import cache
+from typing import Optional
+
+
+# ----------------------------------------------------------------------
+@dataclass(frozen=True)
+class PathSelection:
+    """
+    Glob patterns that restrict generation to a subset of the generated files.
+
+    Patterns are matched against posix paths relative to the output directory using `fnmatch` rules
+    (so "*" also matches "/"). A pattern that matches a directory matches all of the files within it.
+    """
+
+    # Only files that match at least one of these patterns are selected (all files are selected when empty)
+    only: tuple[str, ...] = ()
+
+    # Files that match any of these patterns are not selected
+    exclude: tuple[str, ...] = ()
+
+    # ----------------------------------------------------------------------
+    @classmethod
+    def Create(
+        cls,
+        only: Optional[list[str]] = None,
+        exclude: Optional[list[str]] = None,
+    ) -> Optional["PathSelection"]:
+        """Returns a selection or None if no patterns were provided (in which case, all files are selected)"""
+
+        if not only and not exclude:
+            return None
+
+        return cls(tuple(only or []), tuple(exclude or []))
+
+    # ----------------------------------------------------------------------
+    def IsSelected(self, relative_path: str) -> bool:
+        """Returns True if the file (a posix path relative to the output directory) is selected"""
+
+        if self.only and not _Matches(_CompilePatterns(self.only), relative_path):
+            return False
+
+        return not (self.exclude and _Matches(_CompilePatterns(self.exclude), relative_path))
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+@cache
+def _CompilePatterns(patterns: tuple[str, ...]) -> re.Pattern:
+    return re.compile("|".join(fnmatch.translate(pattern.strip("/")) for pattern in patterns))
+
+
+# ----------------------------------------------------------------------
+def _Matches(regex: re.Pattern, relative_path: str) -> bool:
+    # The path matches if it (or any of the directories that contain it) matches a pattern
+    while relative_path:
+        if regex.match(relative_path):
+            return True
+
+        relative_path = relative_path.rpartition("/")[0]
+
+    return False
@@ -0,0 +1,457 @@
+# ----------------------------------------------------------------------
+# |
+# |  Copyright (c) 2024 Scientific Software Engineering Center at Georgia Tech
+# |  Distributed under the MIT License.
+# |
+# ----------------------------------------------------------------------
+"""Pipelined execution of rendering, hashing, and applying generated content to an output directory"""
+
+import asyncio
+import os
+import shutil
+import threading
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Mapping, Optional
+
+from dbrownell_Common import PathEx
+
+from PythonProjectBootstrapper.CompactManifest import CompactManifest
+from PythonProjectBootstrapper.History import FileDelta
+from PythonProjectBootstrapper.Journal import ApplyJournal, RecoverJournal
+from PythonProjectBootstrapper.PathSelection import PathSelection
+from PythonProjectBootstrapper.ProjectGenerationUtils import (
+    ApplyGeneratedFile,
+    ConflictType,
+    CopyToOutputDirEvent,
+    CopyToOutputDirEventType,
+    CopyToOutputDirResult,
+    CreateDirectories,
+    GenerateFileHash,
+    GetCurrentFileHash,
+    KnownFileHash,
+    LoadExistingManifest,
+    MovePromptFile,
+    PromptForConflict,
+    prompt_filename,
+    RemoveTemplateFiles,
+    WriteHistoryAndManifest,
+)
+from PythonProjectBootstrapper.RepositoryLock import AcquireRepositoryLock
+
+
+@dataclass(frozen=True)
+class PipelineOptions:
+    """
+    Options that control how stages overlap in RenderAndCopyToOutputDir()
+    """
+
+    # Apply files while rendering is in progress. When False (for example, when a post-generation hook may modify
+    # rendered files), files in the output directory are hashed while rendering is in progress, but changes are
+    # only applied once rendering has completed.
+    apply_during_render: bool = True
+
+    # Maximum number of files hashed concurrently
+    hash_workers: int = 4
+
+    # Maximum number of files waiting in each queue
+    max_pending_files: int = 64
+
+
+# ----------------------------------------------------------------------
+def RenderAndCopyToOutputDir(
+    render: Callable[[Callable[[str, KnownFileHash], None]], Optional[str]],
+    src_dir: Path,
+    dest_dir: Path,
+    *,
+    on_conflict: Optional[Callable[[Path, ConflictType], bool]] = None,
+    on_event: Optional[Callable[[CopyToOutputDirEvent], None]] = None,
+    lock_timeout: Optional[float] = None,
+    path_selection: Optional[PathSelection] = None,
+    options: Optional[PipelineOptions] = None,
+    on_render_complete: Optional[Callable[[], None]] = None,
+    get_current_hashes: Optional[Callable[[], Mapping[str, KnownFileHash]]] = None,
+) -> CopyToOutputDirResult:
+    """
+    Variation of ProjectGenerationUtils.CopyToOutputDir() that renders content and applies it to the output directory in a pipeline.
+
+    Rendered files flow through bounded queues into stages that hash the generated file and the existing file in
+    the output directory, and then into a stage that resolves conflicts and applies the file. The stages run
+    concurrently within an asyncio event loop (rendering and file I/O are offloaded to threads), so files are
+    applied while rendering is still in progress and the overall duration approaches that of the slowest stage
+    rather than the sum of all stages. Rendering is paused when the hashing stage falls behind.
+
+    The output directory is modified in the same way as it is by ProjectGenerationUtils.CopyToOutputDir(),
+    although unchanged template files that are no longer generated are only removed once rendering has completed.
+
+    Args:
+        render (Callable[[Callable[[str, KnownFileHash], None]], Optional[str]]): Renders content into src_dir; it is invoked on a worker thread and calls the provided function with the absolute filename and known hash of each file once the file has been written; a file is reported again if its hash value is recalculated after it has been modified (for example, by a hook), and the most recent value is used. Returns the hash of the template configuration values (recorded in the generation history). Files that were not reported (for example, those created by hooks) are found once rendering completes.
+        src_dir (Path): path to source dir
+        dest_dir (Path): path to final output directory
+        on_conflict (Optional[Callable[[Path, ConflictType], bool]], optional): Called with the output filename when a conflict is detected; returns True to overwrite (or recreate) the file with the generated content. Defaults to None (the user is prompted on the terminal).
+        on_event (Optional[Callable[[CopyToOutputDirEvent], None]], optional): Called as each file is processed; `total_files` is the number of files found so far. Defaults to None.
+        lock_timeout (Optional[float], optional): Maximum number of seconds to wait for the output directory's lock; wait indefinitely when None. Defaults to None.
+        path_selection (Optional[PathSelection], optional): Only apply changes to the selected files; manifest entries for all other files are preserved. Defaults to None (all files are selected).
+        options (Optional[PipelineOptions], optional): Controls how the render, hash, and apply stages overlap. Defaults to None (default options).
+        on_render_complete (Optional[Callable[[], None]], optional): Called on the calling thread when rendering has completed. Defaults to None.
+        get_current_hashes (Optional[Callable[[], Mapping[str, KnownFileHash]]], optional): Invoked on a worker thread when rendering begins; returns hash values of files in dest_dir calculated earlier (see the `current_hashes` parameter of ProjectGenerationUtils.CopyToOutputDir()). Files in dest_dir are not hashed until the function returns. Defaults to None.
+
+    Returns:
+        CopyToOutputDirResult: data object containing a lists of files deleted, added, overwritten, and modified due to template changes
+    """
+
+    # Absolute (rather than resolved) paths are used, as rendered files are reported with absolute paths and
+    # rendering may change the working directory.
+    src_dir = Path(os.path.abspath(src_dir))
+    dest_dir = Path(os.path.abspath(dest_dir))
+
+    PathEx.EnsureDir(src_dir)
+    PathEx.EnsureDir(dest_dir)
+
+    with AcquireRepositoryLock(dest_dir, lock_timeout):
+        RecoverJournal(dest_dir)
+
+        journal = ApplyJournal.Begin(dest_dir)
+
+        try:
+            result = asyncio.run(
+                _RenderAndCopyToOutputDirImpl(
+                    render,
+                    src_dir,
+                    dest_dir,
+                    journal=journal,
+                    on_conflict=on_conflict or PromptForConflict,
+                    on_event=on_event,
+                    path_selection=path_selection,
+                    options=options or PipelineOptions(),
+                    on_render_complete=on_render_complete,
+                    get_current_hashes=get_current_hashes,
+                ),
+            )
+        except BaseException:
+            journal.Rollback()
+            raise
+
+        journal.Commit()
+
+    return result
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# The stages are closures so that they can share the state below without passing it between coroutines.
+async def _RenderAndCopyToOutputDirImpl(  # pylint: disable=too-many-locals,too-many-statements
+    render: Callable[[Callable[[str, KnownFileHash], None]], Optional[str]],
+    src_dir: Path,
+    dest_dir: Path,
+    *,
+    journal: ApplyJournal,
+    on_conflict: Callable[[Path, ConflictType], bool],
+    on_event: Optional[Callable[[CopyToOutputDirEvent], None]],
+    path_selection: Optional[PathSelection],
+    options: PipelineOptions,
+    on_render_complete: Optional[Callable[[], None]],
+    get_current_hashes: Optional[Callable[[], Mapping[str, KnownFileHash]]],
+) -> CopyToOutputDirResult:
+    loop = asyncio.get_running_loop()
+
+    existing_manifest, existing_digests = LoadExistingManifest(dest_dir)
+
+    # Rendered files (absolute filename and known hash) waiting to be hashed; files found once rendering has
+    # completed don't have a known hash, and None indicates that there are no more files.
+    rendered_files: asyncio.Queue[Optional[tuple[str, Optional[KnownFileHash]]]] = asyncio.Queue()
+
+    # The render thread acquires a slot before a file is queued and the slot is released once the file has been
+    # dequeued, so rendering is paused when the hashing stage falls behind.
+    rendered_slots = threading.Semaphore(options.max_pending_files)
+
+    # Hashed files (relative filename, known hash of the generated file, and hash of the file in the output
+    # directory) waiting to be applied; None indicates that a hashing worker has completed.
+    hashed_files: asyncio.Queue[Optional[tuple[str, KnownFileHash, Optional[str]]]] = asyncio.Queue(
+        options.max_pending_files
+    )
+
+    reported_files: set[str] = set()
+    updated_known_hashes: dict[str, KnownFileHash] = {}
+    render_complete = asyncio.Event()
+    is_cancelled = threading.Event()
+
+    context_hash: Optional[str] = None
+    num_files = 0
+
+    result_lists: dict[CopyToOutputDirEventType, list[str]] = {
+        CopyToOutputDirEventType.Deleted: [],
+        CopyToOutputDirEventType.Added: [],
+        CopyToOutputDirEventType.Overwritten: [],
+        CopyToOutputDirEventType.Modified: [],
+    }
+
+    generated_digests: list[tuple[str, bytes]] = []
+    manifest_hashes: dict[str, str] = {}
+    history_deltas: dict[str, FileDelta] = {}
+
+    # ----------------------------------------------------------------------
+    def OnEvent(event: CopyToOutputDirEvent) -> None:
+        if on_event is not None:
+            on_event(event)
+
+        result_list = result_lists.get(event.event_type)
+        if result_list is not None:
+            result_list.append(event.filename)
+
+    # ----------------------------------------------------------------------
+    def EnqueueRenderedFile(filename: str, known_hash: Optional[KnownFileHash]) -> None:
+        if filename in reported_files:
+            # The file was reported again once its hash value was recalculated
+            assert known_hash is not None
+
+            updated_known_hashes[filename] = known_hash
+            rendered_slots.release()
+            return
+
+        reported_files.add(filename)
+        rendered_files.put_nowait((filename, known_hash))
+
+    # ----------------------------------------------------------------------
+    def OnFileRendered(filename: str, known_hash: KnownFileHash) -> None:
+        # Called on the render thread
+        # The slot is released once the file has been dequeued rather than in a `with` block
+        while not rendered_slots.acquire(timeout=0.1):  # pylint: disable=consider-using-with
+            if is_cancelled.is_set():
+                raise Exception("Rendering was cancelled.")
+
+        loop.call_soon_threadsafe(EnqueueRenderedFile, filename, known_hash)
+
+    # ----------------------------------------------------------------------
+    async def RenderStage() -> None:
+        nonlocal context_hash
+
+        context_hash = await asyncio.to_thread(render, OnFileRendered)
+
+        # Files that weren't reported were copied without being rendered or were created by hooks
+        for filename in await asyncio.to_thread(_GetFilenames, src_dir):
+            if filename not in reported_files:
+                EnqueueRenderedFile(filename, None)
+
+        for _ in range(options.hash_workers):
+            rendered_files.put_nowait(None)
+
+        render_complete.set()
+
+        if on_render_complete is not None:
+            on_render_complete()
+
+    # ----------------------------------------------------------------------
+    async def HashStage() -> None:
+        nonlocal num_files
+
+        while True:
+            item = await rendered_files.get()
+            if item is None:
+                break
+
+            filename, known_hash = item
+
+            if known_hash is not None:
+                rendered_slots.release()
+
+            rel_filepath = PathEx.CreateRelativePath(src_dir, Path(filename)).as_posix()
+
+            if path_selection is not None and not path_selection.IsSelected(rel_filepath):
+                continue
+
+            num_files += 1
+
+            if known_hash is None:
+                known_hash = await asyncio.to_thread(_CreateKnownFileHash, Path(filename))
+
+            current_file_hash = await asyncio.to_thread(
+                GetCurrentFileHash,
+                dest_dir / rel_filepath,
+                (await current_hashes_task).get(rel_filepath),
+            )
+
+            await hashed_files.put((rel_filepath, known_hash, current_file_hash))
+
+        await hashed_files.put(None)
+
+    # ----------------------------------------------------------------------
+    async def ApplyFile(
+        rel_filepath: str,
+        known_hash: KnownFileHash,
+        current_file_hash: Optional[str],
+    ) -> None:
+        generated_filepath = src_dir / rel_filepath
+        known_hash = updated_known_hashes.get(str(generated_filepath), known_hash)
+
+        if known_hash.IsCurrent(generated_filepath):
+            generated_hash = known_hash.hash_value
+        elif generated_filepath.is_file():
+            # The file was modified after it was rendered (for example, by a hook)
+            generated_hash = await asyncio.to_thread(GenerateFileHash, generated_filepath)
+        else:
+            # The file was removed after it was rendered (for example, by a hook)
+            return
+
+        # ----------------------------------------------------------------------
+        def Apply() -> tuple[CopyToOutputDirEventType, int, str, Optional[FileDelta]]:
+            _CreateParentDirectories(dest_dir, rel_filepath, journal)
+
+            return ApplyGeneratedFile(
+                src_dir,
+                dest_dir,
+                rel_filepath,
+                generated_hash=generated_hash,
+                current_file_hash=current_file_hash,
+                existing_manifest=existing_manifest,
+                on_conflict=on_conflict,
+                journal=journal,
+            )
+
+        # ----------------------------------------------------------------------
+
+        event_type, num_bytes, manifest_hash, delta = await asyncio.to_thread(Apply)
+
+        generated_digests.append((rel_filepath, bytes.fromhex(generated_hash)))
+        manifest_hashes[rel_filepath] = manifest_hash
+
+        if delta is not None:
+            history_deltas[rel_filepath] = delta
+
+        OnEvent(
+            CopyToOutputDirEvent(
+                event_type,
+                (dest_dir / rel_filepath).as_posix(),
+                num_bytes,
+                num_files,
+            ),
+        )
+
+    # ----------------------------------------------------------------------
+    async def ApplyStage() -> None:
+        # Files hashed before rendering has completed are held here when they can't be applied yet
+        pending: list[tuple[str, KnownFileHash, Optional[str]]] = []
+        remaining_workers = options.hash_workers
+
+        while remaining_workers:
+            item = await hashed_files.get()
+            if item is None:
+                remaining_workers -= 1
+                continue
+
+            if not options.apply_during_render and not render_complete.is_set():
+                pending.append(item)
+                continue
+
+            for pending_item in pending:
+                await ApplyFile(*pending_item)
+
+            pending = []
+
+            await ApplyFile(*item)
+
+        for pending_item in pending:
+            await ApplyFile(*pending_item)
+
+    # ----------------------------------------------------------------------
+
+    current_hashes_task = asyncio.create_task(
+        asyncio.to_thread(get_current_hashes or dict),
+    )
+
+    tasks = [
+        current_hashes_task,
+        asyncio.create_task(RenderStage()),
+        *(asyncio.create_task(HashStage()) for _ in range(options.hash_workers)),
+        asyncio.create_task(ApplyStage()),
+    ]
+
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        # Unblock the render thread (if it is waiting for a slot) and stop the other stages
+        is_cancelled.set()
+
+        for task in tasks:
+            task.cancel()
+
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+    generated_manifest = CompactManifest.FromDigests(generated_digests)
+
+    unchanged_files_deleted = RemoveTemplateFiles(
+        generated_manifest,
+        existing_manifest,
+        existing_digests,
+        dest_dir,
+        journal=journal,
+        path_selection=path_selection,
+        current_hashes=current_hashes_task.result(),
+    )
+
+    for deleted_file in unchanged_files_deleted:
+        rel_filepath = PathEx.CreateRelativePath(dest_dir, Path(deleted_file)).as_posix()
+        history_deltas[rel_filepath] = FileDelta(existing_manifest[rel_filepath], None)
+
+        OnEvent(
+            CopyToOutputDirEvent(
+                CopyToOutputDirEventType.Deleted,
+                deleted_file,
+                0,
+                num_files + len(unchanged_files_deleted),
+            ),
+        )
+
+    merged_manifest = existing_manifest.Union(generated_manifest)
+
+    for rel_filepath, manifest_hash in manifest_hashes.items():
+        merged_manifest[rel_filepath] = manifest_hash
+
+    CreateDirectories(src_dir, dest_dir, generated_manifest, path_selection, journal)
+    MovePromptFile(src_dir, dest_dir, journal)
+    WriteHistoryAndManifest(dest_dir, journal, history_deltas, context_hash, merged_manifest)
+
+    shutil.rmtree(src_dir)
+
+    return CopyToOutputDirResult(
+        deleted_files=sorted(result_lists[CopyToOutputDirEventType.Deleted]),
+        added_files=sorted(result_lists[CopyToOutputDirEventType.Added]),
+        overwritten_files=sorted(result_lists[CopyToOutputDirEventType.Overwritten]),
+        modified_template_files=sorted(result_lists[CopyToOutputDirEventType.Modified]),
+    )
+
+
+# ----------------------------------------------------------------------
+def _CreateParentDirectories(dest_dir: Path, rel_filepath: str, journal: ApplyJournal) -> None:
+    parts = rel_filepath.split("/")[:-1]
+
+    for index in range(1, len(parts) + 1):
+        relative_directory = "/".join(parts[:index])
+
+        if not (dest_dir / relative_directory).is_dir():
+            journal.PrepareDirectory(relative_directory)
+            (dest_dir / relative_directory).mkdir()
+
+
+# ----------------------------------------------------------------------
+def _GetFilenames(root: Path) -> list[str]:
+    """Returns the absolute filenames of the files generated in the directory (excluding the prompts)"""
+
+    filenames: list[str] = []
+
+    for dirpath, _, files in os.walk(root):
+        for file in files:
+            if file == prompt_filename and Path(dirpath) == root:
+                continue
+
+            filenames.append(os.path.join(dirpath, file))
+
+    return filenames
+
+
+# ----------------------------------------------------------------------
+def _CreateKnownFileHash(filepath: Path) -> KnownFileHash:
+    return KnownFileHash.Create(filepath, GenerateFileHash(filepath=filepath))
@@ -0,0 +1,134 @@
+# ----------------------------------------------------------------------
+# |
+# |  Copyright (c) 2024 Scientific Software Engineering Center at Georgia Tech
+# |  Distributed under the MIT License.
+# |
+# ----------------------------------------------------------------------
+"""Work performed in the background while the user responds to interactive prompts"""
+
+import threading
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+from PythonProjectBootstrapper.ManifestVerification import CalculateCurrentHashes
+from PythonProjectBootstrapper.ProjectGenerationUtils import (
+    GetFileSystemTime,
+    KnownFileHash,
+    LoadManifest,
+    manifest_filename,
+)
+from PythonProjectBootstrapper.Rendering import RenderingBackend
+
+
+# ----------------------------------------------------------------------
+class Prefetch:
+    """
+    Work that can be performed as soon as the output directory is known, started on background threads so
+    that it overlaps with the time spent waiting for the user (the startup panel and the template's questions).
+
+    The files in the output directory that are named in its manifest are hashed (see `GetCurrentHashes`)
+    and the rendering backend is prepared (see `RenderingBackend.Prepare`). Failures are ignored, as the
+    work is performed again when its results are needed.
+
+    The worker threads prevent the process from exiting until their work is complete, so hashing must be
+    stopped with `Close` (or by using the object as a context manager) when the results will not be used.
+    """
+
+    # ----------------------------------------------------------------------
+    def __init__(
+        self,
+        project_dir: Path,
+        output_dir: Path,
+        rendering_backend: Optional[RenderingBackend] = None,
+    ):
+        """
+        Args:
+            project_dir (Path): Project template directory (the directory that contains `cookiecutter.json`)
+            output_dir (Path): Directory that will be populated
+            rendering_backend (Optional[RenderingBackend], optional): Backend to prepare; it must be the backend used to generate the project. Defaults to None.
+        """
+
+        executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="Prefetch")
+
+        self._cancel = threading.Event()
+
+        self._current_hashes: Future[dict[str, KnownFileHash]] = executor.submit(
+            _HashOutputDir, output_dir, self._cancel
+        )
+
+        if rendering_backend is not None:
+            executor.submit(rendering_backend.Prepare, project_dir)
+
+        # The submitted work continues in the background
+        executor.shutdown(wait=False)
+
+    # ----------------------------------------------------------------------
+    def __enter__(self) -> "Prefetch":
+        return self
+
+    # ----------------------------------------------------------------------
+    def __exit__(self, *args) -> None:
+        self.Close()
+
+    # ----------------------------------------------------------------------
+    def Close(self) -> None:
+        """Stop hashing files; this does not wait for the file being hashed to complete"""
+
+        self._cancel.set()
+
+    # ----------------------------------------------------------------------
+    def GetCurrentHashes(self) -> dict[str, KnownFileHash]:
+        """
+        Returns the hash values of the files in the output directory that are named in its manifest, keyed
+        by relative path (see the `current_hashes` parameter of ProjectGenerationUtils.CopyToOutputDir());
+        waits for hashing to complete if necessary. Only the files hashed before `Close` was called are
+        included.
+        """
+
+        try:
+            return self._current_hashes.result()
+        except Exception:  # pylint: disable=broad-except
+            return {}
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _HashOutputDir(output_dir: Path, cancel: threading.Event) -> dict[str, KnownFileHash]:
+    manifest_filepath = output_dir / manifest_filename
+    if not manifest_filepath.is_file():
+        return {}
+
+    # File system timestamps are coarser than (and may lag) the system clock, so the current time is determined
+    # by the file system itself
+    start_time_ns = GetFileSystemTime(output_dir)
+
+    # Stat information is captured before the files are hashed, so that files modified while they are being
+    # hashed (or while the user responds to prompts) are hashed again when the values are consumed.
+    statuses = {}
+
+    for relative_path in LoadManifest(manifest_filepath):
+        try:
+            status = (output_dir / relative_path).stat()
+        except OSError:
+            continue
+
+        # Files modified during (or after) the timestamp tick in which hashing began are not trusted, as they
+        # may be modified again without a change in their modification time.
+        if status.st_mtime_ns < start_time_ns:
+            statuses[relative_path] = status
+
+    # Tracked files that git reports as clean aren't hashed again, even if their stat information has changed
+    current_hashes = CalculateCurrentHashes(
+        output_dir, list(statuses), use_git_index=True, cancel=cancel
+    )
+
+    return {
+        relative_path: KnownFileHash(
+            hash_value, statuses[relative_path].st_size, statuses[relative_path].st_mtime_ns
+        )
+        for relative_path, hash_value in current_hashes.items()
+        if hash_value is not None
+    }
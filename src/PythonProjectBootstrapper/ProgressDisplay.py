@@ -0,0 +1,110 @@
+# ----------------------------------------------------------------------
+# |
+# |  Copyright (c) 2024 Scientific Software Engineering Center at Georgia Tech
+# |  Distributed under the MIT License.
+# |
+# ----------------------------------------------------------------------
+"""Progress output displayed while generated content is applied to an output directory"""
+
+import json
+import sys
+
+from pathlib import Path
+from typing import Callable
+
+from PythonProjectBootstrapper.ProjectGenerationUtils import ConflictType, CopyToOutputDirEvent
+
+
+# ----------------------------------------------------------------------
+class CopyProgressDisplay:
+    """
+    Displays a progress bar while the events generated by CopyToOutputDir() are processed.
+
+    Use as a context manager and provide `OnEvent` and `WrapConflictCallback(...)` to CopyToOutputDir(); the progress
+    bar is hidden while conflicts are resolved so that it doesn't interfere with prompts.
+    """
+
+    # ----------------------------------------------------------------------
+    def __init__(self) -> None:
+        # rich is imported lazily, as it is only needed when displaying content interactively
+        from rich.progress import (
+            BarColumn,
+            MofNCompleteColumn,
+            Progress,
+            TextColumn,
+            TimeElapsedColumn,
+        )
+
+        self._progress = Progress(
+            TextColumn("Applying changes"),
+            BarColumn(),
+            MofNCompleteColumn(),
+            TextColumn("{task.fields[bytes_written]}"),
+            TimeElapsedColumn(),
+            transient=True,
+        )
+
+        self._task_id = self._progress.add_task("", total=None, bytes_written="")
+        self._bytes_written = 0
+
+    # ----------------------------------------------------------------------
+    def __enter__(self) -> "CopyProgressDisplay":
+        self._progress.start()
+        return self
+
+    # ----------------------------------------------------------------------
+    def __exit__(self, *args) -> None:
+        self._progress.stop()
+
+    # ----------------------------------------------------------------------
+    def OnEvent(self, event: CopyToOutputDirEvent) -> None:
+        from rich import filesize
+
+        self._bytes_written += event.num_bytes
+
+        self._progress.update(
+            self._task_id,
+            total=event.total_files,
+            advance=1,
+            bytes_written=filesize.decimal(self._bytes_written),
+        )
+
+    # ----------------------------------------------------------------------
+    def WrapConflictCallback(
+        self,
+        on_conflict: Callable[[Path, ConflictType], bool],
+    ) -> Callable[[Path, ConflictType], bool]:
+        # ----------------------------------------------------------------------
+        def Impl(output_filename: Path, conflict_type: ConflictType) -> bool:
+            self._progress.stop()
+
+            try:
+                return on_conflict(output_filename, conflict_type)
+            finally:
+                self._progress.start()
+
+        # ----------------------------------------------------------------------
+
+        return Impl
+
+
+# ----------------------------------------------------------------------
+def WriteEventJsonLine(event: CopyToOutputDirEvent) -> None:
+    """
+    Write an event generated by CopyToOutputDir() to stdout as a single line of JSON
+
+    Args:
+        event (CopyToOutputDirEvent): The event to write
+    """
+
+    sys.stdout.write(
+        json.dumps(
+            {
+                "event": event.event_type.value,
+                "filename": event.filename,
+                "bytes": event.num_bytes,
+            },
+        ),
+    )
+    sys.stdout.write("\n")
+    sys.stdout.flush()
@@ -7,20 +7,33 @@
 """Util functions used during project generation"""
 
 from dataclasses import dataclass, field
+from enum import Enum
 import hashlib
 import itertools
 import os
+import re
 from stat import S_IWUSR
 import sys
+import tempfile
 from pathlib import Path
+from typing import Callable, Iterator, Mapping, Optional
 
-from rich import print  # pylint: disable=redefined-builtin
-from rich.panel import Panel
-from rich.text import Text
 import yaml
 
 from dbrownell_Common import PathEx
 from PythonProjectBootstrapper import __version__
+from PythonProjectBootstrapper.CompactManifest import CompactManifest
+from PythonProjectBootstrapper.DirectoryDigests import CalculateDirectoryDigests, root_directory_key
+from PythonProjectBootstrapper.History import (
+    AppendHistoryEntry,
+    FileDelta,
+    GetHistoryFilename,
+    HistoryEntry,
+    history_filename,
+)
+from PythonProjectBootstrapper.Journal import ApplyJournal, RecoverJournal
+from PythonProjectBootstrapper.PathSelection import PathSelection
+from PythonProjectBootstrapper.RepositoryLock import AcquireRepositoryLock
 
 # The following imports are used in cookiecutter hooks. Import them here to
 # ensure that they are frozen when creating binaries,
@@ -32,6 +45,14 @@ import textwrap  # pylint: disable=unused-import, wrong-import-order
 # the variable due to how cookiecutter changes the working directory for the post-gen hook
 prompt_filename: str = "prompt_text.yml"
 
+# Name of the file (written to the root of the output directory) that contains the hash values of all generated files
+manifest_filename: str = ".python_project_bootstrapper_manifest.yml"
+
+# Matches manifest lines that don't require a yaml parser; yaml.dump quotes any value that would not be parsed as a string
+_simple_manifest_line_regex = re.compile(
+    r"^(?P<path>[A-Za-z0-9_.][A-Za-z0-9_./ -]*?): (?P<hash>[0-9a-f]+)$"
+)
+
 
 @dataclass(frozen=True)
 class CopyToOutputDirResult:
@@ -45,6 +66,106 @@ class CopyToOutputDirResult:
     modified_template_files: list[str] = field(default_factory=list)
 
 
+class CopyToOutputDirEventType(str, Enum):
+    """
+    Ways in which a file can be processed by CopyToOutputDir()
+    """
+
+    # The file did not exist in the output directory (or was recreated)
+    Added = "added"
+
+    # The file is no longer generated and was not modified by the user, so it was removed
+    Deleted = "deleted"
+
+    # The file was modified by the user and their changes were overwritten
+    Overwritten = "overwritten"
+
+    # The generated content changed and the file was not modified by the user
+    Modified = "modified"
+
+    # The file was modified or deleted by the user and their changes were kept
+    Skipped = "skipped"
+
+    # The generated content is the same as the file's content
+    Unchanged = "unchanged"
+
+    # The file was not previously generated but already existed in the output directory
+    Replaced = "replaced"
+
+
+@dataclass(frozen=True)
+class CopyToOutputDirEvent:
+    """
+    Information about a file processed by CopyToOutputDir()
+    """
+
+    event_type: CopyToOutputDirEventType
+    filename: str
+
+    # Number of bytes written to the output directory for the file
+    num_bytes: int
+
+    # Total number of events generated during the operation
+    total_files: int
+
+
+class ConflictType(str, Enum):
+    """
+    Types of conflicts between generated content and user changes encountered by CopyToOutputDir()
+    """
+
+    # The user modified a previously generated file and the generated content is different
+    Modified = "modified"
+
+    # The user deleted a previously generated file
+    Deleted = "deleted"
+
+
+@dataclass(frozen=True)
+class KnownFileHash:
+    """
+    Hash value calculated while a file was being written, along with the file's size and modification time at that point.
+    The hash value can be reused as long as the file's size and modification time have not changed.
+
+    A file modified within the same modification time tick as it was written (for example, by a hook on a file system
+    with coarse timestamps) may not have a different modification time; writers that allow such modifications compare
+    `mtime_ns` to `GetFileSystemTime()` before the modifications are made and recalculate values that are not older.
+    """
+
+    hash_value: str
+    size: int
+    mtime_ns: int
+
+    # ----------------------------------------------------------------------
+    @classmethod
+    def Create(cls, filepath: Path, hash_value: str) -> "KnownFileHash":
+        status = filepath.stat()
+        return cls(hash_value, status.st_size, status.st_mtime_ns)
+
+    # ----------------------------------------------------------------------
+    def IsCurrent(self, filepath: Path) -> bool:
+        """Returns True if the file has not been modified since the hash value was calculated"""
+
+        try:
+            status = filepath.stat()
+        except OSError:
+            return False
+
+        return status.st_size == self.size and status.st_mtime_ns == self.mtime_ns
+
+
+# ----------------------------------------------------------------------
+def GetFileSystemTime(directory: Path) -> int:
+    """
+    Returns the current time (in nanoseconds) as recorded in the modification time of a file created in the directory.
+    The value has the granularity of the file system's timestamps (which may be as coarse as 2 seconds), so files with
+    a modification time at or after it may be modified again without a change in their modification time.
+    """
+
+    with tempfile.TemporaryFile(dir=directory) as f:
+        return os.fstat(f.fileno()).st_mtime_ns
+
+
 # ----------------------------------------------------------------------
 def GenerateFileHash(filepath: Path, hash_fn="sha256") -> str:
     """
@@ -78,18 +199,25 @@ def GenerateFileHash(filepath: Path, hash_fn="sha256") -> str:
 
 
 # ----------------------------------------------------------------------
-def CreateManifest(generated_dir: Path) -> dict[str, str]:
+def CreateManifest(
+    generated_dir: Path,
+    known_hashes: Optional[dict[str, KnownFileHash]] = None,
+    path_selection: Optional[PathSelection] = None,
+) -> CompactManifest:
     """
-    Create manifest dictionary for a given path. Note the values in the returned dictionary represent the hash value of the file when it was originally generated or last overwritten by a project generation.
+    Create manifest for a given path. Note the values in the returned dictionary represent the hash value of the file when it was originally generated or last overwritten by a project generation.
     These values will not necessarily reflect the hash of the current state of the file (for example if a user modifies a file but does not want to overwrite their changes)
 
     Args:
         generated_dir (Path): Path to create manifest of
+        known_hashes (Optional[dict[str, KnownFileHash]], optional): Hash values calculated when the files were written, keyed by absolute filename.
+                    Files whose known hash value is still current are not read again. Defaults to None.
+        path_selection (Optional[PathSelection], optional): Only include (and hash) the selected files. Defaults to None (all files are included).
 
     Returns:
-        dict[str, str]: Dictionary mapping filepaths as strings to hash values representing the file contents
+        CompactManifest: Mapping of filepaths as strings to hash values representing the file contents
     """
-    manifest_dict: dict[str, str] = {}
+    digests: list[tuple[str, bytes]] = []
 
     for root, _, files in os.walk(generated_dir):
         root_path = Path(root)
@@ -97,9 +225,157 @@ def CreateManifest(generated_dir: Path) -> dict[str, str]:
         for file in files:
             full_path = root_path / Path(file)
             rel_path = PathEx.CreateRelativePath(generated_dir, full_path)
-            manifest_dict[rel_path.as_posix()] = GenerateFileHash(filepath=full_path)
 
-    return manifest_dict
+            if path_selection is not None and not path_selection.IsSelected(rel_path.as_posix()):
+                continue
+
+            known_hash = known_hashes.get(os.path.abspath(full_path)) if known_hashes else None
+
+            if known_hash is not None and known_hash.IsCurrent(full_path):
+                hash_value = known_hash.hash_value
+            else:
+                hash_value = GenerateFileHash(filepath=full_path)
+
+            digests.append((rel_path.as_posix(), bytes.fromhex(hash_value)))
+
+    return CompactManifest.FromDigests(digests)
+
+
+# ----------------------------------------------------------------------
+def LoadManifest(manifest_filepath: Path) -> dict[str, str]:
+    """
+    Load a manifest previously written by CopyToOutputDir()
+
+    Args:
+        manifest_filepath (Path): Filepath to manifest file
+
+    Returns:
+        dict[str, str]: Dictionary mapping filepaths as strings to hash values representing the file contents
+    """
+
+    return LoadManifestWithDigests(manifest_filepath)[0]
+
+
+# ----------------------------------------------------------------------
+def LoadManifestWithDigests(manifest_filepath: Path) -> tuple[dict[str, str], dict[str, str]]:
+    """
+    Load a manifest previously written by CopyToOutputDir() along with its directory digests (see
+    DirectoryDigests.CalculateDirectoryDigests()). The digests are calculated rather than read, as the manifest is
+    committed and the digests in it are stale if a merge conflict is resolved by hand (or if it is from an earlier version).
+
+    Args:
+        manifest_filepath (Path): Filepath to manifest file
+
+    Returns:
+        tuple[dict[str, str], dict[str, str]]: Hash values keyed by file path and digests keyed by directory path
+    """
+
+    manifest = dict(_IterManifestEntries(manifest_filepath))
+
+    return manifest, CalculateDirectoryDigests(manifest)
+
+
+# ----------------------------------------------------------------------
+def _IterManifestEntries(manifest_filepath: Path) -> Iterator[tuple[str, str]]:
+    """Yields the path and hash value of each file in a manifest"""
+
+    PathEx.EnsureFile(manifest_filepath)
+
+    with open(manifest_filepath, "r") as manifest_file:
+        content = manifest_file.read()
+
+    num_entries = 0
+
+    # Manifests written by yaml.dump are (almost always) a series of unquoted "<path>: <hash>" lines, which can be parsed
+    # much more quickly than a general yaml document can be. Fall back to the yaml parser for anything else.
+    for line in content.splitlines():
+        if not line or line.startswith("#"):
+            continue
+
+        match = _simple_manifest_line_regex.match(line)
+        if match is None:
+            # The entries that have already been parsed are skipped (yaml preserves their order)
+            yaml_content = yaml.load(content, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+            entries = itertools.islice((yaml_content or {}).items(), num_entries, None)
+        else:
+            entries = ((match.group("path"), match.group("hash")),)
+            num_entries += 1
+
+        for path, hash_value in entries:
+            # Directory digests are calculated when the manifest is loaded
+            if path.endswith("/"):
+                continue
+
+            # Removing <prompt_filename> for backward compatibility; previous iterations of PythonProjectBootstrapper saved it
+            # in the manifest even though it was removed from the output directory, so it would be listed as removed.
+            if path != prompt_filename:
+                yield path, hash_value
+
+        if match is None:
+            return
+
+
+# ----------------------------------------------------------------------
+def WriteManifest(manifest_filepath: Path, manifest: Mapping[str, str]) -> None:
+    """
+    Atomically write a manifest; the content is written to a temporary file that replaces the manifest once it has
+    been flushed to disk, so readers never see a partially written manifest. The manifest is read-only once written.
+
+    The digest of each directory (see DirectoryDigests.CalculateDirectoryDigests()) is written along with the hash value of each file.
+
+    Args:
+        manifest_filepath (Path): Filepath to manifest file
+        manifest (Mapping[str, str]): Hash values keyed by posix path relative to the manifest's directory
+    """
+
+    yaml_comments = textwrap.dedent(
+        """\
+        #############################################################################################################
+        # This file is used by PythonProjectBootstrapper (https://github.com/gt-sse-center/PythonProjectBootstrapper)
+        # to determine whether changes have been made to any files in the project. These values are saved in case the
+        # project is regenerated so we can avoid overwriting any user changes. Please do not change the contents :)
+        #############################################################################################################
+
+        """,
+    )
+
+    temp_filepath = manifest_filepath.with_name(
+        "{}.{}.tmp".format(manifest_filepath.name, os.getpid())
+    )
+
+    try:
+        with open(temp_filepath, "w") as manifest_file:
+            manifest_file.write(yaml_comments)
+            content = dict(manifest.items())
+            content.update(CalculateDirectoryDigests(manifest))
+
+            yaml.dump(content, manifest_file)
+
+            manifest_file.flush()
+            os.fsync(manifest_file.fileno())
+
+        _ChangeManifestWritePermissions(manifest_filepath=temp_filepath, read_only=True)
+
+        # Read-only files can't be replaced on Windows
+        if os.name == "nt" and manifest_filepath.is_file():
+            _ChangeManifestWritePermissions(manifest_filepath=manifest_filepath, read_only=False)
+
+        os.replace(temp_filepath, manifest_filepath)
+
+    except BaseException:
+        if temp_filepath.is_file():
+            _ChangeManifestWritePermissions(manifest_filepath=temp_filepath, read_only=False)
+            temp_filepath.unlink()
+
+        raise
+
+    # Persist the rename itself (directories can't be opened on Windows)
+    if os.name != "nt":
+        dir_fd = os.open(manifest_filepath.parent, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
 
 
 # ----------------------------------------------------------------------
@@ -124,26 +400,30 @@ def _ChangeManifestWritePermissions(manifest_filepath: Path, read_only: bool) ->
 
 # ----------------------------------------------------------------------
 def ConditionallyRemoveUnchangedTemplateFiles(
-    new_manifest_dict: dict[str, str],
-    existing_manifest_dict: dict[str, str],
+    new_manifest_dict: Mapping[str, str],
+    existing_manifest_dict: Mapping[str, str],
     output_dir: Path,
+    journal: Optional[ApplyJournal] = None,
+    current_hashes: Optional[Mapping[str, KnownFileHash]] = None,
 ) -> list[str]:
     """
     Remove any template files no longer being generated as long as the file was never modified by the user.
 
     Args:
-        new_manifest_dict (dict[str, str]): Manifest dictionary created that reflects contents on the newly generated cookiecutter project
-        existing_manifest_dict (dict[str, str]): Manifest dictionary that reflects contents of the final output directory
+        new_manifest_dict (Mapping[str, str]): Manifest dictionary created that reflects contents on the newly generated cookiecutter project
+        existing_manifest_dict (Mapping[str, str]): Manifest dictionary that reflects contents of the final output directory
         output_dir (Path): output directory path
+        journal (Optional[ApplyJournal], optional): Journal that records the removed files so that they can be restored. Defaults to None.
+        current_hashes (Optional[Mapping[str, KnownFileHash]], optional): Hash values of files in output_dir calculated earlier, keyed by relative path; a value is only used if the file has not been modified since it was hashed. Defaults to None.
 
     Returns:
         list[str]: Sorted list of file paths that were removed
     """
 
     # files no longer in template
-    removed_template_files: set[str] = set(existing_manifest_dict.keys()) - set(
-        new_manifest_dict.keys()
-    )
+    removed_template_files: list[str] = CompactManifest.FromMapping(
+        existing_manifest_dict
+    ).Difference(CompactManifest.FromMapping(new_manifest_dict))
 
     deleted_files: list[str] = []
 
@@ -153,13 +433,21 @@ def ConditionallyRemoveUnchangedTemplateFiles(
     for removed_file_rel_path in removed_template_files:
         removed_full_path = output_dir / removed_file_rel_path
 
-        if removed_full_path.is_file():
-            current_hash = GenerateFileHash(filepath=removed_full_path)
+        current_hash = GetCurrentFileHash(
+            removed_full_path,
+            current_hashes.get(removed_file_rel_path) if current_hashes is not None else None,
+        )
+
+        if current_hash is not None:
             original_hash = existing_manifest_dict[removed_file_rel_path]
 
             if current_hash == original_hash:
                 deleted_files.append(removed_full_path.as_posix())
-                removed_full_path.unlink()
+
+                if journal is None:
+                    removed_full_path.unlink()
+                else:
+                    journal.RemoveFile(removed_file_rel_path)
 
     return sorted(deleted_files)
 
@@ -168,6 +456,14 @@ def ConditionallyRemoveUnchangedTemplateFiles(
 def CopyToOutputDir(
     src_dir: Path,
     dest_dir: Path,
+    *,
+    known_hashes: Optional[dict[str, KnownFileHash]] = None,
+    on_conflict: Optional[Callable[[Path, ConflictType], bool]] = None,
+    on_event: Optional[Callable[[CopyToOutputDirEvent], None]] = None,
+    lock_timeout: Optional[float] = None,
+    context_hash: Optional[str] = None,
+    path_selection: Optional[PathSelection] = None,
+    current_hashes: Optional[Mapping[str, KnownFileHash]] = None,
 ) -> CopyToOutputDirResult:
     """
     Copy contents to output directory following the following rules:
@@ -180,196 +476,466 @@ def CopyToOutputDir(
     Args:
         src_dir (Path): path to source dir
         dest_dir (Path): path to final output directory
+        known_hashes (Optional[dict[str, KnownFileHash]], optional): Hash values calculated when the files in src_dir were generated. Defaults to None.
+        on_conflict (Optional[Callable[[Path, ConflictType], bool]], optional): Called with the output filename when a conflict is detected; returns True to overwrite (or recreate) the file with the generated content. Defaults to None (the user is prompted on the terminal).
+        on_event (Optional[Callable[[CopyToOutputDirEvent], None]], optional): Called as each file is processed. Defaults to None.
+        lock_timeout (Optional[float], optional): Maximum number of seconds to wait for the output directory's lock; wait indefinitely when None. Defaults to None.
+        context_hash (Optional[str], optional): Hash of the template configuration values, recorded in the generation history. Defaults to None.
+        path_selection (Optional[PathSelection], optional): Only apply changes to the selected files; manifest entries for all other files are preserved. Defaults to None (all files are selected).
+        current_hashes (Optional[Mapping[str, KnownFileHash]], optional): Hash values of files in dest_dir calculated earlier (for example, while the user was responding to prompts), keyed by relative path; a value is only used if the file has not been modified since it was hashed. Defaults to None.
 
     Returns:
         CopyToOutputDir: data object containing a lists of files deleted, added, overwritten, and modified due to template changes
     """
 
+    result_lists: dict[CopyToOutputDirEventType, list[str]] = {
+        CopyToOutputDirEventType.Deleted: [],
+        CopyToOutputDirEventType.Added: [],
+        CopyToOutputDirEventType.Overwritten: [],
+        CopyToOutputDirEventType.Modified: [],
+    }
+
+    for event in CopyToOutputDirEvents(
+        src_dir,
+        dest_dir,
+        known_hashes=known_hashes,
+        on_conflict=on_conflict,
+        lock_timeout=lock_timeout,
+        context_hash=context_hash,
+        path_selection=path_selection,
+        current_hashes=current_hashes,
+    ):
+        if on_event is not None:
+            on_event(event)
+
+        result_list = result_lists.get(event.event_type)
+        if result_list is not None:
+            result_list.append(event.filename)
+
+    return CopyToOutputDirResult(
+        deleted_files=sorted(result_lists[CopyToOutputDirEventType.Deleted]),
+        added_files=sorted(result_lists[CopyToOutputDirEventType.Added]),
+        overwritten_files=sorted(result_lists[CopyToOutputDirEventType.Overwritten]),
+        modified_template_files=sorted(result_lists[CopyToOutputDirEventType.Modified]),
+    )
+
+
+# ----------------------------------------------------------------------
+def CopyToOutputDirEvents(
+    src_dir: Path,
+    dest_dir: Path,
+    *,
+    known_hashes: Optional[dict[str, KnownFileHash]] = None,
+    on_conflict: Optional[Callable[[Path, ConflictType], bool]] = None,
+    lock_timeout: Optional[float] = None,
+    context_hash: Optional[str] = None,
+    path_selection: Optional[PathSelection] = None,
+    current_hashes: Optional[Mapping[str, KnownFileHash]] = None,
+) -> Iterator[CopyToOutputDirEvent]:
+    """
+    Variation of CopyToOutputDir() that yields an event as each file is processed. Files are copied to the output
+    directory as they are processed and the manifest is written once all files have been processed, so the
+    operation must be iterated to completion.
+
+    The output directory's lock (see RepositoryLock.py) is held from the time that the existing manifest is read
+    until the updated manifest is written, so concurrent invocations targeting the same directory are serialized.
+    Changes are recorded in a journal (see Journal.py) and rolled back if the operation is interrupted; changes
+    from a previously interrupted operation (for example, when the process was killed) are rolled back before
+    any new changes are applied. The files written and removed are appended to the generation history (see
+    History.py) and the manifest is written last.
+
+    Args:
+        src_dir (Path): path to source dir
+        dest_dir (Path): path to final output directory
+        known_hashes (Optional[dict[str, KnownFileHash]], optional): Hash values calculated when the files in src_dir were generated. Defaults to None.
+        on_conflict (Optional[Callable[[Path, ConflictType], bool]], optional): Called with the output filename when a conflict is detected; returns True to overwrite (or recreate) the file with the generated content. Defaults to None (the user is prompted on the terminal).
+        lock_timeout (Optional[float], optional): Maximum number of seconds to wait for the output directory's lock; wait indefinitely when None. Defaults to None.
+        context_hash (Optional[str], optional): Hash of the template configuration values, recorded in the generation history. Defaults to None.
+        path_selection (Optional[PathSelection], optional): Only apply changes to the selected files; manifest entries for all other files are preserved. Defaults to None (all files are selected).
+        current_hashes (Optional[Mapping[str, KnownFileHash]], optional): Hash values of files in dest_dir calculated earlier (for example, while the user was responding to prompts), keyed by relative path; a value is only used if the file has not been modified since it was hashed. Defaults to None.
+
+    Yields:
+        CopyToOutputDirEvent: Information about the processed file
+    """
+
     PathEx.EnsureDir(src_dir)
     PathEx.EnsureDir(dest_dir)
 
-    prompt_file = src_dir / prompt_filename
-    if prompt_file.is_file():
-        dest_filename = dest_dir / prompt_filename
+    with AcquireRepositoryLock(dest_dir, lock_timeout):
+        RecoverJournal(dest_dir)
 
-        if dest_filename.is_file():
-            dest_filename.unlink()
+        journal = ApplyJournal.Begin(dest_dir)
 
-        shutil.move(prompt_file, dest_dir)
-        PathEx.EnsureFile(dest_filename)
+        try:
+            yield from _CopyToOutputDirEventsImpl(
+                src_dir,
+                dest_dir,
+                known_hashes=known_hashes,
+                on_conflict=on_conflict,
+                journal=journal,
+                context_hash=context_hash,
+                path_selection=path_selection,
+                current_hashes=current_hashes or {},
+            )
+        except BaseException:
+            journal.Rollback()
+            raise
 
-    # existing_manifest will be populated/updated as necessary and saved
-    generated_manifest: dict[str, str] = CreateManifest(src_dir)
-    existing_manifest: dict[str, str] = {}
+        journal.Commit()
 
-    overwritten_files: list[str] = []
-    added_files: list[str] = []
-    modified_template_files: list[str] = []
-    unchanged_files_deleted: list[str] = []
 
-    potential_manifest: Path = dest_dir / ".python_project_bootstrapper_manifest.yml"
+# ----------------------------------------------------------------------
+def _CopyToOutputDirEventsImpl(
+    src_dir: Path,
+    dest_dir: Path,
+    *,
+    known_hashes: Optional[dict[str, KnownFileHash]],
+    on_conflict: Optional[Callable[[Path, ConflictType], bool]],
+    journal: ApplyJournal,
+    context_hash: Optional[str],
+    path_selection: Optional[PathSelection],
+    current_hashes: Mapping[str, KnownFileHash],
+) -> Iterator[CopyToOutputDirEvent]:
+    on_conflict = on_conflict or PromptForConflict
+
+    MovePromptFile(src_dir, dest_dir, journal)
+
+    # existing_manifest will be populated/updated as necessary and saved
+    generated_manifest = CreateManifest(src_dir, known_hashes, path_selection)
+    existing_manifest, existing_digests = LoadExistingManifest(dest_dir)
 
     # if this is not our first time generating, remove unwanted template files
-    if potential_manifest.is_file():
-        with open(potential_manifest, "r") as existing_manifest_file:
-            existing_manifest = yaml.load(existing_manifest_file, Loader=yaml.Loader)
-
-        # Removing <prompt_filename> from the manifest for backward compatibility.
-        # Previous iterations of PythonProjectBootstrapper saved "<prompt_filename>"" in the manifest file when it should not have been there
-        # (the manifest was created using the contents of the temporary directory and "<prompt_filename>"" was there but was removed from the output directory)
-        # This results in "<prompt_filename>" being listed as a removed file since it exists in the manifest but not in the output directory
-        if prompt_filename in existing_manifest.keys():
-            del existing_manifest[prompt_filename]
-
-        unchanged_files_deleted = ConditionallyRemoveUnchangedTemplateFiles(
-            new_manifest_dict=generated_manifest,
-            existing_manifest_dict=existing_manifest,
-            output_dir=dest_dir,
-        )
+    unchanged_files_deleted = RemoveTemplateFiles(
+        generated_manifest,
+        existing_manifest,
+        existing_digests,
+        dest_dir,
+        journal=journal,
+        path_selection=path_selection,
+        current_hashes=current_hashes,
+    )
+
+    total_files = len(unchanged_files_deleted) + len(generated_manifest)
+
+    # Changes recorded in the generation history
+    history_deltas: dict[str, FileDelta] = {}
+
+    for deleted_file in unchanged_files_deleted:
+        rel_filepath = PathEx.CreateRelativePath(dest_dir, Path(deleted_file)).as_posix()
+        history_deltas[rel_filepath] = FileDelta(existing_manifest[rel_filepath], None)
 
-    merged_manifest = dict(existing_manifest)
-    merged_manifest.update(generated_manifest)
+        yield CopyToOutputDirEvent(CopyToOutputDirEventType.Deleted, deleted_file, 0, total_files)
+
+    merged_manifest = existing_manifest.Union(generated_manifest)
+
+    CreateDirectories(src_dir, dest_dir, generated_manifest, path_selection, journal)
 
     # Ask user if they would like to overwrite their changes if any conflicts detected
     for rel_filepath, generated_hash in generated_manifest.items():
         output_dir_filepath: Path = dest_dir / rel_filepath
 
-        if output_dir_filepath.is_file():
-            current_file_hash: str = GenerateFileHash(filepath=output_dir_filepath)
-
-            # Changes detected in file and file modified by user (changes do not stem only from changes in the contents of the template file)
-            if rel_filepath in existing_manifest.keys() and current_file_hash not in (
-                generated_hash,
-                existing_manifest[rel_filepath],
-            ):
-                while True:
-                    sys.stdout.write(
-                        f"\nWould you like to overwrite your changes in {str(output_dir_filepath)}? [yes/no]: "
-                    )
-                    overwrite = input().strip().lower()
-
-                    if overwrite in ["yes", "y"]:
-                        overwritten_files.append(output_dir_filepath.as_posix())
-                        break
-
-                    # Here, we are copying the file from the output directory to the temporary directory in the case that the user answers "no"
-                    # to whether or not they would like to overwrite their changes. This implementation builds the final directory in the temporary directory then copies everything over.
-                    # This makes it much easier to copy over generated files since we do not need to case on whether we are copying over a directory or a file
-
-                    if overwrite in ["no", "n"]:
-                        merged_manifest[rel_filepath] = existing_manifest[rel_filepath]
-                        shutil.copy2(output_dir_filepath, src_dir / rel_filepath)
-                        break
-
-            # Looking at a template file, contents this generation are different, and contents were untouched by user
-            elif rel_filepath in existing_manifest.keys() and (
-                current_file_hash != generated_hash
-                and current_file_hash == existing_manifest[rel_filepath]
-            ):
-                modified_template_files.append(output_dir_filepath.as_posix())
-        elif rel_filepath in existing_manifest:
-            # If here, the file no longer exists. We still want the file to exist in the manifest
-            # (so that future generations are still aware of it), but do not want it to be created
-            # again.
-            merged_manifest[rel_filepath] = generated_hash
-
-            while True:
-                sys.stdout.write(
-                    f"\nWould you like to recreate {str(output_dir_filepath)}? [yes/no]: "
-                )
-                recreate = input().strip().lower()
-
-                if recreate in ["yes", "y"]:
-                    added_files.append(output_dir_filepath.as_posix())
-                    break
-
-                if recreate in ["no", "n"]:
-                    generated_filename = PathEx.EnsureFile(src_dir / rel_filepath)
-                    generated_filename.unlink()
-
-                    break
-        else:
-            # If here, we are looking at a first time generation and don't need to prompt
-            merged_manifest[rel_filepath] = generated_hash
-            added_files.append(output_dir_filepath.as_posix())
+        event_type, num_bytes, manifest_hash, delta = ApplyGeneratedFile(
+            src_dir,
+            dest_dir,
+            rel_filepath,
+            generated_hash=generated_hash,
+            current_file_hash=GetCurrentFileHash(
+                output_dir_filepath, current_hashes.get(rel_filepath)
+            ),
+            existing_manifest=existing_manifest,
+            on_conflict=on_conflict,
+            journal=journal,
+        )
 
-    # create and save manifest
-    yaml_comments = textwrap.dedent(
-        """\
-        #############################################################################################################
-        # This file is used by PythonProjectBootstrapper (https://github.com/gt-sse-center/PythonProjectBootstrapper)
-        # to determine whether changes have been made to any files in the project. These values are saved in case the
-        # project is regenerated so we can avoid overwriting any user changes. Please do not change the contents :)
-        #############################################################################################################
+        merged_manifest[rel_filepath] = manifest_hash
 
-        """,
-    )
+        if delta is not None:
+            history_deltas[rel_filepath] = delta
 
-    if potential_manifest.is_file():
-        _ChangeManifestWritePermissions(manifest_filepath=potential_manifest, read_only=False)
+        yield CopyToOutputDirEvent(
+            event_type,
+            output_dir_filepath.as_posix(),
+            num_bytes,
+            total_files,
+        )
 
-    with open(potential_manifest, "w") as manifest_file:
-        manifest_file.write(yaml_comments)
-        yaml.dump(merged_manifest, manifest_file)
+    WriteHistoryAndManifest(dest_dir, journal, history_deltas, context_hash, merged_manifest)
 
-    _ChangeManifestWritePermissions(manifest_filepath=potential_manifest, read_only=True)
+    shutil.rmtree(src_dir)
 
-    # copy temporary directory to final output directory and remove temporary directory
-    shutil.copytree(
-        src_dir,
-        dest_dir,
-        dirs_exist_ok=True,
-        ignore_dangling_symlinks=True,
-        copy_function=shutil.copy,
+
+# ----------------------------------------------------------------------
+def LoadExistingManifest(dest_dir: Path) -> tuple[CompactManifest, dict[str, str]]:
+    """Returns the manifest in the output directory (which is empty if it doesn't exist) and its directory digests"""
+
+    manifest_filepath = dest_dir / manifest_filename
+
+    if not manifest_filepath.is_file():
+        return CompactManifest(), {}
+
+    manifest = CompactManifest.FromDigests(
+        (path, bytes.fromhex(hash_value))
+        for path, hash_value in _IterManifestEntries(manifest_filepath)
     )
-    shutil.rmtree(src_dir)
 
-    deleted_files: list[str] = list(set(unchanged_files_deleted) - set(added_files))
+    return manifest, CalculateDirectoryDigests(manifest)
 
-    return CopyToOutputDirResult(
-        deleted_files=sorted(deleted_files),
-        added_files=sorted(added_files),
-        overwritten_files=sorted(overwritten_files),
-        modified_template_files=sorted(modified_template_files),
+
+# ----------------------------------------------------------------------
+def MovePromptFile(src_dir: Path, dest_dir: Path, journal: ApplyJournal) -> None:
+    """Move the prompt file (if any) from the generated content to the output directory"""
+
+    prompt_file = src_dir / prompt_filename
+    if not prompt_file.is_file():
+        return
+
+    dest_filename = dest_dir / prompt_filename
+
+    journal.PrepareWrite(prompt_filename)
+
+    shutil.move(prompt_file, dest_dir)
+    PathEx.EnsureFile(dest_filename)
+
+
+# ----------------------------------------------------------------------
+def RemoveTemplateFiles(
+    generated_manifest: CompactManifest,
+    existing_manifest: CompactManifest,
+    existing_digests: dict[str, str],
+    dest_dir: Path,
+    *,
+    journal: ApplyJournal,
+    path_selection: Optional[PathSelection],
+    current_hashes: Mapping[str, KnownFileHash],
+) -> list[str]:
+    """Remove the (selected) files that are no longer generated by the template if they are unchanged (see ConditionallyRemoveUnchangedTemplateFiles())"""
+
+    if not existing_manifest:
+        return []
+
+    # Nothing was removed from the template if the root digests match
+    generated_root_digest = CalculateDirectoryDigests(generated_manifest)[root_directory_key]
+    if generated_root_digest == existing_digests[root_directory_key]:
+        return []
+
+    return ConditionallyRemoveUnchangedTemplateFiles(
+        new_manifest_dict=generated_manifest,
+        existing_manifest_dict=(
+            existing_manifest
+            if path_selection is None
+            else CompactManifest(
+                {
+                    rel_filepath: hash_value
+                    for rel_filepath, hash_value in existing_manifest.items()
+                    if path_selection.IsSelected(rel_filepath)
+                },
+            )
+        ),
+        output_dir=dest_dir,
+        journal=journal,
+        current_hashes=current_hashes,
     )
 
 
 # ----------------------------------------------------------------------
-def DisplayModifications(modifications: CopyToOutputDirResult) -> None:
+def CreateDirectories(
+    src_dir: Path,
+    dest_dir: Path,
+    generated_manifest: CompactManifest,
+    path_selection: Optional[PathSelection],
+    journal: ApplyJournal,
+) -> None:
+    """Create the (selected) generated directories in the output directory, including directories that don't contain any files"""
+
+    relative_directories: list[str] = []
+
+    for root, directories, _ in os.walk(src_dir):
+        for directory in directories:
+            relative_directories.append(
+                PathEx.CreateRelativePath(src_dir, Path(root) / directory).as_posix()
+            )
+
+    if path_selection is not None:
+        # Only create selected directories and the directories that contain selected files
+        selected_directories: set[str] = set()
+
+        for relative_path in itertools.chain(
+            generated_manifest,
+            (
+                relative_directory + "/"
+                for relative_directory in relative_directories
+                if path_selection.IsSelected(relative_directory)
+            ),
+        ):
+            parent = relative_path.rpartition("/")[0]
+
+            while parent and parent not in selected_directories:
+                selected_directories.add(parent)
+                parent = parent.rpartition("/")[0]
+
+        relative_directories = [
+            relative_directory
+            for relative_directory in relative_directories
+            if relative_directory in selected_directories
+        ]
+
+    for relative_directory in relative_directories:
+        journal.PrepareDirectory(relative_directory)
+        (dest_dir / relative_directory).mkdir(parents=True, exist_ok=True)
+
+
+# ----------------------------------------------------------------------
+def GetCurrentFileHash(filepath: Path, known_hash: Optional[KnownFileHash]) -> Optional[str]:
+    """Returns the hash value of a file in the output directory (using the known hash if it is current) or None if the file doesn't exist"""
+
+    if known_hash is not None and known_hash.IsCurrent(filepath):
+        return known_hash.hash_value
+
+    if not filepath.is_file():
+        return None
+
+    return GenerateFileHash(filepath=filepath)
+
+
+# ----------------------------------------------------------------------
+def ApplyGeneratedFile(
+    src_dir: Path,
+    dest_dir: Path,
+    rel_filepath: str,
+    *,
+    generated_hash: str,
+    current_file_hash: Optional[str],
+    existing_manifest: CompactManifest,
+    on_conflict: Callable[[Path, ConflictType], bool],
+    journal: ApplyJournal,
+) -> tuple[CopyToOutputDirEventType, int, str, Optional[FileDelta]]:
+    """Apply a generated file, returning the event type, the number of bytes written, the hash value to record in the manifest, and the change to record in the generation history (if any)"""
+
+    output_dir_filepath: Path = dest_dir / rel_filepath
+    manifest_hash = generated_hash
+
+    if current_file_hash is not None:
+        # Changes detected in file and file modified by user (changes do not stem only from changes in the contents of the template file)
+        if rel_filepath in existing_manifest and current_file_hash not in (
+            generated_hash,
+            existing_manifest[rel_filepath],
+        ):
+            if on_conflict(output_dir_filepath, ConflictType.Modified):
+                event_type = CopyToOutputDirEventType.Overwritten
+            else:
+                manifest_hash = existing_manifest[rel_filepath]
+                event_type = CopyToOutputDirEventType.Skipped
+
+        # Looking at a template file, contents this generation are different, and contents were untouched by user
+        elif rel_filepath in existing_manifest and (
+            current_file_hash != generated_hash
+            and current_file_hash == existing_manifest[rel_filepath]
+        ):
+            event_type = CopyToOutputDirEventType.Modified
+
+        # The file has not changed, but its permissions may have
+        elif current_file_hash == generated_hash:
+            event_type = CopyToOutputDirEventType.Unchanged
+
+        else:
+            event_type = CopyToOutputDirEventType.Replaced
+
+    elif rel_filepath in existing_manifest:
+        # If here, the file no longer exists. We still want the file to exist in the manifest
+        # (so that future generations are still aware of it), but do not want it to be created
+        # again.
+        if on_conflict(output_dir_filepath, ConflictType.Deleted):
+            event_type = CopyToOutputDirEventType.Added
+        else:
+            event_type = CopyToOutputDirEventType.Skipped
+    else:
+        # If here, we are looking at a first time generation and don't need to prompt
+        event_type = CopyToOutputDirEventType.Added
+
+    generated_filepath = src_dir / rel_filepath
+    num_bytes = 0
+    delta: Optional[FileDelta] = None
+
+    if event_type == CopyToOutputDirEventType.Unchanged:
+        journal.PrepareModeChange(rel_filepath)
+        shutil.copymode(generated_filepath, output_dir_filepath)
+    elif event_type != CopyToOutputDirEventType.Skipped:
+        journal.PrepareWrite(rel_filepath)
+        shutil.copy(generated_filepath, output_dir_filepath)
+        num_bytes = output_dir_filepath.stat().st_size
+
+        if current_file_hash != generated_hash:
+            delta = FileDelta(current_file_hash, generated_hash)
+
+    return event_type, num_bytes, manifest_hash, delta
+
+
+# ----------------------------------------------------------------------
+def WriteHistoryAndManifest(
+    dest_dir: Path,
+    journal: ApplyJournal,
+    history_deltas: dict[str, FileDelta],
+    context_hash: Optional[str],
+    merged_manifest: CompactManifest,
+) -> None:
+    """Append an entry to the generation history and write the manifest once all files have been applied"""
+
+    history_filepath = GetHistoryFilename(dest_dir)
+    history_relative_path = PathEx.CreateRelativePath(dest_dir, history_filepath).as_posix()
+
+    # Move the history recorded before the output directory became a git repository into the `.git` directory,
+    # so that it isn't committed
+    tree_history_filepath = dest_dir / history_filename
+
+    if history_filepath != tree_history_filepath and tree_history_filepath.is_file():
+        content = tree_history_filepath.read_bytes()
+
+        if history_filepath.is_file():
+            content += history_filepath.read_bytes()
+
+        journal.PrepareWrite(history_relative_path)
+        history_filepath.parent.mkdir(parents=True, exist_ok=True)
+        history_filepath.write_bytes(content)
+
+        journal.RemoveFile(history_filename)
+
+    journal.PrepareAppend(history_relative_path)
+    AppendHistoryEntry(dest_dir, HistoryEntry.Create(history_deltas, context_hash))
+
+    # create and save manifest
+    journal.PrepareWrite(manifest_filename, remove_existing=False)
+    WriteManifest(dest_dir / manifest_filename, merged_manifest)
+
+
+# ----------------------------------------------------------------------
+def PromptForConflict(output_filename: Path, conflict_type: ConflictType) -> bool:
     """
-    Print out the changes in the output directory that were triggered by this project generation
+    Ask the user how a conflict detected by CopyToOutputDir() should be resolved
 
     Args:
-        modifications (CopyToOutputDirResult): Object containing information about files deleted, added, overwritten, and modified
-    """
+        output_filename (Path): File in the output directory
+        conflict_type (ConflictType): Type of conflict
 
-    sys.stdout.write("\n\n")
+    Returns:
+        bool: True if the file should be overwritten (or recreated) with the generated content
+    """
 
-    labels = ["Deleted Files", "Added Files", "Overwritten Files", "Modified Template Files"]
-    changes = [
-        modifications.deleted_files,
-        modifications.added_files,
-        modifications.overwritten_files,
-        modifications.modified_template_files,
-    ]
-
-    display_mods = Text("")
-
-    for label, mods in zip(labels, changes):
-        display_mods.append(("\n" + label + "\n"), style="bold")
-
-        for file_changed in mods:
-            display_mods.append(" - " + file_changed + "\n")
-
-    print(
-        Panel(
-            display_mods,
-            border_style="green",
-            padding=1,
-            title="Output Directory Modifications",
-            title_align="left",
+    if conflict_type == ConflictType.Modified:
+        question = (
+            f"\nWould you like to overwrite your changes in {str(output_filename)}? [yes/no]: "
         )
-    )
+    else:
+        question = f"\nWould you like to recreate {str(output_filename)}? [yes/no]: "
+
+    while True:
+        sys.stdout.write(question)
+        response = input().strip().lower()
+
+        if response in ["yes", "y"]:
+            return True
+
+        if response in ["no", "n"]:
+            return False
 
 
 # ----------------------------------------------------------------------
@@ -381,6 +947,10 @@ def DisplayPrompt(output_dir: Path, prompts: list[tuple[str, str]]) -> None:
         output_dir (Path): Path of final output directory
         prompts (dict[tuple[int, str], str]): Dictionary mapping (Prompt Number, Label) -> Prompt Text
     """
+
+    from rich import print  # pylint: disable=redefined-builtin
+    from rich.panel import Panel
+
     PathEx.EnsureDir(output_dir)
 
     sys.stdout.write("\n\n")
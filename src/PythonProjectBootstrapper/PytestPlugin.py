@@ -0,0 +1,136 @@
+# ----------------------------------------------------------------------
+# |
+# |  Copyright (c) 2024 Scientific Software Engineering Center at Georgia Tech
+# |  Distributed under the MIT License.
+# |
+# ----------------------------------------------------------------------
+"""pytest plugin that validates the permutations of a project against golden snapshots"""
+
+from pathlib import Path
+from typing import Any, Optional
+
+import pytest
+
+
+# ----------------------------------------------------------------------
+class TemplateMatrix:
+    """Object provided by the `template_matrix` fixture"""
+
+    # ----------------------------------------------------------------------
+    def __init__(
+        self,
+        *,
+        update_snapshots: bool,
+        sample: Optional[int],
+        max_workers: Optional[int],
+    ):
+        self.update_snapshots = update_snapshots
+        self.sample = sample
+        self.max_workers = max_workers
+
+    # ----------------------------------------------------------------------
+    def Verify(
+        self,
+        project: str,
+        base_context: dict[str, Any],
+        snapshots_filename: Path,
+        axes: Optional[dict[str, list[Any]]] = None,
+        *,
+        seed: int = 0,
+    ) -> dict[str, str]:
+        """
+        Render the permutations of a project and compare their manifest digests with golden snapshots; the
+        test fails if any digest is different or a snapshot does not exist.
+
+        Args:
+            project (str): Name of the project
+            base_context (dict[str, Any]): Configuration values common to all permutations
+            snapshots_filename (Path): File that contains the golden snapshots
+            axes (Optional[dict[str, list[Any]]], optional): Additional (or overridden) values that vary across permutations. Defaults to None.
+            seed (int, optional): Seed used when sampling permutations. Defaults to 0.
+
+        Returns:
+            dict[str, str]: Manifest digests, keyed by permutation name
+        """
+
+        # pytest loads this plugin for every session, so the (slow to import) rendering functionality is only imported
+        # when it is used
+        from PythonProjectBootstrapper import Matrix
+
+        permutations = Matrix.CreatePermutations(
+            project,
+            base_context,
+            axes,
+            sample=self.sample,
+            seed=seed,
+        )
+
+        digests = Matrix.RenderPermutations(project, permutations, max_workers=self.max_workers)
+
+        if self.update_snapshots:
+            # Snapshots for permutations that weren't rendered are preserved when sampling
+            snapshots = Matrix.LoadSnapshots(snapshots_filename) if self.sample is not None else {}
+            snapshots.update(digests)
+
+            Matrix.SaveSnapshots(snapshots_filename, snapshots)
+
+            return digests
+
+        comparison = Matrix.CompareSnapshots(Matrix.LoadSnapshots(snapshots_filename), digests)
+
+        if not comparison.is_success:
+            lines: list[str] = []
+
+            lines += [f"mismatched: {name}" for name in comparison.mismatched]
+            lines += [f"new: {name}" for name in comparison.new]
+
+            pytest.fail(
+                "{} permutation(s) do not match the snapshots in '{}' (run with '--update-template-snapshots' if the changes are expected):\n{}".format(
+                    len(lines),
+                    snapshots_filename,
+                    "\n".join(lines),
+                ),
+                pytrace=False,
+            )
+
+        return digests
+
+
+# ----------------------------------------------------------------------
+def pytest_addoption(parser: pytest.Parser) -> None:  # pylint: disable=invalid-name
+    group = parser.getgroup("PythonProjectBootstrapper")
+
+    group.addoption(
+        "--update-template-snapshots",
+        action="store_true",
+        default=False,
+        help="Update the golden snapshots used by the `template_matrix` fixture.",
+    )
+
+    group.addoption(
+        "--template-matrix-sample",
+        type=int,
+        default=None,
+        help="Number of randomly selected permutations rendered by the `template_matrix` fixture; all permutations are rendered by default.",
+    )
+
+    group.addoption(
+        "--template-matrix-workers",
+        type=int,
+        default=None,
+        help="Number of processes used to render permutations by the `template_matrix` fixture; the default is one process per CPU.",
+    )
+
+
+# ----------------------------------------------------------------------
+@pytest.fixture
+def template_matrix(  # pylint: disable=invalid-name
+    request: pytest.FixtureRequest,
+) -> TemplateMatrix:
+    """Renders the permutations of a project and compares them with golden snapshots"""
+
+    return TemplateMatrix(
+        update_snapshots=request.config.getoption("--update-template-snapshots"),
+        sample=request.config.getoption("--template-matrix-sample"),
+        max_workers=request.config.getoption("--template-matrix-workers"),
+    )
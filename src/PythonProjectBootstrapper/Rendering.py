@@ -0,0 +1,986 @@
+# ----------------------------------------------------------------------
+# |
+# |  Copyright (c) 2024 Scientific Software Engineering Center at Georgia Tech
+# |  Distributed under the MIT License.
+# |
+# ----------------------------------------------------------------------
+"""Rendering backend used in place of cookiecutter's `generate_files` during project generation"""
+
+import hashlib
+import heapq
+import io
+import itertools
+import json
+import os
+import posixpath
+import shutil
+import sys
+import threading
+
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+
+import cookiecutter.main
+
+from binaryornot.check import is_binary
+from cookiecutter.exceptions import UndefinedVariableInTemplate
+from cookiecutter.find import find_template
+from cookiecutter.generate import generate_context, is_copy_only_path, render_and_create_dir
+from cookiecutter.hooks import run_hook_from_repo_dir
+from cookiecutter.utils import create_env_with_context, rmtree, work_in
+from jinja2 import BaseLoader, Environment, FileSystemLoader
+from jinja2.exceptions import TemplateNotFound, TemplateSyntaxError, UndefinedError
+from jinja2.loaders import split_template_path
+
+from PythonProjectBootstrapper.ContextValidation import ValidateContext
+from PythonProjectBootstrapper.PathSelection import PathSelection
+from PythonProjectBootstrapper.ProjectGenerationUtils import (
+    GenerateFileHash,
+    GetFileSystemTime,
+    KnownFileHash,
+)
+from PythonProjectBootstrapper.TemplateBundle import (
+    BundledTemplate,
+    FindTemplateBundle,
+    TemplateBundle,
+)
+from PythonProjectBootstrapper.TemplateIndex import (
+    LoadTemplateIndex,
+    TemplateIndex,
+    TemplateIndexEntry,
+)
+
+
+# Template files are rendered with the template directory as the working directory; each task is (relative input filename, copy without render).
+_RenderTask = tuple[str, bool]
+
+# Known hashes of the files written and information about the first file that could not be rendered (if any)
+_RenderResult = tuple[dict[str, KnownFileHash], Optional[tuple[str, UndefinedError]]]
+
+# Content is written to disk once this many characters have been rendered
+_STREAMING_BUFFER_SIZE = 64 * 1024
+
+# Jinja environment created once per worker process by `_InitializeWorker`
+_worker_env: Optional[Environment] = None
+_worker_context: Optional[dict[str, Any]] = None
+_worker_template_index: Optional[TemplateIndex] = None
+_worker_bundled_template: Optional[BundledTemplate] = None
+
+
+# ----------------------------------------------------------------------
+class RenderingBackend:
+    """
+    Renders cookiecutter templates, partitioning the template files across a pool of worker processes.
+
+    The output produced is identical to that produced by cookiecutter's `generate_files`, including
+    `_copy_without_render` semantics, binary file handling, and file modes. Rendered content is streamed
+    to disk and hashed as it is written, so the hashes of generated files are available without reading
+    the files again. Binary files are detected when the template is indexed and copied verbatim, using
+    hash values calculated once per template version.
+
+    When a template bundle (see TemplateBundle.py) exists alongside the project templates, template files
+    are read from the bundle rather than from the template directory, and the bundle's precomputed index
+    is used in place of the template index.
+
+    Jinja environments are reused across calls to `GenerateFiles` made with the same template and extensions,
+    so a backend that generates multiple projects compiles each template file once.
+    """
+
+    # ----------------------------------------------------------------------
+    def __init__(
+        self,
+        max_workers: Optional[int] = 1,
+        use_template_bundle: bool = True,
+    ):
+        """
+        Args:
+            max_workers (Optional[int], optional): Maximum number of worker processes used to render files. 1 renders
+                        all files in this process, None uses one process per CPU. Defaults to 1.
+            use_template_bundle (bool, optional): Read template files from the template bundle when one exists; the
+                        bundle does not reflect changes made to the template files after it was created. Defaults to True.
+        """
+
+        if max_workers is not None and max_workers < 1:
+            raise ValueError("max_workers must be greater than 0.")
+
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.use_template_bundle = use_template_bundle
+
+        # Hashes of the files written by the most recent call to `GenerateFiles`, keyed by absolute filename
+        self.known_hashes: dict[str, KnownFileHash] = {}
+
+        # Context used by the most recent call to `GenerateFiles`
+        self.context: dict[str, Any] = {}
+
+        # Only template files whose output paths (relative to the project directory) are selected are rendered;
+        # all files are rendered when None. Directories are created regardless of the selection.
+        self.path_selection: Optional[PathSelection] = None
+
+        # Called with the absolute filename and hash of each file as it is written (see
+        # `Pipeline.RenderAndCopyToOutputDir`). When files are rendered by multiple processes,
+        # this is called as each process completes. Files are reported again if their hash values are
+        # recalculated after the post-generation hook has run.
+        self.on_file_rendered: Optional[Callable[[str, KnownFileHash], None]] = None
+
+        self._environments: dict[str, Environment] = {}
+
+        # Held while files are generated or the backend is being prepared (see `Prepare`)
+        self._lock = threading.Lock()
+
+    # ----------------------------------------------------------------------
+    @contextmanager
+    def Install(self) -> Iterator["RenderingBackend"]:
+        """Use this backend for all calls to `cookiecutter.main.cookiecutter` made within the context"""
+
+        original_generate_files = cookiecutter.main.generate_files
+
+        cookiecutter.main.generate_files = self.GenerateFiles
+        try:
+            yield self
+        finally:
+            cookiecutter.main.generate_files = original_generate_files
+
+    # ----------------------------------------------------------------------
+    def Prepare(self, repo_dir: Path) -> None:
+        """
+        Perform the work that doesn't depend on configuration values before those values are known: the Jinja
+        environment is created (loading the template's extensions), the template index is loaded, and template
+        files are compiled. This is invoked on a background thread while the user responds to prompts; calls to
+        `GenerateFiles` wait for the preparation to complete.
+
+        Errors are ignored, as they are encountered again when files are generated.
+        """
+
+        with self._lock:
+            try:
+                self._PrepareImpl(repo_dir)
+            except Exception:  # pylint: disable=broad-except
+                pass
+
+    # ----------------------------------------------------------------------
+    def GenerateFiles(
+        self,
+        repo_dir: Path | str,
+        context: Optional[dict[str, Any]] = None,
+        output_dir: Path | str = ".",
+        overwrite_if_exists: bool = False,
+        skip_if_file_exists: bool = False,
+        accept_hooks: bool = True,
+        keep_project_on_failure: bool = False,
+    ) -> str:
+        """
+        Render the template found in `repo_dir`; the signature matches `cookiecutter.generate.generate_files`.
+
+        Returns:
+            str: Path to the generated project directory
+        """
+
+        with self._lock:
+            return self._GenerateFiles(
+                repo_dir,
+                context or OrderedDict([]),
+                output_dir,
+                overwrite_if_exists,
+                skip_if_file_exists,
+                accept_hooks,
+                keep_project_on_failure,
+            )
+
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    def _PrepareImpl(self, repo_dir: Path) -> None:
+        # The default values are sufficient to create the environment (see `_GetEnvironment`)
+        context = generate_context(context_file=str(repo_dir / "cookiecutter.json"))
+
+        bundle_filename = FindTemplateBundle(repo_dir.parent) if self.use_template_bundle else None
+
+        # Outside of `cookiecutter.main.cookiecutter`, the template's extensions are only importable when the
+        # repository directory is added to the path
+        with _ExtendImportPath(repo_dir):
+            env = self._GetEnvironment(repo_dir, bundle_filename, context)
+
+        template_dir = find_template(str(repo_dir), env)
+
+        with (
+            TemplateBundle.Open(bundle_filename) if bundle_filename is not None else nullcontext()
+        ) as bundle:
+            bundled_template = (
+                bundle.GetTemplate(Path(template_dir)) if bundle is not None else None
+            )
+
+            if bundled_template is None:
+                template_index = LoadTemplateIndex(Path(template_dir))
+            else:
+                template_index = _CreateBundledTemplateIndex(Path(template_dir), bundled_template)
+
+            # Templates compiled in this process aren't available to worker processes
+            if self.max_workers != 1:
+                return
+
+            if env.loader is None:
+                env.loader = _CreateLoader(template_dir, bundled_template)
+            elif isinstance(env.loader, _BundleLoader):
+                assert bundled_template is not None
+                env.loader.bundled_template = bundled_template
+
+            for root, dirs, files in (
+                os.walk(template_dir) if bundled_template is None else bundled_template.Walk()
+            ):
+                if bundled_template is None:
+                    root = os.path.relpath(root, template_dir)
+
+                # Directories that are copied without being rendered are not walked (see `_CreateDirectories`)
+                dirs[:] = [
+                    d
+                    for d in dirs
+                    if not is_copy_only_path(os.path.normpath(os.path.join(root, d)), context)
+                ]
+
+                for f in files:
+                    infile = os.path.normpath(os.path.join(root, f))
+
+                    entry = template_index.GetEntry(infile)
+
+                    if entry is None or entry.is_binary or is_copy_only_path(infile, context):
+                        continue
+
+                    try:
+                        env.get_template(infile.replace(os.path.sep, "/"))
+                    except (TemplateSyntaxError, TemplateNotFound, UnicodeDecodeError):
+                        continue
+
+    # ----------------------------------------------------------------------
+    def _GenerateFiles(
+        self,
+        repo_dir: Path | str,
+        context: dict[str, Any],
+        output_dir: Path | str,
+        overwrite_if_exists: bool,
+        skip_if_file_exists: bool,
+        accept_hooks: bool,
+        keep_project_on_failure: bool,
+    ) -> str:
+        self.context = context
+
+        # Invalid values are detected before anything is created or rendered
+        ValidateContext(Path(repo_dir), context.get("cookiecutter", {}))
+
+        bundle_filename = (
+            FindTemplateBundle(Path(repo_dir).parent) if self.use_template_bundle else None
+        )
+
+        env = self._GetEnvironment(repo_dir, bundle_filename, context)
+
+        template_dir = find_template(repo_dir, env)
+
+        with (
+            TemplateBundle.Open(bundle_filename) if bundle_filename is not None else nullcontext()
+        ) as bundle:
+            return self._GenerateFilesImpl(
+                repo_dir,
+                template_dir,
+                bundle.GetTemplate(Path(template_dir)) if bundle is not None else None,
+                context,
+                env,
+                output_dir,
+                overwrite_if_exists,
+                skip_if_file_exists,
+                accept_hooks,
+                keep_project_on_failure,
+            )
+
+    # ----------------------------------------------------------------------
+    def _GenerateFilesImpl(
+        self,
+        repo_dir: Path | str,
+        template_dir: str,
+        bundled_template: Optional[BundledTemplate],
+        context: dict[str, Any],
+        env: Environment,
+        output_dir: Path | str,
+        overwrite_if_exists: bool,
+        skip_if_file_exists: bool,
+        accept_hooks: bool,
+        keep_project_on_failure: bool,
+    ) -> str:
+        if bundled_template is None:
+            template_index = LoadTemplateIndex(Path(template_dir))
+        else:
+            template_index = _CreateBundledTemplateIndex(Path(template_dir), bundled_template)
+
+        unrendered_dir = os.path.split(template_dir)[1]
+
+        try:
+            project_dir, output_directory_created = render_and_create_dir(
+                unrendered_dir, context, output_dir, env, overwrite_if_exists
+            )
+        except UndefinedError as err:
+            raise UndefinedVariableInTemplate(
+                f"Unable to create project directory '{unrendered_dir}'", err, context
+            ) from err
+
+        project_dir = os.path.abspath(project_dir)
+        delete_project_on_failure = output_directory_created and not keep_project_on_failure
+
+        if accept_hooks:
+            run_hook_from_repo_dir(
+                repo_dir, "pre_gen_project", project_dir, context, delete_project_on_failure
+            )
+
+        try:
+            with work_in(template_dir):
+                if env.loader is None:
+                    env.loader = _CreateLoader(template_dir, bundled_template)
+                elif isinstance(env.loader, _BundleLoader):
+                    # The loader (and the templates compiled through it) is reused with the newly opened bundle
+                    assert bundled_template is not None
+                    env.loader.bundled_template = bundled_template
+
+                tasks = _CreateDirectories(
+                    project_dir, output_dir, context, env, overwrite_if_exists, bundled_template
+                )
+
+                if self.path_selection is not None:
+                    tasks = _SelectTasks(tasks, context, env, self.path_selection)
+
+            self._RenderFiles(
+                Path(repo_dir),
+                template_index,
+                bundled_template,
+                project_dir,
+                context,
+                env,
+                tasks,
+                skip_if_file_exists=skip_if_file_exists,
+            )
+        except UndefinedVariableInTemplate:
+            if delete_project_on_failure:
+                rmtree(project_dir)
+
+            raise
+
+        if accept_hooks:
+            hook_time_ns = GetFileSystemTime(Path(project_dir))
+
+            run_hook_from_repo_dir(
+                repo_dir, "post_gen_project", project_dir, context, delete_project_on_failure
+            )
+
+            self._UpdateRacyKnownHashes(hook_time_ns)
+
+        return project_dir
+
+    # ----------------------------------------------------------------------
+    def _UpdateRacyKnownHashes(self, hook_time_ns: int) -> None:
+        # A hook may modify a file written within the same modification time tick without changing its size
+        # or modification time, so hash values of those files are recalculated (and reported again) once the
+        # hook has completed.
+        for filename, known_hash in list(self.known_hashes.items()):
+            if known_hash.mtime_ns < hook_time_ns:
+                continue
+
+            filepath = Path(filename)
+
+            if not filepath.is_file():
+                del self.known_hashes[filename]
+                continue
+
+            known_hash = KnownFileHash.Create(filepath, GenerateFileHash(filepath))
+
+            self.known_hashes[filename] = known_hash
+
+            if self.on_file_rendered is not None:
+                self.on_file_rendered(filename, known_hash)
+
+    # ----------------------------------------------------------------------
+    def _GetEnvironment(
+        self,
+        repo_dir: Path | str,
+        bundle_filename: Optional[Path],
+        context: dict[str, Any],
+    ) -> Environment:
+        values = context.get("cookiecutter", {})
+
+        # The context is only used by the environment to load extensions; templates are rendered with the
+        # context provided when they are rendered.
+        key = json.dumps(
+            [
+                os.path.abspath(repo_dir),
+                (
+                    [str(bundle_filename), bundle_filename.stat().st_mtime_ns]
+                    if bundle_filename is not None
+                    else None
+                ),
+                values.get("_extensions"),
+                values.get("_jinja2_env_vars"),
+            ],
+            default=str,
+        )
+
+        env = self._environments.get(key)
+        if env is None:
+            env = create_env_with_context(context)
+            self._environments[key] = env
+
+        return env
+
+    # ----------------------------------------------------------------------
+    def _RenderFiles(
+        self,
+        repo_dir: Path,
+        template_index: TemplateIndex,
+        bundled_template: Optional[BundledTemplate],
+        project_dir: str,
+        context: dict[str, Any],
+        env: Environment,
+        tasks: list[_RenderTask],
+        *,
+        skip_if_file_exists: bool,
+    ) -> None:
+        self.known_hashes = {}
+
+        num_workers = min(self.max_workers, len(tasks))
+
+        if num_workers <= 1:
+            with work_in(template_index.template_dir):
+                known_hashes, failure = _RenderTasks(
+                    env,
+                    context,
+                    template_index,
+                    bundled_template,
+                    project_dir,
+                    tasks,
+                    skip_if_file_exists,
+                    self.on_file_rendered,
+                )
+
+            self.known_hashes.update(known_hashes)
+        else:
+            failure = None
+
+            with ProcessPoolExecutor(
+                max_workers=num_workers,
+                initializer=_InitializeWorker,
+                initargs=(
+                    str(repo_dir.resolve()),
+                    template_index,
+                    bundled_template.bundle if bundled_template is not None else None,
+                    context,
+                ),
+            ) as executor:
+                for known_hashes, partition_failure in executor.map(
+                    _RenderPartition,
+                    itertools.repeat(project_dir),
+                    _PartitionTasks(template_index, tasks, num_workers),
+                    itertools.repeat(skip_if_file_exists),
+                ):
+                    self.known_hashes.update(known_hashes)
+
+                    if self.on_file_rendered is not None:
+                        for filename, known_hash in known_hashes.items():
+                            self.on_file_rendered(filename, known_hash)
+
+                    if partition_failure is not None and failure is None:
+                        failure = partition_failure
+
+        if failure is not None:
+            infile, err = failure
+            raise UndefinedVariableInTemplate(f"Unable to create file '{infile}'", err, context)
+
+
+# ----------------------------------------------------------------------
+def RenderTemplateFiles(
+    repo_dir: Path,
+    context: dict[str, Any],
+    output_dir: Path,
+    relative_filenames: list[str],
+) -> dict[str, KnownFileHash]:
+    """
+    Render individual files within a template without running hooks; this is used to update previously
+    generated content when template files change.
+
+    Args:
+        repo_dir (Path): Directory that contains cookiecutter.json
+        context (dict[str, Any]): Context used when the content was generated (see `RenderingBackend.context`)
+        output_dir (Path): Directory in which the project directory is rendered
+        relative_filenames (list[str]): Files to render, relative to the template directory
+
+    Returns:
+        dict[str, KnownFileHash]: Hashes of the files written, keyed by absolute filename
+    """
+
+    repo_dir_str = str(repo_dir.resolve())
+
+    with _ExtendImportPath(repo_dir):
+        env = create_env_with_context(context)
+
+        template_dir = Path(find_template(repo_dir_str, env))
+        template_index = LoadTemplateIndex(template_dir)
+
+        project_dir = os.path.abspath(
+            os.path.join(output_dir, env.from_string(template_dir.name).render(**context))
+        )
+
+        with work_in(template_dir):
+            env.loader = FileSystemLoader([".", "../templates"])
+
+            tasks: list[_RenderTask] = []
+
+            for relative_filename in relative_filenames:
+                infile = os.path.normpath(relative_filename)
+
+                outfile = os.path.join(project_dir, env.from_string(infile).render(**context))
+                os.makedirs(os.path.dirname(outfile), exist_ok=True)
+
+                tasks.append((infile, is_copy_only_path(infile, context)))
+
+            known_hashes, failure = _RenderTasks(
+                env, context, template_index, None, project_dir, tasks, False
+            )
+
+    if failure is not None:
+        infile, err = failure
+        raise UndefinedVariableInTemplate(f"Unable to create file '{infile}'", err, context)
+
+    return known_hashes
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+@contextmanager
+def _ExtendImportPath(repo_dir: Path) -> Iterator[None]:
+    """Make the template's extensions (for example, local_extensions.py) importable, as cookiecutter does while it generates a project"""
+
+    repo_dir_str = str(repo_dir.resolve())
+
+    added_to_sys_path = repo_dir_str not in sys.path
+    if added_to_sys_path:
+        sys.path.append(repo_dir_str)
+
+    try:
+        yield
+    finally:
+        # `cookiecutter.main.cookiecutter` replaces `sys.path` when it completes, which may happen on another thread
+        # while the backend is being prepared
+        if added_to_sys_path and repo_dir_str in sys.path:
+            sys.path.remove(repo_dir_str)
+
+
+# ----------------------------------------------------------------------
+class _BundleLoader(BaseLoader):
+    """Equivalent to `FileSystemLoader([".", "../templates"])` for templates stored in a bundle"""
+
+    # ----------------------------------------------------------------------
+    def __init__(
+        self,
+        template_dir: str,
+        bundled_template: BundledTemplate,
+    ):
+        self.template_dir = template_dir
+        self.bundled_template = bundled_template
+
+    # ----------------------------------------------------------------------
+    def get_source(
+        self,
+        environment: Environment,
+        template: str,
+    ) -> tuple[str, Optional[str], Optional[Callable[[], bool]]]:
+        pieces = split_template_path(template)
+
+        for search_path in [".", "../templates"]:
+            relative_path = posixpath.join(search_path, *pieces)
+
+            if self.bundled_template.GetEntry(relative_path) is None:
+                continue
+
+            # Decode the content in the same way as a file opened in text mode
+            content = self.bundled_template.Read(relative_path).decode("utf-8")
+            content = content.replace("\r\n", "\n").replace("\r", "\n")
+
+            return (
+                content,
+                os.path.normpath(os.path.join(self.template_dir, relative_path)),
+                lambda: True,
+            )
+
+        raise TemplateNotFound(template)
+
+
+# ----------------------------------------------------------------------
+def _CreateLoader(
+    template_dir: str,
+    bundled_template: Optional[BundledTemplate],
+) -> BaseLoader:
+    if bundled_template is None:
+        # Absolute paths are used so that templates can be compiled before the working directory is
+        # changed to the template directory (see `RenderingBackend.Prepare`).
+        return FileSystemLoader([template_dir, os.path.join(template_dir, "..", "templates")])
+
+    return _BundleLoader(template_dir, bundled_template)
+
+
+# ----------------------------------------------------------------------
+def _CreateBundledTemplateIndex(
+    template_dir: Path,
+    bundled_template: BundledTemplate,
+) -> TemplateIndex:
+    """Create a template index from the information stored in the bundle; files are neither read nor hashed"""
+
+    entries: dict[str, TemplateIndexEntry] = {}
+    prefix = bundled_template.prefix + "/"
+
+    for path, entry in bundled_template.bundle.entries.items():
+        if path.startswith(prefix):
+            entries[path[len(prefix) :]] = TemplateIndexEntry(
+                entry.is_binary,
+                entry.size,
+                0,
+                entry.hash_value if entry.is_binary else None,
+            )
+
+    return TemplateIndex(template_dir.resolve(), entries)
+
+
+# ----------------------------------------------------------------------
+def _CreateDirectories(
+    project_dir: str,
+    output_dir: Path | str,
+    context: dict[str, Any],
+    env: Environment,
+    overwrite_if_exists: bool,
+    bundled_template: Optional[BundledTemplate],
+) -> list[_RenderTask]:
+    """Create all output directories (copying those that should not be rendered) and return the files to render; the working directory must be the template directory"""
+
+    tasks: list[_RenderTask] = []
+
+    for root, dirs, files in os.walk(".") if bundled_template is None else bundled_template.Walk():
+        render_dirs: list[str] = []
+
+        for d in sorted(dirs):
+            indir = os.path.normpath(os.path.join(root, d))
+
+            if not is_copy_only_path(indir, context):
+                render_dirs.append(d)
+                continue
+
+            outdir = env.from_string(os.path.normpath(os.path.join(project_dir, indir))).render(
+                **context
+            )
+
+            if os.path.isdir(outdir):
+                shutil.rmtree(outdir)
+
+            if bundled_template is None:
+                shutil.copytree(indir, outdir)
+            else:
+                bundled_template.CopyTree(indir, outdir)
+
+        # Only walk the directories that will be rendered; the others were copied above
+        dirs[:] = render_dirs
+
+        for d in dirs:
+            unrendered_dir = os.path.join(project_dir, root, d)
+
+            try:
+                render_and_create_dir(unrendered_dir, context, output_dir, env, overwrite_if_exists)
+            except UndefinedError as err:
+                raise UndefinedVariableInTemplate(
+                    f"Unable to create directory '{os.path.relpath(unrendered_dir, output_dir)}'",
+                    err,
+                    context,
+                ) from err
+
+        for f in sorted(files):
+            infile = os.path.normpath(os.path.join(root, f))
+            tasks.append((infile, is_copy_only_path(infile, context)))
+
+    return tasks
+
+
+# ----------------------------------------------------------------------
+def _SelectTasks(
+    tasks: list[_RenderTask],
+    context: dict[str, Any],
+    env: Environment,
+    path_selection: PathSelection,
+) -> list[_RenderTask]:
+    """Returns the tasks whose output files are selected"""
+
+    selected_tasks: list[_RenderTask] = []
+
+    for task in tasks:
+        try:
+            outfile = env.from_string(task[0]).render(**context)
+        except UndefinedError:
+            # The error is reported when the file is rendered
+            selected_tasks.append(task)
+            continue
+
+        if path_selection.IsSelected(Path(outfile).as_posix()):
+            selected_tasks.append(task)
+
+    return selected_tasks
+
+
+# ----------------------------------------------------------------------
+def _PartitionTasks(
+    template_index: TemplateIndex,
+    tasks: list[_RenderTask],
+    num_partitions: int,
+) -> list[list[_RenderTask]]:
+    """Distribute the tasks so that each partition contains roughly the same number of bytes"""
+
+    partitions: list[list[_RenderTask]] = [[] for _ in range(num_partitions)]
+    heap: list[tuple[int, int]] = [(0, index) for index in range(num_partitions)]
+
+    sized_tasks: list[tuple[int, _RenderTask]] = []
+
+    for task in tasks:
+        entry = template_index.GetEntry(task[0])
+        sized_tasks.append((entry.size if entry is not None else 0, task))
+
+    sized_tasks.sort(key=lambda value: value[0], reverse=True)
+
+    for size, task in sized_tasks:
+        partition_size, partition_index = heapq.heappop(heap)
+
+        partitions[partition_index].append(task)
+        heapq.heappush(heap, (partition_size + size, partition_index))
+
+    return [partition for partition in partitions if partition]
+
+
+# ----------------------------------------------------------------------
+def _RenderTasks(
+    env: Environment,
+    context: dict[str, Any],
+    template_index: TemplateIndex,
+    bundled_template: Optional[BundledTemplate],
+    project_dir: str,
+    tasks: list[_RenderTask],
+    skip_if_file_exists: bool,
+    on_file_rendered: Optional[Callable[[str, KnownFileHash], None]] = None,
+) -> _RenderResult:
+    """Render the tasks, returning the hashes of the files written and information about the first file that could not be rendered (if any)"""
+
+    known_hashes: dict[str, KnownFileHash] = {}
+
+    for infile, copy_only in tasks:
+        try:
+            if copy_only:
+                outfile = os.path.join(project_dir, env.from_string(infile).render(**context))
+                hash_value = _CopyFile(infile, outfile, bundled_template)
+            else:
+                result = _GenerateFile(
+                    project_dir,
+                    infile,
+                    context,
+                    env,
+                    template_index,
+                    bundled_template,
+                    skip_if_file_exists,
+                )
+                if result is None:
+                    continue
+
+                outfile, hash_value = result
+
+        except UndefinedError as err:
+            return known_hashes, (infile, err)
+
+        filename = os.path.abspath(outfile)
+        known_hash = KnownFileHash.Create(Path(outfile), hash_value)
+
+        known_hashes[filename] = known_hash
+
+        if on_file_rendered is not None:
+            on_file_rendered(filename, known_hash)
+
+    return known_hashes, None
+
+
+# ----------------------------------------------------------------------
+def _GenerateFile(
+    project_dir: str,
+    infile: str,
+    context: dict[str, Any],
+    env: Environment,
+    template_index: TemplateIndex,
+    bundled_template: Optional[BundledTemplate],
+    skip_if_file_exists: bool,
+) -> Optional[tuple[str, str]]:
+    """
+    Equivalent to cookiecutter's `generate_file`, except that rendered content is streamed to disk rather
+    than being rendered to a string first. Returns the output filename and the hash of its contents or
+    None if the file was not generated.
+    """
+
+    outfile = os.path.join(project_dir, env.from_string(infile).render(**context))
+
+    if os.path.isdir(outfile):
+        # The rendered file name is empty
+        return None
+
+    if skip_if_file_exists and os.path.exists(outfile):
+        return None
+
+    entry = template_index.GetEntry(infile)
+
+    if entry is not None and entry.is_binary:
+        assert entry.hash_value is not None
+
+        # Binary files are copied verbatim (copyfile uses zero-copy mechanisms when available) and
+        # their hash values were calculated when the template was indexed.
+        if bundled_template is None:
+            shutil.copyfile(infile, outfile)
+            shutil.copymode(infile, outfile)
+        else:
+            bundled_template.WriteFile(infile, outfile)
+
+        return outfile, entry.hash_value
+
+    if entry is None and is_binary(infile):
+        return outfile, _CopyFile(infile, outfile, None)
+
+    try:
+        # Force forward slashes on Windows for get_template (this is a by-design Jinja issue)
+        template = env.get_template(infile.replace(os.path.sep, "/"))
+    except TemplateSyntaxError as ex:
+        # Disable translated so that the exception contains verbose information about the error location
+        ex.translated = False
+        raise
+
+    newline = context["cookiecutter"].get("_new_lines", False)
+    if not newline:
+        # Detect the newline used in the original file; note that newlines can be a tuple if the
+        # file contains mixed line endings, in which case the first line ending detected is used.
+        with (
+            open(infile, encoding="utf-8")
+            if bundled_template is None
+            else io.TextIOWrapper(io.BytesIO(bundled_template.Read(infile)), encoding="utf-8")
+        ) as f:
+            f.readline()
+
+        newline = f.newlines[0] if isinstance(f.newlines, tuple) else f.newlines
+
+    # Translate newlines in the same way that a file opened in text mode with this newline value would
+    if newline is None:
+        newline = os.linesep
+
+    translate_newlines = newline not in ["", "\n"]
+
+    hasher = hashlib.sha256()
+
+    with open(outfile, "wb") as f:
+        pending: list[str] = []
+        pending_size = 0
+
+        for chunk in itertools.chain(template.generate(**context), [None]):
+            if chunk is not None:
+                pending.append(chunk)
+                pending_size += len(chunk)
+
+                if pending_size < _STREAMING_BUFFER_SIZE:
+                    continue
+
+            content = "".join(pending)
+            if translate_newlines:
+                content = content.replace("\n", newline)
+
+            encoded_content = content.encode("utf-8")
+
+            hasher.update(encoded_content)
+            f.write(encoded_content)
+
+            pending = []
+            pending_size = 0
+
+    if bundled_template is None:
+        shutil.copymode(infile, outfile)
+    else:
+        bundled_template.CopyMode(infile, outfile)
+
+    return outfile, hasher.hexdigest()
+
+
+# ----------------------------------------------------------------------
+def _CopyFile(
+    infile: str,
+    outfile: str,
+    bundled_template: Optional[BundledTemplate],
+) -> str:
+    """Copy the file without rendering it, returning the hash of its contents"""
+
+    if bundled_template is not None:
+        return bundled_template.WriteFile(infile, outfile)
+
+    hasher = hashlib.sha256()
+
+    with open(infile, "rb") as source, open(outfile, "wb") as dest:
+        while True:
+            chunk = source.read(_STREAMING_BUFFER_SIZE)
+            if not chunk:
+                break
+
+            hasher.update(chunk)
+            dest.write(chunk)
+
+    shutil.copymode(infile, outfile)
+
+    return hasher.hexdigest()
+
+
+# ----------------------------------------------------------------------
+def _InitializeWorker(
+    repo_dir: str,
+    template_index: TemplateIndex,
+    bundle: Optional[TemplateBundle],
+    context: dict[str, Any],
+) -> None:
+    global _worker_env  # pylint: disable=global-statement
+    global _worker_context  # pylint: disable=global-statement
+    global _worker_template_index  # pylint: disable=global-statement
+    global _worker_bundled_template  # pylint: disable=global-statement
+
+    # Make the template's extensions (for example, local_extensions.py) importable
+    if repo_dir not in sys.path:
+        sys.path.append(repo_dir)
+
+    os.chdir(template_index.template_dir)
+
+    # The bundle is opened by this process when it is unpickled and remains open for the lifetime of the process
+    _worker_bundled_template = (
+        bundle.GetTemplate(template_index.template_dir) if bundle is not None else None
+    )
+
+    _worker_env = create_env_with_context(context)
+    _worker_env.loader = _CreateLoader(str(template_index.template_dir), _worker_bundled_template)
+
+    _worker_context = context
+    _worker_template_index = template_index
+
+
+# ----------------------------------------------------------------------
+def _RenderPartition(
+    project_dir: str,
+    tasks: list[_RenderTask],
+    skip_if_file_exists: bool,
+) -> _RenderResult:
+    assert _worker_env is not None
+    assert _worker_context is not None
+    assert _worker_template_index is not None
+
+    return _RenderTasks(
+        _worker_env,
+        _worker_context,
+        _worker_template_index,
+        _worker_bundled_template,
+        project_dir,
+        tasks,
+        skip_if_file_exists,
+    )
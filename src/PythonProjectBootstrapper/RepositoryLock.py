@@ -0,0 +1,143 @@
+# ----------------------------------------------------------------------
+# |
+# |  Copyright (c) 2024 Scientific Software Engineering Center at Georgia Tech
+# |  Distributed under the MIT License.
+# |
+# ----------------------------------------------------------------------
+"""Advisory lock that serializes modifications made to an output directory by multiple processes"""
+
+import os
+import time
+
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+from dbrownell_Common import PathEx
+
+
+# Name of the lock file created in output directories that are not git repositories
+lock_filename: str = ".python_project_bootstrapper.lock"
+
+
+# ----------------------------------------------------------------------
+def GetLockFilename(output_dir: Path) -> Path:
+    """Returns the name of the lock file for an output directory; the file is created within the `.git` directory (so that it is never committed) when the output directory is a git repository"""
+
+    git_dir = output_dir / ".git"
+    if git_dir.is_dir():
+        return git_dir / "PythonProjectBootstrapper" / "repository.lock"
+
+    return output_dir / lock_filename
+
+
+# ----------------------------------------------------------------------
+@contextmanager
+def AcquireRepositoryLock(
+    output_dir: Path,
+    timeout: Optional[float] = None,
+    poll_interval: float = 0.05,
+) -> Iterator[Path]:
+    """
+    Acquire an exclusive advisory lock for an output directory, waiting for other processes that hold the lock.
+
+    The lock is associated with an open file handle, so it is released by the operating system if the
+    process terminates unexpectedly.
+
+    Args:
+        output_dir (Path): Output directory
+        timeout (Optional[float], optional): Maximum number of seconds to wait for the lock; wait indefinitely when None. Defaults to None.
+        poll_interval (float, optional): Number of seconds between attempts to acquire the lock. Defaults to 0.05.
+
+    Yields:
+        Path: The lock file
+    """
+    PathEx.EnsureDir(output_dir)
+
+    lock_path = GetLockFilename(output_dir)
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+
+    deadline = None if timeout is None else time.monotonic() + timeout
+
+    while True:
+        fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+
+        if _TryLock(fd):
+            # The file may have been removed (and possibly recreated) by the previous owner after this
+            # process opened it; the lock is only valid if it is held on the file that currently exists.
+            try:
+                is_current = os.path.samestat(os.fstat(fd), os.stat(lock_path))
+            except FileNotFoundError:
+                is_current = False
+
+            if is_current:
+                break
+
+            _Unlock(fd)
+
+        os.close(fd)
+
+        if deadline is not None and time.monotonic() >= deadline:
+            raise TimeoutError(
+                "The lock for '{}' could not be acquired within {} seconds; another process is modifying the directory.".format(
+                    output_dir,
+                    timeout,
+                ),
+            )
+
+        time.sleep(poll_interval)
+
+    try:
+        yield lock_path
+
+    finally:
+        # Remove the file before the lock is released; processes waiting on the removed file detect that it
+        # was removed once they acquire the lock. Open files can't be removed on Windows, so the file remains.
+        try:
+            lock_path.unlink()
+        except OSError:
+            pass
+
+        _Unlock(fd)
+        os.close(fd)
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+if os.name == "nt":
+    import msvcrt  # pylint: disable=import-error
+
+    # ----------------------------------------------------------------------
+    def _TryLock(fd: int) -> bool:
+        try:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)  # type: ignore [attr-defined]
+        except OSError:
+            return False
+
+        return True
+
+    # ----------------------------------------------------------------------
+    def _Unlock(fd: int) -> None:
+        try:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)  # type: ignore [attr-defined]
+        except OSError:
+            pass
+
+else:
+    import fcntl
+
+    # ----------------------------------------------------------------------
+    def _TryLock(fd: int) -> bool:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            return False
+
+        return True
+
+    # ----------------------------------------------------------------------
+    def _Unlock(fd: int) -> None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
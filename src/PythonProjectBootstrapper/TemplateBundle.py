@@ -0,0 +1,362 @@
+# ----------------------------------------------------------------------
+# |
+# |  Copyright (c) 2024 Scientific Software Engineering Center at Georgia Tech
+# |  Distributed under the MIT License.
+# |
+# ----------------------------------------------------------------------
+"""Single-file bundle of project templates, read through a memory map"""
+
+# Note that this module is also used when the package is built (see ../../setup.py), so it should only
+# import modules from the standard library and binaryornot.
+
+import hashlib
+import json
+import mmap
+import os
+import stat
+import struct
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional
+
+from binaryornot.check import is_binary
+
+
+# Name of the bundle file, written to the directory that contains the project templates
+template_bundle_filename: str = "templates.bundle"
+
+# The bundle begins with a header (magic value and index size), followed by the JSON-encoded index and
+# the content of each file.
+_MAGIC = b"PPBTB\x00\x00\x01"
+_HEADER = struct.Struct("<8sQ")
+
+
+# ----------------------------------------------------------------------
+@dataclass(frozen=True)
+class TemplateBundleEntry:
+    """Information about a file within a bundle"""
+
+    # Offset relative to the beginning of the content section
+    offset: int
+    size: int
+    mode: int
+    is_binary: bool
+    hash_value: str
+
+
+# ----------------------------------------------------------------------
+class TemplateBundle:
+    """
+    Project template files stored in a single file with an index of their locations and hash values.
+
+    The bundle is memory mapped when opened, so loading a template requires a single file to be opened
+    regardless of the number of files within it. Paths within the bundle are posix paths relative to the
+    directory that contains the project templates (for example, "package/cookiecutter.json").
+    """
+
+    # ----------------------------------------------------------------------
+    def __init__(
+        self,
+        filename: Path,
+        content: mmap.mmap,
+        content_offset: int,
+        entries: dict[str, TemplateBundleEntry],
+        directories: list[str],
+    ):
+        self.filename = filename
+        self.entries = entries
+        self.directories = directories
+
+        self._content: Optional[mmap.mmap] = content
+        self._content_offset = content_offset
+
+    # ----------------------------------------------------------------------
+    @classmethod
+    def Open(cls, filename: Path) -> "TemplateBundle":
+        with filename.open("rb") as f:
+            try:
+                content = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as ex:
+                raise Exception(f"'{filename}' is not a valid template bundle.") from ex
+
+        try:
+            if len(content) < _HEADER.size:
+                raise Exception(f"'{filename}' is not a valid template bundle.")
+
+            magic, index_size = _HEADER.unpack_from(content, 0)
+            if magic != _MAGIC:
+                raise Exception(f"'{filename}' is not a valid template bundle.")
+
+            index = json.loads(content[_HEADER.size : _HEADER.size + index_size])
+
+        except BaseException:
+            content.close()
+            raise
+
+        return cls(
+            filename,
+            content,
+            _HEADER.size + index_size,
+            {key: TemplateBundleEntry(*value) for key, value in index["files"].items()},
+            index["directories"],
+        )
+
+    # ----------------------------------------------------------------------
+    def Close(self) -> None:
+        if self._content is not None:
+            self._content.close()
+            self._content = None
+
+    # ----------------------------------------------------------------------
+    def __enter__(self) -> "TemplateBundle":
+        return self
+
+    # ----------------------------------------------------------------------
+    def __exit__(self, *args) -> None:
+        self.Close()
+
+    # ----------------------------------------------------------------------
+    def __reduce__(self):
+        # Memory maps can't be pickled; worker processes open the bundle themselves
+        return (TemplateBundle.Open, (self.filename,))
+
+    # ----------------------------------------------------------------------
+    def Read(self, path: str) -> bytes:
+        """Returns the content of a file within the bundle"""
+
+        assert self._content is not None
+
+        entry = self.entries.get(path)
+        if entry is None:
+            raise FileNotFoundError(f"'{path}' does not exist in '{self.filename}'.")
+
+        start = self._content_offset + entry.offset
+        return self._content[start : start + entry.size]
+
+    # ----------------------------------------------------------------------
+    def GetTemplate(self, template_dir: Path) -> Optional["BundledTemplate"]:
+        """Returns the bundled content of a template directory (for example, "<root>/package/{{ cookiecutter.__empty_dir }}") or None if the directory isn't in the bundle"""
+
+        try:
+            prefix = template_dir.resolve().relative_to(self.filename.parent.resolve()).as_posix()
+        except ValueError:
+            return None
+
+        if prefix not in self.directories:
+            return None
+
+        return BundledTemplate(self, prefix)
+
+
+# ----------------------------------------------------------------------
+class BundledTemplate:
+    """Files within a template directory that are stored in a bundle; paths are relative to that directory"""
+
+    # ----------------------------------------------------------------------
+    def __init__(
+        self,
+        bundle: TemplateBundle,
+        prefix: str,
+    ):
+        self.bundle = bundle
+        self.prefix = prefix
+
+    # ----------------------------------------------------------------------
+    def GetEntry(self, relative_path: str) -> Optional[TemplateBundleEntry]:
+        return self.bundle.entries.get(self._GetPath(relative_path))
+
+    # ----------------------------------------------------------------------
+    def Read(self, relative_path: str) -> bytes:
+        return self.bundle.Read(self._GetPath(relative_path))
+
+    # ----------------------------------------------------------------------
+    def Walk(self) -> Iterator[tuple[str, list[str], list[str]]]:
+        """Equivalent to `os.walk(".")` when the template directory is the working directory; directories removed from the yielded list are not walked"""
+
+        children: dict[str, tuple[list[str], list[str]]] = {self.prefix: ([], [])}
+        prefix = self.prefix + "/"
+
+        for directory in self.bundle.directories:
+            if directory.startswith(prefix):
+                children[directory] = ([], [])
+
+        for directory in children:
+            if directory != self.prefix:
+                parent, name = directory.rsplit("/", 1)
+                children[parent][0].append(name)
+
+        for path in self.bundle.entries:
+            if path.startswith(prefix):
+                parent, name = path.rsplit("/", 1)
+                children[parent][1].append(name)
+
+        # ----------------------------------------------------------------------
+        def Impl(directory: str, root: str) -> Iterator[tuple[str, list[str], list[str]]]:
+            dirs, files = children[directory]
+            dirs = list(dirs)
+
+            yield root, dirs, list(files)
+
+            for name in dirs:
+                yield from Impl(f"{directory}/{name}", os.path.join(root, name))
+
+        # ----------------------------------------------------------------------
+
+        yield from Impl(self.prefix, ".")
+
+    # ----------------------------------------------------------------------
+    def WriteFile(self, relative_path: str, output_filename: str) -> str:
+        """Write a file verbatim (including its mode), returning its hash value"""
+
+        return self._WriteFile(self._GetPath(relative_path), output_filename)
+
+    # ----------------------------------------------------------------------
+    def CopyMode(self, relative_path: str, output_filename: str) -> None:
+        entry = self.GetEntry(relative_path)
+        assert entry is not None, relative_path
+
+        os.chmod(output_filename, entry.mode)
+
+    # ----------------------------------------------------------------------
+    def CopyTree(self, relative_path: str, output_dir: str) -> None:
+        """Equivalent to `shutil.copytree` when the template directory is the working directory"""
+
+        path = self._GetPath(relative_path)
+        prefix = path + "/"
+
+        os.makedirs(output_dir)
+
+        for directory in self.bundle.directories:
+            if directory.startswith(prefix):
+                os.makedirs(os.path.join(output_dir, directory[len(prefix) :]), exist_ok=True)
+
+        for bundle_path in self.bundle.entries:
+            if bundle_path.startswith(prefix):
+                self._WriteFile(bundle_path, os.path.join(output_dir, bundle_path[len(prefix) :]))
+
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    def _WriteFile(self, path: str, output_filename: str) -> str:
+        entry = self.bundle.entries[path]
+
+        with open(output_filename, "wb") as f:
+            f.write(self.bundle.Read(path))
+
+        os.chmod(output_filename, entry.mode)
+
+        return entry.hash_value
+
+    # ----------------------------------------------------------------------
+    def _GetPath(self, relative_path: str) -> str:
+        relative_path = os.path.normpath(relative_path).replace(os.path.sep, "/")
+
+        if relative_path == ".":
+            return self.prefix
+
+        if relative_path.startswith("../"):
+            # Paths may refer to siblings of the template directory (for example, "../templates")
+            return "{}/{}".format(self.prefix.rsplit("/", 1)[0], relative_path[3:])
+
+        return f"{self.prefix}/{relative_path}"
+
+
+# ----------------------------------------------------------------------
+def FindTemplateBundle(templates_root_dir: Path) -> Optional[Path]:
+    """Returns the bundle in the directory that contains the project templates (if any)"""
+
+    filename = templates_root_dir / template_bundle_filename
+    return filename if filename.is_file() else None
+
+
+# ----------------------------------------------------------------------
+def CreateTemplateBundle(
+    templates_root_dir: Path,
+    project_names: list[str],
+    output_filename: Path,
+) -> int:
+    """
+    Create a bundle that contains the files of one or more project templates.
+
+    Args:
+        templates_root_dir (Path): Directory that contains the project templates
+        project_names (list[str]): Names of the projects to include
+        output_filename (Path): Name of the bundle to create
+
+    Returns:
+        int: Number of files in the bundle
+    """
+
+    directories: list[str] = []
+    filenames: list[tuple[str, Path]] = []
+
+    for project_name in sorted(project_names):
+        for root, dirs, files in os.walk(templates_root_dir / project_name):
+            dirs[:] = sorted(d for d in dirs if d != "__pycache__")
+
+            root_path = Path(root)
+            directories.append(root_path.relative_to(templates_root_dir).as_posix())
+
+            for file in sorted(files):
+                fullpath = root_path / file
+                filenames.append((fullpath.relative_to(templates_root_dir).as_posix(), fullpath))
+
+    # Calculate the index before writing any content, as the index precedes the content
+    entries: dict[str, list] = {}
+    offset = 0
+
+    for path, fullpath in filenames:
+        hasher = hashlib.sha256()
+
+        with fullpath.open("rb") as f:
+            while True:
+                chunk = f.read(64 * 1024)
+                if not chunk:
+                    break
+
+                hasher.update(chunk)
+
+        status = fullpath.stat()
+
+        entries[path] = [
+            offset,
+            status.st_size,
+            stat.S_IMODE(status.st_mode),
+            is_binary(str(fullpath)),
+            hasher.hexdigest(),
+        ]
+
+        offset += status.st_size
+
+    index = json.dumps({"directories": directories, "files": entries}).encode("utf-8")
+
+    output_filename.parent.mkdir(parents=True, exist_ok=True)
+    temp_filename = output_filename.with_suffix(".{}.tmp".format(os.getpid()))
+
+    try:
+        with temp_filename.open("wb") as f:
+            f.write(_HEADER.pack(_MAGIC, len(index)))
+            f.write(index)
+
+            for path, fullpath in filenames:
+                num_bytes = 0
+
+                with fullpath.open("rb") as source:
+                    while True:
+                        chunk = source.read(64 * 1024)
+                        if not chunk:
+                            break
+
+                        f.write(chunk)
+                        num_bytes += len(chunk)
+
+                if num_bytes != entries[path][1]:
+                    raise Exception(f"'{fullpath}' was modified while the bundle was created.")
+
+        os.replace(temp_filename, output_filename)
+
+    except BaseException:
+        temp_filename.unlink(missing_ok=True)
+        raise
+
+    return len(filenames)
@@ -0,0 +1,154 @@
+# ----------------------------------------------------------------------
+# |
+# |  Copyright (c) 2024 Scientific Software Engineering Center at Georgia Tech
+# |  Distributed under the MIT License.
+# |
+# ----------------------------------------------------------------------
+"""Index of the files in a template directory, cached across invocations"""
+
+import hashlib
+import json
+import os
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from binaryornot.check import is_binary
+from dbrownell_Common import PathEx
+
+from PythonProjectBootstrapper import __version__
+from PythonProjectBootstrapper.CacheDirectory import GetCacheDirectory
+from PythonProjectBootstrapper.ProjectGenerationUtils import GenerateFileHash
+
+
+# ----------------------------------------------------------------------
+@dataclass(frozen=True)
+class TemplateIndexEntry:
+    """Information about a file within a template directory"""
+
+    is_binary: bool
+    size: int
+    mtime_ns: int
+
+    # Hash values are only calculated for binary files, as they are copied verbatim
+    hash_value: Optional[str] = None
+
+
+# ----------------------------------------------------------------------
+@dataclass(frozen=True)
+class TemplateIndex:
+    """Files within a template directory, keyed by their posix path relative to that directory"""
+
+    template_dir: Path
+    entries: dict[str, TemplateIndexEntry]
+
+    # ----------------------------------------------------------------------
+    def GetEntry(self, relative_filename: str) -> Optional[TemplateIndexEntry]:
+        return self.entries.get(relative_filename.replace(os.path.sep, "/"))
+
+
+# ----------------------------------------------------------------------
+def LoadTemplateIndex(
+    template_dir: Path,
+    cache_dir: Optional[Path] = None,
+) -> TemplateIndex:
+    """
+    Load the index for a template directory. Binary files are detected and hashed once per template version;
+    cached entries are reused as long as the file's size and modification time have not changed.
+
+    Args:
+        template_dir (Path): Template directory to index
+        cache_dir (Optional[Path], optional): Directory used to cache indexes. Defaults to a directory within GetCacheDirectory().
+
+    Returns:
+        TemplateIndex: The template index
+    """
+    PathEx.EnsureDir(template_dir)
+
+    template_dir = template_dir.resolve()
+    cache_filename = (cache_dir or GetCacheDirectory() / "TemplateIndexes") / "{}.json".format(
+        hashlib.sha256("{}|{}".format(__version__, template_dir).encode("utf-8")).hexdigest()[:32],
+    )
+
+    cached_entries = _ReadCachedEntries(cache_filename)
+
+    entries: dict[str, TemplateIndexEntry] = {}
+
+    for root, _, files in os.walk(template_dir):
+        root_path = Path(root)
+
+        for file in files:
+            fullpath = root_path / file
+            relative_filename = fullpath.relative_to(template_dir).as_posix()
+
+            status = fullpath.stat()
+
+            entry = cached_entries.get(relative_filename)
+
+            if (
+                entry is None
+                or entry.size != status.st_size
+                or entry.mtime_ns != status.st_mtime_ns
+            ):
+                file_is_binary = is_binary(str(fullpath))
+
+                entry = TemplateIndexEntry(
+                    file_is_binary,
+                    status.st_size,
+                    status.st_mtime_ns,
+                    GenerateFileHash(fullpath) if file_is_binary else None,
+                )
+
+            entries[relative_filename] = entry
+
+    if entries != cached_entries:
+        _WriteCachedEntries(cache_filename, entries)
+
+    return TemplateIndex(template_dir, entries)
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _ReadCachedEntries(cache_filename: Path) -> dict[str, TemplateIndexEntry]:
+    try:
+        with cache_filename.open() as f:
+            content = json.load(f)
+
+        if content.get("version") != __version__:
+            return {}
+
+        return {key: TemplateIndexEntry(*value) for key, value in content["entries"].items()}
+
+    except (OSError, ValueError, KeyError, TypeError):
+        return {}
+
+
+# ----------------------------------------------------------------------
+def _WriteCachedEntries(
+    cache_filename: Path,
+    entries: dict[str, TemplateIndexEntry],
+) -> None:
+    # The cache is an optimization, so failures to write it are not errors
+    try:
+        cache_filename.parent.mkdir(parents=True, exist_ok=True)
+
+        temp_filename = cache_filename.with_suffix(".{}.tmp".format(os.getpid()))
+
+        with temp_filename.open("w") as f:
+            json.dump(
+                {
+                    "version": __version__,
+                    "entries": {
+                        key: [entry.is_binary, entry.size, entry.mtime_ns, entry.hash_value]
+                        for key, entry in entries.items()
+                    },
+                },
+                f,
+            )
+
+        os.replace(temp_filename, cache_filename)
+
+    except OSError:
+        pass
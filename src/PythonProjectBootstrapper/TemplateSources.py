@@ -0,0 +1,319 @@
+# ----------------------------------------------------------------------
+# |
+# |  Copyright (c) 2024 Scientific Software Engineering Center at Georgia Tech
+# |  Distributed under the MIT License.
+# |
+# ----------------------------------------------------------------------
+"""Project templates provided by local directories and local git repositories, in addition to those bundled with the package"""
+
+import json
+import os
+import shutil
+import subprocess
+import tarfile
+import tempfile
+import time
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from PythonProjectBootstrapper.CacheDirectory import GetCacheDirectory
+
+
+# Suffix of the file (alongside each cached worktree) that contains information about the worktree; its
+# modification time is the time at which the worktree was last used.
+_METADATA_SUFFIX = ".json"
+
+# Temporary directories older than this number of seconds were abandoned while a worktree was being populated
+_ABANDONED_TEMP_DIR_AGE = 60 * 60
+
+
+# ----------------------------------------------------------------------
+@dataclass(frozen=True)
+class CachedTemplate:
+    """Worktree in the template cache, containing the content of a git commit"""
+
+    commit_id: str
+    directory: Path
+
+    # Repository and ref most recently resolved to this commit
+    repository: str
+    ref: str
+
+    # Total size of the files in the worktree, in bytes
+    size: int
+
+    # Time (seconds since the epoch) at which the worktree was last used
+    last_used: float
+
+
+# ----------------------------------------------------------------------
+def ResolveTemplateSource(
+    source: str,
+    cache_dir: Optional[Path] = None,
+) -> Path:
+    """
+    Returns the templates root directory (the directory that contains a subdirectory for each project) of a
+    template source.
+
+    Sources are in one of these forms:
+
+        <directory>         A local directory, used in place
+        <directory>@<ref>   A directory within a local git repository at a branch, tag, or commit
+
+    The content of a git commit is exported to a worktree in the template cache, keyed by commit id, the
+    first time that it is used; later uses of any ref that resolves to the same commit use the existing
+    worktree. The repository is never modified and remotes are never contacted.
+
+    Args:
+        source (str): The template source
+        cache_dir (Optional[Path], optional): Directory that contains cached worktrees. Defaults to a directory within GetCacheDirectory().
+
+    Returns:
+        Path: The templates root directory
+    """
+
+    directory = Path(source)
+    if directory.is_dir():
+        return directory.resolve()
+
+    repository, sep, ref = source.rpartition("@")
+    if not sep or not repository or not ref:
+        raise Exception(f"'{source}' is not a directory or '<directory>@<ref>'.")
+
+    directory = Path(repository)
+    if not directory.is_dir():
+        raise Exception(f"'{repository}' is not a directory.")
+
+    prefix = _RunGit(directory, "rev-parse", "--show-prefix")
+    if prefix is None:
+        raise Exception(f"'{repository}' is not within a git repository.")
+
+    commit_id = _RunGit(directory, "rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}")
+    if commit_id is None:
+        raise Exception(f"'{ref}' is not a valid ref in '{repository}'.")
+
+    cache_dir = cache_dir or _GetDefaultCacheDir()
+
+    worktree_dir = cache_dir / commit_id
+    if not worktree_dir.is_dir():
+        # `git archive` only exports the current directory when invoked within a subdirectory
+        repo_dir = _RunGit(directory, "rev-parse", "--show-toplevel")
+        assert repo_dir is not None
+
+        _CreateWorktree(Path(repo_dir), commit_id, worktree_dir)
+
+    # Record the source and the time of use (which is used to evict worktrees that are no longer used)
+    metadata_filename = worktree_dir.with_name(worktree_dir.name + _METADATA_SUFFIX)
+
+    try:
+        with metadata_filename.open("w") as f:
+            json.dump({"repository": str(directory.resolve()), "ref": ref}, f)
+    except OSError:
+        pass
+
+    return worktree_dir / prefix.rstrip("/")
+
+
+# ----------------------------------------------------------------------
+def GetCachedTemplates(
+    cache_dir: Optional[Path] = None,
+) -> list[CachedTemplate]:
+    """Returns the worktrees in the template cache, most recently used first"""
+
+    cache_dir = cache_dir or _GetDefaultCacheDir()
+    if not cache_dir.is_dir():
+        return []
+
+    results: list[CachedTemplate] = []
+
+    for item in cache_dir.iterdir():
+        # Directories that are still being populated (or were abandoned) have a suffix
+        if not item.is_dir() or "." in item.name:
+            continue
+
+        metadata_filename = item.with_name(item.name + _METADATA_SUFFIX)
+
+        try:
+            with metadata_filename.open() as f:
+                metadata = json.load(f)
+
+            last_used = metadata_filename.stat().st_mtime
+        except (OSError, ValueError):
+            metadata = {}
+            last_used = item.stat().st_mtime
+
+        results.append(
+            CachedTemplate(
+                item.name,
+                item,
+                metadata.get("repository", ""),
+                metadata.get("ref", ""),
+                _GetSize(item),
+                last_used,
+            ),
+        )
+
+    results.sort(key=lambda cached_template: cached_template.last_used, reverse=True)
+
+    return results
+
+
+# ----------------------------------------------------------------------
+def PruneCachedTemplates(
+    *,
+    max_age: Optional[float] = None,
+    max_entries: Optional[int] = None,
+    cache_dir: Optional[Path] = None,
+) -> list[CachedTemplate]:
+    """
+    Remove worktrees from the template cache; all worktrees are removed when no limits are provided.
+
+    Args:
+        max_age (Optional[float], optional): Remove worktrees that have not been used within this number of seconds. Defaults to None.
+        max_entries (Optional[int], optional): Remove the least recently used worktrees beyond this number. Defaults to None.
+        cache_dir (Optional[Path], optional): Directory that contains cached worktrees. Defaults to a directory within GetCacheDirectory().
+
+    Returns:
+        list[CachedTemplate]: The worktrees removed
+    """
+
+    cache_dir = cache_dir or _GetDefaultCacheDir()
+
+    cached_templates = GetCachedTemplates(cache_dir)
+
+    if max_age is None and max_entries is None:
+        removed = cached_templates
+    else:
+        removed = []
+        now = time.time()
+
+        for index, cached_template in enumerate(cached_templates):
+            if (max_entries is not None and index >= max_entries) or (
+                max_age is not None and now - cached_template.last_used > max_age
+            ):
+                removed.append(cached_template)
+
+    for cached_template in removed:
+        shutil.rmtree(cached_template.directory, ignore_errors=True)
+
+        metadata_filename = cached_template.directory.with_name(
+            cached_template.directory.name + _METADATA_SUFFIX
+        )
+        metadata_filename.unlink(missing_ok=True)
+
+    # Remove the remnants of worktrees that were abandoned while they were being populated
+    if cache_dir.is_dir():
+        now = time.time()
+
+        for item in cache_dir.iterdir():
+            if (
+                item.is_dir()
+                and item.suffix == ".tmp"
+                and now - item.stat().st_mtime > _ABANDONED_TEMP_DIR_AGE
+            ):
+                shutil.rmtree(item, ignore_errors=True)
+
+    return removed
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _GetDefaultCacheDir() -> Path:
+    return GetCacheDirectory() / "Templates"
+
+
+# ----------------------------------------------------------------------
+def _RunGit(repo_dir: Path, *args: str) -> Optional[str]:
+    try:
+        result = subprocess.run(
+            ["git", *args],
+            cwd=repo_dir,
+            capture_output=True,
+            check=False,
+            text=True,
+        )
+    except OSError:
+        return None
+
+    if result.returncode != 0:
+        return None
+
+    return result.stdout.strip()
+
+
+# ----------------------------------------------------------------------
+def _CreateWorktree(repo_dir: Path, commit_id: str, worktree_dir: Path) -> None:
+    # The content is exported to a temporary directory that is renamed once it is complete, so a
+    # worktree is never used while it is partially populated (for example, by concurrent processes).
+    temp_dir = worktree_dir.with_name("{}.{}.tmp".format(worktree_dir.name, os.getpid()))
+
+    temp_dir.mkdir(parents=True)
+
+    try:
+        # Errors are written to a file rather than a pipe, as a pipe that isn't read until the archive has
+        # been extracted would block git once its buffer is full.
+        with tempfile.TemporaryFile() as error_file:
+            try:
+                with subprocess.Popen(
+                    ["git", "archive", "--format=tar", commit_id],
+                    cwd=repo_dir,
+                    stdout=subprocess.PIPE,
+                    stderr=error_file,
+                ) as process:
+                    assert process.stdout is not None
+
+                    try:
+                        with tarfile.open(fileobj=process.stdout, mode="r|") as archive:
+                            if hasattr(tarfile, "data_filter"):
+                                archive.extractall(temp_dir, filter="data")
+                            else:
+                                archive.extractall(temp_dir)  # pragma: no cover
+                    except BaseException:
+                        # Don't wait for a process that is blocked writing content that will never be read
+                        process.kill()
+                        raise
+
+            except tarfile.TarError:
+                # git doesn't write an archive when it fails, so report its error (below) when there is one
+                error_file.seek(0)
+
+                if process.returncode == 0 or not error_file.read():
+                    raise
+
+            if process.returncode != 0:
+                error_file.seek(0)
+                error = error_file.read().decode("utf-8", errors="replace")
+
+                raise Exception(
+                    f"The content of '{commit_id}' could not be exported: {error.strip()}"
+                )
+
+        try:
+            temp_dir.rename(worktree_dir)
+        except OSError:
+            # Another process created the worktree first
+            if not worktree_dir.is_dir():
+                raise
+
+            shutil.rmtree(temp_dir)
+
+    except BaseException:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        raise
+
+
+# ----------------------------------------------------------------------
+def _GetSize(directory: Path) -> int:
+    size = 0
+
+    for root, _, files in os.walk(directory):
+        for file in files:
+            try:
+                size += os.lstat(os.path.join(root, file)).st_size
+            except OSError:
+                continue
+
+    return size
@@ -0,0 +1,709 @@
+# ----------------------------------------------------------------------
+# |
+# |  Copyright (c) 2024 Scientific Software Engineering Center at Georgia Tech
+# |  Distributed under the MIT License.
+# |
+# ----------------------------------------------------------------------
+"""Tools that operate on projects previously generated by PythonProjectBootstrapper."""
+
+import json
+import sys
+import time
+
+from pathlib import Path
+from typing import Annotated, Any, Optional
+
+import typer
+import yaml
+
+from PythonProjectBootstrapper.CommandLine import CreateApp, version_option
+from PythonProjectBootstrapper.BulkCreation import (
+    CreateProjects,
+    GetOutputDirs,
+    LoadContexts,
+    WriteSummary,
+)
+from PythonProjectBootstrapper.Generation import ConflictPolicy
+from PythonProjectBootstrapper.History import DiffHistory, FindGeneration, LoadHistory
+from PythonProjectBootstrapper.ManifestVerification import VerifyManifest
+from PythonProjectBootstrapper.Matrix import (
+    CompareSnapshots,
+    CreatePermutations,
+    LoadSnapshots,
+    RenderPermutations,
+    SaveSnapshots,
+)
+from PythonProjectBootstrapper.TemplateSources import (
+    CachedTemplate,
+    GetCachedTemplates,
+    PruneCachedTemplates,
+)
+
+
+# ----------------------------------------------------------------------
+app = CreateApp(__doc__)
+
+templates_app = CreateApp(
+    "Manage the cache of template worktrees exported from local git repositories (see '--template-source')."
+)
+
+app.add_typer(templates_app, name="templates")
+
+
+# ----------------------------------------------------------------------
+@app.callback()
+def _Main(
+    version: Annotated[bool, version_option] = False,  # pylint: disable=unused-argument
+) -> None:
+    pass
+
+
+# ----------------------------------------------------------------------
+_output_dir_argument = typer.Argument(
+    exists=True,
+    file_okay=False,
+    resolve_path=True,
+    help="Directory previously populated by PythonProjectBootstrapper.",
+)
+
+_json_option = typer.Option("--json", help="Write the results as JSON.")
+
+_status_styles: dict[str, str] = {
+    "unchanged": "green",
+    "added": "green",
+    "modified": "yellow",
+    "missing": "red",
+    "removed": "red",
+    "created": "green",
+    "failed": "red",
+}
+
+_context_option = typer.Option(
+    "--context",
+    exists=True,
+    dir_okay=False,
+    resolve_path=True,
+    help="YAML file that contains template configuration values; values may be nested under 'default_context' (as in a cookiecutter configuration file).",
+)
+
+_workers_option = typer.Option(
+    "--workers",
+    min=1,
+    help="Maximum number of threads used to hash files; the default is determined by the system.",
+)
+
+
+# ----------------------------------------------------------------------
+@app.command("verify", no_args_is_help=True)
+def Verify(
+    output_dir: Annotated[Path, _output_dir_argument],
+    json_output: Annotated[bool, _json_option] = False,
+    include_unchanged: Annotated[
+        bool, typer.Option("--include-unchanged", help="Include unchanged files in the output.")
+    ] = False,
+    workers: Annotated[Optional[int], _workers_option] = None,
+    no_cache: Annotated[
+        bool,
+        typer.Option(
+            "--no-cache", help="Hash every file, even when its stat information is unchanged."
+        ),
+    ] = False,
+    git_index: Annotated[
+        bool,
+        typer.Option(
+            "--git-index",
+            help="Skip hashing tracked files that git reports as clean when their blob id is unchanged since they were last hashed.",
+        ),
+    ] = False,
+) -> None:
+    """Compare the files in the output directory with the manifest written when they were generated; exits with a non-zero return code when files were modified or are missing."""
+
+    result = VerifyManifest(
+        output_dir,
+        max_workers=workers,
+        use_cache=not no_cache,
+        use_git_index=git_index,
+    )
+
+    if json_output:
+        sys.stdout.write(
+            json.dumps(
+                {
+                    "unchanged": result.unchanged_files,
+                    "modified": result.modified_files,
+                    "missing": result.missing_files,
+                },
+                indent=2,
+            ),
+        )
+        sys.stdout.write("\n")
+    else:
+        from rich import print  # pylint: disable=redefined-builtin
+        from rich.table import Table
+
+        rows: list[tuple[str, str]] = []
+
+        rows += [("modified", filename) for filename in result.modified_files]
+        rows += [("missing", filename) for filename in result.missing_files]
+
+        if include_unchanged:
+            rows += [("unchanged", filename) for filename in result.unchanged_files]
+
+        if rows:
+            table = Table("Status", "File", title=str(output_dir), title_justify="left")
+
+            for status, filename in rows:
+                table.add_row(status, filename, style=_status_styles[status])
+
+            print(table)
+
+        sys.stdout.write(
+            "{} unchanged, {} modified, {} missing\n".format(
+                len(result.unchanged_files),
+                len(result.modified_files),
+                len(result.missing_files),
+            ),
+        )
+
+    if result.has_drift:
+        raise typer.Exit(1)
+
+
+# ----------------------------------------------------------------------
+@app.command("matrix", no_args_is_help=True)
+def Matrix(
+    project: Annotated[str, typer.Argument(help="Name of the project to render.")],
+    context_filename: Annotated[Optional[Path], _context_option] = None,
+    axis: Annotated[
+        Optional[list[str]],
+        typer.Option(
+            "--axis",
+            help="Values that vary across permutations, in the form '<name>=<value1>,<value2>,...'; choices and flags in the project's cookiecutter.json file are always varied.",
+        ),
+    ] = None,
+    sample: Annotated[
+        Optional[int],
+        typer.Option("--sample", min=1, help="Render a random sample of the permutations."),
+    ] = None,
+    seed: Annotated[int, typer.Option("--seed", help="Seed used when sampling permutations.")] = 0,
+    workers: Annotated[
+        Optional[int],
+        typer.Option(
+            "--workers",
+            min=1,
+            help="Maximum number of processes used to render permutations; the default is one process per CPU.",
+        ),
+    ] = None,
+    snapshots_filename: Annotated[
+        Optional[Path],
+        typer.Option(
+            "--snapshots",
+            dir_okay=False,
+            resolve_path=True,
+            help="JSON file that contains golden snapshots of the permutations' manifest digests.",
+        ),
+    ] = None,
+    update_snapshots: Annotated[
+        bool,
+        typer.Option(
+            "--update-snapshots", help="Write the rendered digests to the snapshots file."
+        ),
+    ] = False,
+    json_output: Annotated[bool, _json_option] = False,
+) -> None:
+    """Render permutations of a project's configuration values (with hooks enabled) and compare them with golden snapshots; exits with a non-zero return code when a permutation does not match its snapshot."""
+
+    if update_snapshots and snapshots_filename is None:
+        raise typer.BadParameter("'--snapshots' must be provided with '--update-snapshots'.")
+
+    base_context = _LoadContext(context_filename)
+
+    axes: dict[str, list[Any]] = {}
+
+    for value in axis or []:
+        name, sep, values = value.partition("=")
+        if not sep or not name:
+            raise typer.BadParameter(
+                f"'{value}' is not in the form '<name>=<value1>,<value2>,...'."
+            )
+
+        axes[name] = [yaml.safe_load(axis_value) for axis_value in values.split(",")]
+
+    permutations = CreatePermutations(project, base_context, axes, sample=sample, seed=seed)
+    digests = RenderPermutations(project, permutations, max_workers=workers)
+
+    statuses: dict[str, str] = {name: "rendered" for name in digests}
+
+    if snapshots_filename is not None:
+        snapshots = LoadSnapshots(snapshots_filename)
+
+        if update_snapshots:
+            if sample is None:
+                snapshots = {}
+
+            snapshots.update(digests)
+            SaveSnapshots(snapshots_filename, snapshots)
+        else:
+            comparison = CompareSnapshots(snapshots, digests)
+
+            statuses.update({name: "matching" for name in comparison.matching})
+            statuses.update({name: "mismatched" for name in comparison.mismatched})
+            statuses.update({name: "new" for name in comparison.new})
+
+    if json_output:
+        sys.stdout.write(
+            json.dumps(
+                {
+                    name: {"digest": digest, "status": statuses[name]}
+                    for name, digest in digests.items()
+                },
+                indent=2,
+            ),
+        )
+        sys.stdout.write("\n")
+    else:
+        for name, digest in digests.items():
+            sys.stdout.write(f"{statuses[name]:<10}  {digest[:12]}  {name}\n")
+
+        sys.stdout.write(
+            "{} permutation(s), {} mismatched, {} new\n".format(
+                len(digests),
+                sum(1 for status in statuses.values() if status == "mismatched"),
+                sum(1 for status in statuses.values() if status == "new"),
+            ),
+        )
+
+    if any(status in ["mismatched", "new"] for status in statuses.values()):
+        raise typer.Exit(1)
+
+
+# ----------------------------------------------------------------------
+@app.command("watch", no_args_is_help=True)
+def Watch(
+    project: Annotated[str, typer.Argument(help="Name of the project to render.")],
+    output_dir: Annotated[
+        Path,
+        typer.Argument(
+            file_okay=False,
+            resolve_path=True,
+            help="Scratch directory that is populated with the rendered project; it must be empty or created by a previous watch.",
+        ),
+    ],
+    context_filename: Annotated[Optional[Path], _context_option] = None,
+    debounce: Annotated[
+        int,
+        typer.Option(
+            "--debounce",
+            min=0,
+            help="Milliseconds to wait for additional modifications before rendering.",
+        ),
+    ] = 100,
+    poll: Annotated[
+        bool,
+        typer.Option("--poll", help="Poll for modifications rather than using inotify."),
+    ] = False,
+    poll_interval: Annotated[
+        int,
+        typer.Option("--poll-interval", min=10, help="Milliseconds between polls."),
+    ] = 250,
+) -> None:
+    """Render a project into a scratch directory and re-render it as its templates are modified, displaying the resulting diffs; hooks run during full renders, but startup scripts are never invoked."""
+
+    from PythonProjectBootstrapper.Watch import Watch as WatchImpl
+
+    try:
+        WatchImpl(
+            project,
+            output_dir,
+            _LoadContext(context_filename),
+            debounce=debounce / 1000,
+            use_polling=poll,
+            poll_interval=poll_interval / 1000,
+        )
+    except KeyboardInterrupt:
+        pass
+
+
+# ----------------------------------------------------------------------
+@app.command("history", no_args_is_help=True)
+def History(
+    output_dir: Annotated[Path, _output_dir_argument],
+    json_output: Annotated[bool, _json_option] = False,
+) -> None:
+    """Display the generations recorded in the output directory's history, from the oldest to the newest."""
+
+    entries = LoadHistory(output_dir)
+
+    if json_output:
+        sys.stdout.write(
+            json.dumps(
+                [
+                    {
+                        "generation": index + 1,
+                        "version": entry.version,
+                        "timestamp": entry.timestamp,
+                        "context": entry.context_hash,
+                        "files": {
+                            path: {
+                                "status": delta.status,
+                                "old": delta.old_digest,
+                                "new": delta.new_digest,
+                            }
+                            for path, delta in entry.files.items()
+                        },
+                    }
+                    for index, entry in enumerate(entries)
+                ],
+                indent=2,
+            ),
+        )
+        sys.stdout.write("\n")
+
+        return
+
+    if not entries:
+        sys.stdout.write("No generations have been recorded.\n")
+        return
+
+    from rich import print  # pylint: disable=redefined-builtin
+    from rich.table import Table
+
+    table = Table(
+        "Generation",
+        "Timestamp",
+        "Version",
+        "Context",
+        "Added",
+        "Modified",
+        "Removed",
+        title=str(output_dir),
+        title_justify="left",
+    )
+
+    for index, entry in enumerate(entries):
+        statuses = [delta.status for delta in entry.files.values()]
+
+        table.add_row(
+            str(index + 1),
+            entry.timestamp,
+            entry.version,
+            (entry.context_hash or "")[:12],
+            str(statuses.count("added")),
+            str(statuses.count("modified")),
+            str(statuses.count("removed")),
+        )
+
+    print(table)
+
+
+# ----------------------------------------------------------------------
+@app.command("diff", no_args_is_help=True)
+def Diff(
+    output_dir: Annotated[Path, _output_dir_argument],
+    from_generation: Annotated[
+        Optional[str],
+        typer.Option(
+            "--from",
+            help="Generation number (0 for the output directory before it was generated) or PythonProjectBootstrapper version; changes made after this generation are displayed. The default is the generation before '--to'.",
+        ),
+    ] = None,
+    to_generation: Annotated[
+        Optional[str],
+        typer.Option(
+            "--to",
+            help="Generation number or PythonProjectBootstrapper version; changes made up to and including this generation are displayed. The default is the most recent generation.",
+        ),
+    ] = None,
+    json_output: Annotated[bool, _json_option] = False,
+) -> None:
+    """Display the files changed between generations, as recorded in the output directory's history; files are not rendered or hashed."""
+
+    entries = LoadHistory(output_dir)
+
+    if not entries:
+        sys.stdout.write("No generations have been recorded.\n")
+        raise typer.Exit(1)
+
+    to_index = len(entries) - 1 if to_generation is None else FindGeneration(entries, to_generation)
+
+    if from_generation is None:
+        from_index = max(to_index - 1, -1)
+    else:
+        from_index = FindGeneration(entries, from_generation)
+
+    deltas = DiffHistory(entries, from_index, to_index)
+
+    if json_output:
+        sys.stdout.write(
+            json.dumps(
+                {
+                    path: {
+                        "status": delta.status,
+                        "old": delta.old_digest,
+                        "new": delta.new_digest,
+                    }
+                    for path, delta in deltas.items()
+                },
+                indent=2,
+            ),
+        )
+        sys.stdout.write("\n")
+
+        return
+
+    from rich import print  # pylint: disable=redefined-builtin
+    from rich.table import Table
+
+    if deltas:
+        table = Table(
+            "Status",
+            "File",
+            title="Generation {} -> {}".format(from_index + 1, to_index + 1),
+            title_justify="left",
+        )
+
+        for path, delta in deltas.items():
+            table.add_row(delta.status, path, style=_status_styles[delta.status])
+
+        print(table)
+
+    statuses = [delta.status for delta in deltas.values()]
+
+    sys.stdout.write(
+        "{} added, {} modified, {} removed\n".format(
+            statuses.count("added"),
+            statuses.count("modified"),
+            statuses.count("removed"),
+        ),
+    )
+
+
+# ----------------------------------------------------------------------
+@app.command("create-many", no_args_is_help=True)
+def CreateMany(
+    project: Annotated[str, typer.Argument(help="Name of the project to generate.")],
+    contexts_filename: Annotated[
+        Path,
+        typer.Argument(
+            exists=True,
+            dir_okay=False,
+            resolve_path=True,
+            help="JSON Lines file ('.jsonl', one JSON object per line) or CSV file ('.csv', one row per project with value names in the header row) that contains the template configuration values of each project.",
+        ),
+    ],
+    output_dir_pattern: Annotated[
+        str,
+        typer.Argument(
+            help="Output directory of each project, with configuration value names in braces (for example, 'repos/{github_project_name}'); '{index}' is replaced with the project's index (starting at 1).",
+        ),
+    ],
+    context_filename: Annotated[Optional[Path], _context_option] = None,
+    summary_filename: Annotated[
+        Path,
+        typer.Option(
+            "--summary",
+            dir_okay=False,
+            resolve_path=True,
+            help="JSON file that is populated with the result of each project.",
+        ),
+    ] = Path("create_many_summary.json"),
+    workers: Annotated[
+        Optional[int],
+        typer.Option(
+            "--workers",
+            min=1,
+            help="Maximum number of processes used to create projects; the default is one process per CPU.",
+        ),
+    ] = None,
+    overwrite: Annotated[
+        bool,
+        typer.Option(
+            "--overwrite",
+            help="Overwrite files that were modified in output directories that contain previously generated projects.",
+        ),
+    ] = False,
+    require_git: Annotated[
+        bool,
+        typer.Option(
+            "--require-git", help="Fail projects whose output directory is not a git repository."
+        ),
+    ] = False,
+    json_output: Annotated[bool, _json_option] = False,
+) -> None:
+    """Create many projects, each with its own configuration values, within a pool of long-lived processes; exits with a non-zero return code when a project could not be created."""
+
+    base_context = _LoadContext(context_filename)
+
+    contexts = [{**base_context, **context} for context in LoadContexts(project, contexts_filename)]
+
+    results = CreateProjects(
+        project,
+        contexts,
+        GetOutputDirs(output_dir_pattern, contexts),
+        policy=ConflictPolicy.Overwrite if overwrite else ConflictPolicy.Keep,
+        require_git=require_git,
+        max_workers=workers,
+    )
+
+    WriteSummary(results, summary_filename)
+
+    if json_output:
+        with summary_filename.open() as f:
+            sys.stdout.write(f.read())
+    else:
+        from rich import print  # pylint: disable=redefined-builtin
+        from rich.table import Table
+
+        if results:
+            table = Table("Status", "Directory", "Files", "Seconds", "Error")
+
+            for result in results:
+                status = "created" if result.is_success else "failed"
+
+                table.add_row(
+                    status,
+                    str(result.output_dir),
+                    str(result.num_added_files + result.num_overwritten_files),
+                    "{:.2f}".format(result.duration),
+                    result.error or "",
+                    style=_status_styles[status],
+                )
+
+            print(table)
+
+        sys.stdout.write(
+            "{} created, {} failed; the summary was written to '{}'\n".format(
+                sum(1 for result in results if result.is_success),
+                sum(1 for result in results if not result.is_success),
+                summary_filename,
+            ),
+        )
+
+    if any(not result.is_success for result in results):
+        raise typer.Exit(1)
+
+
+# ----------------------------------------------------------------------
+@templates_app.command("list")
+def TemplatesList(
+    json_output: Annotated[bool, _json_option] = False,
+) -> None:
+    """List the cached template worktrees, most recently used first."""
+
+    cached_templates = GetCachedTemplates()
+
+    if json_output:
+        sys.stdout.write(
+            json.dumps(
+                [_CachedTemplateToJson(cached_template) for cached_template in cached_templates],
+                indent=2,
+            ),
+        )
+        sys.stdout.write("\n")
+        return
+
+    from rich import print  # pylint: disable=redefined-builtin
+    from rich.table import Table
+
+    if cached_templates:
+        table = Table("Commit", "Repository", "Ref", "Size", "Last Used")
+
+        for cached_template in cached_templates:
+            table.add_row(
+                cached_template.commit_id[:12],
+                cached_template.repository,
+                cached_template.ref,
+                _FormatSize(cached_template.size),
+                time.strftime("%Y-%m-%d %H:%M", time.localtime(cached_template.last_used)),
+            )
+
+        print(table)
+
+    sys.stdout.write(
+        "{} cached, {}\n".format(
+            len(cached_templates),
+            _FormatSize(sum(cached_template.size for cached_template in cached_templates)),
+        ),
+    )
+
+
+# ----------------------------------------------------------------------
+@templates_app.command("prune")
+def TemplatesPrune(
+    max_age_days: Annotated[
+        Optional[float],
+        typer.Option(
+            "--max-age-days",
+            min=0,
+            help="Remove worktrees that have not been used within this number of days.",
+        ),
+    ] = None,
+    max_entries: Annotated[
+        Optional[int],
+        typer.Option(
+            "--max-entries",
+            min=0,
+            help="Remove the least recently used worktrees beyond this number.",
+        ),
+    ] = None,
+    json_output: Annotated[bool, _json_option] = False,
+) -> None:
+    """Remove cached template worktrees; all worktrees are removed when no limits are provided."""
+
+    removed = PruneCachedTemplates(
+        max_age=max_age_days * 24 * 60 * 60 if max_age_days is not None else None,
+        max_entries=max_entries,
+    )
+
+    if json_output:
+        sys.stdout.write(
+            json.dumps(
+                [_CachedTemplateToJson(cached_template) for cached_template in removed],
+                indent=2,
+            ),
+        )
+        sys.stdout.write("\n")
+        return
+
+    sys.stdout.write(
+        "{} removed, {}\n".format(
+            len(removed),
+            _FormatSize(sum(cached_template.size for cached_template in removed)),
+        ),
+    )
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _CachedTemplateToJson(cached_template: CachedTemplate) -> dict[str, Any]:
+    return {
+        "commit_id": cached_template.commit_id,
+        "directory": cached_template.directory.as_posix(),
+        "repository": cached_template.repository,
+        "ref": cached_template.ref,
+        "size": cached_template.size,
+        "last_used": cached_template.last_used,
+    }
+
+
+# ----------------------------------------------------------------------
+def _FormatSize(size: int) -> str:
+    from rich import filesize
+
+    return filesize.decimal(size)
+
+
+# ----------------------------------------------------------------------
+def _LoadContext(filename: Optional[Path]) -> dict[str, Any]:
+    if filename is None:
+        return {}
+
+    with filename.open() as f:
+        content = yaml.safe_load(f) or {}
+
+    return content.get("default_context", content)
+
+
+if __name__ == "__main__":
+    app()  # pragma: no cover
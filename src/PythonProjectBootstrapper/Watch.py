@@ -0,0 +1,744 @@
+# ----------------------------------------------------------------------
+# |
+# |  Copyright (c) 2024 Scientific Software Engineering Center at Georgia Tech
+# |  Distributed under the MIT License.
+# |
+# ----------------------------------------------------------------------
+"""Functionality that re-renders a project into a scratch directory as its templates are modified"""
+
+import difflib
+import os
+import select
+import shutil
+import struct
+import sys
+import tempfile
+import threading
+import time
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+from typing import Any, Iterable, Optional, TextIO
+
+from cookiecutter.find import find_template
+from jinja2 import Environment
+
+from PythonProjectBootstrapper.Generation import Generate, GetTemplatesRootDir
+from PythonProjectBootstrapper.History import history_filename
+from PythonProjectBootstrapper.ProjectGenerationUtils import manifest_filename
+from PythonProjectBootstrapper.Rendering import RenderTemplateFiles
+
+
+# Name of the file (written to the root of the scratch directory) that contains the names of the files written by
+# the most recent full render; only these files are removed when they are no longer rendered.
+watch_marker_filename: str = ".python_project_bootstrapper_watch"
+
+
+# ----------------------------------------------------------------------
+class FileChangeType(str, Enum):
+    """Type of change made to a file in the scratch directory"""
+
+    Added = "added"
+    Modified = "modified"
+    Deleted = "deleted"
+
+
+# ----------------------------------------------------------------------
+@dataclass(frozen=True)
+class FileDiff:
+    """Change made to a file in the scratch directory"""
+
+    filename: str
+    change_type: FileChangeType
+
+    # Unified diff of the change
+    lines: list[str] = field(default_factory=list)
+
+
+# ----------------------------------------------------------------------
+@dataclass(frozen=True)
+class WatchUpdate:
+    """Result of rendering the project into the scratch directory"""
+
+    diffs: list[FileDiff]
+
+    # True if only the modified template files were rendered
+    is_incremental: bool
+
+    # Elapsed time (in seconds)
+    elapsed: float
+
+
+# ----------------------------------------------------------------------
+class WatchSession:
+    """
+    Renders a project into a scratch directory and keeps it up to date as template files are modified.
+
+    A full render (including hooks) is performed initially and whenever something other than an existing
+    template file is modified (for example, hooks, cookiecutter.json, included templates, or files added to
+    or removed from the template). Otherwise, only the modified template files are rendered, using the
+    context cached from the most recent full render.
+    """
+
+    # ----------------------------------------------------------------------
+    def __init__(
+        self,
+        project: str,
+        output_dir: Path,
+        context: Optional[dict[str, Any]] = None,
+    ):
+        self.project = project
+        self.output_dir = output_dir.resolve()
+        self.base_context = context or {}
+
+        self.repo_dir = (GetTemplatesRootDir() / project).resolve()
+        self.template_dir = Path(find_template(self.repo_dir, Environment())).resolve()
+
+        # Context used during the most recent full render
+        self.context: dict[str, Any] = {}
+
+        self._template_filenames: set[str] = set()
+
+        # Ensure that the scratch directory can be used before anything is rendered
+        _LoadRenderedFilenames(self.output_dir)
+
+    # ----------------------------------------------------------------------
+    def Render(self) -> WatchUpdate:
+        """Render the entire project, including hooks"""
+
+        start_time = time.perf_counter()
+
+        # Modules imported from the template (for example, local_extensions.py) must be imported again
+        # so that modifications are reflected in the rendered content.
+        for module_name, module in list(sys.modules.items()):
+            module_filename = getattr(module, "__file__", None)
+
+            if module_filename is not None and Path(module_filename).is_relative_to(self.repo_dir):
+                del sys.modules[module_name]
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            rendered_dir = Path(temp_dir) / "output"
+
+            working_dir = Path(temp_dir) / "working"
+            working_dir.mkdir()
+
+            result = Generate(
+                self.project,
+                rendered_dir,
+                self.base_context,
+                require_git=False,
+                working_dir=working_dir,
+                # Template files are modified while watching, so the bundle (if any) is out of date
+                use_template_bundle=False,
+            )
+
+            # The manifest and history are only meaningful for directories updated by `Generate`
+            (rendered_dir / manifest_filename).unlink(missing_ok=True)
+            (rendered_dir / history_filename).unlink(missing_ok=True)
+
+            diffs = _SyncDirectory(
+                rendered_dir,
+                self.output_dir,
+                _LoadRenderedFilenames(self.output_dir),
+            )
+
+            _WriteRenderedFilenames(self.output_dir, set(_GetRelativeFilenames(rendered_dir)))
+
+        self.context = result.context
+        self._template_filenames = set(_GetRelativeFilenames(self.template_dir))
+
+        return WatchUpdate(diffs, False, time.perf_counter() - start_time)
+
+    # ----------------------------------------------------------------------
+    @property
+    def rendered_filenames(self) -> set[str]:
+        """Files written to the scratch directory by the most recent full render"""
+
+        return _LoadRenderedFilenames(self.output_dir)
+
+    # ----------------------------------------------------------------------
+    def Update(
+        self,
+        modified_filenames: Iterable[Path],
+    ) -> WatchUpdate:
+        """
+        Update the scratch directory after files were modified.
+
+        Args:
+            modified_filenames (Iterable[Path]): Files (or directories) that were added, modified, or removed
+
+        Returns:
+            WatchUpdate: Changes made to the scratch directory
+        """
+
+        if not self.context:
+            return self.Render()
+
+        relative_filenames: list[str] = []
+
+        for filename in modified_filenames:
+            filename = filename.resolve()
+
+            if not filename.is_relative_to(self.template_dir) or not filename.is_file():
+                return self.Render()
+
+            relative_filename = filename.relative_to(self.template_dir).as_posix()
+
+            if relative_filename not in self._template_filenames:
+                return self.Render()
+
+            relative_filenames.append(relative_filename)
+
+        if not relative_filenames:
+            return WatchUpdate([], True, 0.0)
+
+        start_time = time.perf_counter()
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            known_hashes = RenderTemplateFiles(
+                self.repo_dir,
+                self.context,
+                Path(temp_dir),
+                sorted(relative_filenames),
+            )
+
+            rendered_filenames = sorted(
+                Path(filename).relative_to(temp_dir).as_posix() for filename in known_hashes
+            )
+
+            # Files moved or removed by hooks can only be updated by a full render
+            if any(
+                not (self.output_dir / rendered_filename).is_file()
+                for rendered_filename in rendered_filenames
+            ):
+                return self.Render()
+
+            diffs: list[FileDiff] = []
+
+            for rendered_filename in rendered_filenames:
+                source = Path(temp_dir) / rendered_filename
+                dest = self.output_dir / rendered_filename
+
+                diff = _CreateDiff(rendered_filename, dest, source)
+                if diff is None:
+                    continue
+
+                # `copyfile` preserves the destination's mode, which may have been modified by hooks
+                shutil.copyfile(source, dest)
+                diffs.append(diff)
+
+        return WatchUpdate(diffs, True, time.perf_counter() - start_time)
+
+
+# ----------------------------------------------------------------------
+class Watcher(ABC):
+    """Detects modifications to files within one or more directories"""
+
+    # ----------------------------------------------------------------------
+    def __init__(self, roots: list[Path]):
+        self.roots = [root.resolve() for root in roots]
+
+    # ----------------------------------------------------------------------
+    def __enter__(self) -> "Watcher":
+        return self
+
+    # ----------------------------------------------------------------------
+    def __exit__(self, *args) -> None:
+        self.Close()
+
+    # ----------------------------------------------------------------------
+    @abstractmethod
+    def Wait(self, timeout: Optional[float] = None) -> set[Path]:
+        """Wait for modifications, returning the files (or directories) modified; an empty set is returned if the timeout (in seconds) expires first"""
+        raise Exception("Abstract method")  # pragma: no cover
+
+    # ----------------------------------------------------------------------
+    def Drain(self) -> set[Path]:
+        """Returns the modifications that have already been detected without waiting"""
+
+        return self.Wait(0)
+
+    # ----------------------------------------------------------------------
+    def Close(self) -> None:
+        pass
+
+
+# ----------------------------------------------------------------------
+class InotifyWatcher(Watcher):
+    """Watcher that uses inotify (Linux only)"""
+
+    # From <sys/inotify.h>
+    _IN_MODIFY = 0x00000002
+    _IN_ATTRIB = 0x00000004
+    _IN_CLOSE_WRITE = 0x00000008
+    _IN_MOVED_FROM = 0x00000040
+    _IN_MOVED_TO = 0x00000080
+    _IN_CREATE = 0x00000100
+    _IN_DELETE = 0x00000200
+    _IN_Q_OVERFLOW = 0x00004000
+    _IN_ISDIR = 0x40000000
+    _IN_NONBLOCK = 0o4000
+    _IN_CLOEXEC = 0o2000000
+
+    _WATCH_MASK = (
+        _IN_MODIFY
+        | _IN_ATTRIB
+        | _IN_CLOSE_WRITE
+        | _IN_MOVED_FROM
+        | _IN_MOVED_TO
+        | _IN_CREATE
+        | _IN_DELETE
+    )
+
+    _EVENT_HEADER = struct.Struct("iIII")
+
+    # ----------------------------------------------------------------------
+    def __init__(self, roots: list[Path]):
+        super().__init__(roots)
+
+        import ctypes
+        import ctypes.util
+
+        self._ctypes = ctypes
+
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._libc.inotify_init1.argtypes = [ctypes.c_int]
+        self._libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+
+        self._fd = self._libc.inotify_init1(self._IN_NONBLOCK | self._IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        self._watched_dirs: dict[int, Path] = {}
+
+        try:
+            for root in self.roots:
+                self._AddWatches(root)
+        except OSError:
+            self.Close()
+            raise
+
+    # ----------------------------------------------------------------------
+    def Wait(self, timeout: Optional[float] = None) -> set[Path]:
+        if self._fd < 0:
+            return set()
+
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return set()
+
+        modified: set[Path] = set()
+
+        while True:
+            try:
+                content = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+
+            offset = 0
+
+            while offset < len(content):
+                wd, mask, _, name_length = self._EVENT_HEADER.unpack_from(content, offset)
+                offset += self._EVENT_HEADER.size
+
+                name = os.fsdecode(content[offset : offset + name_length].rstrip(b"\0"))
+                offset += name_length
+
+                if mask & self._IN_Q_OVERFLOW:
+                    # Events were lost, so everything must be considered modified
+                    modified.update(self.roots)
+                    continue
+
+                directory = self._watched_dirs.get(wd)
+                if directory is None or not name or _IsIgnored(name):
+                    continue
+
+                path = directory / name
+                modified.add(path)
+
+                if mask & self._IN_ISDIR and mask & (self._IN_CREATE | self._IN_MOVED_TO):
+                    self._AddWatches(path)
+
+        return modified
+
+    # ----------------------------------------------------------------------
+    def Close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    def _AddWatches(self, root: Path) -> None:
+        for directory, dirs, _ in os.walk(root):
+            dirs[:] = [d for d in dirs if not _IsIgnored(d)]
+
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), self._WATCH_MASK)
+            if wd < 0:
+                errno = self._ctypes.get_errno()
+
+                # The directory may have been removed after it was detected
+                if not os.path.isdir(directory):
+                    continue
+
+                raise OSError(errno, f"inotify_add_watch failed for '{directory}'")
+
+            self._watched_dirs[wd] = Path(directory)
+
+
+# ----------------------------------------------------------------------
+class PollingWatcher(Watcher):
+    """Watcher that periodically compares the size and modification time of files"""
+
+    # ----------------------------------------------------------------------
+    def __init__(
+        self,
+        roots: list[Path],
+        interval: float = 0.25,
+    ):
+        super().__init__(roots)
+
+        self.interval = interval
+        self._snapshot = self._Scan()
+
+    # ----------------------------------------------------------------------
+    def Wait(self, timeout: Optional[float] = None) -> set[Path]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            snapshot = self._Scan()
+
+            modified = {
+                path
+                for path in snapshot.keys() | self._snapshot.keys()
+                if snapshot.get(path) != self._snapshot.get(path)
+            }
+
+            self._snapshot = snapshot
+
+            if modified:
+                return modified
+
+            if deadline is None:
+                time.sleep(self.interval)
+                continue
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return set()
+
+            time.sleep(min(self.interval, remaining))
+
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    def _Scan(self) -> dict[Path, tuple[int, int, int]]:
+        snapshot: dict[Path, tuple[int, int, int]] = {}
+
+        for root in self.roots:
+            for directory, dirs, files in os.walk(root):
+                dirs[:] = [d for d in dirs if not _IsIgnored(d)]
+
+                for file in files:
+                    if _IsIgnored(file):
+                        continue
+
+                    path = Path(directory) / file
+
+                    try:
+                        status = path.stat()
+                    except FileNotFoundError:
+                        continue
+
+                    snapshot[path] = (status.st_size, status.st_mtime_ns, status.st_mode)
+
+        return snapshot
+
+
+# ----------------------------------------------------------------------
+def CreateWatcher(
+    roots: list[Path],
+    *,
+    use_polling: bool = False,
+    poll_interval: float = 0.25,
+) -> Watcher:
+    """Create an inotify-based watcher when available, falling back to a polling watcher otherwise"""
+
+    if not use_polling and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(roots)
+        except OSError:
+            pass
+
+    return PollingWatcher(roots, poll_interval)
+
+
+# ----------------------------------------------------------------------
+def Watch(
+    project: str,
+    output_dir: Path,
+    context: Optional[dict[str, Any]] = None,
+    *,
+    debounce: float = 0.1,
+    use_polling: bool = False,
+    poll_interval: float = 0.25,
+    output_stream: TextIO = sys.stdout,
+    stop_event: Optional[threading.Event] = None,
+) -> None:
+    """
+    Render a project into a scratch directory and re-render it as its templates are modified, writing
+    the resulting diffs to the output stream. Modifications made directly to rendered files are reverted;
+    other files in the scratch directory are not modified. A scratch directory that isn't empty must have
+    been created by a previous watch.
+
+    Args:
+        project (str): Name of the project
+        output_dir (Path): Scratch directory
+        context (Optional[dict[str, Any]], optional): Template configuration values. Defaults to None.
+        debounce (float, optional): Modifications are processed once no other modifications are detected for this many seconds. Defaults to 0.1.
+        use_polling (bool, optional): Poll for modifications, even when inotify is available. Defaults to False.
+        poll_interval (float, optional): Interval (in seconds) between polls. Defaults to 0.25.
+        output_stream (TextIO, optional): Stream to which diffs are written. Defaults to sys.stdout.
+        stop_event (Optional[threading.Event], optional): Stop watching when this event is set; watch until interrupted when None. Defaults to None.
+    """
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    session = WatchSession(project, output_dir, context)
+
+    update = session.Render()
+
+    with CreateWatcher(
+        [session.repo_dir, session.output_dir],
+        use_polling=use_polling,
+        poll_interval=poll_interval,
+    ) as watcher:
+        _WriteStatus(
+            output_stream,
+            "{} file(s) rendered to '{}' ({:.0f} ms)".format(
+                len(session.rendered_filenames),
+                session.output_dir,
+                update.elapsed * 1000,
+            ),
+        )
+
+        pending: set[Path] = set()
+
+        while stop_event is None or not stop_event.is_set():
+            if not pending:
+                pending = watcher.Wait(None if stop_event is None else 0.1)
+                if not pending:
+                    continue
+
+            # Wait for the burst of modifications (for example, an editor writing a file) to end
+            while True:
+                modified = watcher.Wait(debounce)
+                if not modified:
+                    break
+
+                pending |= modified
+
+            try:
+                update = session.Update(pending)
+            except Exception as ex:  # pylint: disable=broad-exception-caught
+                _WriteStatus(output_stream, f"ERROR: {ex}")
+                update = None
+
+            # Ignore the modifications made to the scratch directory while it was updated, but keep any
+            # template modifications made during that time.
+            pending = {
+                path for path in watcher.Drain() if not path.is_relative_to(session.output_dir)
+            }
+
+            if update is not None:
+                _WriteUpdate(output_stream, update)
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _IsIgnored(name: str) -> bool:
+    # Python caches (created when the template's extensions are imported), editor temporary files, git
+    # repositories, and the list of rendered files
+    return (
+        name in ["__pycache__", ".git", watch_marker_filename]
+        or name.endswith("~")
+        or name.endswith((".swp", ".swx"))
+        or name.startswith(".#")
+    )
+
+
+# ----------------------------------------------------------------------
+def _GetRelativeFilenames(root: Path) -> Iterable[str]:
+    for directory, dirs, files in os.walk(root):
+        dirs[:] = [d for d in dirs if not _IsIgnored(d)]
+
+        for file in files:
+            yield (Path(directory) / file).relative_to(root).as_posix()
+
+
+# ----------------------------------------------------------------------
+def _LoadRenderedFilenames(output_dir: Path) -> set[str]:
+    marker_filename = output_dir / watch_marker_filename
+
+    if marker_filename.is_file():
+        return {line for line in marker_filename.read_text(encoding="utf-8").splitlines() if line}
+
+    if output_dir.is_dir() and any(output_dir.iterdir()):
+        raise Exception(
+            f"'{output_dir}' is not empty and was not created by watch; please specify an empty or new directory."
+        )
+
+    return set()
+
+
+# ----------------------------------------------------------------------
+def _WriteRenderedFilenames(output_dir: Path, rendered_filenames: set[str]) -> None:
+    (output_dir / watch_marker_filename).write_text(
+        "".join(f"{filename}\n" for filename in sorted(rendered_filenames)),
+        encoding="utf-8",
+    )
+
+
+# ----------------------------------------------------------------------
+def _SyncDirectory(
+    source_dir: Path,
+    dest_dir: Path,
+    previous_filenames: set[str],
+) -> list[FileDiff]:
+    """Update `dest_dir` to match `source_dir`; only files in `previous_filenames` (written by an earlier render) are removed"""
+
+    source_filenames = set(_GetRelativeFilenames(source_dir))
+
+    diffs: list[FileDiff] = []
+    deleted_filenames: list[str] = []
+
+    for relative_filename in sorted(source_filenames | previous_filenames):
+        source = source_dir / relative_filename
+        dest = dest_dir / relative_filename
+
+        if relative_filename not in source_filenames:
+            if not dest.is_file():
+                continue
+
+            diffs.append(
+                FileDiff(
+                    relative_filename,
+                    FileChangeType.Deleted,
+                    _DiffContent(relative_filename, dest.read_bytes(), b""),
+                ),
+            )
+
+            dest.unlink()
+            deleted_filenames.append(relative_filename)
+            continue
+
+        diff = _CreateDiff(relative_filename, dest, source)
+
+        if diff is not None:
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy(source, dest)
+
+            diffs.append(diff)
+
+        elif source.stat().st_mode != dest.stat().st_mode:
+            shutil.copymode(source, dest)
+
+    # Remove the directories that are now empty
+    for relative_filename in deleted_filenames:
+        directory = (dest_dir / relative_filename).parent
+
+        while directory != dest_dir and directory.is_dir() and not any(directory.iterdir()):
+            directory.rmdir()
+            directory = directory.parent
+
+    return diffs
+
+
+# ----------------------------------------------------------------------
+def _CreateDiff(
+    relative_filename: str,
+    original: Optional[Path],
+    updated: Path,
+) -> Optional[FileDiff]:
+    """Returns the difference between the files or None if the content is the same"""
+
+    updated_content = updated.read_bytes()
+
+    if original is None or not original.is_file():
+        return FileDiff(
+            relative_filename,
+            FileChangeType.Added,
+            _DiffContent(relative_filename, b"", updated_content),
+        )
+
+    original_content = original.read_bytes()
+
+    if original_content == updated_content:
+        return None
+
+    return FileDiff(
+        relative_filename,
+        FileChangeType.Modified,
+        _DiffContent(relative_filename, original_content, updated_content),
+    )
+
+
+# ----------------------------------------------------------------------
+def _DiffContent(
+    relative_filename: str,
+    original: bytes,
+    updated: bytes,
+) -> list[str]:
+    binary_diff = [f"Binary file {relative_filename} differs"]
+
+    if b"\0" in original or b"\0" in updated:
+        return binary_diff
+
+    try:
+        original_lines = original.decode("utf-8").splitlines()
+        updated_lines = updated.decode("utf-8").splitlines()
+    except UnicodeDecodeError:
+        return binary_diff
+
+    return list(
+        difflib.unified_diff(
+            original_lines,
+            updated_lines,
+            fromfile=f"a/{relative_filename}",
+            tofile=f"b/{relative_filename}",
+            lineterm="",
+        ),
+    )
+
+
+# ----------------------------------------------------------------------
+def _WriteStatus(
+    output_stream: TextIO,
+    message: str,
+) -> None:
+    output_stream.write("[{}] {}\n".format(datetime.now().strftime("%H:%M:%S"), message))
+    output_stream.flush()
+
+
+# ----------------------------------------------------------------------
+def _WriteUpdate(
+    output_stream: TextIO,
+    update: WatchUpdate,
+) -> None:
+    _WriteStatus(
+        output_stream,
+        "{} file(s) changed ({} render, {:.0f} ms)".format(
+            len(update.diffs),
+            "incremental" if update.is_incremental else "full",
+            update.elapsed * 1000,
+        ),
+    )
+
+    for diff in update.diffs:
+        for line in diff.lines:
+            output_stream.write(f"{line}\n")
+
+    output_stream.flush()
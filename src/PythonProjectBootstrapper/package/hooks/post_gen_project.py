@@ -11,8 +11,6 @@ import yaml
 
 from pathlib import Path
 
-from dbrownell_Common import PathEx
-
 # This filename should be the same as the filename defined in ../../ProjectGenerationUtils.py
 # Ideally we would be able to assert that these two variables have the same filename, but we encounter errors when importing
 # the variable due to how cookiecutter changes the working directory for the post-gen hook
@@ -347,7 +345,10 @@ def SavePrompts() -> None:
 def UpdateBootstrapExecutionPermissions():
     bootstrap_path = Path("./Bootstrap.sh")
 
-    PathEx.EnsureFile(bootstrap_path)
+    # The file isn't generated when it isn't selected (see `--only` and `--exclude`)
+    if not bootstrap_path.is_file():
+        return
+
     status = bootstrap_path.stat()
     bootstrap_path.chmod(status.st_mode | 0o700)
 
@@ -355,20 +356,22 @@ def UpdateBootstrapExecutionPermissions():
 # ----------------------------------------------------------------------
 def UpdateLicenseFile():
     this_dir = Path.cwd()
-    licenses_dir = PathEx.EnsureDir(this_dir / "Licenses")
+    licenses_dir = this_dir / "Licenses"
 
     license_name = "{{ cookiecutter.license }}"
 
     if license_name == "BSL-1.0":
-        source_file = licenses_dir / "BST-1.0_LICENSE_1_0.txt"
+        source_file = licenses_dir / "BSL-1.0_LICENSE_1_0.txt"
     else:
         source_file = licenses_dir / "{}_LICENSE.txt".format(license_name)
 
-    PathEx.EnsureFile(source_file)
-    dest_file = this_dir / source_file.name[len(license_name) + 1 :]
+    # The license files aren't generated when they aren't selected (see `--only` and `--exclude`)
+    if source_file.is_file():
+        dest_file = this_dir / source_file.name[len(license_name) + 1 :]
+        shutil.copy(source_file, dest_file)
 
-    shutil.copy(source_file, dest_file)
-    shutil.rmtree(licenses_dir)
+    if licenses_dir.is_dir():
+        shutil.rmtree(licenses_dir)
 
 
 # ----------------------------------------------------------------------
@@ -0,0 +1,147 @@
+# ----------------------------------------------------------------------
+# |
+# |  Copyright (c) 2024 Scientific Software Engineering Center at Georgia Tech
+# |  Distributed under the MIT License.
+# |
+# ----------------------------------------------------------------------
+"""Unit tests for BulkCreation.py"""
+
+import json
+import textwrap
+
+import pytest
+
+from conftest import package_context
+
+from PythonProjectBootstrapper.BulkCreation import (
+    CreateProjects,
+    GetOutputDirs,
+    LoadContexts,
+    WriteSummary,
+)
+from PythonProjectBootstrapper.ProjectGenerationUtils import manifest_filename
+
+
+# ----------------------------------------------------------------------
+def test_LoadContextsJsonLines(tmp_path):
+    filename = tmp_path / "contexts.jsonl"
+    filename.write_text('{"name": "one", "create_docker_image": true}\n\n{"name": "two"}\n')
+
+    assert LoadContexts("package", filename) == [
+        {"name": "one", "create_docker_image": True},
+        {"name": "two"},
+    ]
+
+    filename.write_text('{"name": "one"}\n["not", "an", "object"]\n')
+    with pytest.raises(Exception, match="line 2: a JSON object is expected"):
+        LoadContexts("package", filename)
+
+    filename.write_text("{invalid\n")
+    with pytest.raises(Exception, match="line 1: "):
+        LoadContexts("package", filename)
+
+
+# ----------------------------------------------------------------------
+def test_LoadContextsCsv(tmp_path):
+    filename = tmp_path / "contexts.csv"
+    filename.write_text(
+        textwrap.dedent(
+            """\
+            name,github_project_name,create_docker_image
+            one,first,true
+            "two, with comma",,No
+            """,
+        ),
+    )
+
+    # Empty values are omitted and flags are converted to booleans
+    assert LoadContexts("package", filename) == [
+        {"name": "one", "github_project_name": "first", "create_docker_image": True},
+        {"name": "two, with comma", "create_docker_image": False},
+    ]
+
+    filename.write_text("name,create_docker_image\none,maybe\n")
+    with pytest.raises(
+        Exception, match="row 2: 'maybe' is not a valid value for 'create_docker_image'"
+    ):
+        LoadContexts("package", filename)
+
+    with pytest.raises(Exception, match="is not a '.jsonl' or '.csv' file"):
+        LoadContexts("package", tmp_path / "contexts.yaml")
+
+
+# ----------------------------------------------------------------------
+def test_GetOutputDirs(tmp_path):
+    contexts = [{"github_project_name": "one"}, {"github_project_name": "two"}]
+
+    assert GetOutputDirs(str(tmp_path / "{github_project_name}-{index}"), contexts) == [
+        tmp_path / "one-1",
+        tmp_path / "two-2",
+    ]
+
+    with pytest.raises(Exception, match="must contain at least one configuration value name"):
+        GetOutputDirs(str(tmp_path / "output"), contexts)
+
+    with pytest.raises(Exception, match="Project 2 does not provide a value for 'name'"):
+        GetOutputDirs(str(tmp_path / "{name}"), [{"name": "one"}, {}])
+
+    with pytest.raises(Exception, match="Projects 1 and 2 would both be created in"):
+        GetOutputDirs(str(tmp_path / "{name}"), [{"name": "one"}, {"name": "one"}])
+
+
+# ----------------------------------------------------------------------
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_CreateProjects(tmp_path, max_workers):
+    contexts = [
+        {**package_context, "github_project_name": "first_project"},
+        {**package_context, "github_project_name": "second_project", "name": "<your name>"},
+        {**package_context, "github_project_name": "third_project", "license": "Apache-2.0"},
+    ]
+
+    output_dirs = GetOutputDirs(str(tmp_path / "repos" / "{github_project_name}"), contexts)
+
+    results = CreateProjects("package", contexts, output_dirs, max_workers=max_workers)
+
+    assert [result.output_dir for result in results] == output_dirs
+    assert [result.is_success for result in results] == [True, False, True]
+
+    assert results[1].error is not None and 'name ("<your name>")' in results[1].error
+    assert not output_dirs[1].exists()
+
+    for index in [0, 2]:
+        assert results[index].num_added_files > 0
+        assert (output_dirs[index] / manifest_filename).is_file()
+
+    assert "first_project" in (output_dirs[0] / "README.md").read_text()
+    assert "third_project" in (output_dirs[2] / "README.md").read_text()
+
+    # Creating the projects again doesn't modify them
+    results = CreateProjects("package", contexts[:1], output_dirs[:1], max_workers=max_workers)
+
+    assert results[0].is_success
+    assert results[0].num_added_files == 0
+    assert results[0].num_overwritten_files == 0
+
+    assert CreateProjects("package", [], []) == []
+
+
+# ----------------------------------------------------------------------
+def test_WriteSummary(tmp_path):
+    contexts = [package_context, {**package_context, "gist_id": "not a gist"}]
+    output_dirs = GetOutputDirs(str(tmp_path / "project{index}"), contexts)
+
+    summary_filename = tmp_path / "summaries" / "summary.json"
+
+    WriteSummary(CreateProjects("package", contexts, output_dirs, max_workers=1), summary_filename)
+
+    with summary_filename.open() as f:
+        summary = json.load(f)
+
+    assert [(item["output_dir"], item["status"]) for item in summary] == [
+        ((tmp_path / "project1").as_posix(), "created"),
+        ((tmp_path / "project2").as_posix(), "failed"),
+    ]
+
+    assert summary[0]["error"] is None
+    assert summary[0]["added_files"] > 0
+    assert "gist_id" in summary[1]["error"]
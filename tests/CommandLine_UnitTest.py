@@ -0,0 +1,48 @@
+# ----------------------------------------------------------------------
+# |
+# |  Copyright (c) 2024 Scientific Software Engineering Center at Georgia Tech
+# |  Distributed under the MIT License.
+# |
+# ----------------------------------------------------------------------
+"""Unit tests for CommandLine.py"""
+
+from typing import Annotated
+
+from typer.testing import CliRunner
+
+from PythonProjectBootstrapper import __version__
+from PythonProjectBootstrapper.CommandLine import CreateApp, version_option
+
+
+# ----------------------------------------------------------------------
+def test_CreateApp():
+    app = CreateApp("The help text")
+
+    # ----------------------------------------------------------------------
+    @app.callback()
+    def _Main(
+        version: Annotated[bool, version_option] = False,  # pylint: disable=unused-argument
+    ) -> None:
+        pass
+
+    # ----------------------------------------------------------------------
+    @app.command("zebra")
+    def Zebra() -> None:
+        pass
+
+    # ----------------------------------------------------------------------
+    @app.command("aardvark")
+    def Aardvark() -> None:
+        pass
+
+    # ----------------------------------------------------------------------
+
+    result = CliRunner().invoke(app, [])
+    assert "The help text" in result.stdout
+
+    # Commands are listed in the order in which they were defined
+    assert result.stdout.index("zebra") < result.stdout.index("aardvark")
+
+    result = CliRunner().invoke(app, ["--version"])
+    assert result.exit_code == 0
+    assert result.stdout == f"PythonProjectBootstrapper {__version__}"
@@ -0,0 +1,143 @@
+# ----------------------------------------------------------------------
+# |
+# |  Copyright (c) 2024 Scientific Software Engineering Center at Georgia Tech
+# |  Distributed under the MIT License.
+# |
+# ----------------------------------------------------------------------
+"""Unit tests for CompactManifest.py"""
+
+import hashlib
+import tracemalloc
+
+import pytest
+
+from PythonProjectBootstrapper.CompactManifest import CompactManifest
+
+
+# ----------------------------------------------------------------------
+def _Hash(value: str) -> str:
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+# ----------------------------------------------------------------------
+def test_DictApi():
+    content = {
+        "src/module.py": _Hash("module"),
+        "README.md": _Hash("readme"),
+        "src/ünïcödé.txt": _Hash("unicode"),
+        "src/sub/file.txt": _Hash("file"),
+    }
+
+    manifest = CompactManifest(content)
+
+    assert len(manifest) == 4
+    assert list(manifest) == sorted(content)
+    assert manifest == content
+    assert content == manifest
+    assert dict(manifest.items()) == content
+    assert sorted(manifest.values()) == sorted(content.values())
+
+    assert manifest["src/ünïcödé.txt"] == content["src/ünïcödé.txt"]
+    assert manifest.GetEncodedPath(0) == b"README.md"
+    assert manifest.GetDigest(0) == bytes.fromhex(content["README.md"])
+    assert "src/module.py" in manifest
+    assert "src" not in manifest
+    assert "zzz" not in manifest
+    assert manifest.get("missing") is None
+
+    with pytest.raises(KeyError):
+        manifest["missing"]
+
+    # Existing entries can be updated
+    manifest["README.md"] = _Hash("updated")
+    assert manifest["README.md"] == _Hash("updated")
+    assert manifest != content
+
+    with pytest.raises(KeyError):
+        manifest["new_file.txt"] = _Hash("new")
+
+    with pytest.raises(Exception, match="is not a 32-byte digest"):
+        manifest["README.md"] = "abcd"
+
+    with pytest.raises(Exception, match="is not a hexadecimal digest"):
+        CompactManifest({"file.txt": "not a hash"})
+
+    assert CompactManifest() == {}
+    assert CompactManifest.FromMapping(manifest) is manifest
+    assert CompactManifest.FromDigests(
+        (path, bytes.fromhex(hash_value)) for path, hash_value in content.items()
+    ) == CompactManifest(content)
+
+    # As with a dict, the last digest for a path is used
+    assert CompactManifest.FromDigests(
+        [
+            ("b.txt", bytes.fromhex(_Hash("1"))),
+            ("a.txt", bytes.fromhex(_Hash("2"))),
+            ("b.txt", bytes.fromhex(_Hash("3"))),
+        ],
+    ) == CompactManifest({"a.txt": _Hash("2"), "b.txt": _Hash("3")})
+
+
+# ----------------------------------------------------------------------
+def test_SetOperations():
+    existing = CompactManifest(
+        {
+            "a.txt": _Hash("a"),
+            "b/removed.txt": _Hash("removed"),
+            "c.txt": _Hash("c"),
+            "d/removed.txt": _Hash("removed"),
+        },
+    )
+
+    generated = CompactManifest(
+        {
+            "a.txt": _Hash("a2"),
+            "b/added.txt": _Hash("added"),
+            "c.txt": _Hash("c"),
+        },
+    )
+
+    assert existing.Difference(generated) == ["b/removed.txt", "d/removed.txt"]
+    assert generated.Difference(existing) == ["b/added.txt"]
+    assert existing.Difference(CompactManifest()) == list(existing)
+    assert CompactManifest().Difference(existing) == []
+
+    merged = existing.Union(generated)
+
+    assert merged == {**dict(existing.items()), **dict(generated.items())}
+    assert CompactManifest().Union(generated) == generated
+    assert generated.Union(CompactManifest()) == generated
+
+    with pytest.raises(Exception, match="can't be combined"):
+        existing.Union(CompactManifest({"file.txt": hashlib.md5().hexdigest()}))
+
+
+# ----------------------------------------------------------------------
+def test_MemoryBenchmark():
+    # Paths similar to those in a large generated tree
+    content = {
+        f"src/package{index // 1000}/module{index // 100}/file{index}.py": _Hash(str(index))
+        for index in range(20000)
+    }
+
+    tracemalloc.start()
+
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        # New strings are created, as the manifest's strings would be when read from a file
+        dict_manifest = {
+            path.encode("utf-8").decode("utf-8"): bytes.fromhex(hash_value).hex()
+            for path, hash_value in content.items()
+        }
+        dict_size = tracemalloc.get_traced_memory()[0] - before
+
+        before = tracemalloc.get_traced_memory()[0]
+        compact_manifest = CompactManifest(content)
+        compact_size = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+    assert compact_manifest == dict_manifest
+
+    # The compact representation uses a fraction of the memory used by a dictionary
+    assert compact_size * 3 < dict_size, (compact_size, dict_size)
@@ -0,0 +1,149 @@
+# ----------------------------------------------------------------------
+# |
+# |  Copyright (c) 2024 Scientific Software Engineering Center at Georgia Tech
+# |  Distributed under the MIT License.
+# |
+# ----------------------------------------------------------------------
+"""Unit tests for ContextValidation.py"""
+
+import re
+import textwrap
+
+import pytest
+
+from PythonProjectBootstrapper.ContextValidation import (
+    FieldSchema,
+    LoadValidationSchema,
+    ValidateConfiguration,
+    ValidateContext,
+    ValidationSchema,
+    validation_schema_filename,
+)
+from PythonProjectBootstrapper.Generation import GetTemplatesRootDir
+
+
+# ----------------------------------------------------------------------
+def test_FieldSchema():
+    field_schema = FieldSchema(
+        "value", required=True, placeholder=True, pattern=re.compile("[a-z]+")
+    )
+
+    assert field_schema.Validate("abc") is None
+    assert field_schema.Validate(None) == "value: a value is required"
+    assert field_schema.Validate("") == "value: a value is required"
+    assert field_schema.Validate("<value>") == 'value ("<value>"): the value has not been populated'
+    assert field_schema.Validate("ABC") == 'value ("ABC"): the value does not match "[a-z]+"'
+
+    # Values that aren't strings are only checked for existence
+    assert field_schema.Validate(True) is None
+
+    assert FieldSchema("value").Validate(None) is None
+    assert FieldSchema("value").Validate("<value>") is None
+
+
+# ----------------------------------------------------------------------
+def test_ValidationSchema():
+    schema = ValidationSchema(
+        [
+            FieldSchema("one", required=True),
+            FieldSchema("two", placeholder=True),
+        ],
+    )
+
+    assert schema.Validate({"one": "1", "two": "2"}) == []
+    assert schema.Validate({"two": "<two>"}) == [
+        "one: a value is required",
+        'two ("<two>"): the value has not been populated',
+    ]
+
+    # Missing and unresolved values are skipped in partial validation
+    assert schema.Validate({"two": "<two>"}, partial=True) == [
+        'two ("<two>"): the value has not been populated',
+    ]
+    assert schema.Validate({"one": "{{ cookiecutter.two }}"}, partial=True) == []
+
+
+# ----------------------------------------------------------------------
+def test_LoadValidationSchema(tmp_path):
+    assert LoadValidationSchema(tmp_path) is None
+    ValidateContext(tmp_path, {"anything": "<goes>"})
+
+    filename = tmp_path / validation_schema_filename
+
+    filename.write_text(
+        textwrap.dedent(
+            """\
+            one:
+              required: true
+            two:
+              pattern: ^\\d+$
+            three:
+            """,
+        ),
+    )
+
+    schema = LoadValidationSchema(tmp_path)
+    assert schema is not None
+    assert [field_schema.name for field_schema in schema.fields] == ["one", "two", "three"]
+    assert schema.fields[1].pattern is not None and schema.fields[1].pattern.pattern == "^\\d+$"
+
+    ValidateContext(tmp_path, {"one": "1", "two": "2"})
+
+    with pytest.raises(
+        Exception,
+        match=re.escape(
+            'Template configuration values are not valid:\n    - one: a value is required\n    - two ("a"): the value does not match "^\\d+$"',
+        ),
+    ):
+        ValidateContext(tmp_path, {"two": "a"})
+
+    filename.write_text("one:\n  unknown: true\n  required: true\n")
+
+    with pytest.raises(Exception, match="contains unknown rules for 'one': unknown."):
+        LoadValidationSchema(tmp_path)
+
+
+# ----------------------------------------------------------------------
+def test_ProjectSchema(tmp_path):
+    project_dir = GetTemplatesRootDir() / "package"
+
+    schema = LoadValidationSchema(project_dir)
+    assert schema is not None
+
+    # The default values in cookiecutter.json are placeholders
+    with pytest.raises(Exception) as ex:
+        ValidateConfiguration(project_dir)
+
+    assert str(ex.value).splitlines() == [
+        "Template configuration values are not valid:",
+        '    - name ("<your name>"): the value has not been populated',
+        '    - email ("<your email>"): the value has not been populated',
+        '    - project_description ("<your project description>"): the value has not been populated',
+        '    - github_username ("<your github username>"): the value has not been populated',
+        '    - github_project_name ("<your github repository>"): the value has not been populated',
+        '    - gist_id ("<your gist id>"): the value has not been populated',
+        '    - minisign_public_key ("<your minisign_public_key or none>"): the value has not been populated',
+    ]
+
+    context = {
+        "name": "Jane Doe",
+        "email": "jane@example.com",
+        "project_description": "A test project",
+        "github_username": "jdoe",
+        "github_project_name": "test_project",
+        "minisign_public_key": "none",
+    }
+
+    configuration_filename = tmp_path / "configuration.yaml"
+    configuration_filename.write_text("default_context:\n  gist_id: abc123\n")
+
+    ValidateConfiguration(project_dir, context, configuration_filename)
+
+    # Explicit values take precedence over the configuration file
+    with pytest.raises(Exception, match=r'gist_id \("xyz"\): the value does not match'):
+        ValidateConfiguration(project_dir, {**context, "gist_id": "xyz"}, configuration_filename)
+
+    with pytest.raises(Exception, match=r'pypi_project_name \("-invalid"\)'):
+        ValidateConfiguration(
+            project_dir, {**context, "pypi_project_name": "-invalid"}, configuration_filename
+        )
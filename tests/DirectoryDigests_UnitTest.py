@@ -0,0 +1,65 @@
+# ----------------------------------------------------------------------
+# |
+# |  Copyright (c) 2024 Scientific Software Engineering Center at Georgia Tech
+# |  Distributed under the MIT License.
+# |
+# ----------------------------------------------------------------------
+from PythonProjectBootstrapper.DirectoryDigests import CalculateDirectoryDigests, DiffManifests
+
+
+# ----------------------------------------------------------------------
+def test_CalculateDirectoryDigests():
+    manifest = {"file1.txt": "1", "a/file2.txt": "2", "a/b/c/file3.txt": "3", "d/file4.txt": "4"}
+
+    digests = CalculateDirectoryDigests(manifest)
+    assert list(sorted(digests)) == ["./", "a/", "a/b/", "a/b/c/", "d/"]
+
+    # Changes only affect the digests of the directories that contain the file
+    modified_digests = CalculateDirectoryDigests({**manifest, "a/b/c/file3.txt": "changed"})
+
+    assert modified_digests["d/"] == digests["d/"]
+    assert all(modified_digests[key] != digests[key] for key in ["./", "a/", "a/b/", "a/b/c/"])
+
+    # Names are part of the digest
+    assert (
+        CalculateDirectoryDigests({"a/file.txt": "1"})["./"]
+        != CalculateDirectoryDigests({"b/file.txt": "1"})["./"]
+    )
+    assert (
+        CalculateDirectoryDigests({"a/file.txt": "1"})["./"]
+        != CalculateDirectoryDigests({"a/other.txt": "1"})["./"]
+    )
+
+    # A directory and file with the same name are distinguished
+    assert (
+        CalculateDirectoryDigests({"a": "1"})["./"] != CalculateDirectoryDigests({"a/b": "1"})["./"]
+    )
+
+    assert list(CalculateDirectoryDigests({})) == ["./"]
+
+
+# ----------------------------------------------------------------------
+def test_DiffManifests():
+    manifest = {"file1.txt": "1", "a/file2.txt": "2", "a/b/file3.txt": "3", "d/file4.txt": "4"}
+
+    assert DiffManifests(manifest, dict(manifest)) == []
+    assert DiffManifests({}, {}) == []
+
+    assert DiffManifests(
+        manifest,
+        {
+            "file1.txt": "1",
+            "a/file2.txt": "2",
+            "a/b/file3.txt": "changed",
+            "a/b/new.txt": "5",
+            "e/file5.txt": "6",
+        },
+    ) == ["a/b/file3.txt", "a/b/new.txt", "d/file4.txt", "e/file5.txt"]
+
+    # Directory digests determine which directories are compared
+    digests = CalculateDirectoryDigests(manifest)
+
+    assert DiffManifests(manifest, {**manifest, "d/file4.txt": "changed"}, digests) == [
+        "d/file4.txt"
+    ]
+    assert DiffManifests(manifest, {**manifest, "d/file4.txt": "changed"}, digests, digests) == []
@@ -0,0 +1,274 @@
+# ----------------------------------------------------------------------
+# |
+# |  Copyright (c) 2024 Scientific Software Engineering Center at Georgia Tech
+# |  Distributed under the MIT License.
+# |
+# ----------------------------------------------------------------------
+"""Unit tests for Generation.py"""
+
+import os
+
+import pytest
+
+from conftest import package_context
+
+from PythonProjectBootstrapper.Generation import (
+    ConflictPolicy,
+    Generate,
+    GenerationStage,
+    GetProjectNames,
+)
+from PythonProjectBootstrapper.PathSelection import PathSelection
+from PythonProjectBootstrapper.ProjectGenerationUtils import (
+    ConflictType,
+    LoadManifest,
+    manifest_filename,
+    prompt_filename,
+)
+
+
+# ----------------------------------------------------------------------
+def test_GetProjectNames():
+    assert GetProjectNames() == ["package"]
+
+
+# ----------------------------------------------------------------------
+def test_Generate(tmp_path, capsys, monkeypatch):
+    output_dir = tmp_path / "output"
+    (output_dir / ".git").mkdir(parents=True)
+
+    # Input is never requested
+    monkeypatch.setattr("builtins.input", lambda *args: pytest.fail("input requested"))
+
+    progress: list[tuple[GenerationStage, bool]] = []
+
+    result = Generate(
+        "package",
+        output_dir,
+        package_context,
+        on_progress=lambda stage, is_complete: progress.append((stage, is_complete)),
+    )
+
+    assert capsys.readouterr().out == ""
+
+    assert result.output_dir == output_dir
+    assert (output_dir / "README.md").is_file()
+    assert (output_dir / manifest_filename).is_file()
+    assert not (output_dir / prompt_filename).exists()
+
+    assert str(output_dir / "README.md") in result.modifications.added_files
+    assert result.prompts
+    assert all(isinstance(title, str) and isinstance(text, str) for title, text in result.prompts)
+
+    assert progress == [
+        (GenerationStage.Render, False),
+        (GenerationStage.Render, True),
+        (GenerationStage.Apply, False),
+        (GenerationStage.Apply, True),
+    ]
+    assert set(result.timings) == {GenerationStage.Render, GenerationStage.Apply}
+
+
+# ----------------------------------------------------------------------
+@pytest.mark.parametrize("policy", [ConflictPolicy.Keep, ConflictPolicy.Overwrite])
+def test_ConflictPolicy(tmp_path, policy):
+    output_dir = tmp_path / "output"
+    (output_dir / ".git").mkdir(parents=True)
+
+    Generate("package", output_dir, package_context)
+
+    readme = output_dir / "README.md"
+    original_content = readme.read_text()
+
+    readme.write_text("modified content")
+    (output_dir / "Build.py").unlink()
+
+    result = Generate("package", output_dir, package_context, policy)
+
+    if policy == ConflictPolicy.Overwrite:
+        assert readme.read_text() == original_content
+        assert (output_dir / "Build.py").is_file()
+        assert result.modifications.overwritten_files == [readme.as_posix()]
+    else:
+        assert readme.read_text() == "modified content"
+        assert not (output_dir / "Build.py").exists()
+        assert result.modifications.overwritten_files == []
+
+
+# ----------------------------------------------------------------------
+def test_ConflictCallback(tmp_path):
+    output_dir = tmp_path / "output"
+    (output_dir / ".git").mkdir(parents=True)
+
+    Generate("package", output_dir, package_context)
+
+    (output_dir / "README.md").write_text("modified content")
+    (output_dir / "Build.py").unlink()
+
+    conflicts: list[tuple[str, ConflictType]] = []
+
+    # ----------------------------------------------------------------------
+    def OnConflict(filename, conflict_type):
+        conflicts.append((filename.name, conflict_type))
+        return conflict_type == ConflictType.Deleted
+
+    # ----------------------------------------------------------------------
+
+    Generate("package", output_dir, package_context, on_conflict=OnConflict)
+
+    assert sorted(conflicts) == [
+        ("Build.py", ConflictType.Deleted),
+        ("README.md", ConflictType.Modified),
+    ]
+    assert (output_dir / "README.md").read_text() == "modified content"
+    assert (output_dir / "Build.py").is_file()
+
+
+# ----------------------------------------------------------------------
+def test_Errors(tmp_path):
+    with pytest.raises(
+        Exception, match="'invalid' is not a valid project; valid values are 'package'."
+    ):
+        Generate("invalid", tmp_path, package_context)
+
+    with pytest.raises(Exception, match="is not a git repository"):
+        Generate("package", tmp_path, package_context)
+
+
+# ----------------------------------------------------------------------
+def test_InvalidConfiguration(tmp_path):
+    output_dir = tmp_path / "output"
+    (output_dir / ".git").mkdir(parents=True)
+
+    working_dir = tmp_path / "working"
+
+    # Values that were provided explicitly are validated before anything is created
+    with pytest.raises(
+        Exception, match=r'name \("<your name>"\): the value has not been populated'
+    ):
+        Generate(
+            "package",
+            output_dir,
+            {**package_context, "name": "<your name>"},
+            working_dir=working_dir,
+        )
+
+    assert not working_dir.exists()
+
+    configuration_filename = tmp_path / "configuration.yaml"
+    configuration_filename.write_text("default_context:\n  gist_id: not-a-gist\n")
+
+    with pytest.raises(Exception, match=r'gist_id \("not-a-gist"\): the value does not match'):
+        Generate(
+            "package",
+            output_dir,
+            {key: value for key, value in package_context.items() if key != "gist_id"},
+            configuration_filename=configuration_filename,
+            working_dir=working_dir,
+        )
+
+    assert not working_dir.exists()
+
+    # Values that are resolved during generation are validated before rendering
+    with pytest.raises(Exception, match=r'pypi_project_name \("test project"\)'):
+        Generate("package", output_dir, {**package_context, "github_project_name": "test project"})
+
+    assert list(output_dir.iterdir()) == [output_dir / ".git"]
+
+
+# ----------------------------------------------------------------------
+def test_PathSelection(tmp_path):
+    output_dir = tmp_path / "output"
+    (output_dir / ".git").mkdir(parents=True)
+
+    Generate("package", output_dir, package_context)
+
+    original_manifest = LoadManifest(output_dir / manifest_filename)
+
+    readme = output_dir / "README.md"
+    readme.write_text("modified content")
+    (output_dir / "Build.py").unlink()
+    (output_dir / "LICENSE.txt").unlink()
+
+    workflow = output_dir / ".github" / "workflows" / "standard.yaml"
+    original_workflow = workflow.read_text()
+
+    result = Generate(
+        "package",
+        output_dir,
+        {**package_context, "github_project_name": "other_project"},
+        ConflictPolicy.Overwrite,
+        path_selection=PathSelection.Create([".github/workflows", "Build.py"], ["*/codeql.yml"]),
+    )
+
+    # Only the selected files are applied
+    assert workflow.read_text() != original_workflow
+    assert "other_project_coverage.json" in workflow.read_text()
+    assert (output_dir / "Build.py").is_file()
+
+    assert readme.read_text() == "modified content"
+    assert not (output_dir / "LICENSE.txt").exists()
+
+    assert result.modifications.added_files == [(output_dir / "Build.py").as_posix()]
+    assert result.modifications.modified_template_files == [workflow.as_posix()]
+    assert result.modifications.overwritten_files == []
+    assert result.modifications.deleted_files == []
+
+    # Manifest entries for the other files are preserved
+    manifest = LoadManifest(output_dir / manifest_filename)
+
+    assert set(manifest) == set(original_manifest)
+    assert {
+        relative_path
+        for relative_path, hash_value in manifest.items()
+        if original_manifest[relative_path] != hash_value
+    } == {".github/workflows/standard.yaml", "Build.py"}
+
+
+# ----------------------------------------------------------------------
+def test_Pipelined(tmp_path):
+    sequential_dir = tmp_path / "sequential"
+    (sequential_dir / ".git").mkdir(parents=True)
+
+    pipelined_dir = tmp_path / "pipelined"
+    (pipelined_dir / ".git").mkdir(parents=True)
+
+    Generate("package", sequential_dir, package_context)
+
+    progress: list[tuple[GenerationStage, bool]] = []
+
+    result = Generate(
+        "package",
+        pipelined_dir,
+        package_context,
+        on_progress=lambda stage, is_complete: progress.append((stage, is_complete)),
+        pipelined=True,
+    )
+
+    assert progress == [
+        (GenerationStage.Render, False),
+        (GenerationStage.Render, True),
+        (GenerationStage.Apply, False),
+        (GenerationStage.Apply, True),
+    ]
+    assert result.prompts
+    assert not (pipelined_dir / prompt_filename).exists()
+
+    # The content is the same as the content applied once rendering has completed
+    assert LoadManifest(pipelined_dir / manifest_filename) == LoadManifest(
+        sequential_dir / manifest_filename
+    )
+    assert os.access(pipelined_dir / "Bootstrap.sh", os.X_OK)
+
+    (pipelined_dir / "README.md").write_text("modified content")
+
+    result = Generate(
+        "package",
+        pipelined_dir,
+        {**package_context, "github_project_name": "other_project"},
+        pipelined=True,
+    )
+
+    assert (pipelined_dir / "README.md").read_text() == "modified content"
+    assert result.modifications.overwritten_files == []
+    assert (pipelined_dir / "Build.py").as_posix() in result.modifications.modified_template_files
@@ -0,0 +1,65 @@
+# ----------------------------------------------------------------------
+# |
+# |  Copyright (c) 2024 Scientific Software Engineering Center at Georgia Tech
+# |  Distributed under the MIT License.
+# |
+# ----------------------------------------------------------------------
+"""Unit tests for GitIndex.py"""
+
+import shutil
+import subprocess
+
+from pathlib import Path
+
+import pytest
+
+from PythonProjectBootstrapper.GitIndex import GetCleanBlobIds
+
+
+# ----------------------------------------------------------------------
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git is not available")
+
+
+# ----------------------------------------------------------------------
+def _Git(repo_dir: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", "-C", str(repo_dir), *args],
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout
+
+
+# ----------------------------------------------------------------------
+def test_CleanBlobIds(tmp_path):
+    _Git(tmp_path, "init", "--quiet")
+
+    for filename in [
+        "clean.txt",
+        "modified.txt",
+        "deleted.txt",
+        "staged.txt",
+        "dir/with space.txt",
+    ]:
+        (tmp_path / filename).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / filename).write_text(filename)
+
+    _Git(tmp_path, "add", ".")
+
+    (tmp_path / "modified.txt").write_text("modified")
+    (tmp_path / "deleted.txt").unlink()
+    (tmp_path / "untracked.txt").write_text("untracked")
+
+    blob_ids = GetCleanBlobIds(tmp_path)
+
+    assert blob_ids is not None
+    assert sorted(blob_ids) == ["clean.txt", "dir/with space.txt", "staged.txt"]
+
+    # Values are git's blob ids for the working tree content
+    for filename, blob_id in blob_ids.items():
+        assert blob_id == _Git(tmp_path, "hash-object", filename).strip()
+
+
+# ----------------------------------------------------------------------
+def test_NotGitRepository(tmp_path):
+    assert GetCleanBlobIds(tmp_path) is None
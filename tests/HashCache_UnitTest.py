@@ -0,0 +1,105 @@
+# ----------------------------------------------------------------------
+# |
+# |  Copyright (c) 2024 Scientific Software Engineering Center at Georgia Tech
+# |  Distributed under the MIT License.
+# |
+# ----------------------------------------------------------------------
+"""Unit tests for HashCache.py"""
+
+import os
+
+from PythonProjectBootstrapper.HashCache import FileHashCache
+
+
+# ----------------------------------------------------------------------
+def test_Persisted(tmp_path):
+    (tmp_path / ".git").mkdir()
+
+    filename = tmp_path / "file.txt"
+    filename.write_text("content")
+
+    status = filename.stat()
+
+    cache = FileHashCache.Load(tmp_path)
+    assert cache.GetHash("file.txt", status) is None
+
+    cache.SetHash("file.txt", status, "<hash>")
+    assert cache.GetHash("file.txt", status) == "<hash>"
+
+    cache.Save()
+
+    cache = FileHashCache.Load(tmp_path)
+    assert cache.GetHash("file.txt", status) == "<hash>"
+
+    # Modifications invalidate the entry
+    filename.write_text("different content")
+    assert cache.GetHash("file.txt", filename.stat()) is None
+
+
+# ----------------------------------------------------------------------
+def test_RacyEntriesIgnored(tmp_path):
+    (tmp_path / ".git").mkdir()
+
+    filename = tmp_path / "file.txt"
+    filename.write_text("content")
+
+    cache = FileHashCache.Load(tmp_path)
+    cache.SetHash("file.txt", filename.stat(), "<hash>")
+    cache.Save()
+
+    # Set the file's modification time to be the same as the cache's; the entry can't be trusted
+    assert cache.cache_filename is not None
+    cache_mtime_ns = cache.cache_filename.stat().st_mtime_ns
+
+    os.utime(filename, ns=(cache_mtime_ns, cache_mtime_ns))
+
+    cache = FileHashCache.Load(tmp_path)
+    assert cache.GetHash("file.txt", filename.stat()) is None
+
+
+# ----------------------------------------------------------------------
+def test_BlobIds(tmp_path):
+    (tmp_path / ".git").mkdir()
+
+    cache = FileHashCache.Load(tmp_path)
+    assert cache.GetHashByBlobId("file.txt", "<blob1>") is None
+
+    cache.SetHashByBlobId("file.txt", "<blob1>", "<hash>")
+    cache.Save()
+
+    cache = FileHashCache.Load(tmp_path)
+    assert cache.GetHashByBlobId("file.txt", "<blob1>") == "<hash>"
+    assert cache.GetHashByBlobId("file.txt", "<blob2>") is None
+
+
+# ----------------------------------------------------------------------
+def test_DirectoryDigests(tmp_path):
+    (tmp_path / ".git").mkdir()
+
+    cache = FileHashCache.Load(tmp_path)
+    assert cache.GetDirectoryDigest("dir/", "<signature1>") is None
+
+    cache.SetDirectoryDigest("dir/", "<signature1>", 0, "<digest>")
+    cache.SetDirectoryDigest("racy/", "<signature1>", 2**62, "<digest>")
+    cache.Save()
+
+    cache = FileHashCache.Load(tmp_path)
+    assert cache.GetDirectoryDigest("dir/", "<signature1>") == "<digest>"
+    assert cache.GetDirectoryDigest("dir/", "<signature2>") is None
+
+    # Directories that contain files modified at (or after) the time the cache was written can't be trusted
+    assert cache.GetDirectoryDigest("racy/", "<signature1>") is None
+
+
+# ----------------------------------------------------------------------
+def test_NotGitRepository(tmp_path):
+    filename = tmp_path / "file.txt"
+    filename.write_text("content")
+
+    cache = FileHashCache.Load(tmp_path)
+    assert cache.cache_filename is None
+
+    cache.SetHash("file.txt", filename.stat(), "<hash>")
+    cache.Save()
+
+    assert list(tmp_path.iterdir()) == [filename]
@@ -0,0 +1,200 @@
+# ----------------------------------------------------------------------
+# |
+# |  Copyright (c) 2024 Scientific Software Engineering Center at Georgia Tech
+# |  Distributed under the MIT License.
+# |
+# ----------------------------------------------------------------------
+"""Unit tests for History.py"""
+
+import hashlib
+
+from pathlib import Path
+
+import pytest
+
+from PythonProjectBootstrapper import __version__
+from PythonProjectBootstrapper.History import (
+    CalculateContextHash,
+    DiffHistory,
+    FileDelta,
+    FindGeneration,
+    GetHistoryFilename,
+    HistoryEntry,
+    LoadHistory,
+    history_filename,
+)
+from PythonProjectBootstrapper.ProjectGenerationUtils import CopyToOutputDir
+
+
+# ----------------------------------------------------------------------
+def _WriteTree(root: Path, content: dict[str, str]) -> Path:
+    for relative_path, value in content.items():
+        (root / relative_path).parent.mkdir(parents=True, exist_ok=True)
+        (root / relative_path).write_text(value)
+
+    return root
+
+
+# ----------------------------------------------------------------------
+def _Hash(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+# ----------------------------------------------------------------------
+def test_FileDelta():
+    assert FileDelta(None, "new").status == "added"
+    assert FileDelta("old", None).status == "removed"
+    assert FileDelta("old", "new").status == "modified"
+
+
+# ----------------------------------------------------------------------
+def test_HistoryEntryRoundTrip():
+    entry = HistoryEntry.Create(
+        {"b.txt": FileDelta("old", "new"), "a.txt": FileDelta(None, "new")},
+        "context",
+    )
+
+    assert entry.version == __version__
+
+    line = entry.ToJsonLine()
+    assert "\n" not in line
+    assert line.index('"a.txt"') < line.index('"b.txt"')
+
+    assert HistoryEntry.FromJsonLine(line) == entry
+
+
+# ----------------------------------------------------------------------
+def test_CalculateContextHash():
+    context = {"cookiecutter": {"name": "value", "_template": "one"}}
+
+    assert CalculateContextHash(context) == CalculateContextHash(
+        {"cookiecutter": {"_template": "two", "name": "value"}}
+    )
+    assert CalculateContextHash(context) != CalculateContextHash(
+        {"cookiecutter": {"name": "other value"}}
+    )
+
+
+# ----------------------------------------------------------------------
+def test_FindGeneration():
+    entries = [
+        HistoryEntry("1.0.0", "2024-01-01T00:00:00Z", None),
+        HistoryEntry("1.0.0", "2024-01-02T00:00:00Z", None),
+        HistoryEntry("2.0.0", "2024-01-03T00:00:00Z", None),
+    ]
+
+    assert FindGeneration(entries, "0") == -1
+    assert FindGeneration(entries, "1") == 0
+    assert FindGeneration(entries, "3") == 2
+    assert FindGeneration(entries, "1.0.0") == 1
+    assert FindGeneration(entries, "2.0.0") == 2
+
+    with pytest.raises(Exception, match="'4' is not a valid generation number"):
+        FindGeneration(entries, "4")
+
+    with pytest.raises(Exception, match="version '3.0.0' was not found"):
+        FindGeneration(entries, "3.0.0")
+
+
+# ----------------------------------------------------------------------
+def test_DiffHistory():
+    entries = [
+        HistoryEntry("1.0.0", "", None, {"a": FileDelta(None, "a1"), "b": FileDelta(None, "b1")}),
+        HistoryEntry("1.0.0", "", None, {"a": FileDelta("a1", "a2"), "c": FileDelta(None, "c1")}),
+        HistoryEntry("1.0.0", "", None, {"a": FileDelta("a2", "a1"), "b": FileDelta("b1", None)}),
+    ]
+
+    assert DiffHistory(entries) == {"a": FileDelta(None, "a1"), "c": FileDelta(None, "c1")}
+
+    # Changes to 'a' cancel out
+    assert DiffHistory(entries, 0) == {"b": FileDelta("b1", None), "c": FileDelta(None, "c1")}
+
+    assert DiffHistory(entries, 0, 1) == {"a": FileDelta("a1", "a2"), "c": FileDelta(None, "c1")}
+    assert DiffHistory(entries, to_index=0) == {
+        "a": FileDelta(None, "a1"),
+        "b": FileDelta(None, "b1"),
+    }
+    assert DiffHistory(entries, 2) == {}
+
+
+# ----------------------------------------------------------------------
+def test_CopyToOutputDir(tmp_path):
+    dest = tmp_path / "dest"
+    (dest / ".git").mkdir(parents=True)
+
+    assert LoadHistory(dest) == []
+
+    CopyToOutputDir(
+        src_dir=_WriteTree(tmp_path / "src1", {"a.txt": "a1", "b.txt": "b1", "c.txt": "c1"}),
+        dest_dir=dest,
+        context_hash="first",
+    )
+
+    (dest / "b.txt").write_text("user change")
+
+    src2_content = {"a.txt": "a2", "b.txt": "b2", "d/d.txt": "d1"}
+
+    CopyToOutputDir(
+        src_dir=_WriteTree(tmp_path / "src2", src2_content),
+        dest_dir=dest,
+        on_conflict=lambda *args: True,
+    )
+
+    # Nothing changes
+    CopyToOutputDir(src_dir=_WriteTree(tmp_path / "src3", src2_content), dest_dir=dest)
+
+    entries = LoadHistory(dest)
+    assert [entry.context_hash for entry in entries] == ["first", None, None]
+
+    assert entries[0].files == {
+        "a.txt": FileDelta(None, _Hash("a1")),
+        "b.txt": FileDelta(None, _Hash("b1")),
+        "c.txt": FileDelta(None, _Hash("c1")),
+    }
+
+    assert entries[1].files == {
+        "a.txt": FileDelta(_Hash("a1"), _Hash("a2")),
+        # The previous digest is the content of the file that was overwritten
+        "b.txt": FileDelta(_Hash("user change"), _Hash("b2")),
+        "c.txt": FileDelta(_Hash("c1"), None),
+        "d/d.txt": FileDelta(None, _Hash("d1")),
+    }
+
+    assert entries[2].files == {}
+
+    # The history is written to the `.git` directory
+    assert not (dest / history_filename).exists()
+    assert GetHistoryFilename(dest) == dest / ".git" / "PythonProjectBootstrapper" / "history.jsonl"
+    assert GetHistoryFilename(dest).read_text().count("\n") == 3
+
+
+# ----------------------------------------------------------------------
+def test_HistoryMovedToGitDirectory(tmp_path):
+    dest = tmp_path / "dest"
+    dest.mkdir()
+
+    CopyToOutputDir(
+        src_dir=_WriteTree(tmp_path / "src1", {"a.txt": "a1"}),
+        dest_dir=dest,
+        context_hash="first",
+    )
+
+    # The history is written to the output directory when it isn't a git repository
+    assert GetHistoryFilename(dest) == dest / history_filename
+    assert (dest / history_filename).is_file()
+
+    (dest / ".git").mkdir()
+
+    assert [entry.context_hash for entry in LoadHistory(dest)] == ["first"]
+
+    CopyToOutputDir(
+        src_dir=_WriteTree(tmp_path / "src2", {"a.txt": "a2"}),
+        dest_dir=dest,
+        context_hash="second",
+    )
+
+    # The next generation moves the existing history into the `.git` directory
+    assert not (dest / history_filename).exists()
+    assert GetHistoryFilename(dest).read_text().count("\n") == 2
+
+    assert [entry.context_hash for entry in LoadHistory(dest)] == ["first", "second"]
@@ -0,0 +1,240 @@
+# ----------------------------------------------------------------------
+# |
+# |  Copyright (c) 2024 Scientific Software Engineering Center at Georgia Tech
+# |  Distributed under the MIT License.
+# |
+# ----------------------------------------------------------------------
+"""Unit tests for Journal.py"""
+
+import stat
+import subprocess
+import sys
+import textwrap
+
+from pathlib import Path
+
+import pytest
+
+from PythonProjectBootstrapper.History import LoadHistory
+from PythonProjectBootstrapper.Journal import (
+    ApplyJournal,
+    GetJournalDirectory,
+    RecoverJournal,
+    journal_dirname,
+)
+from PythonProjectBootstrapper.ProjectGenerationUtils import (
+    CopyToOutputDir,
+    manifest_filename,
+)
+
+
+# ----------------------------------------------------------------------
+def _ReadTree(root: Path) -> dict[str, str]:
+    return {
+        path.relative_to(root).as_posix(): path.read_text()
+        for path in sorted(root.rglob("*"))
+        if path.is_file() and ".git" not in path.relative_to(root).parts
+    }
+
+
+# ----------------------------------------------------------------------
+def _WriteTree(root: Path, content: dict[str, str]) -> Path:
+    for relative_path, text in content.items():
+        (root / relative_path).parent.mkdir(parents=True, exist_ok=True)
+        (root / relative_path).write_text(text)
+
+    return root
+
+
+# ----------------------------------------------------------------------
+def test_GetJournalDirectory(tmp_path):
+    assert GetJournalDirectory(tmp_path) == tmp_path / journal_dirname
+
+    (tmp_path / ".git").mkdir()
+    assert GetJournalDirectory(tmp_path) == (
+        tmp_path / ".git" / "PythonProjectBootstrapper" / "journal"
+    )
+
+
+# ----------------------------------------------------------------------
+@pytest.mark.parametrize("commit", [True, False])
+def test_Journal(tmp_path, commit):
+    output_dir = _WriteTree(
+        tmp_path,
+        {"appended.txt": "original\n", "modified.txt": "original", "removed.txt": "removed"},
+    )
+    (output_dir / "modified.txt").chmod(0o600)
+
+    journal = ApplyJournal.Begin(output_dir)
+
+    journal.PrepareWrite("modified.txt")
+    (output_dir / "modified.txt").write_text("modified")
+
+    journal.PrepareModeChange("modified.txt")
+    (output_dir / "modified.txt").chmod(0o700)
+
+    journal.RemoveFile("removed.txt")
+
+    journal.PrepareAppend("appended.txt")
+    with (output_dir / "appended.txt").open("a") as f:
+        f.write("appended\n")
+
+    journal.PrepareAppend("new_log.txt")
+    (output_dir / "new_log.txt").write_text("appended\n")
+
+    journal.PrepareDirectory("new_dir")
+    (output_dir / "new_dir").mkdir()
+
+    journal.PrepareWrite("new_dir/added.txt")
+    (output_dir / "new_dir" / "added.txt").write_text("added")
+
+    if commit:
+        journal.Commit()
+
+        assert _ReadTree(output_dir) == {
+            "appended.txt": "original\nappended\n",
+            "modified.txt": "modified",
+            "new_dir/added.txt": "added",
+            "new_log.txt": "appended\n",
+        }
+    else:
+        assert journal.Rollback() == [
+            "appended.txt",
+            "modified.txt",
+            "new_dir",
+            "new_dir/added.txt",
+            "new_log.txt",
+            "removed.txt",
+        ]
+
+        assert _ReadTree(output_dir) == {
+            "appended.txt": "original\n",
+            "modified.txt": "original",
+            "removed.txt": "removed",
+        }
+        assert stat.S_IMODE((output_dir / "modified.txt").stat().st_mode) == 0o600
+        assert not (output_dir / "new_dir").exists()
+
+    assert not GetJournalDirectory(output_dir).exists()
+
+
+# ----------------------------------------------------------------------
+def test_RecoverIncompleteRecord(tmp_path):
+    output_dir = _WriteTree(tmp_path, {"file.txt": "original"})
+
+    journal = ApplyJournal.Begin(output_dir)
+    journal.PrepareWrite("file.txt")
+    (output_dir / "file.txt").write_text("modified")
+
+    # Simulate a process that was killed while writing a record
+    with (GetJournalDirectory(output_dir) / "journal.jsonl").open("a") as f:
+        f.write('{"operation": "wri')
+
+    with pytest.raises(Exception, match="An interrupted journal exists"):
+        ApplyJournal.Begin(output_dir)
+
+    assert RecoverJournal(output_dir) == ["file.txt"]
+    assert _ReadTree(output_dir) == {"file.txt": "original"}
+
+    # Nothing to recover
+    assert RecoverJournal(output_dir) == []
+
+
+# ----------------------------------------------------------------------
+def test_CopyToOutputDirRollback(tmp_path):
+    dest = tmp_path / "dest"
+    (dest / ".git").mkdir(parents=True)
+
+    CopyToOutputDir(
+        src_dir=_WriteTree(tmp_path / "src1", {"a.txt": "a1", "b.txt": "b1", "c.txt": "c1"}),
+        dest_dir=dest,
+    )
+
+    (dest / "b.txt").write_text("user change")
+
+    original_tree = _ReadTree(dest)
+
+    src2 = _WriteTree(tmp_path / "src2", {"a.txt": "a2", "b.txt": "b2", "d/d.txt": "d2"})
+
+    # ----------------------------------------------------------------------
+    def OnConflict(*args) -> bool:  # pylint: disable=unused-argument
+        raise KeyboardInterrupt()
+
+    # ----------------------------------------------------------------------
+
+    with pytest.raises(KeyboardInterrupt):
+        CopyToOutputDir(src_dir=src2, dest_dir=dest, on_conflict=OnConflict)
+
+    # The manifest is restored along with the files
+    assert _ReadTree(dest) == original_tree
+    assert not (dest / "d").exists()
+    assert not GetJournalDirectory(dest).exists()
+
+
+# ----------------------------------------------------------------------
+def test_CopyToOutputDirKilled(tmp_path):
+    dest = tmp_path / "dest"
+    (dest / ".git").mkdir(parents=True)
+
+    CopyToOutputDir(
+        src_dir=_WriteTree(tmp_path / "src1", {"a.txt": "a1", "b.txt": "b1", "c.txt": "c1"}),
+        dest_dir=dest,
+    )
+
+    (dest / "b.txt").write_text("user change")
+
+    original_tree = _ReadTree(dest)
+
+    src2 = _WriteTree(tmp_path / "src2", {"a.txt": "a2", "b.txt": "b2", "d/d.txt": "d2"})
+
+    # The process is killed when the conflict is detected, after other files have been modified
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            textwrap.dedent(
+                f"""\
+                import os
+                from pathlib import Path
+                from PythonProjectBootstrapper.ProjectGenerationUtils import CopyToOutputDir
+
+                CopyToOutputDir(
+                    src_dir=Path(r"{src2}"),
+                    dest_dir=Path(r"{dest}"),
+                    on_conflict=lambda *args: os._exit(3),
+                )
+                """,
+            ),
+        ],
+        check=False,
+    )
+
+    assert result.returncode == 3
+
+    # c.txt was removed before the process was killed
+    assert not (dest / "c.txt").exists()
+    assert (GetJournalDirectory(dest) / "journal.jsonl").is_file()
+
+    # The changes are rolled back before new changes are applied
+    modifications = CopyToOutputDir(
+        src_dir=src2,
+        dest_dir=dest,
+        on_conflict=lambda *args: False,
+    )
+
+    assert modifications.deleted_files == [(dest / "c.txt").as_posix()]
+    assert modifications.added_files == [(dest / "d" / "d.txt").as_posix()]
+    assert modifications.modified_template_files == [(dest / "a.txt").as_posix()]
+    assert modifications.overwritten_files == []
+
+    assert _ReadTree(dest) == {
+        "a.txt": "a2",
+        "b.txt": original_tree["b.txt"],
+        "d/d.txt": "d2",
+        manifest_filename: (dest / manifest_filename).read_text(),
+    }
+
+    # The history entry appended by the interrupted process was removed
+    assert len(LoadHistory(dest)) == 2
+
+    assert not GetJournalDirectory(dest).exists()
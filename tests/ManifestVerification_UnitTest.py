@@ -0,0 +1,161 @@
+# ----------------------------------------------------------------------
+# |
+# |  Copyright (c) 2024 Scientific Software Engineering Center at Georgia Tech
+# |  Distributed under the MIT License.
+# |
+# ----------------------------------------------------------------------
+"""Unit tests for ManifestVerification.py"""
+
+import os
+import shutil
+import subprocess
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from PythonProjectBootstrapper.HashCache import FileHashCache
+from PythonProjectBootstrapper.ManifestVerification import VerifyManifest
+from PythonProjectBootstrapper.ProjectGenerationUtils import CopyToOutputDir
+
+
+# ----------------------------------------------------------------------
+def _Generate(root: Path, num_files: int = 5) -> Path:
+    src = root / "src"
+    dest = root / "dest"
+
+    for index in range(num_files):
+        filename = src / "dir{}".format(index % 3) / "file{}.txt".format(index)
+
+        filename.parent.mkdir(parents=True, exist_ok=True)
+        filename.write_text("content {}".format(index))
+
+    (dest / ".git").mkdir(parents=True)
+
+    CopyToOutputDir(src_dir=src, dest_dir=dest)
+
+    return dest
+
+
+# ----------------------------------------------------------------------
+def test_NoDrift(tmp_path):
+    dest = _Generate(tmp_path)
+
+    result = VerifyManifest(dest)
+
+    assert len(result.unchanged_files) == 5
+    assert result.modified_files == []
+    assert result.missing_files == []
+    assert result.has_drift is False
+
+
+# ----------------------------------------------------------------------
+@pytest.mark.parametrize("use_cache", [True, False])
+def test_Drift(tmp_path, use_cache):
+    dest = _Generate(tmp_path, 600)
+
+    (dest / "dir1" / "file1.txt").write_text("modified content")
+    (dest / "dir2" / "file5.txt").unlink()
+
+    result = VerifyManifest(dest, max_workers=4, use_cache=use_cache)
+
+    assert len(result.unchanged_files) == 598
+    assert result.modified_files == ["dir1/file1.txt"]
+    assert result.missing_files == ["dir2/file5.txt"]
+    assert result.has_drift is True
+
+
+# ----------------------------------------------------------------------
+def test_Cache(tmp_path):
+    dest = _Generate(tmp_path)
+
+    VerifyManifest(dest)
+    assert (dest / ".git" / "PythonProjectBootstrapper" / "file_hashes.json").is_file()
+
+    modified_filename = dest / "dir0" / "file0.txt"
+    modified_filename.write_text("modified content")
+
+    with patch(
+        "PythonProjectBootstrapper.ManifestVerification.GenerateFileHash",
+        side_effect=lambda filepath: "<modified>",
+    ) as mock_hash:
+        result = VerifyManifest(dest)
+
+    # Only the modified file is hashed again
+    assert [call.args[0] for call in mock_hash.call_args_list] == [modified_filename]
+    assert result.modified_files == ["dir0/file0.txt"]
+    assert len(result.unchanged_files) == 4
+
+
+# ----------------------------------------------------------------------
+def test_UnchangedDirectories(tmp_path):
+    dest = _Generate(tmp_path, 6)
+
+    # Ensure that the files weren't modified at the same time as the cache is written (those entries aren't trusted)
+    for filename in dest.glob("dir*/*.txt"):
+        os.utime(filename, ns=(0, 0))
+
+    VerifyManifest(dest)
+
+    # Files within unchanged directories are skipped
+    with patch.object(FileHashCache, "GetHash", autospec=True, return_value=None) as mock_get_hash:
+        result = VerifyManifest(dest)
+
+    assert mock_get_hash.call_args_list == []
+    assert len(result.unchanged_files) == 6
+
+    # Files within directories that contain a modified file are checked
+    modified_filename = dest / "dir1" / "file1.txt"
+    modified_filename.write_text("modified content")
+
+    with patch.object(
+        FileHashCache, "GetHash", autospec=True, side_effect=FileHashCache.GetHash
+    ) as mock_get_hash:
+        result = VerifyManifest(dest)
+
+    assert sorted(call.args[1] for call in mock_get_hash.call_args_list) == [
+        "dir1/file1.txt",
+        "dir1/file4.txt",
+    ]
+    assert result.modified_files == ["dir1/file1.txt"]
+    assert len(result.unchanged_files) == 5
+
+
+# ----------------------------------------------------------------------
+@pytest.mark.skipif(shutil.which("git") is None, reason="git is not available")
+def test_GitIndex(tmp_path):
+    dest = _Generate(tmp_path)
+
+    shutil.rmtree(dest / ".git")
+    subprocess.run(["git", "init", "--quiet", str(dest)], check=True)
+    subprocess.run(["git", "-C", str(dest), "add", "."], check=True)
+
+    result = VerifyManifest(dest, use_git_index=True)
+    assert len(result.unchanged_files) == 5
+
+    # Update the stat information of a clean file; its hash is still reused based on its blob id
+    modified_filename = dest / "dir0" / "file0.txt"
+    modified_filename.write_text("modified content")
+    modified_filename.write_text("content 0")
+
+    with patch(
+        "PythonProjectBootstrapper.ManifestVerification.GenerateFileHash",
+        side_effect=lambda filepath: "<modified>",
+    ) as mock_hash:
+        result = VerifyManifest(dest, use_git_index=True)
+
+    assert mock_hash.call_args_list == []
+    assert len(result.unchanged_files) == 5
+
+    # Dirty files are hashed
+    modified_filename.write_text("modified content")
+
+    with patch(
+        "PythonProjectBootstrapper.ManifestVerification.GenerateFileHash",
+        side_effect=lambda filepath: "<modified>",
+    ) as mock_hash:
+        result = VerifyManifest(dest, use_git_index=True)
+
+    assert [call.args[0] for call in mock_hash.call_args_list] == [modified_filename]
+    assert result.modified_files == ["dir0/file0.txt"]
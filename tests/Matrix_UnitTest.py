@@ -0,0 +1,151 @@
+# ----------------------------------------------------------------------
+# |
+# |  Copyright (c) 2024 Scientific Software Engineering Center at Georgia Tech
+# |  Distributed under the MIT License.
+# |
+# ----------------------------------------------------------------------
+"""Unit tests for Matrix.py"""
+
+from pathlib import Path
+
+import pytest
+
+from PythonProjectBootstrapper.Matrix import (
+    CalculateManifestDigest,
+    CompareSnapshots,
+    CreatePermutations,
+    GetAxes,
+    LoadSnapshots,
+    RenderPermutations,
+    SaveSnapshots,
+)
+
+
+# ----------------------------------------------------------------------
+_context = {
+    "name": "Jane Doe",
+    "email": "jane@example.com",
+    "project_description": "A test project",
+    "github_username": "jdoe",
+    "github_project_name": "test_project",
+    "gist_id": "abc123",
+    "minisign_public_key": "none",
+    "openssf_best_practices_badge_id": "none",
+}
+
+_snapshots_filename = Path(__file__).parent / "Snapshots" / "package_matrix.json"
+
+
+# ----------------------------------------------------------------------
+def test_GetAxes():
+    axes = GetAxes("package")
+
+    assert axes["create_docker_image"] == [False, True]
+    assert axes["license"][0] == "MIT"
+    assert "name" not in axes
+    assert not any(key.startswith("_") for key in axes)
+
+
+# ----------------------------------------------------------------------
+def test_CreatePermutations():
+    permutations = CreatePermutations("package", _context)
+
+    assert len(permutations) == 2 * 5
+    assert permutations[0].name == "create_docker_image=False,license=Apache-2.0"
+    assert permutations[0].context["create_docker_image"] is False
+    assert permutations[0].context["license"] == "Apache-2.0"
+    assert permutations[0].context["name"] == "Jane Doe"
+
+    # Axes can be overridden
+    permutations = CreatePermutations("package", _context, {"license": ["MIT"]})
+
+    assert [permutation.name for permutation in permutations] == [
+        "create_docker_image=False,license=MIT",
+        "create_docker_image=True,license=MIT",
+    ]
+
+
+# ----------------------------------------------------------------------
+def test_CreatePermutationsSample():
+    sample = CreatePermutations("package", _context, sample=3, seed=1)
+
+    assert len(sample) == 3
+    assert sample == sorted(sample, key=lambda permutation: permutation.name)
+    assert sample == CreatePermutations("package", _context, sample=3, seed=1)
+
+    all_names = {permutation.name for permutation in CreatePermutations("package", _context)}
+    assert {permutation.name for permutation in sample} <= all_names
+
+    # A sample larger than the number of permutations returns all permutations
+    assert len(CreatePermutations("package", _context, sample=100)) == len(all_names)
+
+
+# ----------------------------------------------------------------------
+def test_CalculateManifestDigest():
+    digest = CalculateManifestDigest({"a.txt": "1", "b.txt": "2"})
+
+    assert digest == CalculateManifestDigest({"b.txt": "2", "a.txt": "1"})
+    assert digest != CalculateManifestDigest({"a.txt": "1", "b.txt": "3"})
+    assert digest != CalculateManifestDigest({"a.txt": "1", "c.txt": "2"})
+
+
+# ----------------------------------------------------------------------
+def test_Snapshots(tmp_path):
+    filename = tmp_path / "snapshots" / "snapshots.json"
+
+    assert LoadSnapshots(filename) == {}
+
+    SaveSnapshots(filename, {"b": "2", "a": "1"})
+    assert LoadSnapshots(filename) == {"a": "1", "b": "2"}
+
+    comparison = CompareSnapshots({"a": "1", "b": "2"}, {"a": "1", "b": "3", "c": "4"})
+
+    assert comparison.matching == ["a"]
+    assert comparison.mismatched == ["b"]
+    assert comparison.new == ["c"]
+    assert not comparison.is_success
+
+    assert CompareSnapshots({"a": "1", "b": "2"}, {"a": "1"}).is_success
+
+
+# ----------------------------------------------------------------------
+def test_RenderPermutationsIsDeterministic():
+    permutations = CreatePermutations("package", _context, {"license": ["MIT"]})
+
+    digests = RenderPermutations("package", permutations, max_workers=1)
+
+    assert len(set(digests.values())) == len(permutations)
+    assert digests == RenderPermutations("package", permutations, max_workers=2)
+    assert digests != RenderPermutations(
+        "package", permutations, max_workers=1, snapshot_date="2023-01-01"
+    )
+
+
+# ----------------------------------------------------------------------
+def test_PackageMatrix(template_matrix):
+    digests = template_matrix.Verify("package", _context, _snapshots_filename)
+
+    assert len(set(digests.values())) == len(digests)
+
+
+# ----------------------------------------------------------------------
+def test_PackageMatrixMismatch(tmp_path, template_matrix, monkeypatch):
+    monkeypatch.setattr(template_matrix, "update_snapshots", False)
+    monkeypatch.setattr(template_matrix, "sample", None)
+
+    snapshots = LoadSnapshots(_snapshots_filename)
+    snapshots["create_docker_image=False,license=MIT"] = "0" * 64
+
+    snapshots_filename = tmp_path / "snapshots.json"
+    SaveSnapshots(snapshots_filename, snapshots)
+
+    with pytest.raises(pytest.fail.Exception) as ex:
+        template_matrix.Verify(
+            "package",
+            _context,
+            snapshots_filename,
+            {"license": ["MIT"]},
+        )
+
+    assert "mismatched: create_docker_image=False,license=MIT" in str(ex.value)
+    assert "--update-template-snapshots" in str(ex.value)
@@ -0,0 +1,178 @@
+# ----------------------------------------------------------------------
+# |
+# |  Copyright (c) 2024 Scientific Software Engineering Center at Georgia Tech
+# |  Distributed under the MIT License.
+# |
+# ----------------------------------------------------------------------
+"""Unit tests for ModificationReports.py"""
+
+import io
+import json
+import sys
+import textwrap
+import xml.etree.ElementTree as ET
+
+from pathlib import Path
+from typing import Optional
+from unittest.mock import patch
+
+from PythonProjectBootstrapper.ModificationReports import (
+    CreateDirectoryRollup,
+    DisplayReport,
+    ReportMode,
+    WriteJsonReport,
+    WriteJUnitReport,
+)
+from PythonProjectBootstrapper.ProjectGenerationUtils import CopyToOutputDirResult
+
+
+# ----------------------------------------------------------------------
+_output_dir = Path("/output")
+
+_modifications = CopyToOutputDirResult(
+    deleted_files=["/output/old.txt"],
+    added_files=["/output/src/file{}.py".format(index) for index in range(5)]
+    + ["/output/README.md"],
+    overwritten_files=[],
+    modified_template_files=["/output/src/nested/file.py"],
+)
+
+
+# ----------------------------------------------------------------------
+class _TerminalStream(io.StringIO):
+    def isatty(self) -> bool:
+        return True
+
+
+# ----------------------------------------------------------------------
+def _Display(mode: Optional[ReportMode], max_files: int = 20, is_terminal: bool = False) -> str:
+    sink = _TerminalStream() if is_terminal else io.StringIO()
+
+    DisplayReport(_modifications, _output_dir, mode, max_files, output_stream=sink)
+
+    return sink.getvalue()
+
+
+# ----------------------------------------------------------------------
+def test_Summary():
+    assert _Display(ReportMode.Summary) == textwrap.dedent(
+        """\
+
+
+        Deleted Files: 1
+        Added Files: 6
+        Overwritten Files: 0
+        Modified Template Files: 1
+        """,
+    )
+
+
+# ----------------------------------------------------------------------
+def test_Directories():
+    assert CreateDirectoryRollup(_modifications, _output_dir) == {
+        ".": [1, 1, 0, 0],
+        "src": [0, 5, 0, 0],
+        "src/nested": [0, 0, 0, 1],
+    }
+
+    assert _Display(ReportMode.Directories).splitlines()[2:] == [
+        "Directory   Deleted Files  Added Files  Overwritten Files  Modified Template Files",
+        ".                       1            1                  0                        0",
+        "src                     0            5                  0                        0",
+        "src/nested              0            0                  0                        1",
+    ]
+
+
+# ----------------------------------------------------------------------
+def test_Top():
+    assert _Display(ReportMode.Top, 2) == textwrap.dedent(
+        """\
+
+
+        Deleted Files (1)
+         - /output/old.txt
+        Added Files (6)
+         - /output/src/file0.py
+         - /output/src/file1.py
+         ... and 4 more
+        Overwritten Files (0)
+        Modified Template Files (1)
+         - /output/src/nested/file.py
+        """,
+    )
+
+
+# ----------------------------------------------------------------------
+def test_Full():
+    lines = [line.strip() for line in _Display(ReportMode.Full).splitlines()]
+
+    assert "Output Directory Modifications" in lines[2]
+    assert lines[3:16] == [
+        "",
+        "Deleted Files",
+        "- /output/old.txt",
+        "",
+        "Added Files",
+        "- /output/src/file0.py",
+        "- /output/src/file1.py",
+        "- /output/src/file2.py",
+        "- /output/src/file3.py",
+        "- /output/src/file4.py",
+        "- /output/README.md",
+        "",
+        "Overwritten Files",
+    ]
+
+
+# ----------------------------------------------------------------------
+def test_DefaultMode():
+    with patch(
+        "PythonProjectBootstrapper.ModificationReports.DisplayModifications"
+    ) as mock_display:
+        # Output that isn't displayed in a terminal (for example, CI logs) is limited
+        assert _Display(None, 2) == _Display(ReportMode.Top, 2)
+        assert mock_display.call_count == 0
+
+        _Display(None, is_terminal=True)
+        assert mock_display.call_count == 1
+
+
+# ----------------------------------------------------------------------
+def test_PlainTextWithoutRich():
+    # Plain text reports should not import rich
+    with patch.dict(sys.modules, {"rich": None}):
+        _Display(ReportMode.Summary)
+
+
+# ----------------------------------------------------------------------
+def test_WriteJsonReport(tmp_path):
+    filename = tmp_path / "reports" / "report.json"
+
+    WriteJsonReport(_modifications, filename)
+
+    with filename.open() as f:
+        assert json.load(f) == {
+            "deleted_files": _modifications.deleted_files,
+            "added_files": _modifications.added_files,
+            "overwritten_files": [],
+            "modified_template_files": _modifications.modified_template_files,
+        }
+
+
+# ----------------------------------------------------------------------
+def test_WriteJUnitReport(tmp_path):
+    filename = tmp_path / "report.xml"
+
+    WriteJUnitReport(_modifications, filename)
+
+    root = ET.parse(filename).getroot()
+
+    assert root.tag == "testsuites"
+    assert root.get("tests") == "8"
+    assert [(suite.get("name"), suite.get("tests")) for suite in root] == [
+        ("Deleted Files", "1"),
+        ("Added Files", "6"),
+        ("Overwritten Files", "0"),
+        ("Modified Template Files", "1"),
+    ]
+    assert [testcase.get("name") for testcase in root[0]] == ["/output/old.txt"]
@@ -0,0 +1,62 @@
+# ----------------------------------------------------------------------
+# |
+# |  Copyright (c) 2024 Scientific Software Engineering Center at Georgia Tech
+# |  Distributed under the MIT License.
+# |
+# ----------------------------------------------------------------------
+"""Unit tests for PathSelection.py"""
+
+from PythonProjectBootstrapper.PathSelection import PathSelection
+
+
+# ----------------------------------------------------------------------
+def test_Create():
+    assert PathSelection.Create() is None
+    assert PathSelection.Create([], []) is None
+    assert PathSelection.Create(["*.py"]) == PathSelection(("*.py",), ())
+
+
+# ----------------------------------------------------------------------
+def test_Only():
+    selection = PathSelection.Create([".github/workflows/*", "Build.py"])
+    assert selection is not None
+
+    assert selection.IsSelected(".github/workflows/standard.yaml")
+    assert selection.IsSelected("Build.py")
+
+    assert not selection.IsSelected(".github/CODEOWNERS")
+    assert not selection.IsSelected("src/Build.py")
+    assert not selection.IsSelected("README.md")
+
+
+# ----------------------------------------------------------------------
+def test_Directories():
+    # A pattern that matches a directory matches the files within it
+    selection = PathSelection.Create([".github/", "src"])
+    assert selection is not None
+
+    assert selection.IsSelected(".github/workflows/standard.yaml")
+    assert selection.IsSelected("src/package/__init__.py")
+
+    assert not selection.IsSelected(".githubx/file.txt")
+    assert not selection.IsSelected("tests/src/file.py")
+
+
+# ----------------------------------------------------------------------
+def test_Exclude():
+    selection = PathSelection.Create(exclude=["*.md", "tests"])
+    assert selection is not None
+
+    assert selection.IsSelected("Build.py")
+    assert selection.IsSelected("src/package/__init__.py")
+
+    assert not selection.IsSelected("README.md")
+    assert not selection.IsSelected("docs/index.md")
+    assert not selection.IsSelected("tests/test.py")
+
+    selection = PathSelection.Create(["src"], ["*/__init__.py"])
+    assert selection is not None
+
+    assert selection.IsSelected("src/package/module.py")
+    assert not selection.IsSelected("src/package/__init__.py")
+    assert not selection.IsSelected("Build.py")
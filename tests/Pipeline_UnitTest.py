@@ -0,0 +1,206 @@
+# ----------------------------------------------------------------------
+# |
+# |  Copyright (c) 2024 Scientific Software Engineering Center at Georgia Tech
+# |  Distributed under the MIT License.
+# |
+# ----------------------------------------------------------------------
+import pytest
+import os
+import time
+
+from pathlib import Path
+
+from dbrownell_Common import PathEx
+from PythonProjectBootstrapper.Pipeline import PipelineOptions, RenderAndCopyToOutputDir
+from PythonProjectBootstrapper.ProjectGenerationUtils import (
+    CopyToOutputDirEvent,
+    CopyToOutputDirEventType,
+    GenerateFileHash,
+    KnownFileHash,
+    LoadManifest,
+    manifest_filename,
+)
+
+
+# ----------------------------------------------------------------------
+def test_RenderAndCopyToOutputDir(tmp_path):
+    src = tmp_path / "src"
+    dest = tmp_path / "dest"
+
+    # ----------------------------------------------------------------------
+    def CreateRender(files: dict[str, str], unreported_files: dict[str, str]):
+        def Render(on_file_rendered):
+            for index, (filepath, content) in enumerate(files.items()):
+                fullpath = src / filepath
+
+                fullpath.parent.mkdir(parents=True, exist_ok=True)
+                fullpath.write_text(content)
+
+                on_file_rendered(
+                    str(fullpath), KnownFileHash.Create(fullpath, GenerateFileHash(fullpath))
+                )
+
+                if index == 0 and not unreported_files:
+                    # The first file is applied while rendering is in progress
+                    deadline = time.monotonic() + 10
+
+                    while not (dest / filepath).is_file():
+                        assert time.monotonic() < deadline
+                        time.sleep(0.01)
+
+            # Files created by hooks are not reported
+            for filepath, content in unreported_files.items():
+                (src / filepath).write_text(content)
+
+            return "context_hash"
+
+        return Render
+
+    # ----------------------------------------------------------------------
+
+    src.mkdir()
+    dest.mkdir()
+
+    events: list[CopyToOutputDirEvent] = []
+
+    result = RenderAndCopyToOutputDir(
+        CreateRender(
+            {"same": "abc", "dir/template_changed": "def", "user_changed": "ghi", "removed": "jkl"},
+            {},
+        ),
+        src,
+        dest,
+        on_event=events.append,
+        options=PipelineOptions(max_pending_files=1),
+    )
+
+    assert result.added_files == sorted(
+        (dest / filepath).as_posix()
+        for filepath in ["same", "dir/template_changed", "user_changed", "removed"]
+    )
+    assert [event.total_files for event in events][-1] == 4
+    assert not src.exists()
+
+    original_manifest = LoadManifest(dest / manifest_filename)
+
+    (dest / "user_changed").write_text("modified")
+
+    src.mkdir()
+
+    events = []
+    render_complete: list[int] = []
+
+    result = RenderAndCopyToOutputDir(
+        CreateRender(
+            {"same": "abc", "dir/template_changed": "DEF", "user_changed": "ghi"},
+            {"new": "mnopq"},
+        ),
+        src,
+        dest,
+        on_conflict=lambda *args: False,
+        on_event=events.append,
+        options=PipelineOptions(apply_during_render=False),
+        on_render_complete=lambda: render_complete.append(len(events)),
+    )
+
+    # Files are only applied once rendering has completed
+    assert render_complete == [0]
+
+    assert sorted(
+        (event.event_type, PathEx.CreateRelativePath(dest, Path(event.filename)).as_posix())
+        for event in events
+    ) == [
+        (CopyToOutputDirEventType.Added, "new"),
+        (CopyToOutputDirEventType.Deleted, "removed"),
+        (CopyToOutputDirEventType.Modified, "dir/template_changed"),
+        (CopyToOutputDirEventType.Skipped, "user_changed"),
+        (CopyToOutputDirEventType.Unchanged, "same"),
+    ]
+    assert events[-1].event_type == CopyToOutputDirEventType.Deleted
+    assert events[-1].total_files == 5
+
+    assert result.deleted_files == [(dest / "removed").as_posix()]
+    assert (dest / "user_changed").read_text() == "modified"
+    assert (dest / "dir" / "template_changed").read_text() == "DEF"
+    assert not (dest / "removed").exists()
+
+    # The manifest is the same as the one created when content is applied once rendering has completed
+    manifest = LoadManifest(dest / manifest_filename)
+
+    assert sorted(manifest) == [
+        "dir/template_changed",
+        "new",
+        "removed",
+        "same",
+        "user_changed",
+    ]
+    assert manifest["user_changed"] == original_manifest["user_changed"]
+    assert manifest["new"] == GenerateFileHash(dest / "new")
+
+
+# ----------------------------------------------------------------------
+def test_RenderAndCopyToOutputDirReportedAgain(tmp_path):
+    src = tmp_path / "src"
+    dest = tmp_path / "dest"
+
+    # ----------------------------------------------------------------------
+    def Render(on_file_rendered):
+        fullpath = src / "file"
+        fullpath.write_text("before")
+
+        on_file_rendered(str(fullpath), KnownFileHash.Create(fullpath, GenerateFileHash(fullpath)))
+
+        # Modified by a hook without a change in size or modification time
+        status = fullpath.stat()
+
+        fullpath.write_text("after!")
+        os.utime(fullpath, ns=(status.st_atime_ns, status.st_mtime_ns))
+
+        on_file_rendered(str(fullpath), KnownFileHash.Create(fullpath, GenerateFileHash(fullpath)))
+
+        return "context_hash"
+
+    # ----------------------------------------------------------------------
+
+    src.mkdir()
+    dest.mkdir()
+
+    result = RenderAndCopyToOutputDir(
+        Render,
+        src,
+        dest,
+        options=PipelineOptions(apply_during_render=False, max_pending_files=1),
+    )
+
+    assert result.added_files == [(dest / "file").as_posix()]
+    assert (dest / "file").read_text() == "after!"
+    assert LoadManifest(dest / manifest_filename) == {"file": GenerateFileHash(dest / "file")}
+
+
+# ----------------------------------------------------------------------
+def test_RenderAndCopyToOutputDirError(tmp_path):
+    src = tmp_path / "src"
+    dest = tmp_path / "dest"
+
+    # ----------------------------------------------------------------------
+    def Render(on_file_rendered):
+        for index in range(10):
+            fullpath = src / f"file{index}"
+            fullpath.write_text(str(index))
+
+            on_file_rendered(
+                str(fullpath), KnownFileHash.Create(fullpath, GenerateFileHash(fullpath))
+            )
+
+        raise Exception("Rendering failed")
+
+    # ----------------------------------------------------------------------
+
+    src.mkdir()
+    dest.mkdir()
+
+    with pytest.raises(Exception, match="Rendering failed"):
+        RenderAndCopyToOutputDir(Render, src, dest, options=PipelineOptions(max_pending_files=2))
+
+    # Changes applied before the error are rolled back
+    assert list(dest.iterdir()) == []
@@ -0,0 +1,189 @@
+# ----------------------------------------------------------------------
+# |
+# |  Copyright (c) 2024 Scientific Software Engineering Center at Georgia Tech
+# |  Distributed under the MIT License.
+# |
+# ----------------------------------------------------------------------
+"""Unit tests for Prefetch.py"""
+
+import os
+import shutil
+import subprocess
+import time
+
+import pytest
+import yaml
+
+from conftest import package_context
+
+from PythonProjectBootstrapper import ManifestVerification, Prefetch as PrefetchModule
+from PythonProjectBootstrapper.Generation import Generate, GetTemplatesRootDir
+from PythonProjectBootstrapper.Prefetch import Prefetch
+from PythonProjectBootstrapper.ProjectGenerationUtils import (
+    GenerateFileHash,
+    LoadManifest,
+    manifest_filename,
+)
+from PythonProjectBootstrapper.Rendering import RenderingBackend
+
+
+# ----------------------------------------------------------------------
+def test_GetCurrentHashes(tmp_path):
+    project_dir = GetTemplatesRootDir() / "package"
+
+    output_dir = tmp_path / "output"
+    (output_dir / ".git").mkdir(parents=True)
+
+    # Nothing has been generated yet
+    assert Prefetch(project_dir, output_dir).GetCurrentHashes() == {}
+
+    Generate("package", output_dir, package_context)
+
+    manifest = LoadManifest(output_dir / manifest_filename)
+
+    (output_dir / "Build.py").unlink()
+
+    current_hashes = Prefetch(project_dir, output_dir).GetCurrentHashes()
+
+    # Files named in the manifest are hashed (files that no longer exist are not)
+    assert set(current_hashes) == set(manifest) - {"Build.py"}
+    assert all(
+        known_hash.hash_value == manifest[relative_path]
+        and known_hash.IsCurrent(output_dir / relative_path)
+        for relative_path, known_hash in current_hashes.items()
+    )
+
+    # Hash values are not used once a file has been modified
+    readme = output_dir / "README.md"
+    readme.write_text("modified content")
+
+    assert not current_hashes["README.md"].IsCurrent(readme)
+
+
+# ----------------------------------------------------------------------
+def test_Generate(tmp_path):
+    project_dir = GetTemplatesRootDir() / "package"
+
+    output_dir = tmp_path / "output"
+    (output_dir / ".git").mkdir(parents=True)
+
+    Generate("package", output_dir, package_context)
+
+    backend = RenderingBackend()
+    prefetch = Prefetch(project_dir, output_dir, backend)
+
+    # Files modified after they were hashed are hashed again
+    readme = output_dir / "README.md"
+    prefetch.GetCurrentHashes()
+    readme.write_text("modified content")
+
+    result = Generate(
+        "package",
+        output_dir,
+        {**package_context, "github_project_name": "other_project"},
+        rendering_backend=backend,
+        prefetch=prefetch,
+    )
+
+    assert readme.read_text() == "modified content"
+    assert result.modifications.overwritten_files == []
+    assert (output_dir / "Build.py").as_posix() in result.modifications.modified_template_files
+
+
+# ----------------------------------------------------------------------
+def test_RacyFiles(tmp_path, monkeypatch):
+    output_dir = tmp_path / "output"
+    output_dir.mkdir()
+
+    (output_dir / "old.txt").write_text("old")
+    (output_dir / "racy.txt").write_text("racy")
+
+    (output_dir / manifest_filename).write_text(
+        yaml.dump(
+            {
+                "old.txt": GenerateFileHash(output_dir / "old.txt"),
+                "racy.txt": GenerateFileHash(output_dir / "racy.txt"),
+            },
+        ),
+    )
+
+    racy_time_ns = (output_dir / "racy.txt").stat().st_mtime_ns
+    os.utime(output_dir / "old.txt", ns=(racy_time_ns - 10**9, racy_time_ns - 10**9))
+
+    # The current file system time is the time of the most recent modification (as it is when the file system's
+    # timestamps are coarse), so files modified at that time may be modified again without a change in their
+    # modification time.
+    monkeypatch.setattr(PrefetchModule, "GetFileSystemTime", lambda directory: racy_time_ns)
+
+    assert set(Prefetch(GetTemplatesRootDir() / "package", output_dir).GetCurrentHashes()) == {
+        "old.txt"
+    }
+
+
+# ----------------------------------------------------------------------
+@pytest.mark.skipif(shutil.which("git") is None, reason="git is not available")
+def test_GitIndex(tmp_path, monkeypatch):
+    output_dir = tmp_path / "output"
+    output_dir.mkdir()
+
+    filename = output_dir / "file.txt"
+    filename.write_text("content")
+
+    hash_value = GenerateFileHash(filename)
+
+    (output_dir / manifest_filename).write_text(yaml.dump({"file.txt": hash_value}))
+
+    subprocess.run(["git", "init", "--quiet", str(output_dir)], check=True)
+    subprocess.run(["git", "-C", str(output_dir), "add", "file.txt"], check=True)
+
+    os.utime(filename, ns=(10**18, 10**18))
+    assert Prefetch(GetTemplatesRootDir() / "package", output_dir).GetCurrentHashes()
+
+    # The file's stat information has changed, but git reports that it is clean, so it isn't hashed again
+    os.utime(filename, ns=(10**18 + 10**9, 10**18 + 10**9))
+
+    monkeypatch.setattr(
+        ManifestVerification,
+        "GenerateFileHash",
+        lambda filepath: pytest.fail("'{}' was hashed".format(filepath)),
+    )
+
+    current_hashes = Prefetch(GetTemplatesRootDir() / "package", output_dir).GetCurrentHashes()
+
+    assert current_hashes["file.txt"].hash_value == hash_value
+
+
+# ----------------------------------------------------------------------
+def test_Close(tmp_path, monkeypatch):
+    output_dir = tmp_path / "output"
+    output_dir.mkdir()
+
+    manifest: dict[str, str] = {}
+
+    for index in range(500):
+        filename = output_dir / f"file{index}.txt"
+        filename.write_text(str(index))
+
+        manifest[filename.name] = GenerateFileHash(filename)
+
+    (output_dir / manifest_filename).write_text(yaml.dump(manifest))
+
+    # ----------------------------------------------------------------------
+    def SlowGenerateFileHash(filepath):
+        time.sleep(0.1)
+        return GenerateFileHash(filepath)
+
+    # ----------------------------------------------------------------------
+
+    monkeypatch.setattr(ManifestVerification, "GenerateFileHash", SlowGenerateFileHash)
+
+    start_time = time.perf_counter()
+
+    # Exiting before the hash values are used (for example, when the user declines to continue) stops hashing
+    with Prefetch(GetTemplatesRootDir() / "package", output_dir) as prefetch:
+        time.sleep(0.2)
+
+    current_hashes = prefetch.GetCurrentHashes()
+
+    assert time.perf_counter() - start_time < 5
+    assert 0 < len(current_hashes) < len(manifest)
@@ -0,0 +1,20 @@
+# ----------------------------------------------------------------------
+# |
+# |  Copyright (c) 2024 Scientific Software Engineering Center at Georgia Tech
+# |  Distributed under the MIT License.
+# |
+# ----------------------------------------------------------------------
+from PythonProjectBootstrapper.ProgressDisplay import WriteEventJsonLine
+from PythonProjectBootstrapper.ProjectGenerationUtils import (
+    CopyToOutputDirEvent,
+    CopyToOutputDirEventType,
+)
+
+
+# ----------------------------------------------------------------------
+def test_WriteEventJsonLine(capsys):
+    WriteEventJsonLine(
+        CopyToOutputDirEvent(CopyToOutputDirEventType.Added, "dest/file", 123, 1),
+    )
+
+    assert capsys.readouterr().out == '{"event": "added", "filename": "dest/file", "bytes": 123}\n'
@@ -13,17 +13,27 @@ from unittest.mock import patch
 from pathlib import Path
 
 from dbrownell_Common import PathEx
+from PythonProjectBootstrapper.DirectoryDigests import CalculateDirectoryDigests
 from PythonProjectBootstrapper.ProjectGenerationUtils import (
     CreateManifest,
     ConditionallyRemoveUnchangedTemplateFiles,
     CopyToOutputDir,
+    CopyToOutputDirEventType,
+    CopyToOutputDirEvents,
     GenerateFileHash,
+    KnownFileHash,
+    LoadExistingManifest,
+    LoadManifest,
+    LoadManifestWithDigests,
+    manifest_filename,
+    prompt_filename,
+    WriteManifest,
 )
 
 
 # ----------------------------------------------------------------------
 def _dirs_equal(dir1: Path, dir2: Path) -> bool:
-    # Check that 2 given directories have the same structure and files have the same contents EXCEPT for any manifest.yml files
+    # Check that 2 given directories have the same structure and files have the same contents EXCEPT for any manifest.yml and history files
 
     generated_files1: list[Path] = []
     generated_files2: list[Path] = []
@@ -31,12 +41,16 @@ def _dirs_equal(dir1: Path, dir2: Path) -> bool:
     for root, _, files in os.walk(dir1):
         if ".python_project_bootstrapper_manifest.yml" in files:
             files.remove(".python_project_bootstrapper_manifest.yml")
+        if ".python_project_bootstrapper_history.jsonl" in files:
+            files.remove(".python_project_bootstrapper_history.jsonl")
 
         generated_files1 += [Path(root) / Path(file) for file in files]
 
     for root, _, files in os.walk(dir2):
         if ".python_project_bootstrapper_manifest.yml" in files:
             files.remove(".python_project_bootstrapper_manifest.yml")
+        if ".python_project_bootstrapper_history.jsonl" in files:
+            files.remove(".python_project_bootstrapper_history.jsonl")
 
         generated_files2 += [Path(root) / Path(file) for file in files]
 
@@ -240,3 +254,222 @@ def test_CopyToOutputDir_no_prompt(fs):
     status = manifest_filepath.stat()
     assert status.st_mode & S_IWUSR == 0
     assert status.st_mode & S_IRUSR == S_IRUSR
+
+
+# ----------------------------------------------------------------------
+@pytest.mark.parametrize(
+    "filenames",
+    [
+        ["file1", "dir/file 2.txt", ".github/workflows/standard.yaml"],
+        # These values require quoting, so the manifest is parsed with the yaml parser
+        ["123", "yes", "dir/file: 3", "-file4"],
+    ],
+)
+def test_LoadManifest(fs, filenames):
+    src = Path("src")
+    dest = Path("dest")
+
+    for filename in filenames:
+        fs.create_file(src / filename, contents=filename)
+
+    fs.create_dir(dest)
+
+    expected_manifest = CreateManifest(src)
+
+    CopyToOutputDir(src_dir=src, dest_dir=dest)
+
+    assert LoadManifest(dest / manifest_filename) == expected_manifest
+
+
+# ----------------------------------------------------------------------
+def test_CopyToOutputDirEvents(fs):
+    src = Path("src")
+    src2 = Path("src2")
+    dest = Path("dest")
+
+    for filepath, content in [
+        ("same", "abc"),
+        ("template_changed", "def"),
+        ("user_changed", "ghi"),
+        ("removed", "jkl"),
+    ]:
+        fs.create_file(src / filepath, contents=content)
+
+    for filepath, content in [
+        ("same", "abc"),
+        ("template_changed", "DEF"),
+        ("user_changed", "ghi"),
+        ("new", "mnopq"),
+    ]:
+        fs.create_file(src2 / filepath, contents=content)
+
+    fs.create_dir(dest)
+
+    events = list(CopyToOutputDirEvents(src, dest))
+
+    assert sorted((event.event_type, event.filename, event.num_bytes) for event in events) == [
+        (CopyToOutputDirEventType.Added, "dest/removed", 3),
+        (CopyToOutputDirEventType.Added, "dest/same", 3),
+        (CopyToOutputDirEventType.Added, "dest/template_changed", 3),
+        (CopyToOutputDirEventType.Added, "dest/user_changed", 3),
+    ]
+    assert all(event.total_files == 4 for event in events)
+
+    (dest / "user_changed").write_text("modified")
+
+    events = list(CopyToOutputDirEvents(src2, dest, on_conflict=lambda *args: False))
+
+    assert sorted((event.event_type, event.filename, event.num_bytes) for event in events) == [
+        (CopyToOutputDirEventType.Added, "dest/new", 5),
+        (CopyToOutputDirEventType.Deleted, "dest/removed", 0),
+        (CopyToOutputDirEventType.Modified, "dest/template_changed", 3),
+        (CopyToOutputDirEventType.Skipped, "dest/user_changed", 0),
+        (CopyToOutputDirEventType.Unchanged, "dest/same", 0),
+    ]
+    assert all(event.total_files == 5 for event in events)
+
+    assert (dest / "user_changed").read_text() == "modified"
+    assert (dest / "template_changed").read_text() == "DEF"
+    assert not (dest / "removed").exists()
+    assert not src2.exists()
+
+
+# ----------------------------------------------------------------------
+def test_CopyToOutputDirCurrentHashes(fs):
+    src = Path("src")
+    dest = Path("dest")
+
+    fs.create_file(src / "file1", contents="abc")
+    fs.create_file(src / "file2", contents="def")
+    fs.create_dir(dest)
+
+    CopyToOutputDir(src, dest)
+
+    fs.create_file(src / "file1", contents="ABC")
+    fs.create_file(src / "file2", contents="DEF")
+
+    # Values for files that have not been modified since they were hashed are used (here, a value that
+    # differs from the manifest causes the file to be treated as one that was modified by the user).
+    file2_hash = KnownFileHash.Create(dest / "file2", GenerateFileHash(dest / "file2"))
+    (dest / "file2").write_text("modified")
+
+    result = CopyToOutputDir(
+        src,
+        dest,
+        on_conflict=lambda *args: False,
+        current_hashes={
+            "file1": KnownFileHash.Create(dest / "file1", "0" * 64),
+            "file2": file2_hash,
+        },
+    )
+
+    assert (dest / "file1").read_text() == "abc"
+    assert (dest / "file2").read_text() == "modified"
+    assert result.modified_template_files == []
+
+
+# ----------------------------------------------------------------------
+def test_WriteManifest(fs):
+    dest = Path("dest")
+    fs.create_dir(dest)
+
+    manifest_filepath = dest / manifest_filename
+
+    WriteManifest(manifest_filepath, {"file1.txt": "abc", "dir/file2.txt": "def"})
+    assert LoadManifest(manifest_filepath) == {"file1.txt": "abc", "dir/file2.txt": "def"}
+    assert manifest_filepath.stat().st_mode & S_IWUSR == 0
+
+    # Read-only manifests are replaced
+    WriteManifest(manifest_filepath, {"file1.txt": "123"})
+    assert LoadManifest(manifest_filepath) == {"file1.txt": "123"}
+    assert manifest_filepath.stat().st_mode & S_IWUSR == 0
+
+    # Temporary files are not left behind
+    assert os.listdir(dest) == [manifest_filename]
+
+
+# ----------------------------------------------------------------------
+def test_ManifestDirectoryDigests(fs):
+    dest = Path("dest")
+    fs.create_dir(dest)
+
+    manifest_filepath = dest / manifest_filename
+    manifest = {"file1.txt": "abc", "dir/file2.txt": "def"}
+
+    WriteManifest(manifest_filepath, manifest)
+
+    content = manifest_filepath.read_text()
+    assert "./: " in content
+    assert "dir/: " in content
+
+    assert LoadManifestWithDigests(manifest_filepath) == (
+        manifest,
+        CalculateDirectoryDigests(manifest),
+    )
+
+    # Digests are calculated for manifests written by earlier versions
+    manifest_filepath.chmod(S_IRUSR | S_IWUSR)
+    manifest_filepath.write_text("dir/file2.txt: def\nfile1.txt: abc\n")
+
+    assert LoadManifestWithDigests(manifest_filepath) == (
+        manifest,
+        CalculateDirectoryDigests(manifest),
+    )
+
+    # Stale digests (for example, left behind when a merge conflict is resolved by hand) are not used
+    manifest_filepath.write_text("./: 0000\ndir/: 0000\ndir/file2.txt: def\nfile1.txt: abc\n")
+
+    assert LoadManifestWithDigests(manifest_filepath) == (
+        manifest,
+        CalculateDirectoryDigests(manifest),
+    )
+
+
+# ----------------------------------------------------------------------
+def test_LoadExistingManifest(fs):
+    dest = Path("dest")
+    fs.create_dir(dest)
+
+    assert LoadExistingManifest(dest) == ({}, {})
+
+    hash1 = "a" * 64
+    hash2 = "b" * 64
+
+    # The yaml parser is used once a line that requires quoting is encountered
+    (dest / manifest_filename).write_text(
+        f"# Comment\n./: 0000\nfile1.txt: {hash1}\n'#file2.txt': {hash2}\n{prompt_filename}: {hash1}\n"
+    )
+
+    manifest, directory_digests = LoadManifestWithDigests(dest / manifest_filename)
+    assert manifest == {"file1.txt": hash1, "#file2.txt": hash2}
+
+    assert LoadExistingManifest(dest) == (manifest, directory_digests)
+
+
+# ----------------------------------------------------------------------
+def test_CopyToOutputDirUnchangedRoot(fs):
+    src = Path("src")
+    dest = Path("dest")
+
+    fs.create_file(src / "dir/file1", contents="abc")
+    fs.create_file(src / "file2", contents="def")
+    fs.create_dir(dest)
+
+    CopyToOutputDir(src, dest)
+
+    # Files removed from the template aren't searched for when the root digest is unchanged
+    fs.create_file(src / "dir/file1", contents="abc")
+    fs.create_file(src / "file2", contents="def")
+
+    with patch(
+        "PythonProjectBootstrapper.ProjectGenerationUtils.ConditionallyRemoveUnchangedTemplateFiles",
+    ) as mock_remove:
+        CopyToOutputDir(src, dest)
+
+    assert mock_remove.call_args_list == []
+
+    fs.create_file(src / "dir/file1", contents="abc")
+
+    result = CopyToOutputDir(src, dest)
+
+    assert result.deleted_files == ["dest/file2"]
@@ -0,0 +1,33 @@
+# ----------------------------------------------------------------------
+# |
+# |  Copyright (c) 2024 Scientific Software Engineering Center at Georgia Tech
+# |  Distributed under the MIT License.
+# |
+# ----------------------------------------------------------------------
+"""Unit tests for PytestPlugin.py"""
+
+import subprocess
+import sys
+import textwrap
+
+
+# ----------------------------------------------------------------------
+def test_LazyImports():
+    # pytest loads the plugin for every session, so it must not import the rendering functionality
+    subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            textwrap.dedent(
+                """\
+                import sys
+
+                import PythonProjectBootstrapper.PytestPlugin
+
+                assert "PythonProjectBootstrapper.Matrix" not in sys.modules
+                assert "cookiecutter" not in sys.modules
+                """,
+            ),
+        ],
+        check=True,
+    )
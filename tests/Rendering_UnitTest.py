@@ -0,0 +1,269 @@
+# ----------------------------------------------------------------------
+# |
+# |  Copyright (c) 2024 Scientific Software Engineering Center at Georgia Tech
+# |  Distributed under the MIT License.
+# |
+# ----------------------------------------------------------------------
+"""Unit tests for Rendering.py"""
+
+import json
+import sys
+import textwrap
+import tracemalloc
+
+from pathlib import Path
+
+import pytest
+
+from cookiecutter.exceptions import UndefinedVariableInTemplate
+from cookiecutter.generate import generate_files
+
+from conftest import CreateContext, CreateTemplate, GetContents
+
+from PythonProjectBootstrapper.ProjectGenerationUtils import (
+    CreateManifest,
+    GenerateFileHash,
+)
+from PythonProjectBootstrapper import Rendering
+from PythonProjectBootstrapper.Generation import GetTemplatesRootDir
+from PythonProjectBootstrapper.Rendering import RenderingBackend
+
+
+# ----------------------------------------------------------------------
+@pytest.mark.parametrize("max_workers", [1, 3])
+def test_MatchesCookiecutter(tmp_path, max_workers):
+    repo_dir = CreateTemplate(tmp_path)
+
+    expected_dir = tmp_path / "expected"
+    actual_dir = tmp_path / "actual"
+
+    generate_files(str(repo_dir), CreateContext(), output_dir=str(expected_dir))
+
+    project_dir = RenderingBackend(max_workers=max_workers).GenerateFiles(
+        str(repo_dir), CreateContext(), output_dir=str(actual_dir)
+    )
+
+    assert Path(project_dir) == actual_dir / "TheProject"
+
+    expected = GetContents(expected_dir)
+    actual = GetContents(actual_dir)
+
+    assert actual["TheProject/raw/{{ cookiecutter.module_name }}.txt"][0] == b"{{ not rendered }}"
+    assert actual["TheProject/copy_only.txt"][0] == b"{{ also not rendered }}"
+    assert actual["TheProject/run.sh"][1] & 0o777 == 0o755
+    assert actual["TheProject/windows.txt"][0] == b"the_module\r\nsecond line\r\n"
+    assert actual == expected
+
+
+# ----------------------------------------------------------------------
+@pytest.mark.parametrize("max_workers", [1, 3])
+def test_UndefinedVariable(tmp_path, max_workers):
+    repo_dir = CreateTemplate(tmp_path)
+
+    (repo_dir / "{{ cookiecutter.project_name }}" / "bad.txt").write_text(
+        "{{ cookiecutter.missing }}"
+    )
+
+    with pytest.raises(UndefinedVariableInTemplate, match="bad.txt"):
+        RenderingBackend(max_workers=max_workers).GenerateFiles(
+            str(repo_dir), CreateContext(), output_dir=str(tmp_path / "output")
+        )
+
+    # The project directory was created by the call, so it should be removed on failure
+    assert not (tmp_path / "output" / "TheProject").exists()
+
+
+# ----------------------------------------------------------------------
+@pytest.mark.parametrize("max_workers", [1, 3])
+def test_KnownHashes(tmp_path, max_workers):
+    repo_dir = CreateTemplate(tmp_path)
+
+    backend = RenderingBackend(max_workers=max_workers)
+    project_dir = Path(
+        backend.GenerateFiles(str(repo_dir), CreateContext(), output_dir=str(tmp_path / "output"))
+    )
+
+    filenames = [name for name in GetContents(project_dir) if not name.endswith("/")]
+
+    # Files copied as part of a `_copy_without_render` directory are not hashed during generation
+    assert len(backend.known_hashes) == len(filenames) - 1
+
+    for filename, known_hash in backend.known_hashes.items():
+        assert known_hash.hash_value == GenerateFileHash(Path(filename))
+        assert known_hash.IsCurrent(Path(filename))
+
+    assert CreateManifest(project_dir, backend.known_hashes) == CreateManifest(project_dir)
+
+    # Hashes are no longer used once a file has been modified
+    modified_file = project_dir / "README.md"
+    modified_file.write_text("A different value")
+
+    assert not backend.known_hashes[str(modified_file)].IsCurrent(modified_file)
+    assert CreateManifest(project_dir, backend.known_hashes)["README.md"] == GenerateFileHash(
+        modified_file
+    )
+
+
+# ----------------------------------------------------------------------
+def test_KnownHashesModifiedByHook(tmp_path, monkeypatch):
+    repo_dir = CreateTemplate(tmp_path)
+
+    # The hook rewrites a file with content of the same size and restores its modification time, as a write
+    # within the same tick would on a file system with coarse timestamps.
+    (repo_dir / "hooks").mkdir()
+    (repo_dir / "hooks" / "post_gen_project.py").write_text(
+        textwrap.dedent(
+            """\
+            import os
+
+            status = os.stat("README.md")
+
+            with open("README.md", "r+b") as f:
+                f.write(b"X")
+
+            os.utime("README.md", ns=(status.st_atime_ns, status.st_mtime_ns))
+            """,
+        ),
+    )
+
+    backend = RenderingBackend()
+
+    reported: list[tuple[str, str]] = []
+    backend.on_file_rendered = lambda filename, known_hash: reported.append(
+        (filename, known_hash.hash_value)
+    )
+
+    # All files were written within the tick in which the hook runs
+    monkeypatch.setattr(Rendering, "GetFileSystemTime", lambda directory: 0)
+
+    project_dir = Path(
+        backend.GenerateFiles(str(repo_dir), CreateContext(), output_dir=str(tmp_path / "output"))
+    )
+
+    readme_filename = str(project_dir / "README.md")
+
+    assert (project_dir / "README.md").read_bytes().startswith(b"X")
+    assert backend.known_hashes[readme_filename].hash_value == GenerateFileHash(
+        Path(readme_filename)
+    )
+    assert CreateManifest(project_dir, backend.known_hashes) == CreateManifest(project_dir)
+
+    # The file was reported again with the recalculated value
+    readme_hashes = [hash_value for filename, hash_value in reported if filename == readme_filename]
+
+    assert len(readme_hashes) == 2
+    assert readme_hashes[0] != readme_hashes[1]
+    assert readme_hashes[1] == GenerateFileHash(Path(readme_filename))
+
+
+# ----------------------------------------------------------------------
+def test_ReusedBackend(tmp_path):
+    repo_dir = CreateTemplate(tmp_path)
+
+    backend = RenderingBackend()
+
+    for index, module_name in enumerate(["first_module", "second_module", "first_module"]):
+        context = CreateContext(project_name=f"Project{index}", module_name=module_name)
+
+        expected_dir = tmp_path / f"expected{index}"
+        actual_dir = tmp_path / f"actual{index}"
+
+        generate_files(
+            str(repo_dir), CreateContext(**context["cookiecutter"]), output_dir=str(expected_dir)
+        )
+        backend.GenerateFiles(str(repo_dir), context, output_dir=str(actual_dir))
+
+        # Templates compiled by previous calls are rendered with the current context
+        assert GetContents(actual_dir) == GetContents(expected_dir)
+        assert backend.context is context
+
+
+# ----------------------------------------------------------------------
+def test_Prepare(tmp_path):
+    repo_dir = CreateTemplate(tmp_path)
+
+    (repo_dir / "cookiecutter.json").write_text(json.dumps(CreateContext()["cookiecutter"]))
+
+    backend = RenderingBackend()
+    backend.Prepare(repo_dir)
+
+    # Templates are compiled before configuration values are known
+    env = next(iter(backend._environments.values()))  # pylint: disable=protected-access
+    compiled_templates = {name for _, name in env.cache.keys()}
+
+    assert "README.md" in compiled_templates
+    assert "src/{{ cookiecutter.module_name }}/file0.py" in compiled_templates
+    assert "copy_only.txt" not in compiled_templates
+    assert "raw/{{ cookiecutter.module_name }}.txt" not in compiled_templates
+    assert "image.bin" not in compiled_templates
+
+    expected_dir = tmp_path / "expected"
+    actual_dir = tmp_path / "actual"
+
+    generate_files(str(repo_dir), CreateContext(), output_dir=str(expected_dir))
+    backend.GenerateFiles(str(repo_dir), CreateContext(), output_dir=str(actual_dir))
+
+    assert GetContents(actual_dir) == GetContents(expected_dir)
+
+    # Errors are encountered again when files are generated
+    (repo_dir / "cookiecutter.json").write_text("not json")
+    RenderingBackend().Prepare(repo_dir)
+
+
+# ----------------------------------------------------------------------
+def test_PreparePackageTemplate(monkeypatch):
+    # The package template's extensions are imported from the repository directory
+    monkeypatch.delitem(sys.modules, "local_extensions", raising=False)
+
+    repo_dir = GetTemplatesRootDir() / "package"
+    original_sys_path = list(sys.path)
+
+    backend = RenderingBackend(use_template_bundle=False)
+    backend.Prepare(repo_dir)
+
+    assert sys.path == original_sys_path
+
+    env = next(iter(backend._environments.values()))  # pylint: disable=protected-access
+    compiled_templates = {name for _, name in env.cache.keys()}
+
+    assert "README.md" in compiled_templates
+    assert "pyproject.toml" in compiled_templates
+
+
+# ----------------------------------------------------------------------
+def test_StreamingLargeFile(tmp_path):
+    repo_dir = tmp_path / "template"
+    template_dir = repo_dir / "{{ cookiecutter.project_name }}"
+
+    template_dir.mkdir(parents=True)
+
+    (template_dir / "large.txt").write_text(
+        "{% for i in range(100000) %}{{ cookiecutter.project_name }} line {{ i }} with some additional content\n{% endfor %}",
+    )
+
+    backend = RenderingBackend()
+
+    tracemalloc.start()
+    try:
+        project_dir = backend.GenerateFiles(
+            str(repo_dir), CreateContext(), output_dir=str(tmp_path / "output")
+        )
+
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    output_filename = Path(project_dir) / "large.txt"
+    output_size = output_filename.stat().st_size
+
+    assert output_size > 4 * 1024 * 1024
+    assert peak_memory < output_size // 10
+    assert backend.known_hashes[str(output_filename)].hash_value == GenerateFileHash(
+        output_filename
+    )
+
+
+# ----------------------------------------------------------------------
+def test_InvalidMaxWorkers():
+    with pytest.raises(ValueError, match="max_workers must be greater than 0."):
+        RenderingBackend(max_workers=0)
@@ -0,0 +1,122 @@
+# ----------------------------------------------------------------------
+# |
+# |  Copyright (c) 2024 Scientific Software Engineering Center at Georgia Tech
+# |  Distributed under the MIT License.
+# |
+# ----------------------------------------------------------------------
+"""Unit tests for RepositoryLock.py"""
+
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from PythonProjectBootstrapper.ProjectGenerationUtils import (
+    CopyToOutputDir,
+    GenerateFileHash,
+    LoadManifest,
+    manifest_filename,
+)
+from PythonProjectBootstrapper.RepositoryLock import (
+    AcquireRepositoryLock,
+    GetLockFilename,
+    lock_filename,
+)
+
+
+# ----------------------------------------------------------------------
+def test_GetLockFilename(tmp_path):
+    assert GetLockFilename(tmp_path) == tmp_path / lock_filename
+
+    (tmp_path / ".git").mkdir()
+    assert GetLockFilename(tmp_path) == (
+        tmp_path / ".git" / "PythonProjectBootstrapper" / "repository.lock"
+    )
+
+
+# ----------------------------------------------------------------------
+def test_Timeout(tmp_path):
+    with AcquireRepositoryLock(tmp_path) as lock_path:
+        assert lock_path.is_file()
+
+        with pytest.raises(TimeoutError, match="could not be acquired within 0.1 seconds"):
+            with AcquireRepositoryLock(tmp_path, timeout=0.1):
+                pass
+
+    # The lock file is removed when the lock is released
+    assert not (tmp_path / lock_filename).exists()
+
+    with AcquireRepositoryLock(tmp_path, timeout=0):
+        pass
+
+
+# ----------------------------------------------------------------------
+def test_Wait(tmp_path):
+    acquired = threading.Event()
+
+    # ----------------------------------------------------------------------
+    def HoldLock():
+        with AcquireRepositoryLock(tmp_path):
+            acquired.set()
+            time.sleep(0.3)
+
+    # ----------------------------------------------------------------------
+
+    thread = threading.Thread(target=HoldLock)
+    thread.start()
+
+    try:
+        assert acquired.wait(5)
+
+        start_time = time.perf_counter()
+
+        with AcquireRepositoryLock(tmp_path, timeout=10):
+            assert time.perf_counter() - start_time > 0.1
+            assert not thread.is_alive()
+
+    finally:
+        thread.join()
+
+
+# ----------------------------------------------------------------------
+def test_ConcurrentCopyToOutputDir(tmp_path):
+    dest = tmp_path / "dest"
+    (dest / ".git").mkdir(parents=True)
+
+    num_generations = 8
+
+    # ----------------------------------------------------------------------
+    def Generate(index: int) -> None:
+        src = tmp_path / f"src{index}"
+
+        for file_index in range(20):
+            filename = src / f"dir{file_index % 3}" / f"file{file_index}.txt"
+
+            filename.parent.mkdir(parents=True, exist_ok=True)
+            filename.write_text(f"{index}-{file_index}")
+
+        (src / f"unique{index}.txt").write_text(str(index))
+
+        CopyToOutputDir(src_dir=src, dest_dir=dest, on_conflict=lambda *args: True)
+
+    # ----------------------------------------------------------------------
+
+    with ThreadPoolExecutor(max_workers=num_generations) as executor:
+        list(executor.map(Generate, range(num_generations)))
+
+    manifest = LoadManifest(dest / manifest_filename)
+
+    # Every file generated is in the manifest and the manifest reflects the content on disk; the unique
+    # files of all but the last generation were removed, as they were not generated by the last generation.
+    assert len(manifest) == 20 + num_generations
+    assert len([item for item in dest.iterdir() if item.name.startswith("unique")]) == 1
+
+    for relative_path, hash_value in manifest.items():
+        if relative_path.startswith("unique") and not (dest / relative_path).exists():
+            continue
+
+        assert GenerateFileHash(dest / relative_path) == hash_value
+
+    assert not any(item.name.endswith(".tmp") for item in dest.iterdir())
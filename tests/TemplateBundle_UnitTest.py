@@ -0,0 +1,168 @@
+# ----------------------------------------------------------------------
+# |
+# |  Copyright (c) 2024 Scientific Software Engineering Center at Georgia Tech
+# |  Distributed under the MIT License.
+# |
+# ----------------------------------------------------------------------
+"""Unit tests for TemplateBundle.py"""
+
+import hashlib
+import os
+import pickle
+import shutil
+
+from pathlib import Path
+
+import pytest
+
+from cookiecutter.generate import generate_files
+
+from conftest import CreateContext, CreateTemplate, GetContents
+
+from PythonProjectBootstrapper.Rendering import RenderingBackend
+from PythonProjectBootstrapper.TemplateBundle import (
+    CreateTemplateBundle,
+    FindTemplateBundle,
+    TemplateBundle,
+    template_bundle_filename,
+)
+
+
+# ----------------------------------------------------------------------
+def test_CreateAndOpen(tmp_path):
+    repo_dir = CreateTemplate(tmp_path)
+
+    # Content that isn't in a project directory is not included
+    (tmp_path / "other.txt").write_text("other")
+    (repo_dir / "__pycache__").mkdir()
+    (repo_dir / "__pycache__" / "module.pyc").write_bytes(b"")
+
+    assert FindTemplateBundle(tmp_path) is None
+
+    bundle_filename = tmp_path / template_bundle_filename
+    assert CreateTemplateBundle(tmp_path, ["project"], bundle_filename) == 18
+    assert FindTemplateBundle(tmp_path) == bundle_filename
+
+    with TemplateBundle.Open(bundle_filename) as bundle:
+        assert "project/{{ cookiecutter.project_name }}/empty" in bundle.directories
+        assert "project/__pycache__" not in bundle.directories
+
+        image_filename = repo_dir / "{{ cookiecutter.project_name }}" / "image.bin"
+        image = bundle.entries["project/{{ cookiecutter.project_name }}/image.bin"]
+
+        assert image.is_binary
+        assert image.size == image_filename.stat().st_size
+        assert image.hash_value == hashlib.sha256(image_filename.read_bytes()).hexdigest()
+        assert bundle.Read("project/{{ cookiecutter.project_name }}/image.bin") == (
+            image_filename.read_bytes()
+        )
+
+        script = bundle.entries["project/{{ cookiecutter.project_name }}/run.sh"]
+        assert not script.is_binary
+        assert script.mode == 0o755
+
+        assert bundle.Read("project/cookiecutter.json") == b'{"project_name": "TheProject"}'
+
+        with pytest.raises(FileNotFoundError):
+            bundle.Read("project/missing.txt")
+
+        # Worker processes open the bundle when it is unpickled
+        with pickle.loads(pickle.dumps(bundle)) as unpickled_bundle:
+            assert unpickled_bundle.entries == bundle.entries
+
+        assert bundle.GetTemplate(repo_dir / "{{ cookiecutter.project_name }}") is not None
+        assert bundle.GetTemplate(repo_dir / "missing") is None
+        assert bundle.GetTemplate(tmp_path.parent) is None
+
+
+# ----------------------------------------------------------------------
+def test_InvalidBundle(tmp_path):
+    filename = tmp_path / template_bundle_filename
+
+    filename.write_bytes(b"")
+    with pytest.raises(Exception, match="is not a valid template bundle"):
+        TemplateBundle.Open(filename)
+
+    filename.write_bytes(b"not a bundle, but long enough")
+    with pytest.raises(Exception, match="is not a valid template bundle"):
+        TemplateBundle.Open(filename)
+
+
+# ----------------------------------------------------------------------
+def test_Walk(tmp_path):
+    repo_dir = CreateTemplate(tmp_path)
+    CreateTemplateBundle(tmp_path, ["project"], tmp_path / template_bundle_filename)
+
+    template_dir = repo_dir / "{{ cookiecutter.project_name }}"
+
+    # ----------------------------------------------------------------------
+    def Normalize(walk_results) -> list[tuple[str, list[str], list[str]]]:
+        return sorted((root, sorted(dirs), sorted(files)) for root, dirs, files in walk_results)
+
+    # ----------------------------------------------------------------------
+
+    with TemplateBundle.Open(tmp_path / template_bundle_filename) as bundle:
+        bundled_template = bundle.GetTemplate(template_dir)
+        assert bundled_template is not None
+
+        os.chdir(template_dir)
+        assert Normalize(bundled_template.Walk()) == Normalize(os.walk("."))
+
+        # Directories removed from the results are not walked
+        roots: list[str] = []
+
+        for root, dirs, _ in bundled_template.Walk():
+            roots.append(root)
+            dirs[:] = [d for d in dirs if d != "raw"]
+
+        assert sorted(roots) == [
+            ".",
+            os.path.join(".", "empty"),
+            os.path.join(".", "src"),
+            os.path.join(".", "src", "{{ cookiecutter.module_name }}"),
+        ]
+
+        bundled_template.CopyTree("raw", str(tmp_path / "raw_copy"))
+        assert GetContents(tmp_path / "raw_copy") == GetContents(template_dir / "raw")
+
+
+# ----------------------------------------------------------------------
+@pytest.mark.parametrize("max_workers", [1, 3])
+def test_RenderFromBundle(tmp_path, max_workers):
+    repo_dir = CreateTemplate(tmp_path / "templates")
+    template_dir = repo_dir / "{{ cookiecutter.project_name }}"
+
+    expected_dir = tmp_path / "expected"
+    generate_files(str(repo_dir), CreateContext(), output_dir=str(expected_dir))
+
+    CreateTemplateBundle(
+        tmp_path / "templates", ["project"], tmp_path / "templates" / template_bundle_filename
+    )
+
+    # Only the bundle is read; the template directory must exist, as cookiecutter searches for it
+    shutil.rmtree(template_dir)
+    shutil.rmtree(repo_dir / "templates")
+    template_dir.mkdir()
+
+    backend = RenderingBackend(max_workers=max_workers)
+    project_dir = backend.GenerateFiles(
+        str(repo_dir), CreateContext(), output_dir=str(tmp_path / "actual")
+    )
+
+    actual = GetContents(tmp_path / "actual")
+
+    assert actual["TheProject/run.sh"][1] & 0o777 == 0o755
+    assert actual["TheProject/windows.txt"][0] == b"the_module\r\nsecond line\r\n"
+    assert actual == GetContents(expected_dir)
+
+    for filename, known_hash in backend.known_hashes.items():
+        assert known_hash.hash_value == hashlib.sha256(Path(filename).read_bytes()).hexdigest()
+
+    assert str(Path(project_dir) / "image.bin") in backend.known_hashes
+
+    # The bundle is ignored when requested, so the (empty) template directory is rendered
+    RenderingBackend(max_workers=max_workers, use_template_bundle=False).GenerateFiles(
+        str(repo_dir), CreateContext(), output_dir=str(tmp_path / "ignored")
+    )
+
+    assert list(GetContents(tmp_path / "ignored")) == ["TheProject/"]
@@ -0,0 +1,69 @@
+# ----------------------------------------------------------------------
+# |
+# |  Copyright (c) 2024 Scientific Software Engineering Center at Georgia Tech
+# |  Distributed under the MIT License.
+# |
+# ----------------------------------------------------------------------
+"""Unit tests for TemplateIndex.py"""
+
+import os
+
+from unittest.mock import patch
+
+from PythonProjectBootstrapper.ProjectGenerationUtils import GenerateFileHash
+from PythonProjectBootstrapper.TemplateIndex import LoadTemplateIndex
+
+
+# ----------------------------------------------------------------------
+def _CreateTemplate(template_dir):
+    (template_dir / "subdir").mkdir(parents=True)
+
+    (template_dir / "text.txt").write_text("{{ cookiecutter.name }}")
+    (template_dir / "subdir" / "image.bin").write_bytes(bytes(range(256)) * 4)
+
+
+# ----------------------------------------------------------------------
+def test_Index(tmp_path):
+    template_dir = tmp_path / "template"
+    _CreateTemplate(template_dir)
+
+    index = LoadTemplateIndex(template_dir, tmp_path / "cache")
+
+    assert index.template_dir == template_dir.resolve()
+    assert set(index.entries) == {"text.txt", "subdir/image.bin"}
+
+    text_entry = index.entries["text.txt"]
+    assert text_entry.is_binary is False
+    assert text_entry.hash_value is None
+    assert text_entry.size == len("{{ cookiecutter.name }}")
+
+    binary_entry = index.GetEntry(os.path.join("subdir", "image.bin"))
+    assert binary_entry is not None
+    assert binary_entry.is_binary is True
+    assert binary_entry.hash_value == GenerateFileHash(template_dir / "subdir" / "image.bin")
+
+
+# ----------------------------------------------------------------------
+def test_Cache(tmp_path):
+    template_dir = tmp_path / "template"
+    cache_dir = tmp_path / "cache"
+
+    _CreateTemplate(template_dir)
+
+    index = LoadTemplateIndex(template_dir, cache_dir)
+    assert len(list(cache_dir.iterdir())) == 1
+
+    # Unchanged files are not inspected again
+    with patch("PythonProjectBootstrapper.TemplateIndex.is_binary") as mock_is_binary:
+        assert LoadTemplateIndex(template_dir, cache_dir) == index
+        assert mock_is_binary.call_count == 0
+
+    # Modified files are
+    binary_filename = template_dir / "subdir" / "image.bin"
+    binary_filename.write_bytes(bytes(range(128)) * 4)
+
+    updated_index = LoadTemplateIndex(template_dir, cache_dir)
+
+    assert updated_index.entries["text.txt"] == index.entries["text.txt"]
+    assert updated_index.entries["subdir/image.bin"].hash_value == GenerateFileHash(binary_filename)
+    assert updated_index.entries["subdir/image.bin"] != index.entries["subdir/image.bin"]
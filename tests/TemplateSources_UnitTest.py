@@ -0,0 +1,173 @@
+# ----------------------------------------------------------------------
+# |
+# |  Copyright (c) 2024 Scientific Software Engineering Center at Georgia Tech
+# |  Distributed under the MIT License.
+# |
+# ----------------------------------------------------------------------
+"""Unit tests for TemplateSources.py"""
+
+import json
+import os
+import shutil
+import subprocess
+
+from pathlib import Path
+
+import pytest
+
+from PythonProjectBootstrapper import TemplateSources
+from PythonProjectBootstrapper.Generation import Generate, GetProjectNames
+from PythonProjectBootstrapper.TemplateSources import (
+    GetCachedTemplates,
+    PruneCachedTemplates,
+    ResolveTemplateSource,
+)
+
+
+# ----------------------------------------------------------------------
+def _Git(repo_dir: Path, *args: str) -> str:
+    return subprocess.run(
+        [
+            "git",
+            "-C",
+            str(repo_dir),
+            "-c",
+            "user.name=Test",
+            "-c",
+            "user.email=test@example.com",
+            *args,
+        ],
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout
+
+
+# ----------------------------------------------------------------------
+def _CreateTemplate(templates_root_dir: Path, content: str) -> None:
+    project_dir = templates_root_dir / "custom"
+    template_dir = project_dir / "{{ cookiecutter.__empty_dir }}"
+
+    template_dir.mkdir(parents=True, exist_ok=True)
+
+    (project_dir / "cookiecutter.json").write_text(
+        json.dumps({"project_name": "the_project", "__empty_dir": ""})
+    )
+    (template_dir / "README.md").write_text(content + " {{ cookiecutter.project_name }}\n")
+
+    script = template_dir / "run.sh"
+    script.write_text("echo {{ cookiecutter.project_name }}\n")
+    script.chmod(0o755)
+
+
+# ----------------------------------------------------------------------
+def test_LocalDirectory(tmp_path):
+    templates_root_dir = tmp_path / "templates"
+    _CreateTemplate(templates_root_dir, "local")
+
+    (templates_root_dir / "not_a_project").mkdir()
+
+    # Directories are used in place
+    assert ResolveTemplateSource(str(templates_root_dir)) == templates_root_dir.resolve()
+    assert GetProjectNames(templates_root_dir) == ["custom"]
+
+    with pytest.raises(Exception, match="is not a directory or"):
+        ResolveTemplateSource(str(tmp_path / "missing"))
+
+    output_dir = tmp_path / "output"
+
+    result = Generate(
+        "custom",
+        output_dir,
+        require_git=False,
+        template_source=str(templates_root_dir),
+    )
+
+    assert (output_dir / "README.md").read_text() == "local the_project\n"
+    assert result.modifications.added_files == sorted(
+        [(output_dir / "README.md").as_posix(), (output_dir / "run.sh").as_posix()]
+    )
+
+    with pytest.raises(Exception, match="'package' is not a valid project"):
+        Generate("package", output_dir, require_git=False, template_source=str(templates_root_dir))
+
+
+# ----------------------------------------------------------------------
+@pytest.mark.skipif(shutil.which("git") is None, reason="git is not available")
+def test_GitRepository(tmp_path, monkeypatch):
+    repo_dir = tmp_path / "repo"
+    templates_root_dir = repo_dir / "templates"
+    cache_dir = tmp_path / "cache" / "Templates"
+
+    _Git(tmp_path, "init", "--quiet", str(repo_dir))
+
+    _CreateTemplate(templates_root_dir, "first")
+    _Git(repo_dir, "add", ".")
+    _Git(repo_dir, "commit", "--quiet", "-m", "First")
+    _Git(repo_dir, "tag", "v1")
+
+    first_commit = _Git(repo_dir, "rev-parse", "HEAD").strip()
+
+    _CreateTemplate(templates_root_dir, "second")
+    _Git(repo_dir, "commit", "--quiet", "-am", "Second")
+    _Git(repo_dir, "tag", "v2")
+
+    second_commit = _Git(repo_dir, "rev-parse", "HEAD").strip()
+
+    # Uncommitted changes are not included
+    _CreateTemplate(templates_root_dir, "uncommitted")
+
+    first_dir = ResolveTemplateSource(f"{templates_root_dir}@v1")
+
+    assert first_dir == cache_dir / first_commit / "templates"
+    assert (first_dir / "custom" / "cookiecutter.json").is_file()
+    assert os.access(first_dir / "custom" / "{{ cookiecutter.__empty_dir }}" / "run.sh", os.X_OK)
+
+    output_dir = tmp_path / "output"
+
+    Generate("custom", output_dir, require_git=False, template_source=f"{templates_root_dir}@v1")
+    assert (output_dir / "README.md").read_text() == "first the_project\n"
+
+    Generate("custom", output_dir, require_git=False, template_source=f"{templates_root_dir}@HEAD")
+    assert (output_dir / "README.md").read_text() == "second the_project\n"
+
+    # Errors are reported and partially populated worktrees are removed
+    with pytest.raises(Exception, match="could not be exported: fatal:"):
+        TemplateSources._CreateWorktree(repo_dir, "0" * 40, cache_dir / "invalid")
+
+    assert sorted(item.name for item in cache_dir.iterdir()) == sorted(
+        [first_commit, f"{first_commit}.json", second_commit, f"{second_commit}.json"]
+    )
+
+    # Worktrees are reused by refs that resolve to the same commit
+    monkeypatch.setattr(
+        TemplateSources, "_CreateWorktree", lambda *args: pytest.fail("worktree created")
+    )
+
+    assert ResolveTemplateSource(f"{templates_root_dir}@{first_commit}") == first_dir
+    assert ResolveTemplateSource(f"{repo_dir}@v2") == cache_dir / second_commit
+
+    assert [cached_template.commit_id for cached_template in GetCachedTemplates()] == [
+        second_commit,
+        first_commit,
+    ]
+    assert GetCachedTemplates()[0].ref == "v2"
+    assert GetCachedTemplates()[0].repository == str(repo_dir.resolve())
+
+    with pytest.raises(Exception, match="'missing' is not a valid ref"):
+        ResolveTemplateSource(f"{repo_dir}@missing")
+
+    with pytest.raises(Exception, match="is not within a git repository"):
+        ResolveTemplateSource(f"{tmp_path / 'cache'}@v1")
+
+    # Eviction
+    assert [
+        cached_template.commit_id for cached_template in PruneCachedTemplates(max_entries=1)
+    ] == [first_commit]
+    assert PruneCachedTemplates(max_age=60 * 60) == []
+    assert [cached_template.commit_id for cached_template in PruneCachedTemplates()] == [
+        second_commit
+    ]
+
+    assert GetCachedTemplates() == []
+    assert list(cache_dir.iterdir()) == []
@@ -0,0 +1,274 @@
+# ----------------------------------------------------------------------
+# |
+# |  Copyright (c) 2024 Scientific Software Engineering Center at Georgia Tech
+# |  Distributed under the MIT License.
+# |
+# ----------------------------------------------------------------------
+"""Unit tests for ToolsEntryPoint.py"""
+
+import json
+import os
+
+from pathlib import Path
+
+import yaml
+
+from typer.testing import CliRunner
+
+from PythonProjectBootstrapper import __version__
+from PythonProjectBootstrapper.CacheDirectory import CACHE_DIRECTORY_ENV_VAR
+from PythonProjectBootstrapper.ProjectGenerationUtils import CopyToOutputDir
+from PythonProjectBootstrapper.ToolsEntryPoint import app
+
+
+# ----------------------------------------------------------------------
+def _Generate(root: Path) -> Path:
+    src = root / "src"
+    dest = root / "dest"
+
+    for filename in ["file1.txt", "file2.txt", "subdir/file3.txt"]:
+        (src / filename).parent.mkdir(parents=True, exist_ok=True)
+        (src / filename).write_text(filename)
+
+    (dest / ".git").mkdir(parents=True)
+
+    CopyToOutputDir(src_dir=src, dest_dir=dest)
+
+    return dest
+
+
+# ----------------------------------------------------------------------
+def test_Version():
+    result = CliRunner().invoke(app, ["--version"])
+    assert result.exit_code == 0
+    assert result.stdout == f"PythonProjectBootstrapper {__version__}"
+
+
+# ----------------------------------------------------------------------
+def test_VerifyNoDrift(tmp_path):
+    dest = _Generate(tmp_path)
+
+    result = CliRunner().invoke(app, ["verify", str(dest)])
+    assert result.exit_code == 0, result.stdout
+    assert "3 unchanged, 0 modified, 0 missing" in result.stdout
+
+
+# ----------------------------------------------------------------------
+def test_VerifyDrift(tmp_path):
+    dest = _Generate(tmp_path)
+
+    (dest / "file1.txt").write_text("modified")
+    (dest / "subdir" / "file3.txt").unlink()
+
+    result = CliRunner().invoke(app, ["verify", str(dest)])
+    assert result.exit_code == 1
+    assert "file1.txt" in result.stdout
+    assert "subdir/file3.txt" in result.stdout
+    assert "1 unchanged, 1 modified, 1 missing" in result.stdout
+
+    result = CliRunner().invoke(app, ["verify", str(dest), "--json"])
+    assert result.exit_code == 1
+    assert json.loads(result.stdout) == {
+        "unchanged": ["file2.txt"],
+        "modified": ["file1.txt"],
+        "missing": ["subdir/file3.txt"],
+    }
+
+
+# ----------------------------------------------------------------------
+def test_HistoryAndDiff(tmp_path):
+    dest = _Generate(tmp_path)
+
+    src = tmp_path / "src"
+    (src / "file1.txt").parent.mkdir(parents=True)
+    (src / "file1.txt").write_text("updated")
+    (src / "file4.txt").write_text("added")
+
+    CopyToOutputDir(src_dir=src, dest_dir=dest)
+
+    result = CliRunner().invoke(app, ["history", str(dest), "--json"])
+    assert result.exit_code == 0, result.stdout
+
+    content = json.loads(result.stdout)
+    assert [entry["generation"] for entry in content] == [1, 2]
+    assert content[0]["version"] == __version__
+    assert {path: value["status"] for path, value in content[1]["files"].items()} == {
+        "file1.txt": "modified",
+        "file2.txt": "removed",
+        "file4.txt": "added",
+        "subdir/file3.txt": "removed",
+    }
+
+    result = CliRunner().invoke(app, ["history", str(dest)])
+    assert result.exit_code == 0, result.stdout
+    assert __version__ in result.stdout
+
+    # Changes made by the most recent generation
+    result = CliRunner().invoke(app, ["diff", str(dest)])
+    assert result.exit_code == 0, result.stdout
+    assert "subdir/file3.txt" in result.stdout
+    assert "1 added, 1 modified, 2 removed" in result.stdout
+
+    # Changes made by all generations
+    result = CliRunner().invoke(app, ["diff", str(dest), "--from", "0", "--json"])
+    assert result.exit_code == 0, result.stdout
+    assert {path: value["status"] for path, value in json.loads(result.stdout).items()} == {
+        "file1.txt": "added",
+        "file4.txt": "added",
+    }
+
+    result = CliRunner().invoke(app, ["diff", str(dest), "--from", "1", "--to", "1"])
+    assert result.exit_code == 0, result.stdout
+    assert "0 added, 0 modified, 0 removed" in result.stdout
+
+
+# ----------------------------------------------------------------------
+def test_Matrix(tmp_path):
+    context_filename = tmp_path / "context.yaml"
+    context_filename.write_text(
+        yaml.dump(
+            {
+                "default_context": {
+                    "name": "Jane Doe",
+                    "email": "jane@example.com",
+                    "project_description": "A test project",
+                    "github_username": "jdoe",
+                    "github_project_name": "test_project",
+                    "gist_id": "abc123",
+                    "minisign_public_key": "none",
+                    "openssf_best_practices_badge_id": "none",
+                },
+            },
+        ),
+    )
+
+    snapshots_filename = tmp_path / "snapshots.json"
+
+    args = [
+        "matrix",
+        "package",
+        "--context",
+        str(context_filename),
+        "--axis",
+        "license=MIT",
+        "--axis",
+        "create_docker_image=false",
+        "--workers",
+        "1",
+        "--snapshots",
+        str(snapshots_filename),
+    ]
+
+    # No snapshots exist
+    result = CliRunner().invoke(app, args)
+    assert result.exit_code == 1, result.stdout
+    assert "new" in result.stdout
+    assert "1 permutation(s), 0 mismatched, 1 new" in result.stdout
+
+    result = CliRunner().invoke(app, args + ["--update-snapshots"])
+    assert result.exit_code == 0, result.stdout
+    assert list(json.loads(snapshots_filename.read_text())) == [
+        "create_docker_image=False,license=MIT"
+    ]
+
+    result = CliRunner().invoke(app, args + ["--json"])
+    assert result.exit_code == 0, result.stdout
+    assert (
+        json.loads(result.stdout)["create_docker_image=False,license=MIT"]["status"] == "matching"
+    )
+
+    snapshots_filename.write_text('{"create_docker_image=False,license=MIT": "0"}')
+
+    result = CliRunner().invoke(app, args)
+    assert result.exit_code == 1, result.stdout
+    assert "1 permutation(s), 1 mismatched, 0 new" in result.stdout
+
+
+# ----------------------------------------------------------------------
+def test_CreateMany(tmp_path):
+    context_filename = tmp_path / "context.yaml"
+    context_filename.write_text(
+        yaml.dump(
+            {
+                "default_context": {
+                    "name": "Jane Doe",
+                    "email": "jane@example.com",
+                    "project_description": "A test project",
+                    "github_username": "jdoe",
+                    "gist_id": "abc123",
+                    "minisign_public_key": "none",
+                    "openssf_best_practices_badge_id": "none",
+                },
+            },
+        ),
+    )
+
+    contexts_filename = tmp_path / "contexts.csv"
+    contexts_filename.write_text("github_project_name,license\nfirst,MIT\nsecond,Apache-2.0\n")
+
+    summary_filename = tmp_path / "summary.json"
+
+    args = [
+        "create-many",
+        "package",
+        str(contexts_filename),
+        str(tmp_path / "repos" / "{github_project_name}"),
+        "--context",
+        str(context_filename),
+        "--summary",
+        str(summary_filename),
+        "--workers",
+        "2",
+    ]
+
+    result = CliRunner().invoke(app, args)
+    assert result.exit_code == 0, result.stdout
+    assert "2 created, 0 failed" in result.stdout
+
+    assert (tmp_path / "repos" / "first" / "README.md").is_file()
+    assert (tmp_path / "repos" / "second" / "README.md").is_file()
+
+    assert [item["status"] for item in json.loads(summary_filename.read_text())] == [
+        "created",
+        "created",
+    ]
+
+    # Projects that aren't git repositories fail when git is required
+    result = CliRunner().invoke(app, args + ["--require-git", "--json"])
+    assert result.exit_code == 1, result.stdout
+    assert [item["status"] for item in json.loads(result.stdout)] == ["failed", "failed"]
+
+
+# ----------------------------------------------------------------------
+def test_Templates(tmp_path, monkeypatch):
+    monkeypatch.setenv(CACHE_DIRECTORY_ENV_VAR, str(tmp_path))
+
+    cache_dir = tmp_path / "Templates"
+
+    for index, commit_id in enumerate(["1" * 40, "2" * 40]):
+        (cache_dir / commit_id).mkdir(parents=True)
+        (cache_dir / commit_id / "cookiecutter.json").write_text("{}")
+
+        metadata_filename = cache_dir / f"{commit_id}.json"
+        metadata_filename.write_text(json.dumps({"repository": "/repo", "ref": f"v{index}"}))
+
+        # The second worktree was used most recently
+        os.utime(metadata_filename, (1000 + index, 1000 + index))
+
+    result = CliRunner().invoke(app, ["templates", "list"])
+    assert result.exit_code == 0, result.stdout
+    assert "2 cached, 4 bytes" in result.stdout
+
+    result = CliRunner().invoke(app, ["templates", "list", "--json"])
+    assert result.exit_code == 0, result.stdout
+    assert [item["ref"] for item in json.loads(result.stdout)] == ["v1", "v0"]
+
+    result = CliRunner().invoke(app, ["templates", "prune", "--max-entries", "1", "--json"])
+    assert result.exit_code == 0, result.stdout
+    assert [item["commit_id"] for item in json.loads(result.stdout)] == ["1" * 40]
+    assert sorted(item.name for item in cache_dir.iterdir()) == ["2" * 40, "2" * 40 + ".json"]
+
+    result = CliRunner().invoke(app, ["templates", "prune"])
+    assert result.exit_code == 0, result.stdout
+    assert "1 removed, 2 bytes" in result.stdout
+    assert list(cache_dir.iterdir()) == []
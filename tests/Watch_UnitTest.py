@@ -0,0 +1,270 @@
+# ----------------------------------------------------------------------
+# |
+# |  Copyright (c) 2024 Scientific Software Engineering Center at Georgia Tech
+# |  Distributed under the MIT License.
+# |
+# ----------------------------------------------------------------------
+"""Unit tests for Watch.py"""
+
+import io
+import os
+import shutil
+import sys
+import threading
+import time
+
+from pathlib import Path
+
+import pytest
+
+from conftest import package_context
+
+from PythonProjectBootstrapper import Generation
+from PythonProjectBootstrapper.Watch import (
+    FileChangeType,
+    InotifyWatcher,
+    PollingWatcher,
+    Watch,
+    WatchSession,
+    watch_marker_filename,
+)
+
+
+# ----------------------------------------------------------------------
+@pytest.fixture
+def template_dir(tmp_path, monkeypatch) -> Path:
+    """Copy of the package template that can be modified by tests"""
+
+    templates_root_dir = tmp_path / "templates"
+
+    shutil.copytree(
+        Generation.GetTemplatesRootDir() / "package",
+        templates_root_dir / "package",
+        ignore=shutil.ignore_patterns("__pycache__"),
+    )
+
+    monkeypatch.setattr(Generation, "GetTemplatesRootDir", lambda: templates_root_dir)
+    monkeypatch.setattr(
+        "PythonProjectBootstrapper.Watch.GetTemplatesRootDir", lambda: templates_root_dir
+    )
+
+    return templates_root_dir / "package" / "{{ cookiecutter.__empty_dir }}"
+
+
+# ----------------------------------------------------------------------
+def _Append(filename: Path, content: str) -> None:
+    with filename.open("a", newline="") as f:
+        f.write(content)
+
+
+# ----------------------------------------------------------------------
+def test_IncrementalUpdate(tmp_path, template_dir):
+    output_dir = tmp_path / "output"
+
+    session = WatchSession("package", output_dir, package_context)
+
+    update = session.Render()
+    assert not update.is_incremental
+    assert all(diff.change_type == FileChangeType.Added for diff in update.diffs)
+    assert (output_dir / "README.md").is_file()
+    assert (output_dir / "LICENSE.txt").is_file()
+    assert not (output_dir / "Licenses").exists()
+
+    bootstrap_mode = (output_dir / "Bootstrap.sh").stat().st_mode
+
+    _Append(template_dir / "README.md", "Watched {{ cookiecutter.github_project_name }}\n")
+    _Append(template_dir / "Bootstrap.sh", "# Watched\n")
+
+    update = session.Update([template_dir / "README.md", template_dir / "Bootstrap.sh"])
+    assert update.is_incremental
+    assert [diff.filename for diff in update.diffs] == ["Bootstrap.sh", "README.md"]
+    assert all(diff.change_type == FileChangeType.Modified for diff in update.diffs)
+    assert "+Watched test_project" in update.diffs[1].lines
+
+    assert (output_dir / "README.md").read_text().endswith("Watched test_project\n")
+
+    # The mode set by the post-generation hook is preserved
+    assert (output_dir / "Bootstrap.sh").stat().st_mode == bootstrap_mode
+
+    # Nothing changes when the content is the same
+    os.utime(template_dir / "README.md")
+
+    update = session.Update([template_dir / "README.md"])
+    assert update.is_incremental
+    assert update.diffs == []
+
+
+# ----------------------------------------------------------------------
+def test_FullUpdate(tmp_path, template_dir):
+    output_dir = tmp_path / "output"
+
+    session = WatchSession("package", output_dir, package_context)
+    session.Render()
+
+    # Files moved by hooks require a full render
+    _Append(template_dir / "Licenses" / "MIT_LICENSE.txt", "Watched\n")
+
+    update = session.Update([template_dir / "Licenses" / "MIT_LICENSE.txt"])
+    assert not update.is_incremental
+    assert [diff.filename for diff in update.diffs] == ["LICENSE.txt"]
+
+    # New template files require a full render
+    (template_dir / "NEW.md").write_text("{{ cookiecutter.github_username }}\n")
+
+    update = session.Update([template_dir / "NEW.md"])
+    assert not update.is_incremental
+    assert [(diff.filename, diff.change_type) for diff in update.diffs] == [
+        ("NEW.md", FileChangeType.Added),
+    ]
+    assert (output_dir / "NEW.md").read_text() == "jdoe\n"
+
+    # Removed template files require a full render
+    (template_dir / "NEW.md").unlink()
+
+    update = session.Update([template_dir / "NEW.md"])
+    assert not update.is_incremental
+    assert [(diff.filename, diff.change_type) for diff in update.diffs] == [
+        ("NEW.md", FileChangeType.Deleted),
+    ]
+    assert not (output_dir / "NEW.md").exists()
+
+    # Modifications made to the scratch directory are reverted
+    (output_dir / "README.md").unlink()
+
+    update = session.Update([output_dir / "README.md"])
+    assert not update.is_incremental
+    assert [(diff.filename, diff.change_type) for diff in update.diffs] == [
+        ("README.md", FileChangeType.Added),
+    ]
+
+
+# ----------------------------------------------------------------------
+def test_UnrenderedFiles(tmp_path, template_dir):
+    output_dir = tmp_path / "output"
+
+    # Directories that weren't created by watch are not modified
+    (output_dir / ".git").mkdir(parents=True)
+    (output_dir / ".git" / "config").write_text("config")
+    (output_dir / "notes.txt").write_text("notes")
+
+    with pytest.raises(Exception, match="is not empty and was not created by watch"):
+        WatchSession("package", output_dir, package_context)
+
+    assert (output_dir / ".git" / "config").read_text() == "config"
+    assert (output_dir / "notes.txt").read_text() == "notes"
+
+    # Files that weren't rendered are preserved
+    shutil.rmtree(output_dir)
+
+    session = WatchSession("package", output_dir, package_context)
+    session.Render()
+
+    assert (output_dir / watch_marker_filename).is_file()
+    assert "README.md" in session.rendered_filenames
+
+    (output_dir / ".git").mkdir()
+    (output_dir / ".git" / "config").write_text("config")
+    (output_dir / "notes.txt").write_text("notes")
+
+    (template_dir / "NEW.md").write_text("new\n")
+
+    update = session.Update([template_dir / "NEW.md"])
+    assert not update.is_incremental
+    assert [(diff.filename, diff.change_type) for diff in update.diffs] == [
+        ("NEW.md", FileChangeType.Added),
+    ]
+
+    (template_dir / "NEW.md").unlink()
+
+    update = session.Update([template_dir / "NEW.md"])
+    assert [(diff.filename, diff.change_type) for diff in update.diffs] == [
+        ("NEW.md", FileChangeType.Deleted),
+    ]
+
+    assert (output_dir / ".git" / "config").read_text() == "config"
+    assert (output_dir / "notes.txt").read_text() == "notes"
+
+    # A new session continues to use the directory
+    session = WatchSession("package", output_dir, package_context)
+    assert session.Render().diffs == []
+    assert (output_dir / "notes.txt").read_text() == "notes"
+
+
+# ----------------------------------------------------------------------
+@pytest.mark.parametrize(
+    "watcher_type",
+    [
+        PollingWatcher,
+        pytest.param(
+            InotifyWatcher,
+            marks=pytest.mark.skipif(
+                not sys.platform.startswith("linux"), reason="inotify is only available on Linux"
+            ),
+        ),
+    ],
+)
+def test_Watcher(tmp_path, watcher_type):
+    (tmp_path / "subdir").mkdir()
+
+    with watcher_type([tmp_path]) as watcher:
+        assert watcher.Wait(0.05) == set()
+
+        (tmp_path / "subdir" / "file.txt").write_text("content")
+        (tmp_path / "subdir" / "file.txt~").write_text("ignored")
+
+        assert (tmp_path / "subdir" / "file.txt").resolve() in watcher.Wait(5)
+
+        # New directories are watched
+        (tmp_path / "new_dir").mkdir()
+        watcher.Drain()
+
+        (tmp_path / "new_dir" / "file.txt").write_text("content")
+
+        deadline = time.monotonic() + 5
+        modified: set[Path] = set()
+
+        while (tmp_path / "new_dir" / "file.txt").resolve() not in modified:
+            assert time.monotonic() < deadline
+            modified |= watcher.Wait(0.5)
+
+        assert not any(path.name.endswith("~") for path in modified)
+
+
+# ----------------------------------------------------------------------
+def test_Watch(tmp_path, template_dir):
+    output_dir = tmp_path / "output"
+
+    output_stream = io.StringIO()
+    stop_event = threading.Event()
+
+    thread = threading.Thread(
+        target=Watch,
+        args=("package", output_dir, package_context),
+        kwargs={
+            "debounce": 0.05,
+            "output_stream": output_stream,
+            "stop_event": stop_event,
+        },
+    )
+
+    thread.start()
+
+    try:
+        deadline = time.monotonic() + 30
+
+        while "file(s) rendered" not in output_stream.getvalue():
+            assert thread.is_alive() and time.monotonic() < deadline
+            time.sleep(0.05)
+
+        _Append(template_dir / "README.md", "Watched\n")
+
+        while "+Watched" not in output_stream.getvalue():
+            assert thread.is_alive() and time.monotonic() < deadline
+            time.sleep(0.05)
+
+    finally:
+        stop_event.set()
+        thread.join()
+
+    assert "1 file(s) changed (incremental render" in output_stream.getvalue()
+    assert (output_dir / "README.md").read_text().endswith("Watched\n")
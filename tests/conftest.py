@@ -0,0 +1,121 @@
+# ----------------------------------------------------------------------
+# |
+# |  Copyright (c) 2024 Scientific Software Engineering Center at Georgia Tech
+# |  Distributed under the MIT License.
+# |
+# ----------------------------------------------------------------------
+"""Fixtures and helpers shared by the unit tests"""
+
+import os
+import textwrap
+
+from collections import OrderedDict
+from pathlib import Path
+
+import pytest
+
+from PythonProjectBootstrapper.CacheDirectory import CACHE_DIRECTORY_ENV_VAR
+
+
+# ----------------------------------------------------------------------
+package_context: dict[str, str] = {
+    "name": "Jane Doe",
+    "email": "jane@example.com",
+    "project_description": "A test project",
+    "license": "MIT",
+    "github_username": "jdoe",
+    "github_project_name": "test_project",
+    "gist_id": "abc123",
+    "minisign_public_key": "none",
+    "openssf_best_practices_badge_id": "none",
+}
+
+
+# ----------------------------------------------------------------------
+@pytest.fixture(autouse=True)
+def _CacheDirectory(tmp_path, monkeypatch):
+    monkeypatch.setenv(CACHE_DIRECTORY_ENV_VAR, str(tmp_path / "cache"))
+
+
+# ----------------------------------------------------------------------
+def CreateTemplate(templates_root_dir: Path) -> Path:
+    """Creates a small cookiecutter template named "project" and returns its directory"""
+
+    repo_dir = templates_root_dir / "project"
+    template_dir = repo_dir / "{{ cookiecutter.project_name }}"
+
+    (template_dir / "src" / "{{ cookiecutter.module_name }}").mkdir(parents=True)
+    (template_dir / "raw" / "empty").mkdir(parents=True)
+    (template_dir / "empty").mkdir()
+    (repo_dir / "templates").mkdir()
+
+    (repo_dir / "cookiecutter.json").write_text('{"project_name": "TheProject"}')
+    (repo_dir / "templates" / "header.txt").write_text(
+        "# Header for {{ cookiecutter.project_name }}\n"
+    )
+
+    (template_dir / "README.md").write_text(
+        textwrap.dedent(
+            """\
+            {% include "header.txt" %}
+            {{ cookiecutter.project_name }}
+            {% for i in range(3) %}line {{ i }}
+            {% endfor %}
+            """,
+        ),
+    )
+
+    with (template_dir / "windows.txt").open("w", newline="\r\n") as f:
+        f.write("{{ cookiecutter.module_name }}\nsecond line\n")
+
+    script = template_dir / "run.sh"
+    script.write_text("echo {{ cookiecutter.module_name }}\n")
+    script.chmod(0o755)
+
+    for index in range(10):
+        (template_dir / "src" / "{{ cookiecutter.module_name }}" / f"file{index}.py").write_text(
+            "value = {}  # {{{{ cookiecutter.module_name }}}}\n".format(index) * (index + 1),
+        )
+
+    (template_dir / "raw" / "{{ cookiecutter.module_name }}.txt").write_text("{{ not rendered }}")
+    (template_dir / "copy_only.txt").write_text("{{ also not rendered }}")
+    (template_dir / "image.bin").write_bytes(bytes(range(256)) * 4)
+
+    return repo_dir
+
+
+# ----------------------------------------------------------------------
+def CreateContext(**values) -> dict:
+    """Returns the context used to render the template created by CreateTemplate()"""
+
+    cookiecutter_values = OrderedDict(
+        [
+            ("project_name", "TheProject"),
+            ("module_name", "the_module"),
+            ("_copy_without_render", ["raw", "copy_only.txt"]),
+        ],
+    )
+
+    cookiecutter_values.update(values)
+
+    return OrderedDict([("cookiecutter", cookiecutter_values)])
+
+
+# ----------------------------------------------------------------------
+def GetContents(root: Path) -> dict[str, tuple[bytes, int]]:
+    """Returns the content and mode of each file (and a "<name>/" entry for each directory) under root"""
+
+    results: dict[str, tuple[bytes, int]] = {}
+
+    for dirpath, dirnames, filenames in os.walk(root):
+        for dirname in dirnames:
+            results[(Path(dirpath) / dirname).relative_to(root).as_posix() + "/"] = (b"", 0)
+
+        for filename in filenames:
+            fullpath = Path(dirpath) / filename
+            results[fullpath.relative_to(root).as_posix()] = (
+                fullpath.read_bytes(),
+                fullpath.stat().st_mode,
+            )
+
+    return results